@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark of admission control: per-command overhead, and an interactive
+user's latency while a runaway script floods expensive lists
+
+Times admit() with and without rate limits, then runs a script thread
+issuing `list` over the whole store as fast as it can next to a user issuing
+`show` a few hundred times a second, first with no rate limits and then with
+the default ones, and reports the user's latency percentiles and what
+happened to the script's requests.
+"""
+
+import contextlib
+import io
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from modules.admission import AdmissionController, Overloaded  # noqa: E402
+from modules.cli import TodoCLI  # noqa: E402
+
+
+def admit_overhead(admission, count):
+    """Mean microseconds per admit() and slot release"""
+    start = time.perf_counter()
+    for _ in range(count):
+        try:
+            with admission.admit("bench", 'read'):
+                pass
+        except Overloaded:
+            pass
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def flood(rows, limits, seconds):
+    """User's show latencies (ms) and the script's counters while the script floods lists"""
+    cli = TodoCLI(AdmissionController(limits, max_wait=5.0))
+    cli.task_manager.storage.add_tasks((f"Task {i}", "", False) for i in range(rows))
+    stopping = threading.Event()
+
+    def script():
+        while not stopping.is_set():
+            cli.process_command("list", client="script")
+            # a new task each round defeats the list cache, as a changing store would
+            cli.process_command('add "Noise"', client="script")
+
+    latencies = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        thread = threading.Thread(target=script)
+        thread.start()
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            cli.process_command("show 1", client="user")
+            latencies.append((time.perf_counter() - start) * 1e3)
+            time.sleep(0.003)
+        stopping.set()
+        thread.join()
+    return sorted(latencies), cli.admission.stats("script")
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(f"admit, no limits:    {admit_overhead(AdmissionController({}), 1_000_000):6.3f} us")
+    print(f"admit, rate limited: {admit_overhead(AdmissionController(), 1_000_000):6.3f} us\n")
+
+    print(f"script flooding `list` over {rows:,} tasks, user running `show` for 5 s:")
+    for label, limits in (("no limits", {}), ("default limits", None)):
+        latencies, script = flood(rows, limits, 5.0)
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(f"  {label:<15} user show p50 {statistics.median(latencies):7.2f} ms  p99 {p99:7.2f} ms  "
+              f"({len(latencies)} shows); script admitted {script.admitted:,}, "
+              f"rejected {script.rejected:,}, queued {script.queued:,}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the analytics report at store sizes up to 10M tasks
+
+Fills TaskColumns directly (10M Task objects would need several GB) with a
+year of creation times, 60% completion and varied title lengths, then times
+build_report with NumPy and, for sizes where it is bearable, without it. A
+smaller real store compares the report against the per-task Python loop
+over get_all_tasks() that reports used before.
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from modules.analytics import DAY_US, TaskColumns, build_report, load_numpy  # noqa: E402
+from modules.clock import ManualClock  # noqa: E402
+from modules.storage import InMemoryStorage  # noqa: E402
+
+NOW = 1_790_000_000_000_000
+
+
+def synthetic(count, rng):
+    """Columns for `count` tasks created over the past year"""
+    columns = TaskColumns()
+    created = [NOW - rng.randrange(365 * DAY_US) for _ in range(count)]
+    columns.ids = array('q', range(1, count + 1))
+    columns.created = array('q', created)
+    columns.updated = array('q', (c + rng.randrange(14 * DAY_US) for c in created))
+    columns.completed = array('b', (rng.random() < 0.6 for _ in range(count)))
+    columns.title_length = array('i', (rng.randrange(5, 60) for _ in range(count)))
+    columns.alive = array('b', [1]) * count
+    return columns
+
+
+def loop_report(storage, now_us):
+    """The old way: one pass over task objects in Python"""
+    per_day, durations, ages = {}, [], []
+    for task in storage.get_all_tasks():
+        day = task.created_us // DAY_US
+        created, completed = per_day.get(day, (0, 0))
+        per_day[day] = (created + 1, completed + task.completed)
+        if task.completed:
+            durations.append(task.updated_us - task.created_us)
+        else:
+            ages.append(now_us - task.created_us)
+    return per_day, statistics.median(durations) if durations else None, ages
+
+
+def timed(function, *args, repeats=3):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000, 10_000_000]
+    rng = random.Random(11)
+    print(f"NumPy: {'yes' if load_numpy() else 'not installed'}")
+    print(f"{'tasks':>10} {'numpy ms':>10} {'python ms':>10}")
+    for count in sizes:
+        columns = synthetic(count, rng)
+        fast = timed(build_report, columns, NOW, True) * 1000 if load_numpy() else float('nan')
+        slow = timed(build_report, columns, NOW, False, repeats=1) * 1000 if count <= 1_000_000 else float('nan')
+        print(f"{count:>10} {fast:>10.1f} {slow:>10.1f}")
+        del columns
+
+    count = 200_000
+    storage = InMemoryStorage(ManualClock(NOW))
+    storage.add_tasks((f"Task {i}", "", i % 5 < 3) for i in range(count))
+    start = time.perf_counter()
+    storage.columns
+    built = time.perf_counter() - start
+    print(f"\n{count} stored tasks: columns built in {built * 1000:.0f} ms (once; kept up to date afterwards)")
+    print(f"  loop over get_all_tasks(): {timed(loop_report, storage, NOW) * 1000:.1f} ms")
+    print(f"  build_report:              {timed(build_report, storage.columns, NOW) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
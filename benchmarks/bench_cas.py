@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark of compare-and-set updates from several threads
+
+Each thread runs read-version / update_task(if_version=...) loops, retrying on
+VersionConflict, over either 10k tasks (little contention) or 8 hot tasks.
+Writers lock one of LOCK_STRIPES stripes per task; the same run with a single
+stripe shows what one store-wide lock would do. CPython's GIL still runs one
+thread at a time, so this measures lock overhead and convoying rather than
+parallel speedup.
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import modules.storage as engine  # noqa: E402
+from modules.storage import InMemoryStorage, VersionConflict  # noqa: E402
+
+UPDATES = 200_000
+
+
+def run(threads, tasks):
+    """Updates per second and conflicts for `threads` writers over `tasks` tasks"""
+    storage = InMemoryStorage()
+    storage.add_tasks((str(0), "", False) for _ in range(tasks))
+    per_thread = UPDATES // threads
+    conflicts = [0] * threads
+
+    def worker(index):
+        rng = random.Random(index)
+        get, update = storage.get_task, storage.update_task
+        for _ in range(per_thread):
+            task_id = rng.randrange(tasks) + 1
+            while True:
+                task = get(task_id)
+                try:
+                    update(task_id, title=str(int(task.title) + 1), if_version=task.version)
+                    break
+                except VersionConflict:
+                    conflicts[index] += 1
+
+    workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    assert sum(int(task.title) for task in storage.iter_tasks()) == per_thread * threads
+    return per_thread * threads / elapsed, sum(conflicts)
+
+
+def main():
+    print(f"{'tasks':>6} {'threads':>7} {'striped/s':>11} {'conflicts':>9} {'one lock/s':>11} {'conflicts':>9}")
+    stripes = engine.LOCK_STRIPES
+    for tasks in (10_000, 8):
+        for threads in (1, 2, 4, 8):
+            engine.LOCK_STRIPES = stripes
+            striped = run(threads, tasks)
+            engine.LOCK_STRIPES = 1
+            single = run(threads, tasks)
+            print(f"{tasks:>6} {threads:>7} {striped[0]:>11,.0f} {striped[1]:>9} {single[0]:>11,.0f} {single[1]:>9}")
+    engine.LOCK_STRIPES = stripes
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Mutation microbenchmarks for each clock
+
+Times the engine's hot write paths with the system clock, a coarse clock
+ticked once per batch, and a manual clock (no clock reads at all, the floor).
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from modules.clock import CoarseClock, ManualClock, SystemClock  # noqa: E402
+from modules.storage import InMemoryStorage  # noqa: E402
+
+BATCH = 1000
+
+
+def run(clock, count):
+    """Return {operation: microseconds per call} for one clock"""
+    storage = InMemoryStorage(clock)
+    tick = getattr(clock, 'tick', None)
+    operations = [
+        ('add_task', lambda i: storage.add_task(f"Task {i}", "benchmark")),
+        ('update_task', lambda i: storage.update_task(i, description="edited")),
+        ('mark_completed', lambda i: storage.mark_completed(i)),
+        ('set_priority', lambda i: storage.set_priority(i, 'high')),
+    ]
+    results = {}
+    for name, op in operations:
+        start = time.perf_counter()
+        for i in range(1, count + 1):
+            if tick is not None and i % BATCH == 0:
+                tick()
+            op(i)
+        results[name] = (time.perf_counter() - start) / count * 1e6
+    return results
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    clocks = [("system", SystemClock()), ("coarse", CoarseClock()), ("manual", ManualClock())]
+    names = ['add_task', 'update_task', 'mark_completed', 'set_priority']
+    print(f"{count} mutations per operation; microseconds per call (coarse ticks every {BATCH})")
+    print(f"{'':<8}" + "".join(f"{name:>16}" for name in names))
+    for label, clock in clocks:
+        results = run(clock, count)
+        print(f"{label:<8}" + "".join(f"{results[name]:>16.3f}" for name in names))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark of title completion over 1M task titles
+
+Builds a TitleIndex from generated titles both at once and one add at a time
+(as the engine maintains it), then times prefix, fuzzy and suggest for typed
+queries with and without typos. The target is under 5 ms per suggestion.
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from modules.complete import TitleIndex  # noqa: E402
+
+WORDS = ("report budget meeting call email review draft plan invoice client design deploy fix test "
+         "write read order book schedule update prepare send dentist groceries milk").split()
+QUERIES = ("rep", "report bud", "reprot", "shcedule upd", "meetign call", "invoice clinet email", "zzz")
+
+
+def generate(count, rng):
+    """`count` titles of two to five words and a number"""
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 5))) + f" {rng.randrange(10000)}"
+            for _ in range(count)]
+
+
+def timed(function, *args, repeat=5):
+    """Median milliseconds of `repeat` calls"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    titles = generate(count, random.Random(1))
+
+    start = time.perf_counter()
+    TitleIndex(enumerate(titles, 1))
+    print(f"bulk build of {count:,} titles:        {time.perf_counter() - start:6.2f} s")
+    start = time.perf_counter()
+    index = TitleIndex()
+    for task_id, title in enumerate(titles, 1):
+        index.add(task_id, title)
+    elapsed = time.perf_counter() - start
+    print(f"incremental build ({elapsed / count * 1e6:.1f} us/add):   {elapsed:6.2f} s\n")
+
+    print(f"{'query':<22} {'prefix ms':>10} {'fuzzy ms':>10} {'suggest ms':>11} {'matches':>8}")
+    for query in QUERIES:
+        print(f"{query:<22} {timed(index.prefix, query):>10.2f} {timed(index.fuzzy, query):>10.2f} "
+              f"{timed(index.suggest, query):>11.2f} {len(index.suggest(query)):>8}")
+
+
+if __name__ == '__main__':
+    main()
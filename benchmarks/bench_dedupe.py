@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark of duplicate detection at growing store sizes
+
+Builds stores where one task in ten is a pasted copy and one in ten a lightly
+edited copy, then times building the dedupe index, grouping duplicates and a
+dedupe-on-insert lookup. Per-task cost staying flat as the store grows shows
+the grouping is not quadratic.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from modules.storage import InMemoryStorage  # noqa: E402
+
+WORDS = ("report budget meeting call email review draft plan invoice client design "
+         "deploy fix test write read order book schedule update prepare send").split()
+
+
+def build(count, rng):
+    """A store of `count` tasks with about 20% duplicates"""
+    storage = InMemoryStorage()
+    originals = []
+    for i in range(count):
+        roll = rng.random()
+        if originals and roll < 0.1:
+            title, description = rng.choice(originals)
+        elif originals and roll < 0.2:
+            title, description = rng.choice(originals)
+            title = title.upper() + "!"
+            description += " asap"
+        else:
+            title = " ".join(rng.choice(WORDS) for _ in range(5)) + f" {i}"
+            description = " ".join(rng.choice(WORDS) for _ in range(8))
+            originals.append((title, description))
+        storage.add_task(title, description)
+    return storage
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 50_000, 200_000]
+    rng = random.Random(7)
+    print(f"{'tasks':>8} {'index s':>9} {'groups s':>9} {'us/task':>9} {'groups':>8} {'lookup us':>10}")
+    for count in sizes:
+        storage = build(count, rng)
+        start = time.perf_counter()
+        index = storage.dedupe_index
+        built = time.perf_counter() - start
+
+        start = time.perf_counter()
+        groups = index.groups(storage._tasks)
+        grouped = time.perf_counter() - start
+
+        task = storage.get_task(count // 2)
+        start = time.perf_counter()
+        for _ in range(1000):
+            index.find(task.title, task.description, storage._tasks)
+        lookup = (time.perf_counter() - start) * 1000
+
+        per_task = (built + grouped) / count * 1e6
+        print(f"{count:>8} {built:>9.2f} {grouped:>9.2f} {per_task:>9.1f} {len(groups):>8} {lookup:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
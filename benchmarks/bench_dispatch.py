@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark of command dispatch overhead over 1M commands
+
+Compares the old route (a valid-command set lookup, then an if/elif chain,
+then per-handler id parsing) against a CommandRegistry lookup with the ids
+checked in Command.__call__. Handlers do nothing, so the times are pure
+dispatch. Commands are drawn from a realistic mix where ids are common and
+later branches of the chain are reached often.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from modules.commands import CommandRegistry  # noqa: E402
+from modules.utils import is_valid_command, validate_task_id  # noqa: E402
+
+MIX = [('show', ['17']), ('add', ['Buy milk']), ('list', []), ('update', ['4', 'Title']),
+       ('complete', ['9']), ('delete', ['3']), ('tag', ['2', 'home']), ('due', ['5', 'none']),
+       ('overdue', []), ('memory', [])]
+WEIGHTS = [40, 20, 5, 10, 10, 5, 4, 3, 2, 1]
+
+
+def noop(args):
+    pass
+
+
+def with_id(args):
+    is_valid, task_id = validate_task_id(args[0])
+    if not is_valid:
+        return
+
+
+def chain(command, args):
+    """The old dispatcher's shape: set lookup, if/elif chain, id parsed in each handler"""
+    if not is_valid_command(command):
+        return
+    if command == 'help':
+        noop(args)
+    elif command == 'add':
+        noop(args)
+    elif command == 'list':
+        noop(args)
+    elif command == 'show':
+        with_id(args)
+    elif command == 'update':
+        with_id(args)
+    elif command == 'complete':
+        with_id(args)
+    elif command == 'incomplete':
+        with_id(args)
+    elif command == 'delete':
+        with_id(args)
+    elif command == 'tag':
+        with_id(args)
+    elif command == 'untag':
+        with_id(args)
+    elif command == 'priority':
+        with_id(args)
+    elif command == 'due':
+        with_id(args)
+    elif command == 'overdue':
+        noop(args)
+    elif command == 'import':
+        noop(args)
+    elif command == 'tail':
+        noop(args)
+    elif command == 'replicate':
+        noop(args)
+    elif command == 'explain':
+        noop(args)
+    elif command == 'cache':
+        noop(args)
+    elif command == 'dedupe':
+        noop(args)
+    elif command == 'merge':
+        noop(args)
+    elif command == 'memory':
+        noop(args)
+
+
+def registry():
+    """The same commands in a CommandRegistry"""
+    commands = CommandRegistry()
+    for name in ('help', 'add', 'list', 'overdue', 'import', 'tail', 'replicate', 'explain',
+                 'cache', 'dedupe', 'merge', 'memory'):
+        commands.register(name, noop)
+    for name in ('show', 'update', 'complete', 'incomplete', 'delete', 'tag', 'untag', 'priority', 'due'):
+        commands.register(name, noop, ids=1)
+    return commands
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(3)
+    commands = [rng.choices(MIX, WEIGHTS)[0] for _ in range(count)]
+    table = registry()
+
+    start = time.perf_counter()
+    for command, args in commands:
+        chain(command, list(args))
+    old = time.perf_counter() - start
+
+    start = time.perf_counter()
+    get = table.get
+    for command, args in commands:
+        handler = get(command)
+        if handler is not None:
+            handler(list(args))
+    new = time.perf_counter() - start
+
+    print(f"{count} commands")
+    print(f"if/elif chain: {old:.2f} s ({old / count * 1e9:.0f} ns/command)")
+    print(f"registry:      {new:.2f} s ({new / count * 1e9:.0f} ns/command, timing included)")
+    print(f"\n{table.describe()}")
+
+
+if __name__ == "__main__":
+    main()
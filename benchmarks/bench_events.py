@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark for change event fan-out to concurrent subscribers
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from modules.storage import InMemoryStorage  # noqa: E402
+
+
+def consume(subscription, expected: int, batch_size: int):
+    """Drain a subscription until the expected number of events arrived"""
+    received = 0
+    while received < expected:
+        received += len(subscription.get_batch(max_items=batch_size))
+
+
+def run(subscribers: int, count: int, batch_size: int, bulk: bool):
+    """Publish count task creations to the given number of subscribers"""
+    storage = InMemoryStorage()
+    subscriptions = [storage.events.subscribe(max_queue=4096) for _ in range(subscribers)]
+    consumers = [threading.Thread(target=consume, args=(s, count, batch_size)) for s in subscriptions]
+    for consumer in consumers:
+        consumer.start()
+
+    start = time.perf_counter()
+    if bulk:
+        chunk = 1000
+        for offset in range(0, count, chunk):
+            storage.add_tasks((f"Task {i}", "", False) for i in range(offset, min(count, offset + chunk)))
+    else:
+        for i in range(count):
+            storage.add_task(f"Task {i}")
+    for consumer in consumers:
+        consumer.join()
+    elapsed = time.perf_counter() - start
+
+    mode = "add_tasks x1000" if bulk else "add_task"
+    print(f"  {subscribers:>2} subscribers, {mode:<15} batch={batch_size:<4}: "
+          f"{count / elapsed:>10,.0f} events/s published, "
+          f"{count * subscribers / elapsed:>11,.0f} deliveries/s")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"Publishing {count} events")
+    run(0, count, 256, bulk=False)
+    for batch_size in (1, 256):
+        run(10, count, batch_size, bulk=False)
+    run(10, count, 256, bulk=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the same workload through all three front ends
+
+Each front end (ItemService, TaskManager, TodoManager) creates, reads, lists,
+updates, queries and deletes the same number of records, so a change to the
+shared engine shows up as a per-operation cost on every path.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from modules.tasks import TaskManager  # noqa: E402
+from services import ItemService  # noqa: E402
+from storage import InMemoryStorage  # noqa: E402
+from todo_console_app import TodoManager  # noqa: E402
+
+QUERY = ["where", "completed=false", "and", "title~task", "limit", "10"]
+
+
+def item_service_ops(service):
+    """Operations through the root ItemService"""
+    return {
+        'create': lambda i: service.create_item(f"Task {i}", "benchmark"),
+        'get': lambda i: service.get_item(i),
+        'list': lambda i: service.get_all_items(),
+        'update': lambda i: service.update_item(i, f"Task {i} renamed"),
+        'query': None,
+        'delete': lambda i: service.delete_item(i),
+    }
+
+
+def task_manager_ops(manager):
+    """Operations through modules.tasks.TaskManager"""
+    return {
+        'create': lambda i: manager.add_task(f"Task {i}", "benchmark"),
+        'get': lambda i: manager.get_task(i),
+        'list': lambda i: manager.get_all_tasks(),
+        'update': lambda i: manager.update_task(i, title=f"Task {i} renamed"),
+        'query': lambda i: manager.query_tasks(QUERY),
+        'delete': lambda i: manager.delete_task(i),
+    }
+
+
+def todo_manager_ops(manager):
+    """Operations through todo_console_app.TodoManager"""
+    return {
+        'create': lambda i: manager.add_todo(f"Task {i}", "benchmark"),
+        'get': lambda i: manager.get_todo(i),
+        'list': lambda i: manager.list_todos(),
+        'update': lambda i: manager.update_todo(i, title=f"Task {i} renamed"),
+        'query': lambda i: manager.query_todos(QUERY),
+        'delete': lambda i: manager.delete_todo(i),
+    }
+
+
+def run(ops, count, repeats):
+    """Time each operation and return {name: microseconds per call}"""
+    results = {}
+    for name, op in ops.items():
+        if op is None:
+            continue
+        calls = repeats if name in ('list', 'query') else count
+        if name == 'query':
+            op(0)  # the first query loads the planner and builds the text index
+        start = time.perf_counter()
+        for i in range(1, calls + 1):
+            op(i)
+        results[name] = (time.perf_counter() - start) / calls * 1e6
+    return results
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    front_ends = [
+        ("ItemService", item_service_ops(ItemService(InMemoryStorage()))),
+        ("TaskManager", task_manager_ops(TaskManager())),
+        ("TodoManager", todo_manager_ops(TodoManager())),
+    ]
+    names = ['create', 'get', 'list', 'update', 'query', 'delete']
+    print(f"{count} records, {repeats} list/query repeats; microseconds per call")
+    print(f"{'':<12}" + "".join(f"{name:>10}" for name in names))
+    for label, ops in front_ends:
+        results = run(ops, count, repeats)
+        cells = "".join(f"{results[name]:>10.2f}" if name in results else f"{'-':>10}" for name in names)
+        print(f"{label:<12}{cells}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the parallel JSON Lines import pipeline
+Compares a single-process import against a process pool sized to the machine
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from modules.importer import import_file  # noqa: E402
+from modules.storage import InMemoryStorage  # noqa: E402
+
+
+def build_file(path: str, count: int):
+    """Write a synthetic import file with count records"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(count):
+            record = {
+                "title": f"Task number {i}",
+                "description": "Synthetic description " * (i % 8),
+                "completed": i % 4 == 0,
+            }
+            f.write(json.dumps(record))
+            f.write("\n")
+
+
+def time_import(path: str, workers: int) -> float:
+    """Return the wall time of one import with the given worker count"""
+    storage = InMemoryStorage()
+    start = time.perf_counter()
+    import_file(path, storage, workers=workers, chunk_size=4 << 20)
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    cores = os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tasks.jsonl")
+        build_file(path, count)
+        size_mb = os.path.getsize(path) / (1 << 20)
+        print(f"Importing {count} records ({size_mb:.1f} MiB), {cores} core(s) available")
+
+        baseline = time_import(path, workers=1)
+        print(f"  workers=1: {baseline:.3f}s")
+        for workers in sorted({2, 4, cores} - {1}):
+            elapsed = time_import(path, workers=workers)
+            print(f"  workers={workers}: {elapsed:.3f}s (speedup {baseline / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
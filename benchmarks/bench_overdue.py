@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Benchmark for "next 20 overdue high-priority tasks tagged X"
+"""
+
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from modules.tasks import TaskManager  # noqa: E402
+from modules.storage import PRIORITIES  # noqa: E402
+
+TAGS = ["work", "home", "errand", "health", "finance", "garden", "car", "school"]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(42)
+    now = datetime(2026, 6, 1)
+    manager = TaskManager()
+    storage = manager.storage
+
+    start = time.perf_counter()
+    storage.add_tasks((f"Task {i}", "", rng.random() < 0.3) for i in range(count))
+    for task_id in range(1, count + 1):
+        storage.set_due(task_id, now + timedelta(minutes=rng.randint(-60 * 24 * 30, 60 * 24 * 30)))
+        storage.set_priority(task_id, rng.choice(PRIORITIES))
+        storage.add_tags(task_id, rng.sample(TAGS, 2))
+    print(f"Built {count} tasks in {time.perf_counter() - start:.1f}s")
+
+    for tag, priority in [("work", "high"), (None, "high"), ("work", None), (None, None)]:
+        runs = 200
+        start = time.perf_counter()
+        for _ in range(runs):
+            tasks = manager.overdue_tasks(tag=tag, priority=priority, limit=20, now=now)
+        elapsed = (time.perf_counter() - start) / runs
+        print(f"  tag={tag} priority={priority}: {elapsed * 1000:.3f} ms per query ({len(tasks)} rows)")
+
+
+if __name__ == "__main__":
+    main()
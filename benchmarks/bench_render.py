@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark of rendering the item listing
+
+Compares the old per-row print() with strftime against Table.render plus one
+write, and times a pager screen, which costs the same at any list length.
+Output goes to an in-memory stream so terminal speed is not measured.
+"""
+
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from cli import CLIInterface  # noqa: E402
+from modules.render import Pager  # noqa: E402
+from services import ItemService  # noqa: E402
+from storage import InMemoryStorage  # noqa: E402
+
+
+def print_per_row(items):
+    """The previous listing: one print() per row"""
+    print(f"{'ID':<5} {'Title':<20} {'Description':<25} {'Created At':<20}")
+    print("-" * 75)
+    for item in items:
+        title = item.title[:18] + ".." if len(item.title) > 18 else item.title
+        description = item.description[:23] + ".." if len(item.description) > 23 else item.description
+        created_at = item.created_at.strftime('%Y-%m-%d %H:%M')
+        print(f"{item.id:<5} {title:<20} {description:<25} {created_at:<20}")
+
+
+def timed(action):
+    """Run action with stdout captured and return elapsed milliseconds"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        action()
+        return (time.perf_counter() - start) * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    service = ItemService(InMemoryStorage())
+    for i in range(count):
+        title = f"Task {i} with a fairly long title" if i % 10 else f"任务 {i} 的标题比较长"
+        service.create_item(title, "benchmark description that needs truncating")
+    cli = CLIInterface(service)
+    items = service.get_all_items()
+
+    per_row = timed(lambda: print_per_row(items))
+    buffered = timed(lambda: sys.stdout.write(cli._render_items(80)))
+    pager = Pager(cli._item_table(), service.iter_items(), size=(80, 40))
+    screen = timed(pager.window)
+
+    print(f"{count} items; milliseconds per listing")
+    print(f"  print per row        {per_row:>10.1f}")
+    print(f"  render + one write   {buffered:>10.1f}")
+    print(f"  pager screen         {screen:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
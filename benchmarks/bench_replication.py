@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark for read throughput across follower processes
+Each follower replicates the leader over TCP, then serves get_task/query reads.
+"""
+
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from modules.replication import ReplicationFollower, ReplicationLeader  # noqa: E402
+from modules.tasks import TaskManager  # noqa: E402
+
+READ_SECONDS = 2.0
+
+
+def reader(address: str, seq: int, count: int, start_barrier, results):
+    """Replicate, wait for the other readers, then count reads for a fixed time"""
+    follower = ReplicationFollower(address)
+    follower.wait_for(seq, 60)
+    lag = follower.lag()
+    rng = random.Random(os.getpid())
+    start_barrier.wait()
+
+    reads = 0
+    deadline = time.perf_counter() + READ_SECONDS
+    while time.perf_counter() < deadline:
+        for _ in range(1000):
+            follower.get_task(rng.randint(1, count))
+        reads += 1000
+    results.put((reads, lag.events))
+    follower.stop()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    manager = TaskManager()
+    manager.storage.add_tasks((f"Task {i}", "", i % 2 == 0) for i in range(count))
+    leader = ReplicationLeader(manager.storage)
+    seq = manager.storage.events.seq
+    print(f"Leader on {leader.address} with {count} tasks, {os.cpu_count()} core(s)")
+
+    for followers in (1, 2, 4):
+        barrier = multiprocessing.Barrier(followers)
+        results = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=reader, args=(leader.address, seq, count, barrier, results))
+                     for _ in range(followers)]
+        for process in processes:
+            process.start()
+        totals = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+        reads = sum(total for total, _ in totals)
+        print(f"  {followers} follower(s): {reads / READ_SECONDS:>12,.0f} reads/s, "
+              f"max lag at start {max(lag for _, lag in totals)} events")
+
+    leader.stop()
+
+
+if __name__ == "__main__":
+    main()
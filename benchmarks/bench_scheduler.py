@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the reminder scheduler with a large number of pending timers
+Measures schedule/move/cancel rates and CPU used while the worker thread idles
+"""
+
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from modules.scheduler import ReminderScheduler  # noqa: E402
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(7)
+    base = datetime.now() + timedelta(hours=1)
+    whens = [base + timedelta(seconds=rng.randint(0, 86400)) for _ in range(count)]
+    scheduler = ReminderScheduler(lambda task_id, deadline: None)
+    scheduler.start()
+
+    start = time.perf_counter()
+    for task_id, when in enumerate(whens):
+        scheduler.schedule(task_id, when)
+    elapsed = time.perf_counter() - start
+    print(f"schedule: {count} timers in {elapsed:.2f}s ({count / elapsed:,.0f}/s)")
+
+    moves = count // 10
+    start = time.perf_counter()
+    for task_id in range(moves):
+        scheduler.schedule(task_id, whens[task_id] + timedelta(minutes=5))
+    elapsed = time.perf_counter() - start
+    print(f"move: {moves} timers in {elapsed:.2f}s ({moves / elapsed:,.0f}/s)")
+
+    start = time.perf_counter()
+    for task_id in range(moves, 2 * moves):
+        scheduler.cancel(task_id)
+    elapsed = time.perf_counter() - start
+    print(f"cancel: {moves} timers in {elapsed:.2f}s ({moves / elapsed:,.0f}/s)")
+
+    cpu_before = time.process_time()
+    time.sleep(2.0)
+    idle_cpu = time.process_time() - cpu_before
+    print(f"idle: {len(scheduler)} pending timers, {idle_cpu * 1000:.1f} ms CPU over 2s")
+    scheduler.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark of shared memory snapshots: publishing, attaching and reading
+another process's store
+
+Publishes a store of tasks with varied titles, then from a separate reader
+process times attaching, point reads, a full scan and word searches, and
+compares them with what a process without shared memory would pay to get
+its own copy: unpickling the whole store.
+"""
+
+import os
+import pickle
+import random
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from modules.sharedsnapshot import SnapshotPublisher  # noqa: E402
+from modules.storage import InMemoryStorage  # noqa: E402
+
+WORDS = "report budget meeting call email review draft plan invoice client design deploy fix test".split()
+
+READER = r"""
+import random, statistics, sys, time
+from modules.sharedsnapshot import SnapshotReader
+
+start = time.perf_counter()
+reader = SnapshotReader(sys.argv[1])
+print(f"attach:                     {(time.perf_counter() - start) * 1e3:9.2f} ms")
+
+rng = random.Random(2)
+ids = [rng.randrange(1, len(reader) + 1) for _ in range(100_000)]
+start = time.perf_counter()
+for task_id in ids:
+    reader.get_task(task_id).title
+print(f"get_task + title:           {(time.perf_counter() - start) / len(ids) * 1e6:9.2f} us")
+
+start = time.perf_counter()
+completed = sum(1 for task in reader if task.completed)
+print(f"scan all, read completed:   {time.perf_counter() - start:9.2f} s ({completed:,} completed)")
+
+for query in ("budget", "budget review", "invoice client deploy"):
+    times = []
+    for _ in range(20):
+        start = time.perf_counter()
+        found = reader.search(query, limit=50)
+        times.append((time.perf_counter() - start) * 1e3)
+    print(f"search {query!r:<22} {statistics.median(times):7.2f} ms ({len(found)} shown)")
+reader.close()
+"""
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(1)
+    storage = InMemoryStorage()
+    storage.add_tasks((" ".join(rng.choice(WORDS) for _ in range(4)), "", i % 3 == 0) for i in range(count))
+
+    publisher = SnapshotPublisher(storage, f"todo_bench_{os.getpid()}")
+    try:
+        publisher.publish()
+        print(f"{count:,} tasks: {publisher.describe()}\n")
+        repo = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+        subprocess.run([sys.executable, "-c", READER, publisher.name], cwd=repo, check=True)
+    finally:
+        publisher.stop()
+
+    data = pickle.dumps(storage.get_all_tasks(), protocol=pickle.HIGHEST_PROTOCOL)
+    start = time.perf_counter()
+    pickle.loads(data)
+    print(f"\nwithout shared memory, unpickling a private copy: {time.perf_counter() - start:.2f} s "
+          f"({len(data) / 1e6:.0f} MB)")
+
+
+if __name__ == '__main__':
+    main()
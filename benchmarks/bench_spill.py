@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the memory budget: resident memory, insert cost and page-in latency
+
+Loads a store where most tasks are completed, with and without a budget, and
+reports traced Python memory, the insert rate and the cost of looking up
+spilled tasks (a cold page-in) versus resident ones.
+"""
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from modules.spill import format_size  # noqa: E402
+from modules.storage import InMemoryStorage  # noqa: E402
+
+PENDING_EVERY = 10
+
+
+def load(count, budget):
+    """Fill a store; 9 in 10 tasks are completed. Returns (storage, seconds)"""
+    storage = InMemoryStorage()
+    if budget is not None:
+        storage.set_memory_budget(budget)
+    start = time.perf_counter()
+    for i in range(1, count + 1):
+        storage.add_task(f"Task {i} with a typical title", "a description of moderate length " * 2)
+        if i % PENDING_EVERY:
+            storage.mark_completed(i)
+    return storage, time.perf_counter() - start
+
+
+def lookups(storage, ids):
+    """Mean microseconds per get_task over ids"""
+    start = time.perf_counter()
+    for task_id in ids:
+        storage.get_task(task_id)
+    return (time.perf_counter() - start) / len(ids) * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    budget = int(sys.argv[2]) if len(sys.argv) > 2 else 16 << 20
+    rng = random.Random(3)
+    print(f"{count} tasks, 90% completed; budget {format_size(budget)}")
+    for label, cap in (("unbudgeted", None), ("budgeted", budget)):
+        _, seconds = load(count, cap)
+        tracemalloc.start()
+        storage, _ = load(count, cap)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        sample = rng.sample(range(1, count + 1), 2000)
+        cold = lookups(storage, sample)
+        warm = lookups(storage, sample[-200:])
+        print(f"{label:<11} memory {format_size(current):>10}  insert {seconds / count * 1e6:6.2f} us/task  "
+              f"get cold {cold:6.2f} us  warm {warm:5.2f} us")
+        stats = storage.memory_stats()
+        if stats is not None:
+            print("  " + stats.describe().replace("\n", "\n  "))
+
+
+if __name__ == "__main__":
+    main()
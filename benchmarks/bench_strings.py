@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Memory report for title interning and description compression
+
+Builds a synthetic store shaped like real use: titles drawn Zipf-style from a
+few hundred common ones, descriptions mostly short with a long tail. It is
+built twice, with interning and compression switched off and on, and the
+traced memory, insert rate and description read cost are compared.
+"""
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import modules.storage as engine  # noqa: E402
+from modules.spill import format_size  # noqa: E402
+from modules.strings import string_stats  # noqa: E402
+
+VERBS = "call buy book email fix pay renew review send write clean plan order check prepare".split()
+NOUNS = ("dentist groceries report invoice car insurance garden taxes flight hotel "
+         "presentation budget kitchen laptop passport meeting notes").split()
+WORDS = VERBS + NOUNS + "the a to for and with before after on at by next week today".split()
+
+
+def dataset(count, seed):
+    """
+    Yield (title, description) pairs with Zipf titles and log-normal description lengths
+    Every string is freshly built, as input() would give, so the store owns it.
+    """
+    rng = random.Random(seed)
+    common = [f"{rng.choice(VERBS).title()} {rng.choice(NOUNS)}" for _ in range(300)]
+    weights = [1 / rank for rank in range(1, len(common) + 1)]
+    for title in rng.choices(common, weights, k=count):
+        length = min(int(rng.lognormvariate(3.5, 1.3)), 4000)
+        words = []
+        while sum(map(len, words)) + len(words) < length:
+            words.append(rng.choice(WORDS))
+        yield "".join(list(title)), " ".join(words)
+
+
+def build(count):
+    """Load the dataset into a fresh store; returns (storage, traced bytes, add seconds)"""
+    records = list(dataset(count, seed=11))
+    storage = engine.InMemoryStorage()
+    start = time.perf_counter()
+    for title, description in records:
+        storage.add_task(title, description)
+    seconds = time.perf_counter() - start
+    del records, storage
+
+    tracemalloc.start()
+    storage = engine.InMemoryStorage()
+    for title, description in dataset(count, seed=11):
+        storage.add_task(title, description)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return storage, current, seconds
+
+
+def read_cost(storage):
+    """Mean microseconds to read a description (what show does)"""
+    tasks = storage.get_all_tasks()
+    start = time.perf_counter()
+    for task in tasks:
+        task.description
+    return (time.perf_counter() - start) / len(tasks) * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    intern, threshold = engine.intern, engine.COMPRESS_MIN
+    engine.intern, engine.COMPRESS_MIN = (lambda text: text), sys.maxsize
+    plain, plain_bytes, plain_seconds = build(count)
+    engine.intern, engine.COMPRESS_MIN = intern, threshold
+    packed, packed_bytes, packed_seconds = build(count)
+
+    print(f"{count} tasks")
+    print(f"{'':<10} {'memory':>10} {'add us':>8} {'read us':>8}")
+    print(f"{'plain':<10} {format_size(plain_bytes):>10} {plain_seconds / count * 1e6:>8.2f} {read_cost(plain):>8.3f}")
+    print(f"{'packed':<10} {format_size(packed_bytes):>10} {packed_seconds / count * 1e6:>8.2f} "
+          f"{read_cost(packed):>8.3f}")
+    print(f"saved {format_size(plain_bytes - packed_bytes)} ({1 - packed_bytes / plain_bytes:.0%})\n")
+    print(string_stats(packed.iter_tasks()).describe())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark of subtask trees: progress reads, subtree listing and batched cascades
+
+Builds projects of nested subtasks (a root, `width` steps, each with `width`
+sub-steps) inside a store of flat tasks, then times reading a project's
+progress, listing its subtree, and completing or deleting it as one batch
+against doing the same one task at a time.
+"""
+
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from modules.storage import InMemoryStorage  # noqa: E402
+
+
+def build(flat, projects, width):
+    """A store with `flat` top-level tasks and `projects` two-level projects; returns it and the roots"""
+    storage = InMemoryStorage()
+    storage.add_tasks((f"Task {i}", "", False) for i in range(flat))
+    roots = []
+    for p in range(projects):
+        root = storage.add_task(f"Project {p}").id
+        roots.append(root)
+        for s in range(width):
+            step = storage.add_task(f"Step {s}", parent_id=root).id
+            for _ in range(width):
+                storage.add_task("Sub-step", parent_id=step)
+    return storage, roots
+
+
+def timed(function, args_list):
+    """Median microseconds of calling `function` once per args tuple"""
+    times = []
+    for args in args_list:
+        start = time.perf_counter()
+        function(*args)
+        times.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(times)
+
+
+def main():
+    flat = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    width = 20
+    start = time.perf_counter()
+    storage, roots = build(flat, 40, width)
+    size = 1 + width + width * width
+    print(f"store of {len(storage):,} tasks, 40 projects of {size} built in {time.perf_counter() - start:.1f} s\n")
+
+    tree = storage.tree
+    print(f"progress of a project:              {timed(tree.progress, [(root,) for root in roots]):9.2f} us")
+    print(f"list a project's subtree ({size}):  {timed(tree.subtree, [(root,) for root in roots]):9.2f} us")
+
+    batch, loop = roots[:10], roots[10:20]
+    print(f"complete subtree, one batch:        {timed(storage.complete_subtree, [(root,) for root in batch]):9.0f} us")
+
+    def complete_each(root):
+        for task_id in tree.subtree(root):
+            storage.mark_completed(task_id)
+    print(f"complete subtree, task by task:     {timed(complete_each, [(root,) for root in loop]):9.0f} us")
+
+    batch, loop = roots[20:30], roots[30:40]
+    print(f"delete subtree, one batch:          {timed(storage.delete_subtree, [(root,) for root in batch]):9.0f} us")
+
+    def delete_each(root):
+        for task_id in reversed(tree.subtree(root)):
+            storage.delete_task(task_id)
+    print(f"delete subtree, task by task:       {timed(delete_each, [(root,) for root in loop]):9.0f} us")
+
+
+if __name__ == '__main__':
+    main()
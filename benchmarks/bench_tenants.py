@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark of task namespaces: admission overhead, eviction and reload
+
+Times the per-command cost of admitting against a namespace with and without
+a rate quota, then snapshots and reloads namespaces of growing size, and
+finally runs a throttled heavy tenant alongside a quiet one to show the quiet
+tenant keeps its full throughput.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from modules.tasks import TaskManager  # noqa: E402
+from modules.tenants import Namespaces, Quota, QuotaExceeded  # noqa: E402
+
+
+def admission(namespaces, name, count):
+    """Mean microseconds per admit() call"""
+    namespace = namespaces.get(name)
+    start = time.perf_counter()
+    for _ in range(count):
+        try:
+            namespace.admit()
+        except QuotaExceeded:
+            pass
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as directory:
+        namespaces = Namespaces(lambda name: TaskManager(), directory=directory, max_loaded=2)
+        namespaces.set_quota("limited", Quota(ops_per_second=1e9))
+        print(f"admit, no quota:     {admission(namespaces, 'free', 1_000_000):6.3f} us")
+        print(f"admit, rate quota:   {admission(namespaces, 'limited', 1_000_000):6.3f} us\n")
+
+        print(f"{'tasks':>9} {'evict s':>9} {'reload s':>9} {'snapshot MB':>12}")
+        size = 1000
+        while size <= count:
+            name = f"list{size}"
+            manager = namespaces.get(name).manager
+            manager.storage.add_tasks((f"Task number {i}", "some description", i % 3 == 0) for i in range(size))
+            start = time.perf_counter()
+            namespaces.evict(name)
+            evicted = time.perf_counter() - start
+            snapshot = os.path.getsize(os.path.join(directory, f"{name}.snapshot")) / 1e6
+            start = time.perf_counter()
+            namespaces.get(name)
+            print(f"{size:>9,} {evicted:>9.3f} {time.perf_counter() - start:>9.3f} {snapshot:>12.1f}")
+            size *= 10
+
+        namespaces.set_quota("heavy", Quota(ops_per_second=1000, burst=100))
+        heavy, quiet = namespaces.get("heavy"), namespaces.get("quiet")
+        admitted = {"heavy": 0, "quiet": 0}
+        deadline = time.perf_counter() + 1.0
+        while time.perf_counter() < deadline:
+            for name, namespace in (("heavy", heavy), ("quiet", quiet)):
+                try:
+                    namespace.admit()
+                    admitted[name] += 1
+                except QuotaExceeded:
+                    pass
+        print(f"\none second, heavy tenant capped at 1000 ops/s: heavy {admitted['heavy']:,} admitted "
+              f"({heavy.rejected:,} rejected), quiet {admitted['quiet']:,} admitted")
+        namespaces.close()
+
+
+if __name__ == '__main__':
+    main()
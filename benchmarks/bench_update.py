@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark of item update throughput: rebuilding Items versus patching in place
+
+The rebuild path is what ItemService.update_item used to do: fetch the item,
+construct a whole new Item (re-running its validation) and replace the stored
+record, which unindexes and reindexes every field. patch_item validates only
+the fields given and touches only the indexes over fields that changed. Both
+are timed on a store whose secondary and text indexes are built, changing one
+field per update, for 100k updates over 100k items.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from models import Item  # noqa: E402
+from modules.utils import normalize_tags  # noqa: E402
+from services import ItemService  # noqa: E402
+from storage import InMemoryStorage  # noqa: E402
+
+COUNT = 100_000
+
+
+def rebuild_update(service, item_id, title=None, description=None, tags=None, priority=None, due_at=None):
+    """The former update_item: a new Item per update, stored with upsert"""
+    existing_item = service.storage.get_item(item_id)
+    if not existing_item:
+        return None
+    new_title = title if title is not None else existing_item.title
+    new_description = description if description is not None else existing_item.description
+    updated_item = Item(
+        id=item_id,
+        title=new_title.strip() if new_title else "",
+        description=new_description.strip() if new_description else "",
+        created_at=existing_item.created_us,
+        tags=normalize_tags(tags) if tags is not None else list(existing_item.tags),
+        priority=priority if priority is not None else existing_item.priority,
+        due_at=due_at if due_at is not None else existing_item.due_us,
+        updated_at=service.storage.clock.now_us(),
+        version=existing_item.version + 1
+    )
+    return service.storage.engine.upsert_task(updated_item)
+
+
+def populated():
+    """A service holding COUNT items with every index built"""
+    service = ItemService(InMemoryStorage())
+    for number in range(COUNT):
+        service.create_item(f"Item {number} to do", "Some description of the item", tags=["work", f"t{number % 50}"])
+    engine = service.storage.engine
+    engine.tag_index
+    engine.text_index
+    return service
+
+
+def main():
+    priorities = ('low', 'medium', 'high')
+    cases = {
+        'priority': lambda number: {'priority': priorities[number % 3]},
+        'title': lambda number: {'title': f"Item {number} renamed"},
+    }
+    print(f"{'field':<10} {'rebuild/s':>12} {'patch/s':>12} {'speedup':>8}")
+    for field, make in cases.items():
+        rates = []
+        for update in (lambda service, item_id, **fields: rebuild_update(service, item_id, **fields),
+                       lambda service, item_id, **fields: service.patch_item(item_id, **fields)):
+            service = populated()
+            changes = [make(number) for number in range(COUNT)]
+            start = time.perf_counter()
+            for number, fields in enumerate(changes):
+                update(service, number + 1, **fields)
+            rates.append(COUNT / (time.perf_counter() - start))
+        print(f"{field:<10} {rates[0]:>12,.0f} {rates[1]:>12,.0f} {rates[1] / rates[0]:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,18 @@
-from typing import Optional
+from __future__ import annotations
+
+import sys
+from datetime import datetime
+
 from services import ItemService
-from models import Item
+
+# Annotation-only imports (see storage.py)
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import List, Optional
+    from modules.cache import ResultCache
+    from modules.commands import CommandRegistry
+    from modules.render import Table
+    from modules.tracing import Tracer
 
 
 class CLIInterface:
@@ -10,6 +22,23 @@ class CLIInterface:
 
     def __init__(self, item_service: ItemService):
         self.item_service = item_service
+        self._result_cache: Optional[ResultCache] = None
+        self._commands: Optional[CommandRegistry] = None
+        self.menu = {
+            '1': self.create_item_prompt,
+            '2': self.list_items,
+            '3': self.update_item_prompt,
+            '4': self.delete_item_prompt,
+            '5': self.view_item_details,
+        }
+
+    @property
+    def result_cache(self) -> ResultCache:
+        """Cache of rendered listings, created the first time it is needed."""
+        if self._result_cache is None:
+            from modules.cache import ResultCache
+            self._result_cache = ResultCache()
+        return self._result_cache
 
     def display_menu(self):
         """Display the main menu options."""
@@ -54,25 +83,41 @@ class CLIInterface:
             print(f"\n✗ Error creating item: {e}")
 
     def list_items(self):
-        """Display all items in a formatted table."""
-        print("\n--- ALL ITEMS ---")
+        """
+        Display all items in a formatted table.
+
+        The table is written in a single call; when it is longer than the
+        terminal and both ends are interactive, it is shown in a pager instead.
+        """
+        from modules.render import terminal_size
+        sys.stdout.write("\n--- ALL ITEMS ---\n")
+        columns, lines = terminal_size()
+        if self.item_service.count() > lines and sys.stdin.isatty() and sys.stdout.isatty():
+            from modules.render import Pager
+            Pager(self._item_table(), self.item_service.iter_items()).run()
+            return
+        output = self.result_cache.get_or_compute(
+            f'list\x1f{columns}', self.item_service.generation, lambda: self._render_items(columns))
+        sys.stdout.write(output + "\n")
+
+    def _item_table(self) -> Table:
+        """Columns of the item listing; titles and descriptions share spare width."""
+        from modules.render import Column, Table, format_minute
+        return Table([
+            Column("ID", lambda item: str(item.id), 5),
+            Column("Title", lambda item: item.title, 20, min_width=10),
+            Column("Description", lambda item: item.description, 25, min_width=10),
+            Column("Created At", lambda item: format_minute(item.created_us), 16),
+        ])
+
+    def _render_items(self, width: Optional[int] = None) -> str:
+        """Build the item table shown by list_items, fitted to `width` columns."""
         items = self.item_service.get_all_items()
 
         if not items:
-            print("No items found.")
-            return
-
-        print(f"{'ID':<5} {'Title':<20} {'Description':<25} {'Created At':<20}")
-        print("-" * 75)
-
-        for item in items:
-            title = item.title[:18] + ".." if len(item.title) > 18 else item.title
-            description = item.description[:23] + ".." if len(item.description) > 23 else item.description
-            created_at = item.created_at.strftime('%Y-%m-%d %H:%M')
-
-            print(f"{item.id:<5} {title:<20} {description:<25} {created_at:<20}")
+            return "No items found."
 
-        print(f"\nTotal items: {len(items)}")
+        return self._item_table().render(items, width, footer=f"\nTotal items: {len(items)}")
 
     def update_item_prompt(self):
         """Prompt user for item update details."""
@@ -186,10 +231,12 @@ class CLIInterface:
         print(f"  Description: {item.description}")
         print(f"  Created: {item.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"  Age: {self._calculate_age(item.created_at)}")
+        print(f"  Priority: {item.priority}")
+        print(f"  Tags: {', '.join(item.tags) or 'None'}")
+        print(f"  Due: {item.due_at.strftime('%Y-%m-%d %H:%M') if item.due_at else 'None'}")
 
     def _calculate_age(self, created_at) -> str:
         """Calculate age of an item."""
-        from datetime import datetime
         now = datetime.now()
         diff = now - created_at
 
@@ -204,6 +251,103 @@ class CLIInterface:
         else:
             return f"{minutes} minute{'s' if minutes != 1 else ''}"
 
+    @property
+    def commands(self) -> CommandRegistry:
+        """One-shot commands run by run_once, registered the first time they are needed."""
+        if self._commands is None:
+            from modules.commands import CommandRegistry
+            commands = CommandRegistry(id_error="Error: Invalid item ID. Please enter a number.",
+                                       usage_result=2, id_result=1)
+            commands.register('add', self._add_once, min_args=1, max_args=2,
+                              usage="main.py add <title> [description]")
+            commands.register('list', self._list_once, max_args=0, usage="main.py list")
+            commands.register('show', self._show_once, ids=1, max_args=1, usage="main.py show <id>")
+            commands.register('update', self._update_once, ids=1, min_args=2, max_args=3,
+                              usage="main.py update <id> <title> [description]")
+            commands.register('delete', self._delete_once, ids=1, max_args=1, usage="main.py delete <id>")
+            self._commands = commands
+        return self._commands
+
+    def trace(self, tracer: Tracer):
+        """
+        Record spans for every request: menu and one-shot handlers, the item
+        service methods they call, and the storage and engine calls below those.
+
+        Args:
+            tracer: Tracer receiving the spans
+        """
+        handlers = [handler.__name__ for handler in self.menu.values()]
+        tracer.instrument(self, 'cli', handlers + ['_add_once', '_list_once', '_show_once', '_update_once',
+                                                   '_delete_once'])
+        self.menu = {choice: getattr(self, name) for choice, name in zip(self.menu, handlers)}
+        self._commands = None  # registered again with the traced handlers
+        tracer.instrument(self.item_service, 'service')
+        tracer.instrument(self.item_service.storage, 'storage')
+        tracer.instrument(self.item_service.storage.engine, 'engine')
+
+    def run_once(self, args: List[str]) -> int:
+        """
+        Execute a single command without entering the interactive loop.
+
+        Args:
+            args: Command and arguments, e.g. ['add', 'Buy milk', 'From the store']
+
+        Returns:
+            Process exit status (0 on success)
+        """
+        command = self.commands.get(args[0].lower() if args else 'help')
+        if command is None:
+            print("Usage: main.py [add <title> [description] | list | show <id> | "
+                  "update <id> <title> [description] | delete <id>]")
+            return 0 if not args or args[0].lower() == 'help' else 2
+        return command(args[1:])
+
+    def _add_once(self, args: List[str]) -> int:
+        """One-shot add: create an item."""
+        try:
+            item = self.item_service.create_item(args[0], args[1] if len(args) > 1 else "")
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+        print(f"Created item {item.id}: {item.title}")
+        return 0
+
+    def _list_once(self, args: List[str]) -> int:
+        """One-shot list: print the item table."""
+        from modules.render import terminal_size
+        sys.stdout.write(self._render_items(terminal_size()[0]) + "\n")
+        return 0
+
+    def _show_once(self, args: List[str]) -> int:
+        """One-shot show: print one item."""
+        item = self.item_service.get_item(args[0])
+        if not item:
+            print(f"No item found with ID {args[0]}.")
+            return 1
+        print(f"{item.id}: {item.title} - {item.description}")
+        return 0
+
+    def _update_once(self, args: List[str]) -> int:
+        """One-shot update: change an item's title and optionally its description."""
+        try:
+            item = self.item_service.update_item(args[0], args[1], args[2] if len(args) > 2 else None)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+        if not item:
+            print(f"No item found with ID {args[0]}.")
+            return 1
+        print(f"Updated item {item.id}: {item.title}")
+        return 0
+
+    def _delete_once(self, args: List[str]) -> int:
+        """One-shot delete: remove an item."""
+        if not self.item_service.delete_item(args[0]):
+            print(f"No item found with ID {args[0]}.")
+            return 1
+        print(f"Deleted item {args[0]}")
+        return 0
+
     def run(self):
         """Run the main application loop."""
         print("Welcome to the In-Memory Python Console Application!")
@@ -213,19 +357,10 @@ class CLIInterface:
             self.display_menu()
             choice = self.get_user_choice()
 
-            if choice == '1':
-                self.create_item_prompt()
-            elif choice == '2':
-                self.list_items()
-            elif choice == '3':
-                self.update_item_prompt()
-            elif choice == '4':
-                self.delete_item_prompt()
-            elif choice == '5':
-                self.view_item_details()
-            elif choice == '6':
+            if choice == '6':
                 print("\nThank you for using the application. Goodbye!")
                 break
+            self.menu[choice]()
 
             # Pause to let user see results before showing menu again
             input("\nPress Enter to continue...")
\ No newline at end of file
@@ -4,27 +4,63 @@ Entry point for the In-Memory Python Console Application.
 
 This application provides a menu-driven CLI interface for managing items
 with full CRUD operations. All data is stored in memory only.
+
+Run with arguments for one-shot mode, which executes a single command and
+exits without showing the menu, e.g. `python main.py add "Buy milk"`.
+
+Set TODO_TRACE to a file name to record a Chrome trace-event JSON trace of
+each request through the CLI, service and storage layers (TODO_TRACE_SAMPLE
+sets the fraction of requests traced, 1 by default).
 """
 
+import os
+import sys
+
 from storage import InMemoryStorage
 from services import ItemService
 from cli import CLIInterface
 
 
-def main():
+def main(argv=None) -> int:
     """
     Initialize and run the console application.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Process exit status
     """
-    print("Starting In-Memory Python Console Application...")
+    args = sys.argv[1:] if argv is None else argv
 
     # Initialize components
     storage = InMemoryStorage()
     item_service = ItemService(storage)
     cli_interface = CLIInterface(item_service)
 
-    # Run the application
-    cli_interface.run()
+    tracer = None
+    if os.environ.get('TODO_TRACE'):
+        from modules.tracing import Tracer
+        try:
+            tracer = Tracer.from_environ()
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 2
+        cli_interface.trace(tracer)
+
+    try:
+        if args:
+            return cli_interface.run_once(args)
+
+        print("Starting In-Memory Python Console Application...")
+
+        # Run the application
+        cli_interface.run()
+        return 0
+    finally:
+        if tracer is not None:
+            print(f"Trace of {tracer.sampled} request(s) written to {tracer.save()}", file=sys.stderr)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -1,23 +1,40 @@
-from datetime import datetime
-from typing import Optional
-from dataclasses import dataclass
+from __future__ import annotations
 
+from modules.storage import DEFAULT_PRIORITY, PRIORITIES, Task
 
-@dataclass
-class Item:
+# Annotation-only imports (see storage.py)
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from datetime import datetime
+    from typing import List, Optional, Union
+
+
+class Item(Task):
     """
     Represents an item in the console application.
 
+    Items are stored by the shared task engine, so they carry every Task field;
+    the item console itself never completes them. The constructor keeps the
+    item signature, Item(id, title, description, created_at, tags, priority,
+    due_at); the other Task fields are keyword-only. to_dict() and from_dict()
+    are Task's, so an item round-trips every field, version and parent included.
+
     Attributes:
         id: Unique identifier for the item (auto-incremented)
         title: Title of the item
         description: Description of the item
         created_at: Timestamp when the item was created
+        tags: Lowercase labels attached to the item
+        priority: One of 'low', 'medium' or 'high'
+        due_at: Optional timestamp when the item is due
     """
-    id: int
-    title: str
-    description: str
-    created_at: datetime
+
+    def __init__(self, id: int, title: str, description: str, created_at: Union[datetime, int, None],
+                 tags: Optional[List[str]] = None, priority: str = DEFAULT_PRIORITY,
+                 due_at: Union[datetime, int, None] = None, *, completed: bool = False,
+                 updated_at: Union[datetime, int, None] = None, version: int = 0, parent_id: Optional[int] = None):
+        super().__init__(id, title, description, completed, created_at, updated_at, tags, priority, due_at,
+                         version, parent_id)
 
     def __post_init__(self):
         """Validate the item after initialization."""
@@ -25,12 +42,8 @@ class Item:
             raise ValueError("Title must be a non-empty string")
         if not isinstance(self.description, str):
             raise ValueError("Description must be a string")
-
-    def to_dict(self) -> dict:
-        """Convert the item to a dictionary representation."""
-        return {
-            'id': self.id,
-            'title': self.title,
-            'description': self.description,
-            'created_at': self.created_at.isoformat()
-        }
\ No newline at end of file
+        if not all(isinstance(tag, str) and tag.strip() for tag in self.tags):
+            raise ValueError("Tags must be non-empty strings")
+        if self.priority not in PRIORITIES:
+            raise ValueError(f"Priority must be one of: {', '.join(PRIORITIES)}")
+        # Time fields are validated when stored (see modules.clock.as_micros)
@@ -0,0 +1,261 @@
+"""
+Admission module for the Todo Console Application
+Rate limits per client and command class, and a bounded queue for running commands
+
+Every metered command is admitted in two steps:
+
+1. Its client's token bucket for the command's class (e.g. 'read', 'write',
+   'scan') is charged the command's cost. Costs are weighted by the work a
+   command does, so listing a million tasks (scan_cost) drains a bucket far
+   faster than showing one; a client over its rate is rejected at once with
+   the time until it could retry.
+2. It takes one of `max_running` work slots. When all are busy it waits in a
+   FIFO queue of at most `max_queued` requests, for at most `max_wait`
+   seconds; a request finding the queue full, or waiting too long, is shed
+   and its tokens are refunded. So is one refused after admission (see
+   Slot.refuse), which counts as rejected.
+
+One client flooding expensive scans therefore runs out of its own scan
+tokens without touching other clients' budgets or its own reads, and a burst
+of concurrent requests (from a socket front end, say) is queued or shed
+instead of piling up.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from .ratelimit import TokenBucket
+
+# Annotation-only imports (see storage.py)
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+LOCAL_CLIENT = 'console'
+# Rows a scan may examine per token: rendering a thousand rows takes about as long as ten
+# shows, and every command costs at least one token
+ROWS_PER_TOKEN = 1000
+DEFAULT_MAX_RUNNING = 1
+DEFAULT_MAX_QUEUED = 16
+DEFAULT_MAX_WAIT = 2.0
+
+
+class Overloaded(ValueError):
+    """A request was rejected by a rate limit or shed by a full work queue"""
+
+    def __init__(self, client: str, reason: str, retry_after: Optional[float] = None):
+        message = f"Too busy to run this for '{client}': {reason}"
+        if retry_after is not None:
+            message += f"; retry in {retry_after:.1f}s"
+        super().__init__(message)
+        self.client = client
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class Limit:
+    """Token rate (and optional burst) allowed to each client for one command class"""
+    rate: float
+    burst: Optional[float] = None
+
+    def describe(self) -> str:
+        """Human-readable limit"""
+        text = f"{self.rate:g} tokens/s"
+        if self.burst is not None:
+            text += f" (burst {self.burst:g})"
+        return text
+
+
+# Generous enough that nobody typing notices them; a script at full speed does
+DEFAULT_LIMITS = {
+    'read': Limit(200, 500),
+    'write': Limit(100, 500),
+    'scan': Limit(100, 500),
+}
+
+
+@dataclass
+class AdmissionStats:
+    """Counters for one client"""
+    admitted: int = 0
+    rejected: int = 0
+    queued: int = 0
+    shed: int = 0
+    tokens: float = 0.0
+
+
+def scan_cost(rows: int) -> float:
+    """Tokens charged for a command examining `rows` rows"""
+    return 1.0 + rows / ROWS_PER_TOKEN
+
+
+class Slot:
+    """A held work slot; releases it on exit"""
+
+    __slots__ = ('_controller', '_stats', '_bucket', '_cost')
+
+    def __init__(self, controller: AdmissionController, stats: AdmissionStats, bucket: Optional[TokenBucket],
+                 cost: float):
+        self._controller = controller
+        self._stats = stats
+        self._bucket = bucket
+        self._cost = cost
+
+    def __enter__(self) -> Slot:
+        return self
+
+    def __exit__(self, *exc_info):
+        self._controller._release()
+
+    def refuse(self):
+        """Count a request refused after admission (by a list quota, say) as rejected and refund its tokens"""
+        self._controller._refuse(self._stats, self._bucket, self._cost)
+
+
+class AdmissionController:
+    """
+    Admits commands against per-client, per-class token buckets and a bounded work queue
+    `limits` maps command classes to Limits; classes without one are not
+    rate limited. Buckets are created per (client, class) on first use.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Limit]] = None, max_running: int = DEFAULT_MAX_RUNNING,
+                 max_queued: int = DEFAULT_MAX_QUEUED, max_wait: float = DEFAULT_MAX_WAIT,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_running < 1:
+            raise ValueError("At least one command must be able to run")
+        if max_queued < 0 or max_wait < 0:
+            raise ValueError("Queue length and wait must not be negative")
+        self.limits: Dict[str, Limit] = dict(DEFAULT_LIMITS if limits is None else limits)
+        self.max_running = max_running
+        self.max_queued = max_queued
+        self.max_wait = max_wait
+        self._clock = clock
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._stats: Dict[str, AdmissionStats] = {}
+        self._lock = threading.Lock()
+        self._running = 0
+        self._waiters: Deque[threading.Event] = deque()
+
+    @property
+    def running(self) -> int:
+        """Commands holding a work slot"""
+        return self._running
+
+    @property
+    def waiting(self) -> int:
+        """Commands waiting in the queue"""
+        return len(self._waiters)
+
+    def stats(self, client: str) -> AdmissionStats:
+        """Counters for a client (zero for one never seen)"""
+        return self._stats.get(client) or AdmissionStats()
+
+    def set_limit(self, command_class: str, limit: Optional[Limit]):
+        """Set (or with None, lift) the limit of a command class; every client starts with a full bucket"""
+        with self._lock:
+            if limit is None:
+                self.limits.pop(command_class, None)
+            else:
+                TokenBucket(limit.rate, limit.burst)  # validate before storing
+                self.limits[command_class] = limit
+            for key in [key for key in self._buckets if key[1] == command_class]:
+                del self._buckets[key]
+
+    def admit(self, client: str, command_class: str, cost: float = 1.0) -> Slot:
+        """
+        Charge `cost` tokens and take a work slot, raising Overloaded if either is refused
+        Use the returned Slot as a context manager around running the command.
+        A cost above a bucket's burst is charged as the whole burst, so an
+        expensive command runs when its client's bucket is full rather than
+        never.
+        """
+        with self._lock:
+            stats = self._stats.get(client)
+            if stats is None:
+                stats = self._stats[client] = AdmissionStats()
+            bucket = self._bucket(client, command_class)
+            if bucket is not None:
+                cost = min(cost, bucket.capacity)
+                if not bucket.try_take(cost):
+                    stats.rejected += 1
+                    raise Overloaded(client, f"{command_class} rate limit of {self.limits[command_class].describe()} "
+                                             f"(this costs {cost:g})", bucket.wait_time(cost))
+            if self._running < self.max_running and not self._waiters:
+                self._running += 1
+                stats.admitted += 1
+                stats.tokens += cost
+                return Slot(self, stats, bucket, cost)
+            if len(self._waiters) >= self.max_queued:
+                self._shed(stats, bucket, cost)
+                raise Overloaded(client, f"work queue is full ({self.max_queued} waiting)")
+            waiter = threading.Event()
+            self._waiters.append(waiter)
+            stats.queued += 1
+
+        # _release hands its slot straight to the first waiter, so a woken waiter already holds one
+        waiter.wait(self.max_wait)
+        with self._lock:
+            if not waiter.is_set():
+                self._waiters.remove(waiter)
+                self._shed(stats, bucket, cost)
+                raise Overloaded(client, f"waited {self.max_wait:g}s in the work queue")
+            stats.admitted += 1
+            stats.tokens += cost
+        return Slot(self, stats, bucket, cost)
+
+    def _bucket(self, client: str, command_class: str) -> Optional[TokenBucket]:
+        key = (client, command_class)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            limit = self.limits.get(command_class)
+            if limit is None:
+                return None
+            bucket = self._buckets[key] = TokenBucket(limit.rate, limit.burst, self._clock)
+        return bucket
+
+    def _shed(self, stats: AdmissionStats, bucket: Optional[TokenBucket], cost: float):
+        """Count a shed request and give back the tokens it was charged"""
+        stats.shed += 1
+        self._refund(bucket, cost)
+
+    def _refuse(self, stats: AdmissionStats, bucket: Optional[TokenBucket], cost: float):
+        with self._lock:
+            stats.admitted -= 1
+            stats.rejected += 1
+            stats.tokens -= cost
+            self._refund(bucket, cost)
+
+    @staticmethod
+    def _refund(bucket: Optional[TokenBucket], cost: float):
+        if bucket is not None:
+            bucket.tokens = min(bucket.capacity, bucket.tokens + cost)
+
+    def _release(self):
+        with self._lock:
+            if self._waiters:
+                self._waiters.popleft().set()
+            else:
+                self._running -= 1
+
+    def describe(self) -> str:
+        """Human-readable limits, queue state and per-client counters"""
+        limits = ", ".join(f"{name} {limit.describe()}" for name, limit in sorted(self.limits.items()))
+        lines = [
+            f"Limits per client: {limits or 'none'}",
+            f"Scans cost 1 token plus 1 per {ROWS_PER_TOKEN:,} tasks",
+            f"Work queue: {self.running}/{self.max_running} running, {self.waiting}/{self.max_queued} waiting "
+            f"(up to {self.max_wait:g}s)",
+        ]
+        rows: List[Tuple[str, AdmissionStats]] = sorted(self._stats.items())
+        if rows:
+            lines.append(f"\n{'Client':<16} {'Admitted':>9} {'Rejected':>9} {'Queued':>7} {'Shed':>6} {'Tokens':>9}")
+            for client, stats in rows:
+                lines.append(f"{client:<16} {stats.admitted:>9,} {stats.rejected:>9,} {stats.queued:>7,} "
+                             f"{stats.shed:>6,} {stats.tokens:>9,.0f}")
+        return "\n".join(lines)
@@ -0,0 +1,253 @@
+"""
+Analytics module for the Todo Console Application
+Reports over the whole task store computed on columns instead of task objects
+
+The engine keeps a TaskColumns table once it is first asked for one: each
+column is a typed `array` (created and updated epoch microseconds, completed
+flag, title length) with one row per task, updated as tasks change. Reports
+run over those columns with NumPy when it is installed, which views the arrays
+without copying them; without NumPy the same reports are computed in Python
+over the arrays, which gives the same answers, only more slowly.
+
+Days are local calendar days, taken at the current UTC offset, and a pending
+task's age is the number of days since the day it was created. A completed task's completion time is taken to be its last
+update, which is exact unless it was edited after being completed.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from itertools import compress
+
+# Annotation-only imports (see storage.py)
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, Iterable, List, Optional, Tuple
+    from .storage import Task
+
+DAY_US = 86_400_000_000
+EPOCH = date(1970, 1, 1)
+# Backlog age buckets: (label, first age in days not included); ages count calendar days
+AGE_BUCKETS = (('today', 1), ('1-6 days', 7), ('7-29 days', 30), ('30-89 days', 90), ('90+ days', None))
+
+_numpy = None
+
+
+def load_numpy():
+    """The numpy module, or None if it is not installed (imported on first use)"""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _numpy = numpy
+    return _numpy or None
+
+
+class TaskColumns:
+    """
+    Column-oriented copy of the fields reports read, one row per task
+    Rows are appended as tasks are added; a deleted task's row is marked dead
+    and dropped by the next compaction, so updates and deletes cost O(1).
+    """
+
+    def __init__(self, tasks: Iterable[Task] = ()):
+        self.ids = array('q')
+        self.created = array('q')
+        self.updated = array('q')
+        self.completed = array('b')
+        self.title_length = array('i')
+        self.alive = array('b')
+        self.dead = 0
+        self._rows: Dict[int, int] = {}
+        for task in tasks:
+            self.put(task)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def put(self, task: Task):
+        """Add a task's row or refresh it"""
+        row = self._rows.get(task.id)
+        if row is None:
+            self._rows[task.id] = len(self.ids)
+            self.ids.append(task.id)
+            self.created.append(task.created_us)
+            self.updated.append(task.updated_us)
+            self.completed.append(task.completed)
+            self.title_length.append(len(task.title))
+            self.alive.append(1)
+            return
+        self.updated[row] = task.updated_us
+        self.completed[row] = task.completed
+        self.title_length[row] = len(task.title)
+
+    def remove(self, task_id: int):
+        """Mark a task's row dead"""
+        row = self._rows.pop(task_id, None)
+        if row is None:
+            return
+        self.alive[row] = 0
+        self.dead += 1
+        if self.dead > len(self._rows):
+            self.compact()
+
+    def compact(self):
+        """Rewrite the columns without dead rows"""
+        alive = self.alive
+        for name in ('ids', 'created', 'updated', 'completed', 'title_length'):
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode, [value for value, live in zip(column, alive) if live]))
+        self.alive = array('b', [1]) * len(self.ids)
+        self._rows = {task_id: row for row, task_id in enumerate(self.ids)}
+        self.dead = 0
+
+
+@dataclass
+class Report:
+    """Completion and backlog statistics over the task store"""
+    tasks: int = 0
+    completed: int = 0
+    # (day, tasks created that day, how many of them are completed)
+    per_day: List[Tuple[date, int, int]] = field(default_factory=list)
+    median_completion_us: Optional[float] = None
+    backlog_ages: List[Tuple[str, int]] = field(default_factory=list)
+    mean_title_length: float = 0.0
+    backend: str = "python"
+
+    @property
+    def completion_rate(self) -> float:
+        """Share of all tasks that are completed"""
+        return self.tasks and self.completed / self.tasks
+
+    def describe(self, days: int = 14) -> str:
+        """Human-readable report; per-day rows are limited to the last `days` days"""
+        if not self.tasks:
+            return "No tasks to report on."
+        lines = [f"Tasks: {self.tasks}, completed: {self.completed} ({self.completion_rate:.1%})"]
+        if self.median_completion_us is not None:
+            lines.append(f"Median time to complete: {format_duration(self.median_completion_us)}")
+        lines.append(f"Mean title length: {self.mean_title_length:.1f} characters")
+        lines.append("\nCompletion rate by day created:")
+        for day, created, completed in self.per_day[-days:]:
+            lines.append(f"  {day:%Y-%m-%d}  {completed:>7} / {created:<7} {completed / created:>6.1%}")
+        if self.backlog_ages:
+            lines.append("\nBacklog age (pending tasks):")
+            width = max(count for _, count in self.backlog_ages) or 1
+            for label, count in self.backlog_ages:
+                lines.append(f"  {label:<11} {count:>7} {'#' * round(count / width * 30)}".rstrip())
+        return "\n".join(lines)
+
+
+def format_duration(us: float) -> str:
+    """Format a duration in microseconds with the largest fitting unit"""
+    seconds = us / 1e6
+    for unit, size in (('d', 86400), ('h', 3600), ('m', 60)):
+        if seconds >= size:
+            return f"{seconds / size:.1f}{unit}"
+    return f"{seconds:.1f}s"
+
+
+def build_report(columns: TaskColumns, now_us: int, use_numpy: Optional[bool] = None) -> Report:
+    """
+    Compute a Report from task columns as of `now_us`
+    Uses NumPy when it is installed unless `use_numpy` is False.
+    """
+    numpy = load_numpy() if use_numpy is not False else None
+    if use_numpy and numpy is None:
+        raise ValueError("NumPy is not installed")
+    offset = datetime.fromtimestamp(now_us / 1e6).astimezone().utcoffset() // timedelta(microseconds=1)
+    if numpy is not None:
+        return _numpy_report(numpy, columns, now_us, offset)
+    return _python_report(columns, now_us, offset)
+
+
+def _numpy_report(np, columns: TaskColumns, now_us: int, offset: int) -> Report:
+    """
+    Vectorized report; the arrays are viewed, not copied
+    Boolean indexing is the costly step at this scale, so per-day counts for
+    both statuses come from one bincount over (day << 1 | completed), and only
+    the completion times are filtered.
+    """
+    created = np.frombuffer(columns.created, dtype=np.int64)
+    updated = np.frombuffer(columns.updated, dtype=np.int64)
+    completed = np.frombuffer(columns.completed, dtype=np.int8)
+    title_length = np.frombuffer(columns.title_length, dtype=np.dtype(f'i{columns.title_length.itemsize}'))
+    if columns.dead:
+        alive = np.frombuffer(columns.alive, dtype=np.int8).view(np.bool_)
+        created, updated, completed, title_length = (
+            np.compress(alive, column) for column in (created, updated, completed, title_length))
+
+    report = Report(tasks=len(created), backend="numpy")
+    if not report.tasks:
+        return report
+    report.completed = int(np.count_nonzero(completed))
+    report.mean_title_length = float(title_length.mean())
+
+    days = created + offset
+    days //= DAY_US
+    first = int(days.min())
+    days -= first
+    days <<= 1
+    days |= completed
+    counts = np.bincount(days, minlength=(int(days.max()) | 1) + 1).reshape(-1, 2)
+    _fill_days(report, first, counts[:, 0].tolist(), counts[:, 1].tolist(), (now_us + offset) // DAY_US)
+
+    if report.completed:
+        durations = updated - created
+        report.median_completion_us = float(np.median(np.compress(completed, durations)))
+    return report
+
+
+def _fill_days(report: Report, first: int, pending: List[int], completed: List[int], today: int):
+    """Set per-day rows and backlog ages from per-day pending/completed counts starting at day `first`"""
+    ages = [0] * len(AGE_BUCKETS)
+    bounds = [bound for _, bound in AGE_BUCKETS[:-1]]
+    for offset, (waiting, done) in enumerate(zip(pending, completed)):
+        if waiting or done:
+            day = first + offset
+            report.per_day.append((EPOCH + timedelta(day), waiting + done, done))
+            if waiting:
+                ages[bisect_right(bounds, today - day)] += waiting
+    if report.completed < report.tasks:
+        report.backlog_ages = [(label, count) for (label, _), count in zip(AGE_BUCKETS, ages)]
+
+
+def _python_report(columns: TaskColumns, now_us: int, offset: int) -> Report:
+    """The same report computed in Python, for installs without NumPy"""
+    rows = zip(columns.created, columns.updated, columns.completed, columns.title_length)
+    if columns.dead:
+        rows = compress(rows, columns.alive)
+    pending_per_day: Dict[int, int] = {}
+    completed_per_day: Dict[int, int] = {}
+    durations = []
+    tasks = title_total = 0
+    for created, updated, completed, title_length in rows:
+        tasks += 1
+        title_total += title_length
+        day = (created + offset) // DAY_US
+        if completed:
+            completed_per_day[day] = completed_per_day.get(day, 0) + 1
+            durations.append(updated - created)
+        else:
+            pending_per_day[day] = pending_per_day.get(day, 0) + 1
+
+    report = Report(tasks=tasks, completed=len(durations))
+    if not tasks:
+        return report
+    report.mean_title_length = title_total / tasks
+    known = [*pending_per_day, *completed_per_day]
+    first = min(known)
+    span = range(first, max(known) + 1)
+    _fill_days(report, first, [pending_per_day.get(day, 0) for day in span],
+               [completed_per_day.get(day, 0) for day in span], (now_us + offset) // DAY_US)
+    if durations:
+        durations.sort()
+        middle = len(durations) // 2
+        report.median_completion_us = float(durations[middle] if len(durations) % 2
+                                            else (durations[middle - 1] + durations[middle]) / 2)
+    return report
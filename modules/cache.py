@@ -0,0 +1,127 @@
+"""
+Cache module for the Todo Console Application
+Bounded LRU/TTL cache for rendered list and query results
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+# Annotation-only imports (see storage.py)
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Hashable, Optional, Sequence
+
+QUERY_KEYWORDS = {'where', 'and', 'order', 'by', 'asc', 'desc', 'limit'}
+
+
+def normalize_query(command: str, args: Sequence[str]) -> str:
+    """
+    Build a cache key for a command and its arguments
+    Keywords are lowercased, so equivalent spellings share an entry; every other
+    argument is kept verbatim, as its spacing and case can change the result
+    """
+    parts = [command.lower()]
+    for arg in args:
+        lowered = arg.lower()
+        parts.append(lowered if lowered in QUERY_KEYWORDS else arg)
+    return "\x1f".join(parts)
+
+
+@dataclass
+class CacheStats:
+    """Counters describing cache effectiveness"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ResultCache:
+    """
+    LRU cache whose entries are tagged with the store generation that produced them
+    A lookup under a newer generation is a miss, so any mutation invalidates precisely.
+    """
+
+    def __init__(self, max_entries: int = 128, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_entries <= 0:
+            raise ValueError("Cache size must be positive")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple] = OrderedDict()
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, generation: int) -> Optional[Any]:
+        """Return the cached value for key if it is still valid, else None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        value, entry_generation, stored_at = entry
+        if entry_generation != generation:
+            del self._entries[key]
+            self.stats.invalidations += 1
+            self.stats.misses += 1
+            return None
+        if self.ttl is not None and self._clock() - stored_at > self.ttl:
+            del self._entries[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def holds(self, key: Hashable, generation: int) -> bool:
+        """Whether get() would hit, without counting a lookup or touching the entry"""
+        entry = self._entries.get(key)
+        return (entry is not None and entry[1] == generation
+                and (self.ttl is None or self._clock() - entry[2] <= self.ttl))
+
+    def put(self, key: Hashable, generation: int, value: Any):
+        """Store a value computed at the given generation"""
+        entries = self._entries
+        entries[key] = (value, generation, self._clock())
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def get_or_compute(self, key: Hashable, generation: int, compute: Callable[[], Any]) -> Any:
+        """Return the cached value or compute, store and return it"""
+        value = self.get(key, generation)
+        if value is None:
+            value = compute()
+            self.put(key, generation, value)
+        return value
+
+    def clear(self):
+        """Drop every entry, keeping the statistics"""
+        self._entries.clear()
+
+    def describe(self) -> str:
+        """Summarize the cache for display"""
+        stats = self.stats
+        ttl = f"{self.ttl:g}s" if self.ttl is not None else "none"
+        return (
+            f"Entries: {len(self._entries)}/{self.max_entries} (ttl {ttl})\n"
+            f"Hits: {stats.hits}  Misses: {stats.misses}  Hit rate: {stats.hit_rate:.1%}\n"
+            f"Evictions: {stats.evictions}  Expirations: {stats.expirations}  "
+            f"Invalidations: {stats.invalidations}"
+        )
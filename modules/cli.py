@@ -3,44 +3,201 @@ CLI module for the Todo Console Application
 Handles user interface and command processing
 """
 
-from typing import Optional
+from __future__ import annotations
+
+import threading
+from functools import partial
+from .cache import ResultCache, normalize_query
+from .clock import CoarseClock
+from .commands import ALL, CommandRegistry, load_plugins
+from .scheduler import ReminderScheduler
+from .storage import VersionConflict
 from .tasks import TaskManager
 from .utils import (
     validate_title, validate_task_id, format_task, format_task_detailed,
-    parse_command, is_valid_command
+    parse_command, parse_due, parse_positive_int
 )
 
+# Annotation-only imports (see storage.py)
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, Optional
+    from .admission import AdmissionController  # loaded when the CLI is created
+    from .complete import Completer  # loaded by run()
+    from .events import Subscription
+    from .replication import ReplicationLeader  # loaded on first `replicate serve`
+    from .sharedsnapshot import SnapshotPublisher  # loaded on first `snapshot publish`
+
+# Commands that are not charged to the current list's rate quota or the client's rate limits
+UNMETERED = frozenset(('help', 'quota', 'admission', 'quit', 'exit'))
+# Commands that change limits, which only the local console may run
+LOCAL_ONLY = frozenset(('quota', 'admission'))
+# Commands the memory quota refuses once the list is full
+GROWING = frozenset(('add', 'subtask', 'import'))
+# Admission classes: scans cost tokens by list size (see _admission_cost); everything else is a read
+SCANS = frozenset(('list', 'explain', 'report', 'dedupe'))
+WRITES = frozenset(('add', 'subtask', 'import', 'update', 'cas', 'complete', 'incomplete', 'delete',
+                    'move', 'tag', 'untag', 'priority', 'due', 'merge'))
+
 
 class TodoCLI:
     """Command Line Interface for the Todo Application"""
 
-    def __init__(self):
-        self.task_manager = TaskManager()
+    def __init__(self, admission: Optional[AdmissionController] = None):
+        # Each command reads the time once: the clock is ticked as the command starts
+        self.clock = CoarseClock()
+        # One reminder thread serves every list; reminders are keyed by (list, task id)
+        self.scheduler = ReminderScheduler(self.remind)
+        from .tenants import DEFAULT_NAMESPACE, Namespaces
+        self.namespaces = Namespaces(self._new_task_manager)
+        self.namespace = self.namespaces.use(DEFAULT_NAMESPACE)
+        self.task_manager = self.namespace.manager
+        self.completer: Optional[Completer] = None
+        self.result_cache = ResultCache()
+        if admission is None:
+            from .admission import AdmissionController
+            admission = AdmissionController()
+        self.admission = admission
+        self.tail_subscription: Optional[Subscription] = None
+        self.replication_leader: Optional[ReplicationLeader] = None
+        self.snapshot_publisher: Optional[SnapshotPublisher] = None
+        # List each running feed ('tail', 'replication', 'snapshots') serves; pinned in memory while it runs
+        self.served_lists: Dict[str, str] = {}
         self.running = True
+        self.commands = CommandRegistry()
+        self._register_commands()
+        load_plugins(self.commands, self)
+
+    def _new_task_manager(self, name: str) -> TaskManager:
+        """An empty task manager for the list `name`"""
+        from .tenants import ScopedScheduler
+        return TaskManager(scheduler=ScopedScheduler(self.scheduler, name), clock=self.clock)
+
+    def _register_commands(self):
+        """Register the built-in commands and their argument specs"""
+        register = self.commands.register
+        register('help', lambda args: self.display_help())
+        register('add', self.handle_add, min_args=1, usage='add "title" ["description"]',
+                 missing="Error: Please provide a title for the task")
+        register('list', self.handle_list)
+        register('explain', self.handle_explain)
+        register('cache', self.handle_cache)
+        register('show', self.handle_show, ids=1, max_args=1, usage="show <id>",
+                 missing="Error: Please provide a task ID")
+        register('update', self.handle_update, ids=1, min_args=2, usage='update <id> "title" ["description"]',
+                 missing="Error: Please provide task ID and new title")
+        register('cas', self.handle_cas, ids=1, min_args=3, max_args=4, usage='cas <id> <version> "title" ["description"]',
+                 missing="Error: Please provide task ID, expected version and new title")
+        register('complete', partial(self.handle_complete, completed=True), ids=1, max_args=2,
+                 usage="complete <id> [all]", missing="Error: Please provide a task ID to complete")
+        register('incomplete', partial(self.handle_complete, completed=False), ids=1, max_args=2,
+                 usage="incomplete <id> [all]", missing="Error: Please provide a task ID to mark as incomplete")
+        register('delete', self.handle_delete, ids=1, max_args=2, usage="delete <id> [version|all]",
+                 missing="Error: Please provide a task ID to delete")
+        register('subtask', self.handle_subtask, ids=1, min_args=2, max_args=3,
+                 usage='subtask <parent id> "title" ["description"]',
+                 missing="Error: Please provide a parent task ID and a title")
+        register('move', self.handle_move, ids=1, min_args=2, max_args=2, usage="move <id> <parent id>|none",
+                 missing="Error: Please provide a task ID and its new parent")
+        register('tree', self.handle_tree, ids=1, max_args=1, usage="tree <id>",
+                 missing="Error: Please provide a task ID")
+        register('tag', self.handle_tags, ids=1, min_args=2, usage="tag <id> <tag> [tag ...]",
+                 missing="Error: Please provide a task ID and at least one tag")
+        register('untag', partial(self.handle_tags, remove=True), ids=1, min_args=2,
+                 usage="untag <id> <tag> [tag ...]", missing="Error: Please provide a task ID and at least one tag")
+        register('priority', self.handle_priority, ids=1, min_args=2, max_args=2,
+                 usage="priority <id> <low|medium|high>", missing="Error: Please provide a task ID and a priority")
+        register('due', self.handle_due, ids=1, min_args=2, max_args=2, usage="due <id> <YYYY-MM-DD[THH:MM]|none>",
+                 missing="Error: Please provide a task ID and a due date")
+        register('overdue', self.handle_overdue)
+        register('dedupe', self.handle_dedupe)
+        register('merge', self.handle_merge, ids=ALL, min_args=2, usage="merge <keep id> <id> [id ...]",
+                 missing="Error: Please provide the task to keep and at least one duplicate")
+        register('memory', self.handle_memory)
+        register('import', self.handle_import, min_args=1, max_args=2, usage="import <file> [workers]",
+                 missing="Error: Please provide a file to import")
+        register('tail', self.handle_tail)
+        register('replicate', self.handle_replicate)
+        register('snapshot', self.handle_snapshot, max_args=3,
+                 usage="snapshot publish [name] [interval] | snapshot status | snapshot stop")
+        register('report', self.handle_report, max_args=1, usage="report [days]")
+        register('stats', self.handle_stats)
+        register('use', self.handle_use, max_args=1, usage="use [list]")
+        register('quota', self.handle_quota, max_args=3,
+                 usage="quota [memory <size>|off] [rate <ops/s> [burst]|off]")
+        register('admission', self.handle_admission, max_args=3,
+                 usage="admission [<read|write|scan> <tokens/s> [burst]|off]")
+        register('quit', self.handle_quit, aliases=('exit',))
 
     def display_help(self):
         """Display help information"""
         help_text = """
 Available Commands:
   add "title" ["description"]    - Add a new task
-  list                          - List all tasks
+  list [query]                  - List tasks, optionally filtered:
+                                  list where completed=false and created>2026-01-01
+                                       order by updated desc limit 50
+  explain list [query]          - Show the query plan and rows examined
+  cache [clear]                 - Show list cache statistics or clear it
   show <id>                     - Show details of a specific task
   update <id> "title" ["desc"]  - Update a task
-  complete <id>                 - Mark task as complete
-  incomplete <id>               - Mark task as incomplete
-  delete <id>                   - Delete a task
+  cas <id> <version> "title" ["desc"] - Update a task only if it is still at that version
+  complete <id> [all]           - Mark task (and with 'all', its subtasks) as complete
+  incomplete <id> [all]         - Mark task (and with 'all', its subtasks) as incomplete
+  delete <id> [version|all]     - Delete a task (only if still at version, when given);
+                                  its subtasks move up, or with 'all' are deleted too
+  subtask <parent id> "title" ["desc"] - Add a subtask
+  move <id> <parent id>|none    - Move a task under another task, or to the top level
+  tree <id>                     - Show a task's subtasks as an outline with progress
+  tag <id> <tag> [tag ...]      - Add tags to a task
+  untag <id> <tag> [tag ...]    - Remove tags from a task
+  priority <id> <low|medium|high> - Set a task's priority
+  due <id> <YYYY-MM-DD[THH:MM]|none> - Set or clear a task's due date
+  overdue [tag=X] [priority=P] [limit=N] - Show the next overdue tasks
+  dedupe [threshold]            - List groups of duplicate tasks (similarity 0-1, default 0.8)
+  dedupe merge [threshold]      - Merge every duplicate group into its oldest task
+  dedupe auto on|off            - Skip adding tasks that duplicate an existing one
+  merge <keep id> <id> [id ...] - Merge tasks into the first one
+  memory                        - Show resident memory, spilled tasks, page-in latency and string savings
+  memory budget <size>|off [file] - Spill cold completed tasks to disk above a size, e.g. 64MB
+  import <file> [workers]       - Import tasks from a JSON Lines file
+  tail [off]                    - Stream task change events live (or stop)
+  replicate serve [address]     - Serve read-only replicas (tcp://host:port or unix:///path)
+  replicate status|stop         - Show replication status or stop serving
+  snapshot publish [name] [interval] - Keep a read-only copy of the current list in shared
+                                  memory for local processes (refreshed every 1s by default)
+  snapshot status|stop          - Show the shared snapshot or stop publishing it
+  report [days]                 - Completion rate per day (last 14 days by default), median
+                                  time to complete and backlog age distribution
+  stats [reset]                 - Show how often each command ran and its mean time
+  use [list]                    - Switch to (or create) a separate task list; alone, show all lists
+  quota memory <size>|off       - Cap the current list's memory; adds are refused once it is full
+  quota rate <ops/s> [burst]|off - Cap how many commands per second the current list admits
+  admission                     - Show per-client rate limits, the work queue and rejected/queued counts
+  admission <read|write|scan> <tokens/s> [burst]|off - Set a class's rate limit (a list of
+                                  N tasks costs 1 + N/1000 scan tokens; other commands 1)
   help                          - Show this help message
   quit/exit                     - Exit the application
         """
+        plugins = self.commands.help_lines()
+        if plugins:
+            help_text = help_text.rstrip() + "\n\nPlugin Commands:\n" + "\n".join(plugins) + "\n"
         print(help_text)
 
-    def handle_add(self, args: list):
-        """Handle add command"""
-        if len(args) < 1:
-            print("Error: Please provide a title for the task")
-            print("Usage: add \"title\" [\"description\"]")
+    def remind(self, key: tuple, deadline: float):
+        """Print a reminder when a task falls due (called from the scheduler thread)"""
+        name, task_id = key
+        namespace = self.namespaces.peek(name)
+        where = "" if name == self.namespace.name else f" in list '{name}'"
+        if namespace is None:
+            print(f"\nReminder: task {task_id}{where} is due now")
             return
+        task = namespace.manager.get_task(task_id)
+        if task is not None:
+            print(f"\nReminder: task is due now{where}: {format_task(task)}")
 
+    def handle_add(self, args: list):
+        """Handle add command"""
         title = args[0]
         description = args[1] if len(args) > 1 else ""
 
@@ -49,54 +206,80 @@ Available Commands:
             return
 
         try:
+            generation = self.task_manager.generation
             task = self.task_manager.add_task(title, description)
-            print(f"Added task: {format_task(task)}")
         except ValueError as e:
             print(f"Error: {e}")
+            return
+
+        if self.task_manager.generation == generation:
+            print(f"Not added, duplicate of: {format_task(task)}")
+        else:
+            print(f"Added task: {format_task(task)}")
 
     def handle_list(self, args: list):
         """Handle list command"""
-        tasks = self.task_manager.get_all_tasks()
+        key = normalize_query('list', args)
+        try:
+            output = self.result_cache.get_or_compute(
+                key, self.task_manager.generation, lambda: self._render_list(args))
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+
+        print(output)
+
+    def _render_list(self, args: list) -> str:
+        """Build the output of a list command"""
+        if args:
+            tasks = self.task_manager.query_tasks(args).rows
+        else:
+            tasks = self.task_manager.get_all_tasks()
 
         if not tasks:
-            print("\nNo tasks found.")
+            return "\nNo tasks found."
+
+        lines = ["\nYour tasks:"]
+        lines.extend(f"  {format_task(task)}" for task in tasks)
+        return "\n".join(lines)
+
+    def handle_cache(self, args: list):
+        """Handle cache command"""
+        if args and args[0].lower() == 'clear':
+            self.result_cache.clear()
+            print("List cache cleared")
             return
 
-        print("\nYour tasks:")
-        for task in tasks:
-            print(f"  {format_task(task)}")
+        print(f"\n{self.result_cache.describe()}")
 
-    def handle_show(self, args: list):
-        """Handle show command"""
-        if len(args) != 1:
-            print("Error: Please provide a task ID")
-            print("Usage: show <id>")
+    def handle_explain(self, args: list):
+        """Handle explain command"""
+        if not args or args[0].lower() != 'list':
+            print("Error: Please provide a list query to explain")
+            print("Usage: explain list [where ...] [order by ...] [limit n]")
             return
 
-        is_valid, task_id = validate_task_id(args[0])
-        if not is_valid:
-            print("Error: Task ID must be a positive integer")
+        try:
+            result = self.task_manager.query_tasks(args[1:])
+        except ValueError as e:
+            print(f"Error: {e}")
             return
 
+        print(f"\n{result.explain()}")
+
+    def handle_show(self, args: list):
+        """Handle show command"""
+        task_id = args[0]
         task = self.task_manager.get_task(task_id)
         if not task:
             print(f"Error: Task with ID {task_id} not found")
             return
 
-        print(f"\n{format_task_detailed(task)}")
+        print(f"\n{format_task_detailed(task, self.task_manager.progress(task_id))}")
 
     def handle_update(self, args: list):
         """Handle update command"""
-        if len(args) < 2:
-            print("Error: Please provide task ID and new title")
-            print("Usage: update <id> \"title\" [\"description\"]")
-            return
-
-        is_valid, task_id = validate_task_id(args[0])
-        if not is_valid:
-            print("Error: Task ID must be a positive integer")
-            return
-
+        task_id = args[0]
         title = args[1]
         description = args[2] if len(args) > 2 else ""
 
@@ -111,16 +294,42 @@ Available Commands:
         else:
             print(f"Error: Task with ID {task_id} not found")
 
-    def handle_complete(self, args: list, completed: bool = True):
-        """Handle complete/incomplete commands"""
-        if len(args) != 1:
-            print(f"Error: Please provide a task ID to {'complete' if completed else 'mark as incomplete'}")
-            print(f"Usage: {'complete' if completed else 'incomplete'} <id>")
+    def handle_cas(self, args: list):
+        """Handle cas command: update only if nobody changed the task since `version`"""
+        task_id, version, title = args[0], args[1], args[2]
+        description = args[3] if len(args) > 3 else ""
+        if not version.isdigit():
+            print("Error: Version must be a non-negative integer")
+            return
+        if not validate_title(title):
+            print("Error: Task title cannot be empty")
             return
 
-        is_valid, task_id = validate_task_id(args[0])
-        if not is_valid:
-            print("Error: Task ID must be a positive integer")
+        try:
+            success = self.task_manager.update_task(task_id, title, description, if_version=int(version))
+        except VersionConflict as conflict:
+            print(f"Conflict: task {task_id} is at version {conflict.actual}, not {conflict.expected}; "
+                  f"not updated")
+            return
+        if success:
+            task = self.task_manager.get_task(task_id)
+            print(f"Updated task: {format_task(task)} (version {task.version})")
+        else:
+            print(f"Error: Task with ID {task_id} not found")
+
+    def handle_complete(self, args: list, completed: bool = True):
+        """Handle complete/incomplete commands"""
+        task_id = args[0]
+        if len(args) > 1:
+            if args[1].lower() != 'all':
+                print(f"Usage: {'complete' if completed else 'incomplete'} <id> [all]")
+                return
+            changed = self.task_manager.complete_subtree(task_id, completed)
+            if changed is None:
+                print(f"Error: Task with ID {task_id} not found")
+                return
+            status = "completed" if completed else "marked as incomplete"
+            print(f"{len(changed)} task(s) {status} in the tree of task {task_id}")
             return
 
         action = self.task_manager.mark_completed if completed else self.task_manager.mark_incomplete
@@ -134,59 +343,556 @@ Available Commands:
             print(f"Error: Task with ID {task_id} not found")
 
     def handle_delete(self, args: list):
-        """Handle delete command"""
-        if len(args) != 1:
-            print("Error: Please provide a task ID to delete")
-            print("Usage: delete <id>")
+        """Handle delete command; with a version, delete only if the task is still at it"""
+        task_id = args[0]
+        version = args[1] if len(args) > 1 else None
+        if version is not None and version.lower() == 'all':
+            deleted = self.task_manager.delete_subtree(task_id)
+            if deleted:
+                print(f"Deleted task with ID {task_id} and {len(deleted) - 1} subtask(s)")
+            else:
+                print(f"Error: Task with ID {task_id} not found")
+            return
+        if version is not None and not version.isdigit():
+            print("Error: Version must be a non-negative integer")
+            return
+        try:
+            success = self.task_manager.delete_task(task_id, None if version is None else int(version))
+        except VersionConflict as conflict:
+            print(f"Conflict: task {task_id} is at version {conflict.actual}, not {conflict.expected}; "
+                  f"not deleted")
+            return
+        if success:
+            print(f"Deleted task with ID {task_id}")
+        else:
+            print(f"Error: Task with ID {task_id} not found")
+
+    def handle_subtask(self, args: list):
+        """Handle subtask command"""
+        parent_id, title = args[0], args[1]
+        description = args[2] if len(args) > 2 else ""
+        if not validate_title(title):
+            print("Error: Task title cannot be empty")
             return
 
-        is_valid, task_id = validate_task_id(args[0])
-        if not is_valid:
-            print("Error: Task ID must be a positive integer")
+        try:
+            task = self.task_manager.add_subtask(parent_id, title, description)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        print(f"Added subtask of task {parent_id}: {format_task(task)}")
+
+    def handle_move(self, args: list):
+        """Handle move command"""
+        task_id, target = args[0], args[1]
+        parent_id = None
+        if target.lower() != 'none':
+            is_valid, parent_id = validate_task_id(target)
+            if not is_valid:
+                print("Error: Parent must be a task ID or 'none'")
+                return
+
+        try:
+            success = self.task_manager.move_task(task_id, parent_id)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        if not success:
+            print(f"Error: Task with ID {task_id} not found")
+        elif parent_id is None:
+            print(f"Task {task_id} is now a top-level task")
+        else:
+            print(f"Task {task_id} is now a subtask of task {parent_id}")
+
+    def handle_tree(self, args: list):
+        """Handle tree command"""
+        task_id = args[0]
+        rows = self.task_manager.subtree(task_id)
+        if not rows:
+            print(f"Error: Task with ID {task_id} not found")
+            return
+
+        progress = self.task_manager.progress
+        lines = [""]
+        for task, depth in rows:
+            done, total = progress(task.id)
+            lines.append(f"{'  ' * (depth + 1)}{format_task(task)}" + (f" ({done}/{total})" if total else ""))
+        print("\n".join(lines))
+
+    def handle_tags(self, args: list, remove: bool = False):
+        """Handle tag/untag commands"""
+        task_id = args[0]
+        action = self.task_manager.remove_tags if remove else self.task_manager.add_tags
+        try:
+            success = action(task_id, args[1:])
+        except ValueError as e:
+            print(f"Error: {e}")
             return
 
-        success = self.task_manager.delete_task(task_id)
         if success:
-            print(f"Deleted task with ID {task_id}")
+            task = self.task_manager.get_task(task_id)
+            print(f"Tags for task {task_id}: {', '.join(task.tags) or 'None'}")
         else:
             print(f"Error: Task with ID {task_id} not found")
 
-    def process_command(self, user_input: str):
-        """Process a single command from user input"""
+    def handle_dedupe(self, args: list):
+        """Handle dedupe command"""
+        if args and args[0].lower() == 'auto':
+            if len(args) != 2 or args[1].lower() not in ('on', 'off'):
+                print("Usage: dedupe auto on|off")
+                return
+            self.task_manager.dedupe_on_add = args[1].lower() == 'on'
+            print(f"Duplicate check on add is {'on' if self.task_manager.dedupe_on_add else 'off'}")
+            return
+
+        merge = bool(args) and args[0].lower() == 'merge'
+        rest = args[1:] if merge else args
+        try:
+            threshold = float(rest[0]) if rest else None
+            if len(rest) > 1:
+                raise ValueError
+        except ValueError:
+            print("Usage: dedupe [merge] [threshold] | dedupe auto on|off")
+            return
+
+        options = {} if threshold is None else {'threshold': threshold}
+        try:
+            if merge:
+                removed = self.task_manager.merge_duplicates(**options)
+                print(f"Merged away {removed} duplicate task(s)")
+                return
+            groups = self.task_manager.duplicate_groups(**options)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+
+        if not groups:
+            print("\nNo duplicate tasks.")
+            return
+
+        print(f"\n{len(groups)} group(s) of duplicates:")
+        for group in groups:
+            print(f"  {format_task(group[0])}")
+            for task in group[1:]:
+                print(f"    = {format_task(task)}")
+        print("Use 'dedupe merge' to merge them, or 'merge <keep id> <id> [id ...]'")
+
+    def handle_merge(self, args: list):
+        """Handle merge command"""
+        ids = args
+        missing = [task_id for task_id in ids if self.task_manager.get_task(task_id) is None]
+        if missing:
+            print(f"Error: Task with ID {missing[0]} not found")
+            return
+
+        task = self.task_manager.merge_tasks(ids[0], ids[1:])
+        print(f"Merged into task: {format_task(task)}")
+
+    def handle_memory(self, args: list):
+        """Handle memory command"""
+        from .spill import format_size, parse_size
+        if args and args[0].lower() == 'budget' and len(args) in (2, 3):
+            try:
+                budget = None if args[1].lower() == 'off' else parse_size(args[1])
+                self.task_manager.set_memory_budget(budget, args[2] if len(args) > 2 else None)
+            except (ValueError, OSError) as e:
+                print(f"Error: {e}")
+                return
+            print("Memory budget removed" if budget is None else f"Memory budget set to {format_size(budget)}")
+            return
+        if args:
+            print("Usage: memory [budget <size>|off [segment file]]")
+            return
+
+        stats = self.task_manager.memory_stats()
+        if stats is None:
+            print(f"\nNo memory budget set; all {len(self.task_manager.storage)} task(s) are resident")
+        else:
+            print(f"\n{stats.describe()}")
+        print(self.task_manager.string_stats().describe())
+
+    def handle_priority(self, args: list):
+        """Handle priority command"""
+        task_id = args[0]
+        try:
+            success = self.task_manager.set_priority(task_id, args[1])
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+
+        if success:
+            print(f"Task {task_id} priority set to {self.task_manager.get_task(task_id).priority}")
+        else:
+            print(f"Error: Task with ID {task_id} not found")
+
+    def handle_due(self, args: list):
+        """Handle due command"""
+        task_id = args[0]
+        is_valid, due_at = parse_due(args[1])
+        if not is_valid:
+            print("Error: Due date must look like YYYY-MM-DD or YYYY-MM-DDTHH:MM")
+            return
+
+        if self.task_manager.set_due(task_id, due_at):
+            if due_at is None:
+                print(f"Cleared due date for task {task_id}")
+            else:
+                print(f"Task {task_id} due {due_at.strftime('%Y-%m-%d %H:%M')}")
+        else:
+            print(f"Error: Task with ID {task_id} not found")
+
+    def handle_overdue(self, args: list):
+        """Handle overdue command"""
+        options = {}
+        for arg in args:
+            key, sep, value = arg.partition('=')
+            if not sep or key.lower() not in ('tag', 'priority', 'limit') or not value:
+                print(f"Error: Invalid option '{arg}'")
+                print("Usage: overdue [tag=X] [priority=P] [limit=N]")
+                return
+            options[key.lower()] = value
+
+        limit = 20
+        if 'limit' in options:
+            limit = parse_positive_int(options['limit'])
+            if limit is None:
+                print("Error: Limit must be a positive integer")
+                return
+
+        try:
+            tasks = self.task_manager.overdue_tasks(options.get('tag'), options.get('priority'), limit)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+
+        if not tasks:
+            print("\nNo overdue tasks.")
+            return
+
+        print("\nOverdue tasks:")
+        for task in tasks:
+            print(f"  {format_task(task)} (due {task.due_at.strftime('%Y-%m-%d %H:%M')}, {task.priority})")
+
+    def handle_tail(self, args: list):
+        """Handle tail command"""
+        if args and args[0].lower() == 'off':
+            if self.tail_subscription is None:
+                print("Not tailing changes")
+                return
+            self.tail_subscription.close()
+            self.tail_subscription = None
+            self._stop_serving('tail')
+            print("Stopped tailing changes")
+            return
+
+        if self.tail_subscription is not None:
+            print(f"Already tailing changes in list '{self.served_lists['tail']}'. Use 'tail off' to stop")
+            return
+
+        # A slow console must never stall writers, so the oldest events are dropped instead
+        self.tail_subscription = self.task_manager.subscribe(overflow='drop_oldest')
+        printer = threading.Thread(target=self._print_events, args=(self.tail_subscription,),
+                                   name="tail", daemon=True)
+        printer.start()
+        self._start_serving('tail')
+        print(f"Tailing changes in list '{self.namespace.name}'. Use 'tail off' to stop")
+
+    def _print_events(self, subscription: Subscription):
+        """Print change events until the subscription is closed"""
+        for event in subscription:
+            title = f": {event.data['title']}" if event.data else ""
+            print(f"  #{event.seq} {event.kind} task {event.record_id}{title}")
+
+    def handle_replicate(self, args: list):
+        """Handle replicate command"""
+        action = args[0].lower() if args else 'status'
+        leader = self.replication_leader
+
+        if action == 'serve':
+            if leader is not None:
+                print(f"Already serving replicas on {leader.address}")
+                return
+            address = args[1] if len(args) > 1 else 'tcp://127.0.0.1:0'
+            from .replication import ReplicationLeader
+            try:
+                self.replication_leader = ReplicationLeader(self.task_manager.storage, address)
+            except (OSError, ValueError) as e:
+                print(f"Error: Could not serve replicas: {e}")
+                return
+            self._start_serving('replication')
+            print(f"Serving replicas of list '{self.namespace.name}' on {self.replication_leader.address}")
+        elif action == 'status':
+            if leader is None:
+                print("Replication is not running")
+                return
+            print(f"Serving list '{self.served_lists['replication']}' on {leader.address}: {leader.followers} follower(s), log at seq {leader.seq}")
+        elif action == 'stop':
+            if leader is None:
+                print("Replication is not running")
+                return
+            leader.stop()
+            self.replication_leader = None
+            self._stop_serving('replication')
+            print("Stopped serving replicas")
+        else:
+            print("Usage: replicate serve [address] | replicate status | replicate stop")
+
+    def handle_snapshot(self, args: list):
+        """Handle snapshot command"""
+        action = args[0].lower() if args else 'status'
+        publisher = self.snapshot_publisher
+
+        if action == 'publish':
+            if publisher is not None:
+                print(f"Already publishing snapshots as '{publisher.name}'")
+                return
+            from .sharedsnapshot import DEFAULT_INTERVAL, SnapshotPublisher
+            name = args[1] if len(args) > 1 else None
+            try:
+                interval = float(args[2]) if len(args) > 2 else DEFAULT_INTERVAL
+                publisher = SnapshotPublisher(self.task_manager.storage, name, interval)
+            except (OSError, ValueError) as e:
+                print(f"Error: Could not publish snapshots: {e}")
+                return
+            publisher.start()
+            self.snapshot_publisher = publisher
+            self._start_serving('snapshots')
+            print(f"Publishing snapshots of list '{self.namespace.name}' as '{publisher.name}' "
+                  f"({len(self.task_manager.storage)} task(s))")
+        elif action == 'status':
+            if publisher is None:
+                print("Snapshots are not being published")
+                return
+            print(f"{publisher.describe()} (list '{self.served_lists['snapshots']}')")
+        elif action == 'stop':
+            if publisher is None:
+                print("Snapshots are not being published")
+                return
+            publisher.stop()
+            self.snapshot_publisher = None
+            self._stop_serving('snapshots')
+            print("Stopped publishing snapshots")
+        else:
+            print("Usage: snapshot publish [name] [interval] | snapshot status | snapshot stop")
+
+    def _start_serving(self, feed: str):
+        """Record that `feed` serves the current list, keeping the list loaded while it runs"""
+        self.namespaces.pin(self.namespace.name)
+        self.served_lists[feed] = self.namespace.name
+
+    def _stop_serving(self, feed: str):
+        self.namespaces.unpin(self.served_lists.pop(feed))
+
+    def handle_import(self, args: list):
+        """Handle import command"""
+        workers = None
+        if len(args) == 2:
+            workers = parse_positive_int(args[1])
+            if workers is None:
+                print("Error: Worker count must be a positive integer")
+                return
+
+        try:
+            result = self.task_manager.import_tasks(args[0], workers=workers)
+        except OSError as e:
+            print(f"Error: Could not read {args[0]}: {e}")
+            return
+
+        print(f"Imported {result.imported} task(s) from {args[0]}")
+        for line_no, message in result.errors:
+            print(f"  Skipped line {line_no}: {message}")
+
+    def process_command(self, user_input: str, client: Optional[str] = None):
+        """Process a single command from user input, sent by `client` (None for the local console)"""
+        from .admission import LOCAL_CLIENT, Overloaded
+        from .tenants import QuotaExceeded
         command, args = parse_command(user_input)
+        if client is None:
+            client = LOCAL_CLIENT
 
         if command in ['', ' ']:
             return  # Empty command, just return
 
-        if not is_valid_command(command):
+        self.clock.tick()
+
+        handler = self.commands.get(command)
+        if handler is None:
             print(f"Unknown command: {command}. Type 'help' for available commands.")
             return
+        if command in LOCAL_ONLY and client != LOCAL_CLIENT:
+            print(f"Error: '{command}' can only be run from the console")
+            return
+        if command in UNMETERED:
+            handler(args)
+            return
+        try:
+            slot = self.admission.admit(client, self._admission_class(command, args),
+                                        self._admission_cost(command, args))
+        except Overloaded as e:
+            print(f"Error: {e}")
+            return
+        with slot:
+            # Switching lists is not charged to the list being left, so an exhausted list can be left
+            if command != 'use':
+                try:
+                    self.namespace.admit(grows=command in GROWING)
+                except QuotaExceeded as e:
+                    slot.refuse()
+                    print(f"Error: {e}; try again later")
+                    return
+            handler(args)
+
+    def _admission_class(self, command: str, args: list) -> str:
+        """Admission class of a command; `use` creating a list is a write"""
+        if command in SCANS:
+            return 'scan'
+        if command in WRITES or command == 'use' and args and args[0] not in self.namespaces:
+            return 'write'
+        return 'read'
+
+    def _admission_cost(self, command: str, args: list) -> float:
+        """Tokens a command is charged: scans by the size of the list, unless served from the list cache"""
+        if command not in SCANS:
+            return 1.0
+        if command == 'list' and self.result_cache.holds(normalize_query('list', args), self.task_manager.generation):
+            return 1.0
+        from .admission import scan_cost
+        return scan_cost(len(self.task_manager.storage))
+
+    def handle_report(self, args: list):
+        """Handle report command"""
+        days = 14
+        if args:
+            days = parse_positive_int(args[0])
+            if days is None:
+                print("Error: Days must be a positive integer")
+                return
+
+        print(f"\n{self.task_manager.report().describe(days)}")
+
+    def handle_stats(self, args: list):
+        """Handle stats command"""
+        if args and args[0].lower() == 'reset':
+            self.commands.reset_stats()
+            print("Command timings reset")
+            return
 
-        if command == 'help':
-            self.display_help()
-        elif command == 'add':
-            self.handle_add(args)
-        elif command == 'list':
-            self.handle_list(args)
-        elif command == 'show':
-            self.handle_show(args)
-        elif command == 'update':
-            self.handle_update(args)
-        elif command == 'complete':
-            self.handle_complete(args, completed=True)
-        elif command == 'incomplete':
-            self.handle_complete(args, completed=False)
-        elif command == 'delete':
-            self.handle_delete(args)
-        elif command in ['quit', 'exit']:
-            print("Goodbye!")
-            self.running = False
+        print(f"\n{self.commands.describe()}")
+
+    def handle_use(self, args: list):
+        """Handle use command: switch lists, or show them all"""
+        if not args:
+            print(f"\n{self.namespaces.describe()}")
+            return
+
+        name = args[0]
+        if name == self.namespace.name:
+            print(f"Already using list '{name}'")
+            return
+        try:
+            created = name not in self.namespaces
+            namespace = self.namespaces.use(name)
+        except (ValueError, OSError) as e:
+            print(f"Error: {e}")
+            return
+
+        self.namespace = namespace
+        self.task_manager = namespace.manager
+        # Cached listings are keyed by generation, which each list counts separately
+        self.result_cache.clear()
+        if self.completer is not None:
+            self.completer.storage = self.task_manager.storage
+        count = len(self.task_manager.storage)
+        print(f"{'Created' if created else 'Using'} list '{name}' ({count} task(s))")
+        # Feeds keep serving the list they were started on
+        for feed, served in sorted(self.served_lists.items()):
+            print(f"Note: {feed} still serves list '{served}'")
+
+    def handle_quota(self, args: list):
+        """Handle quota command for the current list"""
+        from .spill import parse_size
+        from .tenants import Quota
+        namespace = self.namespace
+        if not args:
+            ops, rejected = self.namespaces.counters(namespace.name)
+            print(f"\nList '{namespace.name}': {namespace.quota.describe()}; "
+                  f"{ops} command(s) admitted, {rejected} rejected")
+            return
+
+        quota = namespace.quota
+        kind, values = args[0].lower(), args[1:]
+        try:
+            if kind == 'memory' and len(values) == 1:
+                max_bytes = None if values[0].lower() == 'off' else parse_size(values[0])
+                quota = Quota(max_bytes, quota.ops_per_second, quota.burst)
+            elif kind == 'rate' and values == ['off']:
+                quota = Quota(quota.max_bytes)
+            elif kind == 'rate' and values:
+                rate, burst = float(values[0]), float(values[1]) if len(values) > 1 else None
+                if rate <= 0 or (burst is not None and burst < 1):
+                    raise ValueError("Rate must be positive and burst at least 1")
+                quota = Quota(quota.max_bytes, rate, burst)
+            else:
+                print("Usage: quota [memory <size>|off] [rate <ops/s> [burst]|off]")
+                return
+            self.namespaces.set_quota(namespace.name, quota)
+        except (ValueError, OSError) as e:
+            print(f"Error: {e}")
+            return
+        print(f"Quota for list '{namespace.name}': {quota.describe()}")
+
+    def handle_admission(self, args: list):
+        """Handle admission command: show counters or set a class's rate limit"""
+        admission = self.admission
+        if not args:
+            print(f"\n{admission.describe()}")
+            return
+
+        command_class, values = args[0].lower(), args[1:]
+        if command_class not in ('read', 'write', 'scan') or not values:
+            print("Usage: admission [<read|write|scan> <tokens/s> [burst]|off]")
+            return
+        try:
+            if values == ['off']:
+                admission.set_limit(command_class, None)
+                print(f"No rate limit for {command_class} commands")
+                return
+            from .admission import Limit
+            limit = Limit(float(values[0]), float(values[1]) if len(values) > 1 else None)
+            admission.set_limit(command_class, limit)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        print(f"Rate limit for {command_class} commands: {limit.describe()} per client")
+
+    def handle_quit(self, args: list):
+        """Handle quit/exit commands"""
+        print("Goodbye!")
+        self.running = False
 
     def run(self):
         """Main CLI loop"""
         print("Welcome to the Todo Console Application!")
         print("Type 'help' for available commands or 'quit' to exit.")
 
+        from .complete import Completer, install as install_completion
+        self.completer = Completer(self.commands, self.task_manager.storage)
+        install_completion(self.completer)
+        self.scheduler.start()
+        try:
+            self._loop()
+        finally:
+            self.scheduler.stop()
+            if self.tail_subscription is not None:
+                self.tail_subscription.close()
+            if self.replication_leader is not None:
+                self.replication_leader.stop()
+            if self.snapshot_publisher is not None:
+                self.snapshot_publisher.stop()
+            self.namespaces.close()
+
+    def _loop(self):
+        """Read and process commands until the user quits"""
         while self.running:
             try:
                 user_input = input("\n> ").strip()
@@ -0,0 +1,162 @@
+"""
+Clock module for the Todo Console Application
+Injectable time sources; stores keep timestamps as integer epoch microseconds
+
+Every store takes a clock so tests can pin time with ManualClock. Reading the
+wall clock as an int is about twice as cheap as datetime.now(), and a
+CoarseClock makes it a plain attribute read: the cached value is refreshed by
+tick() (once per batch) or by a background ticker (once per resolution).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# Annotation-only imports; the root console loads this module at startup
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Iterator, Optional, Union
+
+MICROS = 1_000_000
+
+
+def to_micros(when: datetime) -> int:
+    """Convert a datetime (naive means local time) to epoch microseconds"""
+    return int(when.replace(microsecond=0).timestamp()) * MICROS + when.microsecond
+
+
+def to_datetime(micros: int) -> datetime:
+    """Convert epoch microseconds to a naive local datetime"""
+    return datetime.fromtimestamp(micros / MICROS)
+
+
+def as_micros(value: Union[datetime, int, None], name: str) -> Optional[int]:
+    """Normalize a time given as a datetime, epoch microseconds or None"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return to_micros(value)
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValueError(f"{name} time must be a datetime")
+    return value
+
+
+class SystemClock:
+    """Reads the system wall clock on every call"""
+
+    def now_us(self) -> int:
+        """Current time in epoch microseconds"""
+        return time.time_ns() // 1000
+
+    def now(self) -> datetime:
+        """Current time as a naive local datetime"""
+        return to_datetime(self.now_us())
+
+    def seconds(self) -> float:
+        """Current time in epoch seconds, for components that take a time.monotonic-style callable"""
+        return self.now_us() / MICROS
+
+    @contextmanager
+    def batch(self) -> Iterator[int]:
+        """
+        Read the clock once and return that time for the rest of the block
+        Nested batches share the outermost reading. Other threads using the same
+        clock also see the frozen time while the block runs.
+        """
+        if 'now_us' in self.__dict__:
+            yield self.now_us()
+            return
+        frozen = self.now_us()
+        self.now_us = lambda: frozen
+        try:
+            yield frozen
+        finally:
+            del self.now_us
+
+
+class CoarseClock(SystemClock):
+    """
+    Returns a cached time that is refreshed explicitly or by a ticker thread
+    Without start() the time only moves on tick(), so call it at batch boundaries.
+    """
+
+    def __init__(self, resolution: float = 0.001):
+        self.resolution = resolution
+        self._now_us = time.time_ns() // 1000
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    def now_us(self) -> int:
+        """Cached time in epoch microseconds"""
+        return self._now_us
+
+    def tick(self) -> int:
+        """Refresh the cached time from the system clock"""
+        self._now_us = time.time_ns() // 1000
+        return self._now_us
+
+    def start(self):
+        """Refresh the cached time every `resolution` seconds in the background"""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="coarse-clock", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background ticker"""
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stopping.set()
+            thread.join()
+
+    def _run(self):
+        """Ticker loop"""
+        while not self._stopping.wait(self.resolution):
+            self.tick()
+
+
+class ManualClock(SystemClock):
+    """A clock that only moves when told to, for deterministic tests"""
+
+    def __init__(self, start: Union[datetime, int] = 0):
+        self._now_us = start if isinstance(start, int) else to_micros(start)
+
+    def now_us(self) -> int:
+        """Current manual time in epoch microseconds"""
+        return self._now_us
+
+    def set(self, when: Union[datetime, int]):
+        """Jump to a point in time"""
+        self._now_us = when if isinstance(when, int) else to_micros(when)
+
+    def advance(self, seconds: float = 0, microseconds: int = 0):
+        """Move time forward"""
+        self._now_us += round(seconds * MICROS) + microseconds
+
+
+class Timestamp:
+    """
+    Dataclass field descriptor storing a datetime as epoch microseconds
+    The integer lives in the `<name>_us` attribute (created_at -> created_us) for
+    indexes and comparisons; reading the field converts it to a datetime. Assigning
+    accepts a datetime, an int of epoch microseconds or None.
+    """
+
+    def __init__(self):
+        self.key = ""
+
+    def __set_name__(self, owner, name: str):
+        self.key = name[:-3] + '_us' if name.endswith('_at') else name + '_us'
+
+    def __get__(self, obj, owner=None) -> Optional[datetime]:
+        if obj is None:
+            return None  # the dataclass default
+        micros = obj.__dict__.get(self.key)
+        return to_datetime(micros) if micros is not None else None
+
+    def __set__(self, obj, value: Union[datetime, int, None]):
+        obj.__dict__[self.key] = as_micros(value, self.key[:-3])
@@ -0,0 +1,245 @@
+"""
+Commands module for the Todo Console Application
+Routes commands to handlers through a registry instead of if/elif chains
+
+Each front end builds a CommandRegistry and registers its commands with a
+declarative argument spec: how many arguments the command takes and how many
+of the leading ones are task ids. Looking a command up is one dict lookup, and
+argument counts and ids are checked in one shared place (ids with
+validate_task_id), so handlers receive ids already converted to ints.
+
+Plugins add commands the same way, either by calling register() on a front
+end's registry or by naming their module in the TODO_PLUGINS environment
+variable (see load_plugins). Every command is timed as it runs; stats()
+reports calls and mean time per command.
+"""
+
+from __future__ import annotations
+
+import sys
+from time import perf_counter
+
+from .utils import validate_task_id
+
+# Annotation-only imports (see storage.py)
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# `ids=ALL` parses every argument as a task id
+ALL = sys.maxsize
+
+ID_ERROR = "Error: Task ID must be a positive integer"
+
+
+class Command:
+    """
+    A registered command: its handler, argument spec and timing counters
+    `run` is a function compiled for the spec: it checks the argument count,
+    converts the first `ids` arguments to task ids in place and calls the
+    handler with the list, timing the call. Calling the command calls `run`.
+    """
+
+    __slots__ = ('registry', 'name', 'handler', 'min_args', 'max_args', 'ids', 'usage', 'missing',
+                 'help', 'calls', 'seconds', 'run')
+
+    def __init__(self, registry: CommandRegistry, name: str, handler: Callable[[list], Any],
+                 min_args: int = 0, max_args: Optional[int] = None, ids: int = 0, usage: str = "",
+                 missing: str = "", help: str = ""):
+        self.registry = registry
+        self.name = name
+        self.handler = handler
+        self.min_args = max(min_args, ids) if ids != ALL else min_args
+        self.max_args = max_args
+        self.ids = ids
+        self.usage = usage
+        self.missing = missing
+        self.help = help
+        self.calls = 0
+        self.seconds = 0.0
+        self.run = self._compile()
+
+    def __repr__(self) -> str:
+        return f"Command({self.name!r}, {self.min_args}..{self.max_args}, ids={self.ids})"
+
+    def __call__(self, args: List[str]):
+        return self.run(args)
+
+    @property
+    def mean_us(self) -> float:
+        """Mean handler time in microseconds"""
+        return self.calls and self.seconds / self.calls * 1e6
+
+    def reject_usage(self):
+        """Report a wrong number of arguments"""
+        if self.missing:
+            print(self.missing)
+        if self.usage:
+            print(f"Usage: {self.usage}")
+        return self.registry.usage_result
+
+    def reject_id(self):
+        """Report an argument that is not a valid task id"""
+        print(self.registry.id_error)
+        return self.registry.id_result
+
+    def _compile(self) -> Callable[[list], Any]:
+        """
+        Build the dispatch function for this spec
+        Everything it needs is bound as closure variables, and the common
+        shapes (no ids, one id) get their own loop-free versions.
+        """
+        command, handler, ids, clock = self, self.handler, self.ids, perf_counter
+        min_args = self.min_args
+        max_args = sys.maxsize if self.max_args is None else self.max_args
+
+        if not ids:
+            def run(args):
+                if not min_args <= len(args) <= max_args:
+                    return command.reject_usage()
+                start = clock()
+                try:
+                    return handler(args)
+                finally:
+                    command.seconds += clock() - start
+                    command.calls += 1
+        elif ids == 1:
+            def run(args):
+                if not min_args <= len(args) <= max_args:
+                    return command.reject_usage()
+                is_valid, args[0] = validate_task_id(args[0])
+                if not is_valid:
+                    return command.reject_id()
+                start = clock()
+                try:
+                    return handler(args)
+                finally:
+                    command.seconds += clock() - start
+                    command.calls += 1
+        else:
+            def run(args):
+                count = len(args)
+                if not min_args <= count <= max_args:
+                    return command.reject_usage()
+                for i in range(min(ids, count)):
+                    is_valid, args[i] = validate_task_id(args[i])
+                    if not is_valid:
+                        return command.reject_id()
+                start = clock()
+                try:
+                    return handler(args)
+                finally:
+                    command.seconds += clock() - start
+                    command.calls += 1
+        return run
+
+
+class CommandRegistry:
+    """
+    Command name -> Command table shared by a front end and its plugins
+    `id_error` is printed for an invalid id; `usage_result` and `id_result` are
+    returned instead of the handler's result when arguments are rejected.
+    """
+
+    def __init__(self, id_error: str = ID_ERROR, usage_result=None, id_result=None):
+        self._commands: Dict[str, Command] = {}
+        # name -> Command.run, so dispatch skips the Command.__call__ indirection
+        self._run: Dict[str, Callable[[list], Any]] = {}
+        self.id_error = id_error
+        self.usage_result = usage_result
+        self.id_result = id_result
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._commands
+
+    def __iter__(self) -> Iterator[Command]:
+        """Registered commands, once each (aliases are skipped), in registration order"""
+        seen = set()
+        for command in self._commands.values():
+            if id(command) not in seen:
+                seen.add(id(command))
+                yield command
+
+    def get(self, name: str) -> Optional[Callable[[list], Any]]:
+        """The compiled dispatch function for a name or alias, if any"""
+        return self._run.get(name)
+
+    def command(self, name: str) -> Optional[Command]:
+        """The command registered under a name or alias, if any"""
+        return self._commands.get(name)
+
+    def register(self, name: str, handler: Optional[Callable[[list], Any]] = None, *,
+                 aliases: Iterable[str] = (), replace: bool = False, **spec):
+        """
+        Register a handler under a name (and aliases), with its argument spec
+        The spec is Command's min_args, max_args, ids, usage, missing and help.
+        Without a handler, returns a decorator. Names already taken raise
+        ValueError unless `replace` is set.
+        """
+        if handler is None:
+            return lambda function: self.register(name, function, aliases=aliases, replace=replace, **spec)
+
+        names = [name.lower(), *(alias.lower() for alias in aliases)]
+        if not replace:
+            taken = [key for key in names if key in self._commands]
+            if taken:
+                raise ValueError(f"Command already registered: {taken[0]}")
+        command = Command(self, names[0], handler, **spec)
+        for key in names:
+            self._commands[key] = command
+            self._run[key] = command.run
+        return handler
+
+    def unregister(self, name: str):
+        """Remove a command and its aliases"""
+        command = self._commands.pop(name.lower(), None)
+        if command is None:
+            raise KeyError(name)
+        self._run.pop(name.lower())
+        for key in [key for key, value in self._commands.items() if value is command]:
+            del self._commands[key]
+            del self._run[key]
+
+    def help_lines(self) -> List[str]:
+        """One line per command registered with help text"""
+        return [f"  {command.usage or command.name:<30}- {command.help}"
+                for command in self if command.help]
+
+    def stats(self) -> List[Tuple[str, int, float]]:
+        """(name, calls, mean microseconds) for each command run so far, busiest first"""
+        rows = [(command.name, command.calls, command.mean_us) for command in self if command.calls]
+        return sorted(rows, key=lambda row: (-row[1], row[0]))
+
+    def reset_stats(self):
+        """Zero every command's timing counters"""
+        for command in self:
+            command.calls = 0
+            command.seconds = 0.0
+
+    def describe(self) -> str:
+        """Human-readable timing table"""
+        rows = self.stats()
+        if not rows:
+            return "No commands run yet"
+        lines = [f"{'command':<12} {'calls':>8} {'mean us':>10} {'total ms':>10}"]
+        lines.extend(f"{name:<12} {calls:>8} {mean:>10.1f} {calls * mean / 1000:>10.1f}"
+                     for name, calls, mean in rows)
+        return "\n".join(lines)
+
+
+def load_plugins(registry: CommandRegistry, app, modules: Optional[str] = None) -> List[str]:
+    """
+    Import plugin modules and let each register its commands
+    `modules` is a comma-separated list of module names, by default the
+    TODO_PLUGINS environment variable; each module must define
+    `register_commands(registry, app)`. Returns the names loaded.
+    """
+    if modules is None:
+        import os
+        modules = os.environ.get('TODO_PLUGINS', '')
+    loaded = []
+    for name in filter(None, (part.strip() for part in modules.split(','))):
+        from importlib import import_module
+        import_module(name).register_commands(registry, app)
+        loaded.append(name)
+    return loaded
@@ -0,0 +1,283 @@
+"""
+Completion module for the Todo Console Application
+Tab-completion of commands, task ids and task titles at the interactive prompt
+
+Titles are held in a TitleIndex: lowercased titles in a sorted array, searched
+by prefix with bisect. Fuzzy matches (a few typos) come from walking the same
+sorted array as an implicit trie: the keys sharing a prefix form a contiguous
+range, so each trie node is a (start, end) range whose children are found by
+bisecting, and a Levenshtein row per node prunes every branch that is already
+too far from what was typed. No trie nodes are ever allocated. Swapping two
+adjacent characters counts as one edit, as the most common typo.
+
+New titles go to a small sorted buffer that is merged into the main array
+once it grows past a fraction of it, so adding a task never shifts a
+million-entry list. Removed and renamed titles are dropped lazily: an entry is
+live only while it matches the task's current key.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+
+# Annotation-only imports (see storage.py)
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, Iterable, List, Optional, Tuple
+    from .commands import CommandRegistry
+    from .storage import InMemoryStorage
+
+# The buffer of recent titles is merged once it holds this many entries or
+# 1/MERGE_FRACTION of the main arrays, whichever is larger
+MERGE_MIN = 1024
+MERGE_FRACTION = 64
+DEFAULT_LIMIT = 20
+
+# Separates the title key from the id in an index entry, and the smallest
+# character that can follow it in a longer title
+SEP = "\x00"
+CHILD_MIN = "\x01"
+
+
+def title_key(title: str) -> str:
+    """The form titles are indexed and matched in"""
+    return " ".join(title.lower().replace(SEP, " ").split())
+
+
+def max_typos(query: str) -> int:
+    """Edits allowed between a query and a title prefix: none for very short queries"""
+    return 0 if len(query) < 3 else 1 if len(query) < 8 else 2
+
+
+def _entry_id(entry: str) -> int:
+    return int(entry[entry.rindex(SEP) + 1:])
+
+
+class TitleIndex:
+    """
+    Sorted "title key<SEP>id" strings for prefix and fuzzy prefix search
+    Carrying the id inside the string keeps one array instead of two, and lets
+    merges be a plain list sort, which Timsort does as a linear merge of the
+    two sorted runs. SEP sorts below every other character, so a title ends
+    before any longer title it prefixes. Kept in step with the engine like the
+    text index.
+    """
+
+    def __init__(self, titles: Iterable[Tuple[int, str]] = ()):
+        """Build from (id, title) pairs with a single sort"""
+        self._current: Dict[int, str] = {task_id: f"{title_key(title)}{SEP}{task_id}" for task_id, title in titles}
+        self._entries: List[str] = sorted(self._current.values())
+        self._recent: List[str] = []
+        self.dead = 0
+
+    def __len__(self) -> int:
+        return len(self._current)
+
+    def add(self, task_id: int, title: str, description: str = ""):
+        """Index a task's title"""
+        entry = f"{title_key(title)}{SEP}{task_id}"
+        self._current[task_id] = entry
+        insort(self._recent, entry)
+        if len(self._recent) > max(MERGE_MIN, len(self._entries) // MERGE_FRACTION):
+            self._merge()
+
+    def remove(self, task_id: int, title: str = "", description: str = ""):
+        """Drop a task; its entry is skipped from now on and purged at the next compaction"""
+        if self._current.pop(task_id, None) is not None:
+            self.dead += 1
+            if self.dead > len(self._current):
+                self._compact()
+
+    def _merge(self):
+        """Fold the sorted recent buffer into the main array"""
+        self._entries += self._recent
+        self._entries.sort()
+        self._recent = []
+
+    def _compact(self):
+        """Merge the buffer and drop entries of removed or renamed tasks"""
+        live = set(self._current.values())
+        self._entries = sorted(entry for entry in self._entries + self._recent if entry in live)
+        self._recent = []
+        self.dead = 0
+
+    def _live(self, entry: str) -> Optional[int]:
+        """The entry's id if it is still the task's current entry"""
+        task_id = _entry_id(entry)
+        return task_id if self._current.get(task_id) == entry else None
+
+    def prefix(self, query: str, limit: int = DEFAULT_LIMIT) -> List[int]:
+        """Ids of tasks whose title starts with `query`, in title order"""
+        key = title_key(query)
+        found = []
+        for entries in (self._entries, self._recent):
+            i = bisect_left(entries, key)
+            taken = 0
+            while i < len(entries) and taken < limit and entries[i].startswith(key):
+                task_id = self._live(entries[i])
+                if task_id is not None:
+                    found.append((entries[i], task_id))
+                    taken += 1
+                i += 1
+        return self._ordered(found, limit)
+
+    def fuzzy(self, query: str, max_edits: Optional[int] = None, limit: int = DEFAULT_LIMIT) -> List[int]:
+        """
+        Ids of tasks whose title starts with something within `max_edits` edits of `query`
+        Closest matches come first, then title order.
+        """
+        key = title_key(query)
+        if max_edits is None:
+            max_edits = max_typos(key)
+        first_row = list(range(len(key) + 1))
+        # Widen one edit at a time: the narrower walk prunes far more, and
+        # usually finds enough matches on its own
+        for edits in range(min(1, max_edits), max_edits + 1):
+            found: List[Tuple[int, str, int]] = []
+            for entries in (self._entries, self._recent):
+                if entries:
+                    self._walk(entries, 0, len(entries), 0, first_row, first_row, "", key, edits, found, limit)
+            result = self._ordered(found, limit)
+            if len(result) >= limit:
+                break
+        return result
+
+    def _walk(self, entries: List[str], lo: int, hi: int, depth: int, row: List[int], prev_row: List[int],
+              prev_char: str, query: str, max_edits: int, found: list, limit: int):
+        """Visit the implicit trie node entries[lo:hi] (which share `depth` characters)"""
+        if row[-1] <= max_edits:
+            # The node's prefix is close enough to the query: every title below it matches
+            taken = 0
+            for i in range(lo, hi):
+                task_id = self._live(entries[i])
+                if task_id is not None:
+                    found.append((row[-1], entries[i], task_id))
+                    taken += 1
+                    if taken >= limit:
+                        break
+            return
+        if min(row) > max_edits:
+            return
+
+        prefix = entries[lo][:depth]
+        i = bisect_left(entries, prefix + CHILD_MIN, lo, hi)  # skip titles that end at this node
+        while i < hi:
+            char = entries[i][depth]
+            end = bisect_left(entries, prefix + chr(ord(char) + 1), i, hi) if char < '\U0010ffff' else hi
+            # Edit distance row of the prefix extended by `char` against the query
+            next_row = [row[0] + 1]
+            for j, query_char in enumerate(query, 1):
+                cost = min(next_row[j - 1] + 1, row[j] + 1, row[j - 1] + (query_char != char))
+                if j > 1 and query_char == prev_char and query[j - 2] == char:
+                    cost = min(cost, prev_row[j - 2] + 1)  # adjacent characters swapped
+                next_row.append(cost)
+            self._walk(entries, i, end, depth + 1, next_row, row, char, query, max_edits, found, limit)
+            i = end
+
+    @staticmethod
+    def _ordered(found: list, limit: int) -> List[int]:
+        """Ids of sorted matches, each once"""
+        found.sort()
+        result, seen = [], set()
+        for match in found:
+            task_id = match[-1]
+            if task_id not in seen:
+                seen.add(task_id)
+                result.append(task_id)
+        return result[:limit]
+
+    def suggest(self, query: str, limit: int = DEFAULT_LIMIT) -> List[int]:
+        """Prefix matches, topped up with fuzzy matches when there are fewer than `limit`"""
+        result = self.prefix(query, limit)
+        if len(result) < limit and max_typos(title_key(query)):
+            seen = set(result)
+            result.extend(task_id for task_id in self.fuzzy(query, limit=limit) if task_id not in seen)
+        return result[:limit]
+
+
+def id_prefix(storage: InMemoryStorage, digits: str, limit: int = DEFAULT_LIMIT) -> List[int]:
+    """Existing task ids that start with the given digits, smallest first"""
+    low = int(digits)
+    high = low + 1
+    tasks, end = storage._tasks, storage._next_id
+    result = []
+    while 0 < low < end:
+        # Ids starting with the digits: low..high-1, then 10x that range, and so on
+        for task_id in range(low, min(high, end)):
+            if task_id in tasks:
+                result.append(task_id)
+                if len(result) >= limit:
+                    return result
+        low, high = low * 10, high * 10
+    return result
+
+
+class Completer:
+    """
+    Completes whole input lines: command names, then task ids or titles for
+    commands whose first argument is a task id
+    Each match is (replacement line, label to display).
+    """
+
+    def __init__(self, commands: CommandRegistry, storage: InMemoryStorage, limit: int = DEFAULT_LIMIT):
+        self.commands = commands
+        self.storage = storage
+        self.limit = limit
+        self.prompt = "> "
+        self._matches: List[Tuple[str, str]] = []
+
+    def complete(self, line: str) -> List[Tuple[str, str]]:
+        """Matches for a partly typed line"""
+        name, space, rest = line.lstrip().partition(' ')
+        if not space:
+            names = sorted({command.name for command in self.commands if command.name.startswith(name.lower())})
+            return [(f"{command} ", command) for command in names]
+
+        command = self.commands.command(name.lower())
+        if command is None or not command.ids:
+            return []
+        rest = rest.lstrip()
+        if not rest:
+            ids = [task.id for _, task in zip(range(self.limit), self.storage.iter_tasks())]
+        elif rest.isdigit():
+            ids = id_prefix(self.storage, rest, self.limit)
+        elif rest.split(' ', 1)[0].isdigit():
+            return []  # the id is already typed
+        else:
+            ids = self.storage.title_index.suggest(rest, self.limit)
+        tasks = self.storage._tasks
+        return [(f"{name} {task_id} ", f"{task_id:>6}  {tasks[task_id].title}") for task_id in ids]
+
+    def readline_complete(self, text: str, state: int) -> Optional[str]:
+        """readline completer function (completer delimiters must be empty)"""
+        if state == 0:
+            import readline
+            self._matches = self.complete(readline.get_line_buffer()[:readline.get_endidx()])
+        return self._matches[state][0] if state < len(self._matches) else None
+
+    def display_matches(self, substitution: str, matches: List[str], longest: int):
+        """readline display hook: list matching tasks by id and title"""
+        import readline
+        labels = dict(self._matches)
+        print()
+        for match in matches:
+            print(labels.get(match, match))
+        print(self.prompt + readline.get_line_buffer(), end="", flush=True)
+
+
+def install(completer: Completer, prompt: str = "> ") -> bool:
+    """Bind tab to the completer in input(); False where readline is unavailable"""
+    try:
+        import readline
+    except ImportError:
+        return False
+    completer.prompt = prompt
+    readline.set_completer(completer.readline_complete)
+    readline.set_completer_delims("")
+    if hasattr(readline, 'set_completion_display_matches_hook'):
+        readline.set_completion_display_matches_hook(completer.display_matches)
+    if 'libedit' in (readline.__doc__ or ""):
+        readline.parse_and_bind("bind ^I rl_complete")
+    else:
+        readline.parse_and_bind("tab: complete")
+    return True
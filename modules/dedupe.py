@@ -0,0 +1,273 @@
+"""
+Dedupe module for the Todo Console Application
+Finds exact and near-duplicate tasks without comparing every pair
+
+Exact duplicates share a normalized title: case, punctuation and spacing are
+ignored, but symbols such as emoji are kept, and a title with no words or
+symbols at all ("???") is compared as written, spacing aside. They are found
+through a hash of that title. Near duplicates are found with MinHash over
+character shingles of the normalized title and description, bucketed by
+locality-sensitive hashing (LSH): each task lands in BANDS buckets, and only
+tasks sharing a bucket are ever compared. Candidates are confirmed by their
+exact Jaccard similarity, so the index never reports a pair below the
+threshold; it can miss a similar pair that shares no bucket (see DEFAULT_THRESHOLD).
+
+The signature uses one-permutation hashing: each shingle is hashed once and
+binned, rather than hashed SIGNATURE_SIZE times, which keeps indexing a task
+linear in its length. Hashes use Python's per-process string hash, which is
+fine because the index lives only in memory.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+
+from .indexes import tokenize
+
+# Annotation-only imports (see storage.py)
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, Iterable, List, Mapping, Optional, Set, Union
+    from .storage import Task
+
+SHINGLE_SIZE = 4
+SIGNATURE_SIZE = 32  # a power of two, so a hash's low bits pick its bin
+BANDS = 8
+ROWS = SIGNATURE_SIZE // BANDS
+# With 8 bands of 4 rows, pairs at Jaccard 0.8 share a bucket ~98.5% of the time
+DEFAULT_THRESHOLD = 0.8
+
+# Above any 64-bit hash; marks a bin no shingle fell into
+_EMPTY = 1 << 64
+# Offset added per bin when an empty bin borrows its neighbour's value
+_DENSIFY_STEP = 0x9E3779B97F4A7C15
+
+
+# A run of word characters, or any single other non-space character
+TERM_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def _terms(text: str) -> List[str]:
+    """Lowercase words of text, plus symbols such as emoji; punctuation (all non-word ASCII) is dropped"""
+    if text.isascii():
+        return tokenize(text)
+    return [term for term in TERM_RE.findall(text.lower())
+            if term[0].isalnum() or term[0] == '_' or unicodedata.category(term)[0] == 'S']
+
+
+def normalize_title(title: str) -> str:
+    """
+    Lowercase a title and reduce it to its words and symbols, dropping punctuation and spacing
+    A title with none (only punctuation) is kept as written, spacing aside, so
+    it never matches an unrelated one; it cannot collide with a title that
+    has words, as it contains no word characters.
+    """
+    terms = _terms(title)
+    return " ".join(terms) if terms else " ".join(title.split())
+
+
+def shingles(title: str, description: str = "") -> Set[str]:
+    """Overlapping character SHINGLE_SIZE-grams of the normalized title and description"""
+    text = normalize_title(f"{title} {description}")
+    if len(text) <= SHINGLE_SIZE:
+        return {text}
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    """Jaccard similarity of two shingle sets"""
+    if len(a) > len(b):
+        a, b = b, a
+    shared = len(a & b) if a else 0
+    union = len(a) + len(b) - shared
+    return shared / union if union else 1.0
+
+
+def signature(shingle_set: Iterable[str]) -> List[int]:
+    """
+    MinHash signature of a shingle set by one-permutation hashing
+    Each shingle is hashed once; its low bits choose a bin and the hash competes
+    for that bin's minimum. Empty bins borrow from the next filled bin.
+    """
+    sig = [_EMPTY] * SIGNATURE_SIZE
+    mask = SIGNATURE_SIZE - 1
+    # Hashes within one bin share their low bits, so comparing whole (signed)
+    # hashes orders them the same way as comparing the remaining bits
+    for h in map(hash, shingle_set):
+        if h < sig[h & mask]:
+            sig[h & mask] = h
+    if _EMPTY in sig:
+        filled = [i for i, v in enumerate(sig) if v != _EMPTY]
+        if filled:
+            dense = list(sig)
+            for i in range(SIGNATURE_SIZE):
+                if sig[i] == _EMPTY:
+                    j = next((k for k in filled if k > i), filled[0])
+                    dense[i] = sig[j] + ((j - i) % SIGNATURE_SIZE) * _DENSIFY_STEP
+            sig = dense
+    return sig
+
+
+def band_keys(sig: List[int]) -> List[int]:
+    """One LSH bucket key per band of ROWS signature values"""
+    return [hash((band,) + tuple(sig[band * ROWS:band * ROWS + ROWS])) for band in range(BANDS)]
+
+
+def _bucket_add(buckets: Dict[int, Union[int, Set[int]]], key: int, task_id: int):
+    """Add an id to a bucket; singletons are stored as a bare int to save memory"""
+    members = buckets.get(key)
+    if members is None:
+        buckets[key] = task_id
+    elif isinstance(members, int):
+        if members != task_id:
+            buckets[key] = {members, task_id}
+    else:
+        members.add(task_id)
+
+
+def _bucket_remove(buckets: Dict[int, Union[int, Set[int]]], key: int, task_id: int):
+    """Remove an id from a bucket, shrinking it back to a bare int at one member"""
+    members = buckets.get(key)
+    if members is None:
+        return
+    if isinstance(members, int):
+        if members == task_id:
+            del buckets[key]
+        return
+    members.discard(task_id)
+    if len(members) == 1:
+        buckets[key] = next(iter(members))
+
+
+def _members(bucket: Union[int, Set[int], None]) -> Iterable[int]:
+    if bucket is None:
+        return ()
+    return (bucket,) if isinstance(bucket, int) else bucket
+
+
+class _Groups:
+    """Union-find over task ids"""
+
+    def __init__(self):
+        self.parent: Dict[int, int] = {}
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        root = x
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while x != root:
+            parent[x], x = root, parent.get(x, x)
+        return root
+
+    def union(self, a: int, b: int) -> bool:
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        if rb < ra:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.parent.setdefault(ra, ra)
+        return True
+
+    def groups(self) -> List[List[int]]:
+        clusters: Dict[int, List[int]] = {}
+        for x in self.parent:
+            clusters.setdefault(self.find(x), []).append(x)
+        return sorted(sorted(ids) for ids in clusters.values() if len(ids) > 1)
+
+
+class DedupeIndex:
+    """
+    Exact-title and LSH indexes for finding duplicate tasks
+    Kept in step with the engine like the text index; texts are passed again on
+    removal so no per-task signature has to be stored.
+    """
+
+    def __init__(self):
+        self._titles: Dict[int, Union[int, Set[int]]] = {}
+        self._buckets: Dict[int, Union[int, Set[int]]] = {}
+
+    def add(self, task_id: int, title: str, description: str):
+        """Index a task's title and text"""
+        _bucket_add(self._titles, hash(normalize_title(title)), task_id)
+        buckets = self._buckets
+        for key in band_keys(signature(shingles(title, description))):
+            _bucket_add(buckets, key, task_id)
+
+    def remove(self, task_id: int, title: str, description: str):
+        """Drop a task indexed with the given title and text"""
+        _bucket_remove(self._titles, hash(normalize_title(title)), task_id)
+        buckets = self._buckets
+        for key in band_keys(signature(shingles(title, description))):
+            _bucket_remove(buckets, key, task_id)
+
+    def exact(self, title: str, tasks: Mapping[int, Task]) -> List[int]:
+        """Ids of tasks whose normalized title equals this one"""
+        normalized = normalize_title(title)
+        return sorted(task_id for task_id in _members(self._titles.get(hash(normalized)))
+                      if normalize_title(tasks[task_id].title) == normalized)
+
+    def similar(self, title: str, description: str, tasks: Mapping[int, Task],
+                threshold: float = DEFAULT_THRESHOLD) -> List[int]:
+        """Ids of tasks whose text is at least `threshold` similar, most similar first"""
+        probe = shingles(title, description)
+        candidates: Set[int] = set()
+        for key in band_keys(signature(probe)):
+            candidates.update(_members(self._buckets.get(key)))
+        scored = []
+        for task_id in candidates:
+            task = tasks[task_id]
+            score = jaccard(probe, shingles(task.title, task.description))
+            if score >= threshold:
+                scored.append((-score, task_id))
+        return [task_id for _, task_id in sorted(scored)]
+
+    def find(self, title: str, description: str, tasks: Mapping[int, Task],
+             threshold: float = DEFAULT_THRESHOLD) -> Optional[int]:
+        """The existing task a new one would duplicate, if any (exact title first)"""
+        exact = self.exact(title, tasks)
+        if exact:
+            return exact[0]
+        similar = self.similar(title, description, tasks, threshold)
+        return similar[0] if similar else None
+
+    def groups(self, tasks: Mapping[int, Task], threshold: float = DEFAULT_THRESHOLD) -> List[List[int]]:
+        """
+        Cluster duplicate tasks into groups of ids, each sorted, smallest id first
+        Each shared bucket is checked against its lowest id only, so a bucket of
+        k tasks costs k comparisons rather than k*k: buckets of unrelated tasks
+        reach hundreds of members, and comparing every pair made grouping
+        quadratic. The price is recall: two tasks similar to each other but not
+        to their bucket's lowest id are grouped only if another bucket (or a
+        chain of matches) links them. find() and similar() compare every
+        candidate and do not lose pairs this way.
+        """
+        groups = _Groups()
+        for bucket in self._titles.values():
+            if isinstance(bucket, int):
+                continue
+            by_title: Dict[str, int] = {}
+            for task_id in sorted(bucket):
+                first = by_title.setdefault(normalize_title(tasks[task_id].title), task_id)
+                if first != task_id:
+                    groups.union(first, task_id)
+
+        cache: Dict[int, Set[str]] = {}
+
+        def text(task_id: int) -> Set[str]:
+            shingle_set = cache.get(task_id)
+            if shingle_set is None:
+                task = tasks[task_id]
+                shingle_set = cache[task_id] = shingles(task.title, task.description)
+            return shingle_set
+
+        for bucket in self._buckets.values():
+            if isinstance(bucket, int):
+                continue
+            first, *rest = sorted(bucket)
+            for task_id in rest:
+                if groups.find(task_id) != groups.find(first) and jaccard(text(first), text(task_id)) >= threshold:
+                    groups.union(first, task_id)
+        return groups.groups()
@@ -0,0 +1,173 @@
+"""
+Events module for the Todo Console Application
+Publishes ordered, sequence-numbered change events to in-process subscribers
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+EVENT_KINDS = ('created', 'updated', 'deleted', 'completed')
+OVERFLOW_POLICIES = ('block', 'drop_oldest')
+
+
+@dataclass
+class ChangeEvent:
+    """A single change to a record in a store"""
+    seq: int
+    kind: str
+    record_id: int
+    timestamp: float
+    data: Optional[Dict[str, Any]] = None  # record snapshot after the change; None for deletes
+    fields: Optional[List[str]] = None  # names of the fields an update changed, when known
+
+    def to_dict(self) -> dict:
+        """Convert the event to a dictionary representation"""
+        return {
+            'seq': self.seq,
+            'kind': self.kind,
+            'id': self.record_id,
+            'timestamp': self.timestamp,
+            'data': self.data,
+            'fields': self.fields,
+        }
+
+
+class Subscription:
+    """
+    A bounded queue of events for one subscriber
+    With overflow='block' a full queue makes the publisher wait (backpressure);
+    with overflow='drop_oldest' the oldest events are discarded and counted.
+    """
+
+    def __init__(self, bus: "EventBus", max_queue: int, overflow: str):
+        self._bus = bus
+        self._queue: deque = deque()
+        self._max_queue = max_queue
+        self._overflow = overflow
+        self._condition = threading.Condition()
+        self.closed = False
+        self.delivered = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def _offer(self, events: List[ChangeEvent]):
+        """Enqueue events from the publisher, applying the overflow policy"""
+        with self._condition:
+            for event in events:
+                while len(self._queue) >= self._max_queue and not self.closed:
+                    if self._overflow == 'drop_oldest':
+                        self._queue.popleft()
+                        self.dropped += 1
+                    else:
+                        self._condition.wait()
+                if self.closed:
+                    return
+                self._queue.append(event)
+            self._condition.notify_all()
+
+    def get_batch(self, max_items: int = 256, timeout: Optional[float] = None) -> List[ChangeEvent]:
+        """
+        Wait for at least one event and return up to max_items of them in order
+        Returns an empty list on timeout or once the subscription is closed and drained
+        """
+        with self._condition:
+            if not self._queue and not self.closed:
+                self._condition.wait_for(lambda: self._queue or self.closed, timeout)
+            queue = self._queue
+            batch = [queue.popleft() for _ in range(min(max_items, len(queue)))]
+            if batch:
+                self.delivered += len(batch)
+                self._condition.notify_all()  # wake a publisher blocked on a full queue
+            return batch
+
+    def __iter__(self) -> Iterator[ChangeEvent]:
+        """Yield events until the subscription is closed"""
+        while True:
+            batch = self.get_batch()
+            if not batch:
+                return
+            yield from batch
+
+    def close(self):
+        """Unsubscribe and release any waiting publisher or consumer"""
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+        # A publisher blocked on this queue holds the bus lock until it sees closed
+        self._bus._unsubscribe(self)
+
+
+class EventBus:
+    """
+    Assigns sequence numbers to changes and fans them out to subscribers
+    Records are converted with `snapshot` only when someone is subscribed, so
+    publishing with no subscribers just advances the sequence counter. Events
+    are stamped from `now_us` (epoch microseconds), which a store sets to its
+    own clock so event times match the records' updated_at.
+    """
+
+    def __init__(self, snapshot: Callable[[Any], Dict[str, Any]] = lambda record: record.to_dict(),
+                 now_us: Callable[[], int] = lambda: time.time_ns() // 1000):
+        self._snapshot = snapshot
+        self._now_us = now_us
+        self._lock = threading.Lock()
+        self._subscribers: Tuple[Subscription, ...] = ()
+        self.seq = 0
+
+    @property
+    def has_subscribers(self) -> bool:
+        """Check whether anyone is listening"""
+        return bool(self._subscribers)
+
+    def subscribe(self, max_queue: int = 1024, overflow: str = 'block') -> Subscription:
+        """Create a subscription that receives every event published from now on"""
+        if max_queue <= 0:
+            raise ValueError("Queue size must be positive")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Overflow policy must be one of: {', '.join(OVERFLOW_POLICIES)}")
+        subscription = Subscription(self, max_queue, overflow)
+        with self._lock:
+            self._subscribers = self._subscribers + (subscription,)
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription):
+        """Stop delivering to a subscription"""
+        with self._lock:
+            self._subscribers = tuple(s for s in self._subscribers if s is not subscription)
+
+    def publish(self, kind: str, record_id: int, record: Any = None, fields: Optional[Iterable[str]] = None) -> int:
+        """
+        Publish one change (record is None for deletes) and return its sequence number
+        `fields` names the fields an update changed, if the publisher knows them.
+        """
+        return self.publish_batch([(kind, record_id, record, fields)])
+
+    def publish_batch(self, changes: Iterable[Tuple]) -> int:
+        """
+        Publish several (kind, record_id, record[, fields]) changes with consecutive sequence numbers
+        Returns the sequence number of the last event
+        """
+        with self._lock:
+            subscribers = self._subscribers
+            if not subscribers:
+                for _ in changes:
+                    self.seq += 1
+                return self.seq
+
+            now = self._now_us() / 1_000_000
+            snapshot = self._snapshot
+            events = []
+            for kind, record_id, record, *fields in changes:
+                self.seq += 1
+                data = snapshot(record) if record is not None else None
+                fields = sorted(fields[0]) if fields and fields[0] is not None else None
+                events.append(ChangeEvent(self.seq, kind, record_id, now, data, fields))
+            # Delivering under the lock keeps every subscriber's stream in seq order
+            for subscription in subscribers:
+                subscription._offer(events)
+            return self.seq
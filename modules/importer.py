@@ -0,0 +1,138 @@
+"""
+Import module for the Todo Console Application
+Loads tasks from JSON Lines files, parsing byte-range chunks in parallel
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # 1 MiB per worker task
+
+# (title, description, completed) as accepted by InMemoryStorage.add_tasks
+Record = Tuple[str, str, bool]
+
+
+@dataclass
+class ImportResult:
+    """Summary of an import run"""
+    imported: int = 0
+    chunks: int = 0
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+
+
+def split_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Tuple[int, int]]:
+    """
+    Split a file into (start, end) byte ranges
+    Every range except the last ends just after a newline, so no line is cut
+    """
+    if chunk_size <= 0:
+        raise ValueError("Chunk size must be positive")
+
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, 'rb') as f:
+        start = 0
+        while start < size:
+            end = start + chunk_size
+            if end < size:
+                f.seek(end - 1)
+                f.readline()  # move to the end of the line straddling the boundary
+                end = f.tell()
+            else:
+                end = size
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def validate_record(record) -> Record:
+    """
+    Validate one decoded record using the same rules as Item.__post_init__
+    Returns a (title, description, completed) tuple
+    """
+    if not isinstance(record, dict):
+        raise ValueError("Record must be a JSON object")
+
+    title = record.get('title')
+    if not isinstance(title, str) or not title.strip():
+        raise ValueError("Title must be a non-empty string")
+
+    description = record.get('description', "")
+    if description is None:
+        description = ""
+    if not isinstance(description, str):
+        raise ValueError("Description must be a string")
+
+    completed = record.get('completed', False)
+    if not isinstance(completed, bool):
+        raise ValueError("Completed must be a boolean")
+
+    return title.strip(), description.strip(), completed
+
+
+def parse_chunk(path: str, start: int, end: int) -> Tuple[List[Record], List[Tuple[int, str]], int]:
+    """
+    Parse and validate the lines in one byte range
+    Returns (records, errors, line_count); error line numbers are relative to the chunk
+    """
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    records = []
+    errors = []
+    lines = data.split(b'\n')
+    if lines and not lines[-1]:
+        lines.pop()  # trailing newline does not start a new line
+
+    for offset, raw in enumerate(lines):
+        if not raw.strip():
+            continue
+        try:
+            records.append(validate_record(json.loads(raw)))
+        except ValueError as e:  # includes JSONDecodeError and UnicodeDecodeError
+            errors.append((offset, str(e)))
+
+    return records, errors, len(lines)
+
+
+def import_file(path: str, storage, workers: Optional[int] = None,
+                chunk_size: int = DEFAULT_CHUNK_SIZE) -> ImportResult:
+    """
+    Import a JSON Lines file into storage
+    Chunks are parsed in a process pool and merged into storage in file order.
+    Invalid records are skipped and reported with their 1-based line number.
+    """
+    ranges = split_chunks(path, chunk_size)
+    result = ImportResult(chunks=len(ranges))
+    if not ranges:
+        return result
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(ranges))
+
+    starts = [start for start, _ in ranges]
+    ends = [end for _, end in ranges]
+
+    if workers <= 1:
+        # A pool is pure overhead for a single worker
+        _merge(map(parse_chunk, [path] * len(ranges), starts, ends), storage, result)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map() yields in submission order, which keeps ids in file order
+            _merge(pool.map(parse_chunk, [path] * len(ranges), starts, ends), storage, result)
+
+    return result
+
+
+def _merge(chunk_results, storage, result: ImportResult):
+    """Apply parsed chunks to storage in order, translating error line numbers"""
+    line_base = 0
+    for records, errors, line_count in chunk_results:
+        result.imported += len(storage.add_tasks(records))
+        result.errors.extend((line_base + offset + 1, message) for offset, message in errors)
+        line_base += line_count
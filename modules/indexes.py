@@ -0,0 +1,382 @@
+"""
+Index module for the Todo Console Application
+Secondary indexes kept in step with InMemoryStorage mutations
+"""
+
+from __future__ import annotations
+
+import heapq
+import re
+from bisect import bisect_left, bisect_right
+
+# The root item console imports this module at startup, where importing typing
+# would be most of its cost; annotations are not evaluated at runtime
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Container, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+WORD_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens"""
+    return WORD_RE.findall(text.lower())
+
+
+class StatusIndex:
+    """Sets of task ids partitioned by completion status"""
+
+    def __init__(self):
+        self.completed: Set[int] = set()
+        self.pending: Set[int] = set()
+
+    def add(self, task_id: int, completed: bool):
+        """Index a task under its status"""
+        (self.completed if completed else self.pending).add(task_id)
+
+    def remove(self, task_id: int):
+        """Drop a task from the index"""
+        self.completed.discard(task_id)
+        self.pending.discard(task_id)
+
+    def ids(self, completed: bool) -> Set[int]:
+        """Get the ids with the given status"""
+        return self.completed if completed else self.pending
+
+
+class TimeIndex:
+    """
+    Sorted (epoch microseconds, id) pairs supporting range scans
+    Removals are lazy: stale ids stay until compact() and readers filter them
+    """
+
+    def __init__(self):
+        self._keys: List[int] = []
+        self._ids: List[int] = []
+        self.dead = 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, task_id: int, key: int):
+        """Index a task at the given time"""
+        if not self._keys or key >= self._keys[-1]:
+            # Creation times arrive in order, so this is the common case
+            self._keys.append(key)
+            self._ids.append(task_id)
+        else:
+            pos = bisect_right(self._keys, key)
+            self._keys.insert(pos, key)
+            self._ids.insert(pos, task_id)
+
+    def remove(self, task_id: int):
+        """Mark one entry as stale"""
+        self.dead += 1
+
+    def compact(self, live: Container[int]):
+        """Drop entries whose ids are no longer live"""
+        keep = [i for i, task_id in enumerate(self._ids) if task_id in live]
+        self._keys = [self._keys[i] for i in keep]
+        self._ids = [self._ids[i] for i in keep]
+        self.dead = 0
+
+    def bounds(self, low: Optional[int] = None, high: Optional[int] = None,
+               include_low: bool = True, include_high: bool = True) -> Tuple[int, int]:
+        """Get the (start, end) positions of entries within a time range"""
+        start = 0
+        end = len(self._keys)
+        if low is not None:
+            start = bisect_left(self._keys, low) if include_low else bisect_right(self._keys, low)
+        if high is not None:
+            end = bisect_right(self._keys, high) if include_high else bisect_left(self._keys, high)
+        return start, max(start, end)
+
+    def ids(self, start: int, end: int) -> List[int]:
+        """Get the ids between two positions, oldest first (may include stale ids)"""
+        return self._ids[start:end]
+
+
+class TextIndex:
+    """Inverted index from word tokens to task ids"""
+
+    def __init__(self):
+        self._postings: Dict[str, Set[int]] = {}
+
+    def add(self, task_id: int, *texts: str):
+        """Index the words of the given texts"""
+        postings = self._postings
+        for token in set(tokenize(" ".join(texts))):
+            ids = postings.get(token)
+            if ids is None:
+                postings[token] = {task_id}
+            else:
+                ids.add(task_id)
+
+    def replace(self, task_id: int, old_texts: Tuple[str, ...], new_texts: Tuple[str, ...]):
+        """Reindex changed texts, touching only the words that appear or disappear"""
+        old = set(tokenize(" ".join(old_texts)))
+        new = set(tokenize(" ".join(new_texts)))
+        postings = self._postings
+        for token in old - new:
+            ids = postings.get(token)
+            if ids is not None:
+                ids.discard(task_id)
+                if not ids:
+                    del postings[token]
+        for token in new - old:
+            ids = postings.get(token)
+            if ids is None:
+                postings[token] = {task_id}
+            else:
+                ids.add(task_id)
+
+    def remove(self, task_id: int, *texts: str):
+        """Remove the words of the given texts"""
+        postings = self._postings
+        for token in set(tokenize(" ".join(texts))):
+            ids = postings.get(token)
+            if ids is not None:
+                ids.discard(task_id)
+                if not ids:
+                    del postings[token]
+
+    def estimate(self, tokens: Iterable[str]) -> int:
+        """Upper bound on matches: the size of the shortest posting list"""
+        return min((len(self._postings.get(token, ())) for token in tokens), default=0)
+
+    def ids(self, tokens: Iterable[str]) -> Set[int]:
+        """Get the ids whose texts contain every token"""
+        lists = sorted((self._postings.get(token, set()) for token in tokens), key=len)
+        if not lists:
+            return set()
+        result = set(lists[0])
+        for ids in lists[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
+
+
+class SetIndex:
+    """Posting lists from a key (a tag or a priority bucket) to task ids"""
+
+    def __init__(self):
+        self._postings: Dict[str, Set[int]] = {}
+
+    def add(self, task_id: int, key: str):
+        """Index a task under a key"""
+        ids = self._postings.get(key)
+        if ids is None:
+            self._postings[key] = {task_id}
+        else:
+            ids.add(task_id)
+
+    def remove(self, task_id: int, key: str):
+        """Remove a task from a key"""
+        ids = self._postings.get(key)
+        if ids is not None:
+            ids.discard(task_id)
+            if not ids:
+                del self._postings[key]
+
+    def ids(self, key: str) -> Set[int]:
+        """Get the ids indexed under a key"""
+        return self._postings.get(key, set())
+
+    def keys(self) -> List[str]:
+        """Get every key that has at least one id"""
+        return sorted(self._postings)
+
+
+class DueIndex:
+    """
+    Min-heap of (due epoch microseconds, id) with lazy deletion
+    Entries whose time no longer matches the task's current due time are stale.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[int, int]] = []
+        self._current: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._current)
+
+    def set(self, task_id: int, key: Optional[int]):
+        """Set or clear (key=None) a task's due time"""
+        if key is None:
+            self._current.pop(task_id, None)
+        else:
+            if self._current.get(task_id) == key:
+                return
+            self._current[task_id] = key
+            heapq.heappush(self._heap, (key, task_id))
+        if len(self._heap) > 2 * len(self._current) + 64:
+            self._rebuild()
+
+    def _rebuild(self):
+        """Drop stale entries"""
+        self._heap = [(key, task_id) for task_id, key in self._current.items()]
+        heapq.heapify(self._heap)
+
+    def peek(self) -> Optional[Tuple[int, int]]:
+        """Get the earliest live (due time, id) without removing it"""
+        heap = self._heap
+        current = self._current
+        while heap and current.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def iter_due(self, until: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+        """
+        Yield live (due time, id) pairs in due order, stopping after `until`
+        Walks the heap tree with a frontier heap, so the first k items cost O(k log k).
+        """
+        heap = self._heap
+        current = self._current
+        frontier = [(heap[0], 0)] if heap else []
+        size = len(heap)
+        seen = set()  # a task moved away and back has two identical live entries
+        while frontier:
+            entry, pos = heapq.heappop(frontier)
+            if until is not None and entry[0] > until:
+                return
+            if current.get(entry[1]) == entry[0] and entry[1] not in seen:
+                seen.add(entry[1])
+                yield entry
+            for child in (2 * pos + 1, 2 * pos + 2):
+                if child < size:
+                    heapq.heappush(frontier, (heap[child], child))
+
+
+class TreeIndex:
+    """
+    Parent/child links between tasks with completion counts rolled up to every ancestor
+    Children are kept in insertion-ordered dicts, so listing a subtree visits
+    only its members and unlinking a child is O(1). counts[id] holds
+    [descendants, completed descendants] for every task with children; each
+    change adjusts the counts along its ancestor path (O(depth)), so a task's
+    progress is one lookup. Tasks without a parent or children have no entry.
+    """
+
+    def __init__(self):
+        self.parents: Dict[int, int] = {}
+        self.children: Dict[int, Dict[int, None]] = {}
+        self.counts: Dict[int, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    def _adjust(self, parent_id: Optional[int], total: int, done: int):
+        """Add to the counts of `parent_id` and every ancestor above it"""
+        counts, parents = self.counts, self.parents
+        while parent_id is not None:
+            row = counts.get(parent_id)
+            if row is None:
+                counts[parent_id] = [total, done]
+            else:
+                row[0] += total
+                row[1] += done
+                if not row[0]:
+                    del counts[parent_id]
+            parent_id = parents.get(parent_id)
+
+    def add(self, task_id: int, parent_id: Optional[int], completed: bool):
+        """Link a task (and the subtree already below it) under `parent_id`"""
+        if parent_id is None:
+            return
+        self.parents[task_id] = parent_id
+        self.children.setdefault(parent_id, {})[task_id] = None
+        total, done = self.counts.get(task_id, (0, 0))
+        self._adjust(parent_id, total + 1, done + completed)
+
+    def remove(self, task_id: int, completed: bool):
+        """Unlink a task from its parent; its own children stay linked to it"""
+        parent_id = self.parents.pop(task_id, None)
+        if parent_id is None:
+            return
+        siblings = self.children[parent_id]
+        del siblings[task_id]
+        if not siblings:
+            del self.children[parent_id]
+        total, done = self.counts.get(task_id, (0, 0))
+        self._adjust(parent_id, -(total + 1), -(done + completed))
+
+    def set_completed(self, task_id: int, completed: bool):
+        """Roll a change of one task's status up to its ancestors"""
+        parent_id = self.parents.get(task_id)
+        if parent_id is not None:
+            self._adjust(parent_id, 0, 1 if completed else -1)
+
+    def set_subtree_completed(self, task_id: int, completed: bool, flipped: int):
+        """
+        Record that a whole subtree now has one status
+        `flipped` is how many of its tasks (the root included) changed status.
+        """
+        counts = self.counts
+        for node in self.subtree(task_id):
+            row = counts.get(node)
+            if row is not None:
+                row[1] = row[0] if completed else 0
+        self._adjust(self.parents.get(task_id), 0, flipped if completed else -flipped)
+
+    def drop_subtree(self, task_id: int, ids: Iterable[int], completed: int):
+        """
+        Forget a subtree being deleted: `ids` are its members (from subtree())
+        and `completed` how many of them, the root included, were completed.
+        """
+        total, _ = self.counts.get(task_id, (0, 0))
+        parent_id = self.parents.get(task_id)
+        if parent_id is not None:
+            self._adjust(parent_id, -(total + 1), -completed)
+            siblings = self.children[parent_id]
+            del siblings[task_id]
+            if not siblings:
+                del self.children[parent_id]
+        parents, children, counts = self.parents, self.children, self.counts
+        for node in ids:
+            parents.pop(node, None)
+            children.pop(node, None)
+            counts.pop(node, None)
+
+    def parent(self, task_id: int) -> Optional[int]:
+        """Get a task's parent id"""
+        return self.parents.get(task_id)
+
+    def child_ids(self, task_id: int) -> List[int]:
+        """Get a task's direct children in the order they were linked"""
+        return list(self.children.get(task_id, ()))
+
+    def ancestors(self, task_id: int) -> Iterator[int]:
+        """Yield a task's parent, grandparent and so on up to its root"""
+        parent_id = self.parents.get(task_id)
+        while parent_id is not None:
+            yield parent_id
+            parent_id = self.parents.get(parent_id)
+
+    def subtree(self, task_id: int) -> List[int]:
+        """A task and all its descendants in depth-first pre-order, in O(subtree size)"""
+        children = self.children
+        ids, stack = [], [task_id]
+        while stack:
+            node = stack.pop()
+            ids.append(node)
+            below = children.get(node)
+            if below:
+                stack.extend(reversed(below))
+        return ids
+
+    def depth_first(self, task_id: int) -> Iterator[Tuple[int, int]]:
+        """Yield (id, depth below `task_id`) over a subtree in pre-order"""
+        children = self.children
+        stack = [(task_id, 0)]
+        while stack:
+            node, depth = stack.pop()
+            yield node, depth
+            below = children.get(node)
+            if below:
+                stack.extend((child, depth + 1) for child in reversed(below))
+
+    def progress(self, task_id: int) -> Tuple[int, int]:
+        """(completed descendants, descendants) of a task, in O(1)"""
+        row = self.counts.get(task_id)
+        return (row[1], row[0]) if row is not None else (0, 0)
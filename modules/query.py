@@ -0,0 +1,395 @@
+"""
+Query module for the Todo Console Application
+Parses list queries, plans them against the storage indexes and executes them
+
+Grammar:
+    [where <field><op><value> [and ...]] [order by <field> [asc|desc]] [limit <n>]
+
+Operators are = != < <= > >= and ~ (all words present, case-insensitive).
+"""
+
+import heapq
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Iterable, List, Mapping, Optional, Sequence
+
+from .clock import to_micros
+from .indexes import tokenize
+from .storage import PRIORITIES
+
+PRIORITY_RANK = {name: rank for rank, name in enumerate(PRIORITIES)}
+
+# Query field name -> task attribute
+FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'description': 'description',
+    'text': None,  # title and description together
+    'completed': 'completed',
+    'created': 'created_us',  # times are compared as epoch microseconds
+    'updated': 'updated_us',
+    'tag': 'tags',
+    'priority': 'priority',
+    'due': 'due_us',
+}
+TEXT_FIELDS = {'title', 'description', 'text'}
+TIME_FIELDS = {'created', 'updated', 'due'}
+OPERATORS = ('<=', '>=', '!=', '=', '<', '>', '~')
+
+CONDITION_RE = re.compile(r"^([A-Za-z_]+)\s*(<=|>=|!=|=|<|>|~)\s*(.*)$", re.DOTALL)
+TRUE_WORDS = {'true', 'yes', '1', 'done'}
+FALSE_WORDS = {'false', 'no', '0', 'pending'}
+
+
+@dataclass
+class Condition:
+    """A single field comparison"""
+    field: str
+    op: str
+    value: Any
+    # The value as rows store it (epoch microseconds, priority rank), computed once
+    key: Any = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.field in TIME_FIELDS and isinstance(self.value, datetime):
+            self.key = to_micros(self.value)
+        elif self.field == 'priority':
+            self.key = PRIORITY_RANK[self.value]
+        else:
+            self.key = self.value
+
+    def __str__(self):
+        value = self.value
+        if isinstance(value, datetime):
+            value = value.isoformat(sep=' ')
+        elif isinstance(value, list):
+            value = " ".join(value)
+        return f"{self.field} {self.op} {value}"
+
+
+@dataclass
+class Query:
+    """A parsed list query"""
+    conditions: List[Condition] = field(default_factory=list)
+    order_by: Optional[str] = None
+    descending: bool = False
+    limit: Optional[int] = None
+
+
+@dataclass
+class Plan:
+    """How a query will be executed"""
+    access: str
+    estimated_rows: int
+    index_condition: Optional[Condition] = None
+    candidates: Any = None  # ids to examine, or None for a full scan
+    ordered: bool = True  # candidates already come in id order
+
+
+@dataclass
+class QueryResult:
+    """Rows returned by a query along with execution statistics"""
+    rows: List[Any]
+    plan: Plan
+    query: Query
+    rows_examined: int = 0
+
+    def explain(self) -> str:
+        """Describe the plan and the work done"""
+        lines = [f"access: {self.plan.access} (estimated {self.plan.estimated_rows} rows)"]
+        residual = [str(c) for c in self.query.conditions if c is not self.plan.index_condition]
+        if residual:
+            lines.append(f"filter: {' and '.join(residual)}")
+        if self.query.order_by:
+            direction = "desc" if self.query.descending else "asc"
+            if self.query.limit is not None:
+                lines.append(f"order: top-{self.query.limit} heap on {self.query.order_by} {direction}")
+            else:
+                lines.append(f"order: sort on {self.query.order_by} {direction}")
+        elif self.query.limit is not None:
+            lines.append(f"limit: {self.query.limit}")
+        lines.append(f"rows examined: {self.rows_examined}, returned: {len(self.rows)}")
+        return "\n".join(lines)
+
+
+def _parse_value(field_name: str, op: str, raw: str):
+    """Convert a raw value to the type of its field"""
+    if op == '~':
+        if field_name not in TEXT_FIELDS:
+            raise ValueError(f"Operator ~ only applies to {', '.join(sorted(TEXT_FIELDS))}")
+        tokens = tokenize(raw)
+        if not tokens:
+            raise ValueError("Search text must contain at least one word")
+        return tokens
+
+    if field_name == 'completed':
+        lowered = raw.lower()
+        if op not in ('=', '!='):
+            raise ValueError("completed only supports = and !=")
+        if lowered in TRUE_WORDS:
+            return True
+        if lowered in FALSE_WORDS:
+            return False
+        raise ValueError(f"Invalid value for completed: {raw}")
+
+    if field_name == 'tag':
+        if op not in ('=', '!='):
+            raise ValueError("tag only supports = and !=")
+        return raw.lower().lstrip('#')
+
+    if field_name == 'priority':
+        if raw.lower() not in PRIORITY_RANK:
+            raise ValueError(f"Priority must be one of: {', '.join(PRIORITIES)}")
+        return raw.lower()
+
+    if field_name == 'id':
+        try:
+            return int(raw)
+        except ValueError:
+            raise ValueError(f"Invalid value for id: {raw}")
+
+    if field_name in TIME_FIELDS:
+        try:
+            return datetime.fromisoformat(raw)
+        except ValueError:
+            raise ValueError(f"Invalid date for {field_name}: {raw} (use YYYY-MM-DD[THH:MM])")
+
+    if field_name == 'text':
+        raise ValueError("text only supports the ~ operator")
+    return raw
+
+
+def parse_query(tokens: Sequence[str], fields: Iterable[str] = FIELDS) -> Query:
+    """
+    Parse query tokens (the arguments after 'list') into a Query
+    Raises ValueError with a user-facing message on bad input
+    """
+    allowed = set(fields)
+    query = Query()
+    tokens = list(tokens)
+    i = 0
+
+    def keyword(pos: int) -> str:
+        return tokens[pos].lower() if pos < len(tokens) else ""
+
+    if keyword(0) == 'where':
+        i = 1
+        while True:
+            # A condition may be one token (a=b) or split across up to three (a = b)
+            text = ""
+            matched = None
+            for width in (1, 2, 3):
+                if i + width > len(tokens):
+                    break
+                text = " ".join(tokens[i:i + width])
+                matched = CONDITION_RE.match(text)
+                if matched and matched.group(3):
+                    i += width
+                    break
+                matched = None
+            if matched is None:
+                raise ValueError(f"Invalid condition: {text or 'missing'}")
+
+            name, op, raw = matched.group(1).lower(), matched.group(2), matched.group(3).strip()
+            if name not in allowed:
+                raise ValueError(f"Unknown field: {name}")
+            query.conditions.append(Condition(name, op, _parse_value(name, op, raw)))
+
+            if keyword(i) != 'and':
+                break
+            i += 1
+
+    if keyword(i) == 'order':
+        if keyword(i + 1) != 'by' or i + 2 >= len(tokens):
+            raise ValueError("Expected: order by <field> [asc|desc]")
+        name = tokens[i + 2].lower()
+        if name not in allowed or name == 'text':
+            raise ValueError(f"Cannot order by: {name}")
+        query.order_by = name
+        i += 3
+        if keyword(i) in ('asc', 'desc'):
+            query.descending = keyword(i) == 'desc'
+            i += 1
+
+    if keyword(i) == 'limit':
+        if i + 1 >= len(tokens) or not tokens[i + 1].isdigit():
+            raise ValueError("Expected: limit <n>")
+        query.limit = int(tokens[i + 1])
+        i += 2
+
+    if i < len(tokens):
+        raise ValueError(f"Unexpected '{tokens[i]}' in query")
+    return query
+
+
+def _field_value(row, name: str):
+    """Read a query field from a row"""
+    if name == 'text':
+        return f"{row.title} {row.description}"
+    if name == 'priority':
+        return PRIORITY_RANK[row.priority]
+    return getattr(row, FIELDS[name])
+
+
+def matches(row, condition: Condition) -> bool:
+    """Evaluate one condition against a row"""
+    value = _field_value(row, condition.field)
+    op = condition.op
+    target = condition.key
+    if condition.field == 'tag':
+        return (target in value) == (op == '=')
+    if value is None:
+        return op == '!='  # a missing due date never compares equal or ordered
+    if op == '~':
+        words = set(tokenize(value))
+        return all(token in words for token in target)
+    if op == '=':
+        return value == target
+    if op == '!=':
+        return value != target
+    if op == '<':
+        return value < target
+    if op == '<=':
+        return value <= target
+    if op == '>':
+        return value > target
+    return value >= target
+
+
+def plan_query(query: Query, rows: Mapping[int, Any], storage=None) -> Plan:
+    """
+    Pick the cheapest access path for a query
+    Index estimates are compared with a full scan of every row.
+    """
+    best = Plan(access="full scan", estimated_rows=len(rows))
+    status_index = getattr(storage, 'status_index', None)
+    time_index = getattr(storage, 'time_index', None)
+    text_index = None  # built on first use, so only fetched when a condition needs it
+    tag_index = getattr(storage, 'tag_index', None)
+    priority_index = getattr(storage, 'priority_index', None)
+
+    for condition in query.conditions:
+        plan = None
+        if condition.field == 'id' and condition.op == '=':
+            ids = [condition.value] if condition.value in rows else []
+            plan = Plan("primary key", len(ids), condition, ids)
+        elif condition.field == 'completed' and status_index is not None:
+            wanted = condition.value if condition.op == '=' else not condition.value
+            ids = status_index.ids(wanted)
+            plan = Plan(f"status index ({'completed' if wanted else 'pending'})", len(ids),
+                        condition, ids, ordered=False)
+        elif condition.field == 'created' and time_index is not None and condition.op != '!=':
+            op, when = condition.op, condition.key
+            low = when if op in ('>', '>=', '=') else None
+            high = when if op in ('<', '<=', '=') else None
+            start, end = time_index.bounds(low, high, include_low=op != '>', include_high=op != '<')
+            plan = Plan("time index (created)", end - start, condition, time_index.ids(start, end))
+        elif condition.field == 'tag' and condition.op == '=' and tag_index is not None:
+            ids = tag_index.ids(condition.value)
+            plan = Plan(f"tag index ({condition.value})", len(ids), condition, ids, ordered=False)
+        elif condition.field == 'priority' and condition.op == '=' and priority_index is not None:
+            ids = priority_index.ids(condition.value)
+            plan = Plan(f"priority index ({condition.value})", len(ids), condition, ids, ordered=False)
+        elif condition.op == '~' and getattr(storage, 'text_index', None) is not None:
+            text_index = storage.text_index
+            plan = Plan(f"text index ({' '.join(condition.value)})",
+                        text_index.estimate(condition.value), condition, None, ordered=False)
+
+        if plan is not None and plan.estimated_rows < best.estimated_rows:
+            best = plan
+
+    if best.index_condition is not None and query.limit is not None and query.order_by is None:
+        # An unordered scan stops after `limit` matches; when the index is not
+        # selective that comes sooner than walking (and sorting) its candidates
+        scan_rows = query.limit * len(rows) // max(best.estimated_rows, 1)
+        if scan_rows < best.estimated_rows:
+            return Plan(access="full scan", estimated_rows=scan_rows)
+
+    if best.candidates is None and best.index_condition is not None:
+        # Posting lists are only intersected once the text index has won
+        best.candidates = text_index.ids(best.index_condition.value)
+    return best
+
+
+class _Descending:
+    """Wraps a sort value so that it orders in reverse, for values that cannot be negated"""
+
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other: '_Descending') -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: '_Descending') -> bool:
+        return self.value == other.value
+
+
+def _sort_key(name: str, descending: bool = False):
+    """
+    Build an ascending sort key for ordering by `name`
+    Only the value is reversed for descending order: missing values still go
+    last and ties stay in id order either way.
+    """
+    attr = FIELDS[name]
+    sign = -1 if descending else 1
+    if attr == 'id':
+        return lambda row: sign * row.id
+    if name == 'priority':
+        return lambda row: (sign * PRIORITY_RANK[row.priority], row.id)
+    if name == 'tag':
+        if descending:
+            return lambda row: (not row.tags, _Descending(sorted(row.tags)), row.id)
+        return lambda row: (not row.tags, sorted(row.tags), row.id)
+    if attr in ('title', 'description'):
+        if descending:
+            return lambda row: (_Descending(getattr(row, attr)), row.id)
+        return lambda row: (getattr(row, attr), row.id)
+
+    # Booleans and epoch microseconds, possibly missing
+    def key(row):
+        value = getattr(row, attr)
+        return (True, 0, row.id) if value is None else (False, sign * value, row.id)
+    return key
+
+
+def execute_query(query: Query, rows: Mapping[int, Any], storage=None) -> QueryResult:
+    """Plan and run a query over a mapping of id -> row"""
+    plan = plan_query(query, rows, storage)
+    result = QueryResult(rows=[], plan=plan, query=query)
+
+    if plan.candidates is None:
+        source = rows.values()
+    else:
+        ids = plan.candidates
+        if not plan.ordered and query.order_by is None:
+            ids = sorted(ids)  # keep insertion order when no ordering was requested
+        source = (rows[task_id] for task_id in ids if task_id in rows)
+
+    conditions = query.conditions
+    examined = 0
+
+    def filtered():
+        nonlocal examined
+        for row in source:
+            examined += 1
+            if all(matches(row, condition) for condition in conditions):
+                yield row
+
+    if query.order_by is None:
+        selected = []
+        if query.limit != 0:
+            for row in filtered():
+                selected.append(row)
+                if query.limit is not None and len(selected) >= query.limit:
+                    break  # rows already come in id order, so stop early
+    elif query.limit is not None:
+        selected = heapq.nsmallest(query.limit, filtered(), key=_sort_key(query.order_by, query.descending))
+    else:
+        selected = sorted(filtered(), key=_sort_key(query.order_by, query.descending))
+
+    result.rows = selected
+    result.rows_examined = examined
+    return result
@@ -0,0 +1,64 @@
+"""
+Rate limit module for the Todo Console Application
+Token buckets for capping how fast a caller may issue operations
+
+A bucket holds up to `capacity` tokens and refills at `rate` tokens per
+second; an operation costing n tokens is admitted only if n are available.
+Refilling is computed from the elapsed time when a token is asked for, so an
+idle bucket costs nothing and there is no timer thread.
+"""
+
+from __future__ import annotations
+
+import time
+
+# Annotation-only imports (see storage.py)
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable, Optional
+
+
+class TokenBucket:
+    """
+    A token bucket refilling at `rate` per second up to `capacity`
+    The capacity (default: one second's worth, at least one token) is the
+    burst a caller may spend at once after being idle. Buckets start full.
+    """
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated', 'clock')
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        if capacity is None:
+            capacity = max(float(rate), 1.0)
+        if capacity <= 0:
+            raise ValueError("Burst must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = self.capacity
+        self.clock = clock
+        self.updated = clock()
+
+    def __repr__(self) -> str:
+        return f"TokenBucket(rate={self.rate:g}, capacity={self.capacity:g}, tokens={self.tokens:.2f})"
+
+    def _refill(self) -> float:
+        now = self.clock()
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = now
+        return self.tokens
+
+    def try_take(self, cost: float = 1.0) -> bool:
+        """Take `cost` tokens if they are available, returning whether they were"""
+        if self._refill() >= cost:
+            self.tokens -= cost
+            return True
+        return False
+
+    def wait_time(self, cost: float = 1.0) -> float:
+        """Seconds until `cost` tokens will be available (0 if they are now)"""
+        missing = cost - self._refill()
+        return missing / self.rate if missing > 0 else 0.0
@@ -0,0 +1,284 @@
+"""
+Render module for the Todo Console Application
+Table output built in one buffer, and a pager that draws only the visible rows
+
+Printing a listing row by row costs one write (and usually one terminal
+flush) per row. Table.render builds the whole listing as a single string, so
+it reaches the terminal in one sys.stdout.write; Pager goes further for huge
+listings and only ever renders the window on screen, pulling rows from an
+iterator as the user scrolls.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import unicodedata
+from dataclasses import dataclass
+
+from .clock import MICROS
+
+# Annotation-only imports (see storage.py)
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, TextIO, Tuple
+
+ELLIPSIS = ".."
+DEFAULT_SIZE = (80, 24)
+# Lines a pager screen spends on things other than rows: header, rule, status, prompt
+PAGER_CHROME = 4
+CLEAR_SCREEN = "\x1b[H\x1b[2J"
+
+_char_widths: Dict[str, int] = {}
+_minutes: Dict[int, str] = {}
+MINUTE_CACHE_SIZE = 4096
+
+
+def terminal_size(stream: Optional[TextIO] = None) -> Tuple[int, int]:
+    """
+    Get (columns, lines) for a stream, honouring the COLUMNS and LINES variables
+    Falls back to 80x24 when the stream is not a terminal.
+    """
+    stream = stream if stream is not None else sys.stdout
+    try:
+        size = os.get_terminal_size(stream.fileno())
+        columns, lines = size.columns, size.lines
+    except (AttributeError, ValueError, OSError):
+        columns, lines = DEFAULT_SIZE
+    try:
+        columns = int(os.environ.get('COLUMNS', columns)) or columns
+        lines = int(os.environ.get('LINES', lines)) or lines
+    except ValueError:
+        pass
+    return columns, lines
+
+
+def char_width(char: str) -> int:
+    """Terminal columns taken by one character (wide CJK is 2, combining marks 0)"""
+    width = _char_widths.get(char)
+    if width is None:
+        if unicodedata.combining(char):
+            width = 0
+        elif unicodedata.east_asian_width(char) in ('W', 'F'):
+            width = 2
+        else:
+            width = 1
+        _char_widths[char] = width
+    return width
+
+
+def display_width(text: str) -> int:
+    """Terminal columns taken by a string"""
+    if text.isascii():
+        return len(text)
+    return sum(map(char_width, text))
+
+
+def fit(text: str, width: int) -> str:
+    """
+    Pad or truncate text to exactly `width` terminal columns
+    Truncated text ends in '..'; ASCII text takes a fast path using plain slicing.
+    """
+    if text.isascii():
+        if len(text) <= width:
+            return text.ljust(width)
+        if width <= len(ELLIPSIS):
+            return text[:width]
+        return text[:width - len(ELLIPSIS)] + ELLIPSIS
+
+    total = display_width(text)
+    if total <= width:
+        return text + " " * (width - total)
+    suffix = ELLIPSIS if width > len(ELLIPSIS) else ""
+    room = width - len(suffix)
+    used = end = 0
+    for end, char in enumerate(text):
+        step = char_width(char)
+        if used + step > room:
+            break
+        used += step
+    # A wide character that does not fit leaves a one-column gap, filled with a space
+    return text[:end] + suffix + " " * (room - used)
+
+
+def format_minute(micros: Optional[int]) -> str:
+    """
+    Format epoch microseconds as local 'YYYY-MM-DD HH:MM'
+    Listings share a handful of distinct minutes, so results are cached per minute.
+    """
+    if micros is None:
+        return ""
+    minute = micros // (60 * MICROS)
+    text = _minutes.get(minute)
+    if text is None:
+        if len(_minutes) >= MINUTE_CACHE_SIZE:
+            _minutes.clear()
+        text = _minutes[minute] = time.strftime('%Y-%m-%d %H:%M', time.localtime(minute * 60))
+    return text
+
+
+@dataclass
+class Column:
+    """
+    One table column
+    Columns with min_width set are flexible: they grow to share spare terminal
+    width and shrink down to min_width on narrow terminals. Others keep `width`.
+    """
+    header: str
+    value: Callable[[Any], str]
+    width: int
+    min_width: int = 0
+
+
+class Table:
+    """Renders rows as fixed-width text columns sized to the terminal"""
+
+    def __init__(self, columns: Sequence[Column], gap: str = " "):
+        self.columns = list(columns)
+        self.gap = gap
+
+    def widths(self, total: Optional[int] = None) -> List[int]:
+        """
+        Work out each column's width for a terminal `total` columns wide
+        Without a total, every column gets its preferred width.
+        """
+        widths = [column.width for column in self.columns]
+        flexible = [i for i, column in enumerate(self.columns) if column.min_width]
+        if total is None or not flexible:
+            return widths
+
+        spare = total - len(self.gap) * (len(widths) - 1) - sum(widths)
+        preferred = sum(widths[i] for i in flexible)
+        for i in flexible:
+            share = spare * widths[i] // preferred
+            widths[i] = max(self.columns[i].min_width, widths[i] + share)
+        return widths
+
+    def header(self, widths: Sequence[int]) -> List[str]:
+        """Header line and rule for the given widths"""
+        line = self.gap.join(fit(column.header, width) for column, width in zip(self.columns, widths))
+        return [line.rstrip(), "-" * len(line)]
+
+    def lines(self, rows: Iterable[Any], widths: Sequence[int]) -> List[str]:
+        """One line of text per row"""
+        cells = [(column.value, width) for column, width in zip(self.columns, widths)]
+        join = self.gap.join
+        return [join([fit(value(row), width) for value, width in cells]).rstrip() for row in rows]
+
+    def render(self, rows: Iterable[Any], width: Optional[int] = None, footer: Optional[str] = None) -> str:
+        """Render the header, rows and optional footer as one string"""
+        widths = self.widths(width)
+        lines = self.header(widths)
+        lines.extend(self.lines(rows, widths))
+        if footer is not None:
+            lines.append(footer)
+        return "\n".join(lines)
+
+    def write(self, rows: Iterable[Any], out: Optional[TextIO] = None, width: Optional[int] = None,
+              footer: Optional[str] = None):
+        """Render the table and send it to `out` in a single write"""
+        out = out if out is not None else sys.stdout
+        out.write(self.render(rows, width, footer) + "\n")
+
+
+class Pager:
+    """
+    Interactive pager showing one screen of table rows at a time
+    Rows may be a sequence or any iterator; an iterator is consumed only as far
+    as the user scrolls, so paging a million-row source renders one screen's
+    worth at a time. Column widths follow the terminal size on every redraw.
+
+    Commands: Enter/n next page, p previous page, g first page, G last page,
+    a row number to jump to that row, q to quit.
+    """
+
+    def __init__(self, table: Table, rows: Iterable[Any], out: Optional[TextIO] = None,
+                 read: Callable[[str], str] = input, size: Optional[Tuple[int, int]] = None):
+        self.table = table
+        self.out = out if out is not None else sys.stdout
+        self.read = read
+        self.size = size
+        self.top = 0
+        if hasattr(rows, '__len__') and hasattr(rows, '__getitem__'):
+            self._rows = rows
+            self._source = None
+        else:
+            self._rows = []
+            self._source = iter(rows)
+
+    @property
+    def page_size(self) -> int:
+        """Rows that fit on one screen"""
+        return max(1, self._size()[1] - PAGER_CHROME)
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether every row is known (always true for sequences)"""
+        return self._source is None
+
+    def _size(self) -> Tuple[int, int]:
+        return self.size if self.size is not None else terminal_size(self.out)
+
+    def _load(self, count: int):
+        """Pull rows from the source until `count` are buffered or it runs out"""
+        source = self._source
+        rows = self._rows
+        if source is None or len(rows) >= count:
+            return
+        for row in source:
+            rows.append(row)
+            if len(rows) >= count:
+                return
+        self._source = None
+
+    def window(self) -> str:
+        """Render the visible rows and a status line"""
+        columns, lines = self._size()
+        page = max(1, lines - PAGER_CHROME)
+        self._load(self.top + page + 1)
+        visible = self._rows[self.top:self.top + page]
+        widths = self.table.widths(columns)
+        output = self.table.header(widths)
+        output.extend(self.table.lines(visible, widths))
+        known = len(self._rows)
+        total = f"{known}" if self.exhausted else f"{known}+"
+        first = self.top + 1 if visible else 0
+        output.append(f"-- rows {first}-{self.top + len(visible)} of {total} --")
+        return "\n".join(output)
+
+    def scroll(self, command: str) -> bool:
+        """Apply one pager command; returns False when the user quits"""
+        command = command.strip()
+        page = self.page_size
+        if command in ('q', 'Q'):
+            return False
+        if command in ('', 'n', ' '):
+            self._load(self.top + page + 1)
+            if self.top + page < len(self._rows):
+                self.top += page
+        elif command in ('p', 'b'):
+            self.top = max(0, self.top - page)
+        elif command == 'g':
+            self.top = 0
+        elif command == 'G':
+            self._load(sys.maxsize)
+            self.top = max(0, len(self._rows) - page)
+        elif command.isdigit():
+            row = max(1, int(command))
+            self._load(row)
+            self.top = min(row, max(1, len(self._rows))) - 1
+        return True
+
+    def run(self):
+        """Show pages until the user quits or input ends"""
+        clear = CLEAR_SCREEN if self.out.isatty() else ""
+        while True:
+            self.out.write(f"{clear}{self.window()}\n")
+            self.out.flush()
+            try:
+                command = self.read("[Enter/n]ext [p]rev [g]first [G]last <row> [q]uit: ")
+            except (EOFError, KeyboardInterrupt):
+                break
+            if not self.scroll(command):
+                break
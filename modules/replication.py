@@ -0,0 +1,329 @@
+"""
+Replication module for the Todo Console Application
+Ships the leader's change log to read-only followers over TCP or Unix sockets
+
+Addresses look like tcp://127.0.0.1:7000 or unix:///tmp/todo.sock. The wire
+format is one JSON object per line:
+
+    follower -> leader   {"type": "hello", "from_seq": N}
+    leader -> follower   {"type": "snapshot_begin", "seq": S}
+                         {"type": "snapshot_records", "records": [...]}
+                         {"type": "snapshot_end", "seq": S}
+                         {"type": "event", "seq": N, "kind": ..., "id": ..., "timestamp": ..., "data": ...}
+                         {"type": "heartbeat", "seq": N, "time": T}
+
+Events carry the full record after each change, so applying one is an
+idempotent upsert. That lets a follower load a snapshot taken without stopping
+writers and then replay the log tail from the snapshot's sequence number.
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from itertools import islice
+from typing import List, Optional, Sequence, Tuple
+
+from .query import QueryResult, execute_query, parse_query
+from .storage import InMemoryStorage, Task
+
+DEFAULT_LOG_CAPACITY = 100_000
+SNAPSHOT_CHUNK = 1000
+HEARTBEAT_INTERVAL = 0.5
+
+
+def parse_address(address: str) -> Tuple[int, object]:
+    """Convert tcp://host:port or unix:///path into (socket family, socket address)"""
+    if address.startswith('unix://'):
+        return socket.AF_UNIX, address[len('unix://'):]
+    if address.startswith('tcp://'):
+        host, sep, port = address[len('tcp://'):].rpartition(':')
+        if sep and port.isdigit():
+            return socket.AF_INET, (host or '127.0.0.1', int(port))
+    raise ValueError(f"Invalid address: {address} (use tcp://host:port or unix:///path)")
+
+
+def _encode(message: dict) -> bytes:
+    """Encode one protocol message as a JSON line"""
+    return json.dumps(message, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+@dataclass
+class ReplicationLag:
+    """How far a follower is behind its leader"""
+    applied_seq: int
+    leader_seq: int
+    seconds: float
+    connected: bool
+
+    @property
+    def events(self) -> int:
+        """Number of leader events not yet applied"""
+        return max(0, self.leader_seq - self.applied_seq)
+
+
+class ReplicationLeader:
+    """
+    Serves a store's change log to followers
+    The log keeps the most recent `log_capacity` events; a follower that asks
+    for anything older is sent a fresh snapshot instead.
+    """
+
+    def __init__(self, storage: InMemoryStorage, address: str = 'tcp://127.0.0.1:0',
+                 log_capacity: int = DEFAULT_LOG_CAPACITY):
+        self.storage = storage
+        self._family, bind_address = parse_address(address)
+        self._log: deque = deque(maxlen=log_capacity)  # (seq, encoded line)
+        self._log_condition = threading.Condition()
+        self._last_seq = storage.events.seq
+        self._subscription = storage.events.subscribe(max_queue=65536)
+        self._stopping = False
+        self._connections: List[socket.socket] = []
+
+        if self._family == socket.AF_UNIX and os.path.exists(bind_address):
+            os.unlink(bind_address)
+        self._server = socket.socket(self._family, socket.SOCK_STREAM)
+        if self._family == socket.AF_INET:
+            self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind(bind_address)
+        self._server.listen()
+        bound = self._server.getsockname()
+        self.address = f"unix://{bound}" if self._family == socket.AF_UNIX else f"tcp://{bound[0]}:{bound[1]}"
+
+        self._threads = [
+            threading.Thread(target=self._pump, name="replication-pump", daemon=True),
+            threading.Thread(target=self._accept, name="replication-accept", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def followers(self) -> int:
+        """Number of connected followers"""
+        return len(self._connections)
+
+    @property
+    def seq(self) -> int:
+        """Sequence number of the newest logged event"""
+        return self._last_seq
+
+    def stop(self):
+        """Stop serving and disconnect every follower"""
+        self._stopping = True
+        self._subscription.close()
+        with self._log_condition:
+            self._log_condition.notify_all()
+        try:
+            self._server.close()
+        except OSError:
+            pass
+        for connection in list(self._connections):
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            connection.close()
+        if self._family == socket.AF_UNIX:
+            try:
+                os.unlink(self.address[len('unix://'):])
+            except OSError:
+                pass
+
+    def _pump(self):
+        """Move events from the store subscription into the shared log"""
+        subscription = self._subscription
+        while not self._stopping:
+            batch = subscription.get_batch(max_items=1024)
+            if not batch:
+                continue
+            lines = [(event.seq, _encode(dict(event.to_dict(), type='event'))) for event in batch]
+            with self._log_condition:
+                self._log.extend(lines)
+                self._last_seq = lines[-1][0]
+                self._log_condition.notify_all()
+
+    def _accept(self):
+        """Accept follower connections"""
+        while not self._stopping:
+            try:
+                connection, _ = self._server.accept()
+            except OSError:
+                return
+            self._connections.append(connection)
+            threading.Thread(target=self._serve, args=(connection,),
+                             name="replication-follower", daemon=True).start()
+
+    def _serve(self, connection: socket.socket):
+        """Stream snapshot and log entries to one follower"""
+        try:
+            reader = connection.makefile('rb')
+            hello = json.loads(reader.readline() or b'{}')
+            cursor = int(hello.get('from_seq', 0)) + 1
+            while not self._stopping:
+                with self._log_condition:
+                    if self._last_seq < cursor:
+                        self._log_condition.wait(HEARTBEAT_INTERVAL)
+                    lines, cursor, needs_snapshot = self._read_log(cursor)
+                if needs_snapshot:
+                    cursor = self._send_snapshot(connection) + 1
+                    continue
+                if lines:
+                    connection.sendall(b''.join(lines))
+                else:
+                    connection.sendall(_encode({'type': 'heartbeat', 'seq': self._last_seq, 'time': time.time()}))
+        except (OSError, ValueError):
+            pass
+        finally:
+            if connection in self._connections:
+                self._connections.remove(connection)
+            connection.close()
+
+    def _read_log(self, cursor: int) -> Tuple[List[bytes], int, bool]:
+        """Get logged lines from cursor onward; called with the log condition held"""
+        log = self._log
+        if cursor > self._last_seq + 1:
+            return [], cursor, True  # the follower has history this leader never produced
+        if not log or cursor > self._last_seq:
+            # Nothing new; a follower that predates the log still needs a snapshot
+            return [], cursor, cursor <= self._last_seq
+        first_seq = log[0][0]
+        if cursor < first_seq:
+            return [], cursor, True
+        lines = [line for _, line in islice(log, cursor - first_seq, None)]
+        return lines, self._last_seq + 1, False
+
+    def _send_snapshot(self, connection: socket.socket) -> int:
+        """Send the full store state and return the sequence number it covers"""
+        with self._log_condition:
+            seq = self._last_seq
+        # Records copied after reading seq may already include later changes;
+        # replaying those events afterwards is harmless because events are upserts.
+        tasks = list(self.storage._tasks.values())
+        connection.sendall(_encode({'type': 'snapshot_begin', 'seq': seq}))
+        for start in range(0, len(tasks), SNAPSHOT_CHUNK):
+            records = [task.to_dict() for task in tasks[start:start + SNAPSHOT_CHUNK]]
+            connection.sendall(_encode({'type': 'snapshot_records', 'records': records}))
+        connection.sendall(_encode({'type': 'snapshot_end', 'seq': seq}))
+        return seq
+
+
+class ReplicationFollower:
+    """
+    A read-only replica that applies a leader's change log
+    Reconnects automatically and resumes from the last applied sequence number.
+    """
+
+    def __init__(self, address: str, reconnect_delay: float = 0.2):
+        self._family, self._address = parse_address(address)
+        self._reconnect_delay = reconnect_delay
+        self.storage = InMemoryStorage()
+        self.applied_seq = 0
+        self.leader_seq = 0
+        self._behind_since: Optional[float] = None
+        self._connected = False
+        self._socket: Optional[socket.socket] = None
+        self._stopping = False
+        self._caught_up = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="replication-follower", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Disconnect from the leader"""
+        self._stopping = True
+        if self._socket is not None:
+            try:
+                self._socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self._thread.join(2.0)
+
+    def lag(self) -> ReplicationLag:
+        """Report how far behind the leader this follower is"""
+        behind = self._behind_since
+        seconds = time.time() - behind if behind is not None and self.applied_seq < self.leader_seq else 0.0
+        return ReplicationLag(self.applied_seq, self.leader_seq, seconds, self._connected)
+
+    def wait_for(self, seq: int, timeout: Optional[float] = None) -> bool:
+        """Block until the follower has applied at least seq"""
+        with self._caught_up:
+            return self._caught_up.wait_for(lambda: self.applied_seq >= seq, timeout)
+
+    def get_task(self, task_id: int) -> Optional[Task]:
+        """Get a replicated task by ID"""
+        return self.storage.get_task(task_id)
+
+    def get_all_tasks(self) -> List[Task]:
+        """Get every replicated task"""
+        return self.storage.get_all_tasks()
+
+    def query_tasks(self, tokens: Sequence[str]) -> QueryResult:
+        """Run a list query against the replica"""
+        storage = self.storage
+        return execute_query(parse_query(tokens), storage._tasks, storage)
+
+    def _run(self):
+        """Connect, stream and reconnect until stopped"""
+        while not self._stopping:
+            try:
+                with socket.socket(self._family, socket.SOCK_STREAM) as sock:
+                    sock.connect(self._address)
+                    self._socket = sock
+                    self._connected = True
+                    sock.sendall(_encode({'type': 'hello', 'from_seq': self.applied_seq}))
+                    self._stream(sock.makefile('rb'))
+            except (OSError, ValueError):
+                pass
+            finally:
+                self._connected = False
+                self._socket = None
+            if not self._stopping:
+                time.sleep(self._reconnect_delay)
+
+    def _stream(self, reader):
+        """Apply messages from the leader until the connection closes"""
+        staging: Optional[InMemoryStorage] = None
+        for line in reader:
+            message = json.loads(line)
+            kind = message['type']
+            if kind == 'event':
+                self._apply_event(message)
+            elif kind == 'heartbeat':
+                self._note_leader_seq(message['seq'])
+            elif kind == 'snapshot_begin':
+                staging = InMemoryStorage()
+            elif kind == 'snapshot_records' and staging is not None:
+                for record in message['records']:
+                    staging.upsert_task(Task.from_dict(record))
+            elif kind == 'snapshot_end' and staging is not None:
+                self.storage = staging  # readers see either the old or the new state, never a mix
+                staging = None
+                self._note_leader_seq(message['seq'])
+                self._advance(message['seq'])
+
+    def _apply_event(self, message: dict):
+        """Apply one replicated change"""
+        seq = message['seq']
+        if seq <= self.applied_seq:
+            return
+        self._note_leader_seq(seq)
+        if message['kind'] == 'deleted':
+            self.storage.delete_task(message['id'])
+        else:
+            self.storage.upsert_task(Task.from_dict(message['data']))
+        self._advance(seq)
+
+    def _note_leader_seq(self, seq: int):
+        """Track the newest sequence number the leader has reported"""
+        if seq > self.leader_seq:
+            if self.applied_seq >= self.leader_seq:
+                self._behind_since = time.time()
+            self.leader_seq = seq
+
+    def _advance(self, seq: int):
+        """Record progress and wake anyone waiting for it"""
+        with self._caught_up:
+            self.applied_seq = seq
+            self._caught_up.notify_all()
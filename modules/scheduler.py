@@ -0,0 +1,137 @@
+"""
+Scheduler module for the Todo Console Application
+Fires due-date reminders from a background thread using a lazy-deletion heap
+"""
+
+from __future__ import annotations
+
+import heapq
+import threading
+import time
+
+# Annotation-only imports (see storage.py)
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from datetime import datetime
+    from typing import Callable, Dict, List, Optional, Tuple
+
+    ReminderCallback = Callable[[int, float], None]
+
+
+class ReminderScheduler:
+    """
+    Heap-based timer queue keyed by task id
+    schedule() is O(log n); cancel() is O(1) amortized and leaves a stale heap entry
+    that is skipped when it reaches the top, or dropped when stale entries come to
+    outnumber live ones and the heap is rebuilt. The worker thread sleeps until the earliest
+    deadline, so a large number of pending timers costs no CPU while idle.
+    """
+
+    def __init__(self, callback: ReminderCallback, clock: Callable[[], float] = time.time):
+        self._callback = callback
+        self._clock = clock
+        self._heap: List[Tuple[float, int]] = []
+        self._deadlines: Dict[int, float] = {}
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self.fired = 0
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def schedule(self, task_id: int, when: datetime):
+        """Add or move the reminder for a task"""
+        deadline = when.timestamp()
+        with self._condition:
+            if self._deadlines.get(task_id) == deadline:
+                return
+            self._deadlines[task_id] = deadline
+            heapq.heappush(self._heap, (deadline, task_id))
+            self._compact_if_needed()
+            if self._heap[0] == (deadline, task_id):
+                self._condition.notify()  # the worker may be sleeping past the new deadline
+
+    def cancel(self, task_id: int) -> bool:
+        """Cancel the reminder for a task, returning whether one was pending"""
+        with self._condition:
+            if self._deadlines.pop(task_id, None) is None:
+                return False
+            self._compact_if_needed()
+            return True
+
+    def next_deadline(self) -> Optional[float]:
+        """Get the earliest pending deadline as an epoch timestamp"""
+        with self._condition:
+            self._drop_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def run_pending(self, now: Optional[float] = None) -> int:
+        """Fire every reminder due at or before now, returning how many fired"""
+        due = self._pop_due(self._clock() if now is None else now)
+        for deadline, task_id in due:
+            self._callback(task_id, deadline)
+        self.fired += len(due)
+        return len(due)
+
+    def start(self):
+        """Start the background worker thread"""
+        with self._condition:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="reminders", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 1.0):
+        """Stop the background worker thread"""
+        with self._condition:
+            thread = self._thread
+            self._stopping = True
+            self._condition.notify()
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        """Worker loop: sleep until the next deadline, then fire what is due"""
+        while True:
+            with self._condition:
+                while not self._stopping:
+                    self._drop_stale()
+                    if not self._heap:
+                        self._condition.wait()
+                        continue
+                    delay = self._heap[0][0] - self._clock()
+                    if delay <= 0:
+                        break
+                    self._condition.wait(delay)
+                if self._stopping:
+                    return
+            self.run_pending()
+
+    def _pop_due(self, now: float) -> List[Tuple[float, int]]:
+        """Remove and return live entries due at or before now"""
+        due = []
+        with self._condition:
+            heap = self._heap
+            deadlines = self._deadlines
+            while heap and heap[0][0] <= now:
+                deadline, task_id = heapq.heappop(heap)
+                if deadlines.get(task_id) == deadline:
+                    del deadlines[task_id]
+                    due.append((deadline, task_id))
+        return due
+
+    def _drop_stale(self):
+        """Pop cancelled or moved entries off the top of the heap"""
+        heap = self._heap
+        deadlines = self._deadlines
+        while heap and deadlines.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def _compact_if_needed(self):
+        """Rebuild the heap once stale entries outnumber live ones"""
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._heap = [(deadline, task_id) for task_id, deadline in self._deadlines.items()]
+            heapq.heapify(self._heap)
@@ -0,0 +1,529 @@
+"""
+Shared snapshot module for the Todo Console Application
+Publishes read-only snapshots of a task store in shared memory for other processes
+
+A SnapshotPublisher writes the whole store into a new shared memory segment
+in a fixed binary layout, then points a small control segment at it; it
+repeats this whenever the store's generation has moved on (at most once per
+`interval`, from a background thread, or on demand with publish()). Readers
+in other processes open the control segment by name (SnapshotReader), map
+the current data segment and read tasks straight out of it: nothing is
+unpickled, and fields are decoded only when a record is read.
+
+Each published segment is immutable. Swapping generations is atomic for
+readers: the control segment is a seqlock (an odd sequence number means a
+swap is in progress), so a reader sees either the old segment name or the
+new one, never a torn mix, and a reader still mapped to the old segment keeps
+a consistent view of it until it calls refresh(). The publisher unlinks the
+old segment right after the swap; a reader that loses that race retries
+with the new name.
+
+Data segment layout (native byte order, as segments never leave the machine;
+offsets are from the segment start):
+
+    header    HEADER
+    ids       count x int64, ascending task ids
+    records   count x RECORD, in id order
+    tokens    token_count x TOKEN, sorted by token bytes
+    postings  uint32 record numbers, ascending within each token
+    heap      UTF-8 titles, descriptions, tags (joined by \\x1f) and tokens
+
+Records hold no Python objects, only numbers and (offset, length) pairs into
+the heap, so get_task is a binary search over the id column, and search()
+intersects posting lists found by binary search over the token table.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import struct
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left
+
+from .clock import to_datetime
+from .indexes import WORD_RE, tokenize
+from .storage import PRIORITIES, Task
+
+# Annotation-only imports (see storage.py)
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from datetime import datetime
+    from multiprocessing.shared_memory import SharedMemory
+    from typing import Dict, Iterator, List, Optional, Tuple
+    from .storage import InMemoryStorage
+
+LAYOUT_VERSION = 1
+CONTROL_MAGIC = b'TODOCTL1'
+DATA_MAGIC = b'TODOSNP1'
+# magic, sequence (odd while swapping), publish number, publisher pid, data segment name
+CONTROL = struct.Struct('=8sQQQ64s')
+# magic, layout version, record size, publish number, store generation, published at (epoch us),
+# count, ids offset, records offset, tokens offset, token count, postings offset, heap offset, heap size
+HEADER = struct.Struct('=8sIIQQqQQQQQQQQ')
+# created, updated and due (epoch us), version, parent id (0: none), then (offset, length)
+# of title, description and tags in the heap, completed flag and priority number
+RECORD = struct.Struct('=qqqqqIIIIIIBB6x')
+# token (offset, length) in the heap, first posting, posting count
+TOKEN = struct.Struct('=IIII')
+NO_DUE = -(1 << 63)
+TAG_SEPARATOR = '\x1f'
+PRIORITY_CODES = {name: code for code, name in enumerate(PRIORITIES)}
+# WORD_RE restricted to ASCII text, where it matches the same words
+ASCII_WORD_RE = re.compile(rb"\w+")
+# Seconds a reader waits for a swap in progress before giving up
+ATTACH_TIMEOUT = 5.0
+DEFAULT_INTERVAL = 1.0
+# Largest share of wall time the background thread spends building snapshots
+BUILD_SHARE = 0.25
+# SharedMemory(track=False) exists from Python 3.13
+UNTRACKED_ATTACH = sys.version_info >= (3, 13)
+
+
+def _create(name: str, size: int) -> SharedMemory:
+    from multiprocessing.shared_memory import SharedMemory
+    return SharedMemory(name, create=True, size=max(size, 1))
+
+
+def _attach(name: str) -> SharedMemory:
+    """Map an existing segment, without tracking it where Python allows (3.13+; see _untrack)"""
+    from multiprocessing.shared_memory import SharedMemory
+    if UNTRACKED_ATTACH:
+        return SharedMemory(name, track=False)
+    return SharedMemory(name)
+
+
+def _untrack(segment: SharedMemory, publisher_pid: int):
+    """
+    Withdraw an attached segment from this process's resource tracker
+    Before Python 3.13 attaching registers the segment, and the tracker of a
+    reader process would unlink it when that process exits. A reader in the
+    publisher's own process shares its registration, which the publisher
+    withdraws itself when it unlinks the segment.
+    """
+    if not UNTRACKED_ATTACH and publisher_pid != os.getpid():
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(segment._name, 'shared_memory')
+
+
+def encode_snapshot(tasks: List[Task], number: int, generation: int, published_us: int) -> Tuple[bytes, ...]:
+    """
+    Lay out tasks (in id order) as data segment parts whose concatenation is the segment
+    `published_us` is the publish time recorded in the header, from the store's clock.
+    Fails with ValueError if the heap would outgrow 32-bit offsets.
+    """
+    heap: List[bytes] = []
+    heap_size = 0
+    records: List[bytes] = []
+    postings: Dict[bytes, List[int]] = {}
+    pack, add_text, add_record = RECORD.pack, heap.append, records.append
+    find_ascii, find_text = ASCII_WORD_RE.findall, WORD_RE.findall
+    for position, task in enumerate(tasks):
+        title, description, tags = task.title, task.description, task.tags
+        text = data = title.encode('utf-8')
+        add_text(data)
+        description_offset = heap_size + len(data)
+        tags_offset = description_offset
+        if description:
+            data = description.encode('utf-8')
+            add_text(data)
+            tags_offset += len(data)
+            text = b"%s %s" % (text, data)
+        end = tags_offset
+        if tags:
+            data = TAG_SEPARATOR.join(tags).encode('utf-8')
+            add_text(data)
+            end += len(data)
+        due = task.due_us
+        add_record(pack(task.created_us, task.updated_us, NO_DUE if due is None else due, task.version,
+                        task.parent_id or 0, heap_size, description_offset - heap_size, description_offset,
+                        tags_offset - description_offset, tags_offset, end - tags_offset,
+                        task.completed, PRIORITY_CODES.get(task.priority, 1)))
+        heap_size = end
+        # ASCII text tokenizes the same as bytes, without decoding anything back to str
+        if text.isascii():
+            words = find_ascii(text.lower())
+        else:
+            words = [word.encode('utf-8') for word in find_text(text.decode('utf-8').lower())]
+        for token in set(words):
+            ids = postings.get(token)
+            if ids is None:
+                postings[token] = [position]
+            else:
+                ids.append(position)
+
+    tokens: List[bytes] = []
+    posting_list = array('I')
+    for token in sorted(postings):
+        positions = postings[token]
+        tokens.append(TOKEN.pack(heap_size, len(token), len(posting_list), len(positions)))
+        posting_list.extend(positions)
+        add_text(token)
+        heap_size += len(token)
+    if heap_size >= 1 << 32:
+        raise ValueError("Snapshot text exceeds 4 GB")
+
+    count = len(tasks)
+    ids_offset = HEADER.size
+    records_offset = ids_offset + 8 * count
+    tokens_offset = records_offset + RECORD.size * count
+    postings_offset = tokens_offset + TOKEN.size * len(tokens)
+    heap_offset = postings_offset + posting_list.itemsize * len(posting_list)
+    header = HEADER.pack(DATA_MAGIC, LAYOUT_VERSION, RECORD.size, number, generation, published_us,
+                         count, ids_offset, records_offset, tokens_offset, len(tokens), postings_offset,
+                         heap_offset, heap_size)
+    ids = array('q', [task.id for task in tasks])
+    return (header, ids.tobytes(), b''.join(records), b''.join(tokens), posting_list.tobytes(), b''.join(heap))
+
+
+class SnapshotPublisher:
+    """
+    Publishes snapshots of `storage` under the shared memory name `name`
+    Data segments are named `<name>_<publish number>`. start() republishes
+    from a background thread whenever the store has changed, checking every
+    `interval` seconds, or less often when builds are slow (large stores) so
+    that building takes at most BUILD_SHARE of the time; stop() unlinks
+    every segment.
+    """
+
+    def __init__(self, storage: InMemoryStorage, name: Optional[str] = None, interval: float = DEFAULT_INTERVAL):
+        if interval <= 0:
+            raise ValueError("Interval must be positive")
+        self.storage = storage
+        self.name = name or f"todo_{os.getpid()}"
+        if len(self.name) > 48:
+            raise ValueError("Shared memory name must be at most 48 characters")
+        self.interval = interval
+        self.number = 0
+        self.generation: Optional[int] = None
+        self.size = 0
+        self.build_seconds = 0.0
+        self._lock = threading.Lock()
+        self._data: Optional[SharedMemory] = None
+        self._control = _create(self.name, CONTROL.size)
+        CONTROL.pack_into(self._control.buf, 0, CONTROL_MAGIC, 0, 0, os.getpid(), b'')
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def publish(self) -> int:
+        """Write a snapshot of the store as it is now and make it current; returns its number"""
+        with self._lock:
+            start = time.perf_counter()
+            generation = self.storage.generation
+            # Copying the task list is one C-level step; each record is then read as it is when encoded
+            tasks = self.storage.get_all_tasks()
+            tasks.sort(key=lambda task: task.id)
+            number = self.number + 1
+            parts = encode_snapshot(tasks, number, generation, self.storage.clock.now_us())
+            size = sum(map(len, parts))
+            segment = _create(f"{self.name}_{number}", size)
+            offset = 0
+            for part in parts:
+                segment.buf[offset:offset + len(part)] = part
+                offset += len(part)
+            self._swap(segment, number)
+            self.number, self.generation, self.size = number, generation, size
+            self.build_seconds = time.perf_counter() - start
+            return number
+
+    def _swap(self, segment: SharedMemory, number: int):
+        """Point the control segment at a new data segment and retire the old one"""
+        buf = self._control.buf
+        _, seq, _, pid, _ = CONTROL.unpack_from(buf)
+        struct.pack_into('=Q', buf, 8, seq + 1)  # odd: readers wait
+        CONTROL.pack_into(buf, 0, CONTROL_MAGIC, seq + 1, number, pid, segment.name.lstrip('/').encode('ascii'))
+        struct.pack_into('=Q', buf, 8, seq + 2)
+        old, self._data = self._data, segment
+        if old is not None:
+            old.close()
+            old.unlink()
+
+    def start(self):
+        """Publish now, then again whenever the store changes, from a background thread"""
+        if self._thread is not None:
+            return
+        self.publish()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="snapshot-publisher", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stopping.wait(max(self.interval, self.build_seconds / BUILD_SHARE)):
+            if self.storage.generation != self.generation:
+                self.publish()
+
+    def stop(self):
+        """Stop republishing and unlink the control and data segments"""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            for segment in (self._data, self._control):
+                if segment is not None:
+                    segment.close()
+                    segment.unlink()
+            self._data = None
+            self._control = None
+
+    def describe(self) -> str:
+        """Human-readable publishing status"""
+        from .spill import format_size
+        if self.generation is None:
+            return f"Shared snapshot '{self.name}': nothing published yet"
+        return (f"Shared snapshot '{self.name}': #{self.number} at store generation {self.generation}, "
+                f"{format_size(self.size)}, built in {self.build_seconds * 1000:.1f} ms")
+
+
+class SnapshotTask:
+    """
+    A task read from a snapshot; fields are decoded from shared memory as they are read
+    Valid while its snapshot is mapped (until the reader refreshes or closes).
+    """
+
+    __slots__ = ('_snapshot', 'id', '_fields')
+
+    def __init__(self, snapshot: Snapshot, task_id: int, fields: tuple):
+        self._snapshot = snapshot
+        self.id = task_id
+        self._fields = fields
+
+    def __repr__(self) -> str:
+        return f"SnapshotTask({self.id}, {self.title!r})"
+
+    def _text(self, slot: int) -> str:
+        offset = self._fields[slot]
+        return self._snapshot._heap[offset:offset + self._fields[slot + 1]].tobytes().decode('utf-8')
+
+    @property
+    def created_us(self) -> int:
+        return self._fields[0]
+
+    @property
+    def updated_us(self) -> int:
+        return self._fields[1]
+
+    @property
+    def due_us(self) -> Optional[int]:
+        due = self._fields[2]
+        return None if due == NO_DUE else due
+
+    @property
+    def version(self) -> int:
+        return self._fields[3]
+
+    @property
+    def parent_id(self) -> Optional[int]:
+        return self._fields[4] or None
+
+    @property
+    def title(self) -> str:
+        return self._text(5)
+
+    @property
+    def description(self) -> str:
+        return self._text(7)
+
+    @property
+    def tags(self) -> List[str]:
+        tags = self._text(9)
+        return tags.split(TAG_SEPARATOR) if tags else []
+
+    @property
+    def completed(self) -> bool:
+        return bool(self._fields[11])
+
+    @property
+    def priority(self) -> str:
+        return PRIORITIES[self._fields[12]]
+
+    @property
+    def created_at(self) -> datetime:
+        return to_datetime(self.created_us)
+
+    @property
+    def updated_at(self) -> datetime:
+        return to_datetime(self.updated_us)
+
+    @property
+    def due_at(self) -> Optional[datetime]:
+        due = self.due_us
+        return None if due is None else to_datetime(due)
+
+    def to_task(self) -> Task:
+        """Copy the record out into a Task"""
+        return Task(id=self.id, title=self.title, description=self.description, completed=self.completed,
+                    created_at=self.created_us, updated_at=self.updated_us, tags=self.tags,
+                    priority=self.priority, due_at=self.due_us, version=self.version, parent_id=self.parent_id)
+
+
+class Snapshot:
+    """One mapped, immutable data segment"""
+
+    def __init__(self, segment: SharedMemory):
+        self._segment = segment
+        buf = segment.buf
+        (magic, version, record_size, self.number, self.generation, self.published_us, count, ids_offset,
+         self._records_offset, self._tokens_offset, self._token_count, postings_offset, heap_offset,
+         heap_size) = HEADER.unpack_from(buf)
+        if magic != DATA_MAGIC or version != LAYOUT_VERSION or record_size != RECORD.size:
+            segment.close()
+            raise ValueError(f"Shared memory segment {segment.name} is not a task snapshot this version can read")
+        self._buf = buf
+        self._ids = buf[ids_offset:ids_offset + 8 * count].cast('q')
+        self._postings = buf[postings_offset:heap_offset].cast('I')
+        self._heap = buf[heap_offset:heap_offset + heap_size]
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _record(self, position: int) -> SnapshotTask:
+        return SnapshotTask(self, self._ids[position],
+                            RECORD.unpack_from(self._buf, self._records_offset + RECORD.size * position))
+
+    def get_task(self, task_id: int) -> Optional[SnapshotTask]:
+        """The task with this id, found by binary search over the id column"""
+        ids = self._ids
+        position = bisect_left(ids, task_id)
+        if position < len(ids) and ids[position] == task_id:
+            return self._record(position)
+        return None
+
+    def __iter__(self) -> Iterator[SnapshotTask]:
+        return map(self._record, range(len(self._ids)))
+
+    def _token_postings(self, token: bytes) -> Optional[memoryview]:
+        """The posting list of a token, found by binary search over the token table"""
+        buf, heap, offset = self._buf, self._heap, self._tokens_offset
+        low, high = 0, self._token_count
+        while low < high:
+            middle = (low + high) // 2
+            start, length, first, count = TOKEN.unpack_from(buf, offset + TOKEN.size * middle)
+            key = heap[start:start + length].tobytes()
+            if key < token:
+                low = middle + 1
+            elif key > token:
+                high = middle
+            else:
+                return self._postings[first:first + count]
+        return None
+
+    def search(self, text: str, limit: Optional[int] = None) -> List[SnapshotTask]:
+        """Tasks whose title or description contains every word of `text`, in id order"""
+        lists = []
+        for token in set(tokenize(text)):
+            postings = self._token_postings(token.encode('utf-8'))
+            if postings is None:
+                return []
+            lists.append(postings)
+        if not lists:
+            return []
+        lists.sort(key=len)
+        shortest, others = lists[0], lists[1:]
+        matches = []
+        for position in shortest:
+            for postings in others:
+                found = bisect_left(postings, position)
+                if found == len(postings) or postings[found] != position:
+                    break
+            else:
+                matches.append(self._record(position))
+                if limit is not None and len(matches) >= limit:
+                    break
+        return matches
+
+    def close(self):
+        """Unmap the segment; records read from it become unusable"""
+        for view in (self._ids, self._postings, self._heap):
+            view.release()
+        self._buf = None
+        self._segment.close()
+
+
+class SnapshotReader:
+    """
+    Reads the snapshots a SnapshotPublisher publishes under `name`
+    Reads go to the snapshot mapped when the reader was opened or last
+    refreshed, so a sequence of reads sees one consistent generation.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._control = _attach(name)
+        magic, _, _, self.publisher_pid, _ = CONTROL.unpack_from(self._control.buf)
+        _untrack(self._control, self.publisher_pid)
+        if magic != CONTROL_MAGIC:
+            self._control.close()
+            raise ValueError(f"Shared memory segment {name} is not a task snapshot")
+        self.snapshot: Optional[Snapshot] = None
+        if not self.refresh():
+            raise ValueError(f"Nothing has been published under {name} yet")
+
+    def _current(self) -> Tuple[int, str]:
+        """Read (publish number, data segment name) from the control seqlock"""
+        buf = self._control.buf
+        deadline = time.monotonic() + ATTACH_TIMEOUT
+        while True:
+            _, seq, number, _, name = CONTROL.unpack_from(buf)
+            if not seq & 1 and CONTROL.unpack_from(buf)[1] == seq:
+                return number, name.rstrip(b'\0').decode('ascii')
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Snapshot {self.name} is stuck mid-swap")
+            time.sleep(0)
+
+    def refresh(self) -> bool:
+        """
+        Switch to the newest published snapshot, returning whether there was a newer one
+        Raises FileNotFoundError if the publisher has stopped and unlinked it.
+        """
+        deadline = time.monotonic() + ATTACH_TIMEOUT
+        missing = None
+        while True:
+            number, name = self._current()
+            if not number:
+                return False
+            if self.snapshot is not None and number == self.snapshot.number:
+                return False
+            try:
+                segment = _attach(name)
+            except FileNotFoundError:
+                # A segment retired by a swap is renamed in the control segment first, so reading
+                # the same missing name twice means the publisher has stopped
+                if name == missing or time.monotonic() > deadline:
+                    raise FileNotFoundError(f"Snapshot {self.name} is gone: its publisher has stopped") from None
+                missing = name
+                continue
+            _untrack(segment, self.publisher_pid)
+            old, self.snapshot = self.snapshot, Snapshot(segment)
+            if old is not None:
+                old.close()
+            return True
+
+    @property
+    def generation(self) -> int:
+        """Store generation the current snapshot was taken at"""
+        return self.snapshot.generation
+
+    def __len__(self) -> int:
+        return len(self.snapshot)
+
+    def __iter__(self) -> Iterator[SnapshotTask]:
+        return iter(self.snapshot)
+
+    def get_task(self, task_id: int) -> Optional[SnapshotTask]:
+        """Get a task by id from the current snapshot"""
+        return self.snapshot.get_task(task_id)
+
+    def search(self, text: str, limit: Optional[int] = None) -> List[SnapshotTask]:
+        """Tasks containing every word of `text` in the current snapshot"""
+        return self.snapshot.search(text, limit)
+
+    def close(self):
+        """Unmap everything; records read earlier become unusable"""
+        if self.snapshot is not None:
+            self.snapshot.close()
+            self.snapshot = None
+        self._control.close()
@@ -0,0 +1,383 @@
+"""
+Spill module for the Todo Console Application
+Keeps the task table within a memory budget by moving cold tasks to disk
+
+When a budget is set, InMemoryStorage swaps its task dict for a SpillingTasks
+table. Once the estimated size of resident tasks exceeds the budget, the
+coldest completed tasks are written to an append-only segment file and dropped
+from memory. Looking one up by id pages it back in; scans read spilled tasks
+from the file without making them resident. Pending tasks are never spilled.
+
+Coldness is decided by an AccessTracker: an LRU order of completed tasks with
+a per-task hit count that buys extra passes through the queue, so a completed
+task that keeps being read survives longer than one touched once.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import tempfile
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from dataclasses import dataclass
+from sys import getsizeof, intern
+
+# Annotation-only imports (see storage.py)
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+    from .storage import Task
+
+# Eviction frees memory down to this fraction of the budget, so the next few
+# inserts do not each trigger a spill
+LOW_WATER = 0.9
+# Hits remembered per task; each buys one more pass through the eviction queue
+MAX_HITS = 3
+# The segment file is rewritten once dead records exceed this size and outweigh live ones
+COMPACT_MIN_BYTES = 1 << 20
+
+UNITS = {'': 1, 'b': 1, 'k': 1 << 10, 'kb': 1 << 10, 'm': 1 << 20, 'mb': 1 << 20, 'g': 1 << 30, 'gb': 1 << 30}
+
+
+def parse_size(text: str) -> int:
+    """Parse a byte count such as 512, 64k, 64KB or 1.5GB"""
+    value = text.strip().lower()
+    number = value.rstrip('kmgb')
+    unit = value[len(number):]
+    if unit not in UNITS or not number:
+        raise ValueError(f"Invalid size: {text}")
+    try:
+        size = int(float(number) * UNITS[unit])
+    except ValueError:
+        raise ValueError(f"Invalid size: {text}") from None
+    if size <= 0:
+        raise ValueError("Memory budget must be positive")
+    return size
+
+
+def format_size(size: int) -> str:
+    """Format a byte count with a binary unit"""
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def task_size(task: Task) -> int:
+    """Estimated bytes a resident task holds: the object, its fields and its strings"""
+    state = task.__dict__
+    # A compressed description is sized as stored, without decompressing it (see strings.py)
+    description = state.get('description')
+    if description is None:
+        description = state.get('description_z', "")
+    size = (getsizeof(task) + getsizeof(state) + getsizeof(task.title)
+            + getsizeof(description) + getsizeof(task.tags))
+    for tag in task.tags:
+        size += getsizeof(tag)
+    return size
+
+
+@dataclass
+class MemoryStats:
+    """Residency and paging counters for a budgeted task table"""
+    budget: int
+    resident_bytes: int
+    resident: int
+    spilled: int
+    segment_bytes: int
+    evictions: int
+    page_ins: int
+    page_in_seconds: float
+
+    @property
+    def page_in_latency_us(self) -> float:
+        """Mean time to page one task back in, in microseconds"""
+        return self.page_ins and self.page_in_seconds / self.page_ins * 1e6
+
+    def describe(self) -> str:
+        """Human-readable summary"""
+        return (f"Memory budget: {format_size(self.budget)}\n"
+                f"Resident: {self.resident} task(s), {format_size(self.resident_bytes)}\n"
+                f"Spilled: {self.spilled} task(s), segment file {format_size(self.segment_bytes)}\n"
+                f"Evictions: {self.evictions}, page-ins: {self.page_ins} "
+                f"(mean {self.page_in_latency_us:.1f} us)")
+
+
+class AccessTracker:
+    """
+    Chooses eviction victims among completed tasks
+    Completed tasks queue in least-recently-used order. A victim with hits
+    left is sent back to the end with one hit fewer instead (second chance),
+    which approximates least-frequently-used with ageing.
+    """
+
+    def __init__(self):
+        self._queue: OrderedDict[int, int] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def touch(self, task_id: int, completed: bool):
+        """Record an access to a resident task"""
+        queue = self._queue
+        if not completed:
+            queue.pop(task_id, None)
+            return
+        hits = queue.pop(task_id, -1)
+        queue[task_id] = min(hits + 1, MAX_HITS)
+
+    def forget(self, task_id: int):
+        """Stop tracking a task that left memory"""
+        self._queue.pop(task_id, None)
+
+    def victim(self) -> Optional[int]:
+        """Remove and return the coldest completed task id"""
+        queue = self._queue
+        while queue:
+            task_id, hits = queue.popitem(last=False)
+            if hits <= 0:
+                return task_id
+            queue[task_id] = hits - 1
+        return None
+
+
+class Segment:
+    """
+    Append-only file of pickled tasks with an in-memory offset index
+    Each record's position is packed into one int (offset << 32 | length),
+    which costs far less per spilled task than a tuple.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._file: BinaryIO = open(path, 'w+b') if path else tempfile.TemporaryFile()
+        self._offsets: Dict[int, int] = {}
+        self._end = 0
+        self.dead_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, task_id: int) -> bool:
+        return task_id in self._offsets
+
+    @property
+    def size(self) -> int:
+        """Bytes in the file, live and dead"""
+        return self._end
+
+    def ids(self) -> Iterator[int]:
+        """Ids of the spilled tasks"""
+        return iter(self._offsets)
+
+    def write(self, task: Task):
+        """Append a task, replacing any earlier copy"""
+        self.discard(task.id)
+        data = pickle.dumps(task, pickle.HIGHEST_PROTOCOL)
+        self._file.seek(self._end)
+        self._file.write(data)
+        self._offsets[task.id] = self._end << 32 | len(data)
+        self._end += len(data)
+
+    def read(self, task_id: int) -> Task:
+        """Load a spilled task (it stays in the file)"""
+        position = self._offsets[task_id]
+        self._file.seek(position >> 32)
+        return pickle.loads(self._file.read(position & 0xFFFFFFFF))
+
+    def discard(self, task_id: int):
+        """Forget a task's record; its bytes become garbage until compaction"""
+        position = self._offsets.pop(task_id, None)
+        if position is not None:
+            self.dead_bytes += position & 0xFFFFFFFF
+            if self.dead_bytes > COMPACT_MIN_BYTES and self.dead_bytes > self._end - self.dead_bytes:
+                self.compact()
+
+    def compact(self):
+        """Rewrite the file with only live records"""
+        old, self._file = self._file, (open(self.path + '.tmp', 'w+b') if self.path else tempfile.TemporaryFile())
+        offsets, self._offsets, self._end = self._offsets, {}, 0
+        for task_id, position in sorted(offsets.items(), key=lambda item: item[1]):
+            length = position & 0xFFFFFFFF
+            old.seek(position >> 32)
+            self._file.write(old.read(length))
+            self._offsets[task_id] = self._end << 32 | length
+            self._end += length
+        old.close()
+        if self.path:
+            os.replace(self.path + '.tmp', self.path)
+        self.dead_bytes = 0
+
+    def close(self):
+        """Close (and for temporary files, delete) the segment file"""
+        self._file.close()
+
+
+class SpillingTasks(dict):
+    """
+    Task table (id -> task) that spills cold completed tasks to a Segment
+    Behaves like the engine's plain dict: indexing by id or get() pages a
+    spilled task back in, while len(), `in` and iteration include spilled tasks
+    (iteration reads them from disk, in id order, without paging them in).
+    Ids are kept in an ascending list as tasks come and go, so iterating never
+    sorts; spilling and paging in move a task without changing the id set.
+    """
+
+    def __init__(self, budget: int, path: Optional[str] = None):
+        super().__init__()
+        self.budget = budget
+        self.segment = Segment(path)
+        self.tracker = AccessTracker()
+        self.resident_bytes = 0
+        self._sizes: Dict[int, int] = {}
+        self.evictions = 0
+        self.page_ins = 0
+        self.page_in_seconds = 0.0
+        # Every id, resident or spilled, ascending; deletes under different stripe locks may race
+        self._ids: List[int] = []
+        self._ids_lock = threading.Lock()
+
+    # Mapping interface -------------------------------------------------
+
+    def __setitem__(self, task_id: int, task: Task):
+        if not dict.__contains__(self, task_id) and task_id not in self.segment:
+            with self._ids_lock:
+                ids = self._ids
+                if ids and task_id < ids[-1]:
+                    insort(ids, task_id)
+                else:
+                    ids.append(task_id)
+        self.segment.discard(task_id)
+        dict.__setitem__(self, task_id, task)
+        self.touch(task)
+        self.enforce(keep=task_id)
+
+    def __missing__(self, task_id: int) -> Task:
+        if task_id not in self.segment:
+            raise KeyError(task_id)
+        return self._page_in(task_id)
+
+    def get(self, task_id: int, default=None):
+        task = dict.get(self, task_id)
+        if task is None:
+            if task_id not in self.segment:
+                return default
+            return self._page_in(task_id)
+        self.tracker.touch(task_id, task.completed)
+        return task
+
+    def pop(self, task_id: int, *default):
+        if dict.__contains__(self, task_id):
+            task = dict.pop(self, task_id)
+            self._forget(task_id)
+            self._drop_id(task_id)
+            return task
+        if task_id in self.segment:
+            task = self.segment.read(task_id)
+            self.segment.discard(task_id)
+            self._drop_id(task_id)
+            return task
+        if default:
+            return default[0]
+        raise KeyError(task_id)
+
+    def __delitem__(self, task_id: int):
+        self.pop(task_id)
+
+    def __contains__(self, task_id) -> bool:
+        return dict.__contains__(self, task_id) or task_id in self.segment
+
+    def __len__(self) -> int:
+        return dict.__len__(self) + len(self.segment)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.keys())
+
+    def keys(self):
+        with self._ids_lock:
+            return list(self._ids)
+
+    def _drop_id(self, task_id: int):
+        with self._ids_lock:
+            ids = self._ids
+            position = bisect_left(ids, task_id)
+            if position < len(ids) and ids[position] == task_id:
+                del ids[position]
+
+    def values(self):
+        return (task for _, task in self.items())
+
+    def items(self):
+        return self._items()
+
+    def _items(self) -> Iterator[Tuple[int, Task]]:
+        resident = dict.get
+        for task_id in self.keys():
+            task = resident(self, task_id)
+            if task is None:
+                if task_id not in self.segment:
+                    continue  # deleted while iterating
+                task = self.segment.read(task_id)
+            yield task_id, task
+
+    # Residency ---------------------------------------------------------
+
+    def touch(self, task: Task):
+        """Record an access to (or change of) a resident task and refresh its size"""
+        task_id = task.id
+        if not dict.__contains__(self, task_id):
+            return
+        size = task_size(task)
+        self.resident_bytes += size - self._sizes.get(task_id, 0)
+        self._sizes[task_id] = size
+        self.tracker.touch(task_id, task.completed)
+
+    def enforce(self, keep: Optional[int] = None):
+        """Spill cold completed tasks until resident tasks fit the budget"""
+        if self.resident_bytes <= self.budget:
+            return
+        target = self.budget * LOW_WATER
+        tracker = self.tracker
+        while self.resident_bytes > target:
+            task_id = tracker.victim()
+            if task_id is None:
+                break  # only pending tasks remain resident
+            if task_id == keep:
+                continue
+            task = dict.pop(self, task_id)
+            self.segment.write(task)
+            self.resident_bytes -= self._sizes.pop(task_id)
+            self.evictions += 1
+        if keep is not None and dict.__contains__(self, keep):
+            self.tracker.touch(keep, dict.__getitem__(self, keep).completed)
+
+    def _page_in(self, task_id: int) -> Task:
+        start = time.perf_counter()
+        task = self.segment.read(task_id)
+        task.title = intern(task.title)  # unpickling made a private copy
+        self.segment.discard(task_id)
+        dict.__setitem__(self, task_id, task)
+        self.page_in_seconds += time.perf_counter() - start
+        self.page_ins += 1
+        self.touch(task)
+        self.enforce(keep=task_id)
+        return task
+
+    def _forget(self, task_id: int):
+        self.resident_bytes -= self._sizes.pop(task_id, 0)
+        self.tracker.forget(task_id)
+
+    def stats(self) -> MemoryStats:
+        """Current residency and paging counters"""
+        return MemoryStats(
+            budget=self.budget, resident_bytes=self.resident_bytes, resident=dict.__len__(self),
+            spilled=len(self.segment), segment_bytes=self.segment.size, evictions=self.evictions,
+            page_ins=self.page_ins, page_in_seconds=self.page_in_seconds)
+
+    def close(self):
+        """Release the segment file"""
+        self.segment.close()
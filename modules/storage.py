@@ -1,42 +1,513 @@
 """
 In-memory storage module for the Todo Console Application
 Handles all data storage using Python lists and dictionaries
+
+This is the shared engine behind every front end: modules.tasks uses it
+directly, while the root item console (storage.py) and todo_console_app.py
+adapt it to their own record types, which subclass Task.
 """
 
-from typing import Dict, List
+from __future__ import annotations
+
+import heapq
+import threading
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import wraps
+from sys import intern
+
+from .clock import SystemClock, Timestamp, as_micros, to_micros
+from .indexes import DueIndex, SetIndex, StatusIndex, TimeIndex, TextIndex, TreeIndex
+from .strings import COMPRESS_MIN, CompressedText, set_text
+
+# Imported only for annotations so that front ends loading the engine at startup
+# do not pay for typing or the event machinery
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple, Union
+    from .analytics import TaskColumns
+    from .clock import SystemClock as Clock
+    from .complete import TitleIndex
+    from .dedupe import DedupeIndex
+    from .spill import MemoryStats
+    from .events import EventBus
+
+PRIORITIES = ('low', 'medium', 'high')
+DEFAULT_PRIORITY = 'medium'
+
+# Candidate sets up to this size are filtered directly instead of walking the due heap
+OVERDUE_SCAN_LIMIT = 4096
+# Fields patch_task can change
+PATCHABLE = frozenset(('title', 'description', 'completed', 'tags', 'priority', 'due_at'))
+# Writes to one task hold one of this many locks, picked by task id
+LOCK_STRIPES = 64
+
+
+class VersionConflict(ValueError):
+    """An update expected a version of a task that is no longer its current one"""
+
+    def __init__(self, task_id: int, expected: int, actual: int):
+        super().__init__(f"Task {task_id} was changed (version {actual}, expected {expected})")
+        self.task_id = task_id
+        self.expected = expected
+        self.actual = actual
+
+
+def _check_version(task: Task, if_version: Optional[int]):
+    """Raise VersionConflict if a version is expected and the task is at another"""
+    if if_version is not None and task.version != if_version:
+        raise VersionConflict(task.id, if_version, task.version)
+
+
+def _per_task(method):
+    """
+    Run a single-task write holding its task's lock stripe
+    Writers of the same task take turns, so a version check and the change it
+    guards happen together; writers of different tasks never share a
+    store-wide lock.
+    """
+    @wraps(method)
+    def locked(self, task_id, *args, **kwargs):
+        with self._stripes[task_id % LOCK_STRIPES]:
+            return method(self, task_id, *args, **kwargs)
+    return locked
 
 
-@dataclass
+def _whole_store(method):
+    """
+    Run a write spanning many tasks holding every lock stripe
+    Stripes are taken in order, so two such writes cannot deadlock; the method
+    must not call _per_task methods, whose locks are not reentrant.
+    """
+    @wraps(method)
+    def locked(self, *args, **kwargs):
+        for lock in self._stripes:
+            lock.acquire()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            for lock in reversed(self._stripes):
+                lock.release()
+    return locked
+
+
+@dataclass(init=False)
 class Task:
-    """Represents a single task in the todo list"""
+    """
+    Represents a single task in the todo list
+    Times are stored as epoch microseconds in created_us, updated_us and due_us;
+    the *_at fields convert to datetime when read and accept either form.
+    Titles are interned and long descriptions compressed (see strings.py);
+    assign descriptions through strings.set_text to keep them compressed.
+    `version` counts changes: the engine increments it on every mutation.
+    `parent_id` makes the task a subtask of another (see TreeIndex).
+    A task built without created_at or updated_at has none until a store
+    stamps it from the store's clock as it is inserted.
+    """
     id: int
     title: str
-    description: str = ""
+    description: str = CompressedText()
     completed: bool = False
-    created_at: datetime = field(default_factory=datetime.now)
-    updated_at: datetime = field(default_factory=datetime.now)
+    created_at: datetime = Timestamp()
+    updated_at: datetime = Timestamp()
+    tags: List[str] = field(default_factory=list)
+    priority: str = DEFAULT_PRIORITY
+    due_at: Optional[datetime] = Timestamp()
+    version: int = 0
+    parent_id: Optional[int] = None
+
+    def __init__(self, id: int, title: str, description: str = "", completed: bool = False,
+                 created_at: Union[datetime, int, None] = None, updated_at: Union[datetime, int, None] = None,
+                 tags: Optional[List[str]] = None, priority: str = DEFAULT_PRIORITY,
+                 due_at: Union[datetime, int, None] = None, version: int = 0, parent_id: Optional[int] = None):
+        # Written by hand so integer times skip the descriptors; this is the insert hot path
+        self.id = id
+        self.title = intern(title) if type(title) is str else title
+        if type(description) is str and len(description) >= COMPRESS_MIN:
+            set_text(self, 'description', description)
+        else:
+            self.description = description
+        self.completed = completed
+        self.created_us = created_at if type(created_at) is int else as_micros(created_at, 'created')
+        self.updated_us = updated_at if type(updated_at) is int else as_micros(updated_at, 'updated')
+        self.tags = tags if tags is not None else []
+        self.priority = priority
+        self.due_us = due_at if due_at is None or type(due_at) is int else as_micros(due_at, 'due')
+        self.version = version
+        self.parent_id = parent_id
+        self.__post_init__()
+
+    def __post_init__(self):
+        """Hook for subclasses to validate a new record"""
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Task":
+        """Build a task from the output of to_dict()"""
+        created_at, updated_at, due_at = data.get('created_at'), data.get('updated_at'), data.get('due_at')
+        return cls(
+            id=data['id'],
+            title=data['title'],
+            description=data.get('description', ""),
+            completed=data.get('completed', False),
+            created_at=datetime.fromisoformat(created_at) if created_at else None,
+            updated_at=datetime.fromisoformat(updated_at) if updated_at else None,
+            tags=list(data.get('tags', ())),
+            priority=data.get('priority', DEFAULT_PRIORITY),
+            due_at=datetime.fromisoformat(due_at) if due_at else None,
+            version=data.get('version', 0),
+            parent_id=data.get('parent_id'),
+        )
+
+    def to_dict(self) -> dict:
+        """Convert the task to a dictionary representation"""
+        return {
+            'id': self.id,
+            'title': self.title,
+            'description': self.description,
+            'completed': self.completed,
+            'created_at': self.created_at.isoformat() if self.created_us is not None else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_us is not None else None,
+            'tags': list(self.tags),
+            'priority': self.priority,
+            'due_at': self.due_at.isoformat() if self.due_at else None,
+            'version': self.version,
+            'parent_id': self.parent_id,
+        }
+
+    def is_overdue(self, now: datetime) -> bool:
+        """Check whether the task is pending and past its due time"""
+        return not self.completed and self.due_us is not None and self.due_us <= to_micros(now)
 
 
 class InMemoryStorage:
-    """Manages in-memory storage for tasks"""
+    """
+    Manages in-memory storage for tasks
+    Indexes and the event bus are created on first use, so a front end that only
+    does CRUD pays for a dict write and nothing else. The secondary indexes are
+    built together when a query first reads one; the text index, the costliest
+    to maintain, waits for the first text search.
+    """
 
-    def __init__(self):
+    def __init__(self, clock: Optional[Clock] = None):
+        self.clock = clock if clock is not None else SystemClock()
         self._tasks: Dict[int, Task] = {}
         self._next_id: int = 1
+        # Byte cap on resident tasks; when set, _tasks is a spill.SpillingTasks
+        self.memory_budget: Optional[int] = None
+        # Bumped on every mutation so caches can tell when results are stale
+        self.generation: int = 0
+        # Ordered change stream for downstream subscribers, created on first use
+        self._events: Optional[EventBus] = None
+        self._event_seq: int = 0
+        # Secondary indexes exist (and are maintained) only once _indexed is set
+        self._indexed = False
+        self._status_index = StatusIndex()
+        self._time_index = TimeIndex()
+        self._tag_index = SetIndex()
+        self._priority_index = SetIndex()
+        self._due_index = DueIndex()
+        self._text_index: Optional[TextIndex] = None
+        self._dedupe_index: Optional[DedupeIndex] = None
+        self._columns: Optional[TaskColumns] = None
+        self._title_index: Optional[TitleIndex] = None
+        # Subtask links, kept from the start: tasks without a parent cost one attribute check
+        self._tree = TreeIndex()
+        self._stripes = tuple(threading.Lock() for _ in range(LOCK_STRIPES))
 
-    def add_task(self, title: str, description: str = "") -> Task:
-        """Add a new task to storage"""
-        task = Task(
-            id=self._next_id,
-            title=title,
-            description=description
-        )
-        self._tasks[self._next_id] = task
+    def _build_indexes(self):
+        """Fill the secondary indexes from the current tasks and start maintaining them"""
+        self._indexed = True
+        text_index, self._text_index = self._text_index, None  # maintained separately
+        for task in sorted(self._tasks.values(), key=lambda task: task.created_us):
+            self._index(task)
+        self._text_index = text_index
+
+    @property
+    def status_index(self) -> StatusIndex:
+        """Completed/pending id sets"""
+        if not self._indexed:
+            self._build_indexes()
+        return self._status_index
+
+    @property
+    def time_index(self) -> TimeIndex:
+        """Creation-time range index"""
+        if not self._indexed:
+            self._build_indexes()
+        return self._time_index
+
+    @property
+    def tag_index(self) -> SetIndex:
+        """Tag posting lists"""
+        if not self._indexed:
+            self._build_indexes()
+        return self._tag_index
+
+    @property
+    def priority_index(self) -> SetIndex:
+        """Priority posting lists"""
+        if not self._indexed:
+            self._build_indexes()
+        return self._priority_index
+
+    @property
+    def due_index(self) -> DueIndex:
+        """Due-time heap over pending tasks"""
+        if not self._indexed:
+            self._build_indexes()
+        return self._due_index
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    @property
+    def events(self) -> EventBus:
+        """Ordered change stream; sequence numbers count every mutation, even unobserved ones"""
+        if self._events is None:
+            from .events import EventBus
+            self._events = EventBus(now_us=self.clock.now_us)
+            self._events.seq = self._event_seq
+        return self._events
+
+    @property
+    def text_index(self) -> TextIndex:
+        """Word index over titles and descriptions, built from the current tasks on first use"""
+        if self._text_index is None:
+            index = TextIndex()
+            for task in self._tasks.values():
+                index.add(task.id, task.title, task.description)
+            self._text_index = index
+        return self._text_index
+
+    @property
+    def dedupe_index(self) -> DedupeIndex:
+        """Duplicate-detection index over titles and texts, built on first use"""
+        if self._dedupe_index is None:
+            from .dedupe import DedupeIndex
+            index = DedupeIndex()
+            for task in self._tasks.values():
+                index.add(task.id, task.title, task.description)
+            self._dedupe_index = index
+        return self._dedupe_index
+
+    @property
+    def title_index(self) -> TitleIndex:
+        """Sorted title index for prefix and fuzzy completion, built on first use"""
+        if self._title_index is None:
+            from .complete import TitleIndex
+            self._title_index = TitleIndex((task.id, task.title) for task in self._tasks.values())
+        return self._title_index
+
+    @property
+    def tree(self) -> TreeIndex:
+        """Parent/child links and rolled-up completion counts"""
+        return self._tree
+
+    @property
+    def columns(self) -> TaskColumns:
+        """Column arrays of the fields analytics reads, built on first use"""
+        if self._columns is None:
+            from .analytics import TaskColumns
+            self._columns = TaskColumns(self._tasks.values())
+        return self._columns
+
+    def _index(self, task: Task, with_time: bool = True):
+        """Add a new task to every built index"""
+        if self._text_index is not None:
+            self._text_index.add(task.id, task.title, task.description)
+        if self._dedupe_index is not None:
+            self._dedupe_index.add(task.id, task.title, task.description)
+        if self._title_index is not None:
+            self._title_index.add(task.id, task.title)
+        if not self._indexed:
+            return
+        self._status_index.add(task.id, task.completed)
+        if with_time:
+            self._time_index.add(task.id, task.created_us)
+        for tag in task.tags:
+            self._tag_index.add(task.id, tag)
+        self._priority_index.add(task.id, task.priority)
+        if not task.completed and task.due_us is not None:
+            self._due_index.set(task.id, task.due_us)
+
+    def _unindex(self, task: Task, with_time: bool = True):
+        """Remove a task from every built index"""
+        if self._text_index is not None:
+            self._text_index.remove(task.id, task.title, task.description)
+        if self._dedupe_index is not None:
+            self._dedupe_index.remove(task.id, task.title, task.description)
+        if self._title_index is not None:
+            self._title_index.remove(task.id)
+        if not self._indexed:
+            return
+        self._status_index.remove(task.id)
+        for tag in task.tags:
+            self._tag_index.remove(task.id, tag)
+        self._priority_index.remove(task.id, task.priority)
+        if task.due_us is not None:
+            self._due_index.set(task.id, None)
+        if with_time:
+            self._time_index.remove(task.id)
+            if self._time_index.dead > len(self._tasks):
+                self._time_index.compact(self._tasks)
+
+    def _changed(self, kind: str, task_id: int, task: Optional[Task], fields: Optional[FrozenSet[str]] = None,
+                 bump: bool = True):
+        """
+        Record a mutation: bump the task's version and the generation and publish a change event
+        `fields` names the fields an update changed, when known.
+        """
+        if bump and task is not None:
+            task.version += 1
+        self.generation += 1
+        if self._columns is not None:
+            if task is None:
+                self._columns.remove(task_id)
+            else:
+                self._columns.put(task)
+        if self.memory_budget is not None and task is not None:
+            self._tasks.touch(task)
+            self._tasks.enforce(keep=task_id)
+        if self._events is None:
+            self._event_seq += 1
+        else:
+            self._events.publish(kind, task_id, task, fields)
+
+    def _changed_many(self, kind: str, changes: List[Tuple[int, Optional[Task]]], bump: bool = True):
+        """Record a batch of mutations of one kind as a single generation, like _changed for each"""
+        if not changes:
+            return
+        self.generation += 1
+        if bump:
+            for _, task in changes:
+                if task is not None:
+                    task.version += 1
+        if self._columns is not None:
+            for task_id, task in changes:
+                if task is None:
+                    self._columns.remove(task_id)
+                else:
+                    self._columns.put(task)
+        if self.memory_budget is not None:
+            for _, task in changes:
+                if task is not None:
+                    self._tasks.touch(task)
+            self._tasks.enforce()
+        if self._events is None:
+            self._event_seq += len(changes)
+        else:
+            self._events.publish_batch((kind, task_id, task) for task_id, task in changes)
+
+    def add_task(self, title: str, description: str = "", parent_id: Optional[int] = None) -> Task:
+        """Add a new task to storage, as a subtask of `parent_id` if given"""
+        if parent_id is not None and parent_id not in self._tasks:
+            raise ValueError(f"Parent task {parent_id} not found")
+        now = self.clock.now_us()
+        return self.insert_task(Task(id=0, title=title, description=description,
+                                     created_at=now, updated_at=now, parent_id=parent_id))
+
+    def insert_task(self, task: Task) -> Task:
+        """Store a new task (or Task subclass) under the next id, stamping missing times from the store's clock"""
+        if task.created_us is None or task.updated_us is None:
+            self._stamp(task)
+        task.id = self._next_id
+        self._tasks[task.id] = task
         self._next_id += 1
+        self._index(task)
+        if task.parent_id is not None:
+            self._tree.add(task.id, task.parent_id, task.completed)
+        self._changed('created', task.id, task)
+        return task
+
+    def add_tasks(self, records: Iterable[Tuple[str, str, bool]]) -> List[Task]:
+        """Add many (title, description, completed) records in one batch"""
+        now = self.clock.now_us()
+        next_id = self._next_id
+        tasks = self._tasks
+        added = []
+        for title, description, completed in records:
+            task = Task(id=next_id, title=title, description=description,
+                        completed=completed, created_at=now, updated_at=now, version=1)
+            tasks[next_id] = task
+            self._index(task)
+            added.append(task)
+            next_id += 1
+        self._next_id = next_id
+        self._changed_many('created', [(task.id, task) for task in added], bump=False)
+        return added
+
+    def upsert_task(self, task: Task) -> Task:
+        """Insert or replace a task exactly as given, version included (used to apply replicated changes)"""
+        if task.created_us is None or task.updated_us is None:
+            self._stamp(task)
+        existing = self._tasks.get(task.id)
+        if existing is not None:
+            # Creation times never change, so the time index entry stays valid
+            self._unindex(existing, with_time=False)
+            self._tree.remove(task.id, existing.completed)
+        self._tasks[task.id] = task
+        self._index(task, with_time=existing is None)
+        self._tree.add(task.id, task.parent_id, task.completed)
+        if task.id >= self._next_id:
+            self._next_id = task.id + 1
+        self._changed('updated' if existing is not None else 'created', task.id, task, bump=False)
         return task
 
+    def _stamp(self, task: Task):
+        """Give a task built without times the store's current time"""
+        now = self.clock.now_us()
+        if task.created_us is None:
+            task.created_us = now
+        if task.updated_us is None:
+            task.updated_us = task.created_us
+
+    def set_memory_budget(self, budget: Optional[int], path: Optional[str] = None):
+        """
+        Cap the memory held by resident tasks at `budget` bytes (None lifts the cap)
+        Over budget, the least recently used completed tasks are spilled to a
+        segment file (a temporary file unless `path` is given) and paged back in
+        when looked up. Lifting the cap loads every spilled task back.
+        """
+        current = self._tasks
+        if budget is None:
+            if self.memory_budget is not None:
+                self._tasks = dict(current.items())
+                current.close()
+            self.memory_budget = None
+            return
+
+        if budget <= 0:
+            raise ValueError("Memory budget must be positive")
+        if self.memory_budget is not None:
+            current.budget = budget
+            current.enforce()
+        else:
+            from .spill import SpillingTasks
+            tasks = SpillingTasks(budget, path)
+            for task_id, task in current.items():
+                tasks[task_id] = task
+            self._tasks = tasks
+        self.memory_budget = budget
+
+    def memory_stats(self) -> Optional[MemoryStats]:
+        """Residency and paging counters, or None when no budget is set"""
+        return self._tasks.stats() if self.memory_budget is not None else None
+
+    @property
+    def next_id(self) -> int:
+        """The id the next added task will get"""
+        return self._next_id
+
+    def reserve_ids(self, next_id: int):
+        """Never hand out ids below `next_id` (restoring a snapshot whose newest tasks were deleted)"""
+        if next_id > self._next_id:
+            self._next_id = next_id
+
+    def close(self):
+        """Release the spill segment file, if any; the storage is not used afterwards"""
+        if self.memory_budget is not None:
+            self._tasks.close()
+
     def get_task(self, task_id: int) -> Task:
         """Retrieve a task by ID"""
         return self._tasks.get(task_id)
@@ -45,48 +516,360 @@ class InMemoryStorage:
         """Get all tasks"""
         return list(self._tasks.values())
 
+    def iter_tasks(self) -> Iterator[Task]:
+        """Iterate over tasks in id order without copying them into a list"""
+        return iter(self._tasks.values())
+
+    @_per_task
     def update_task(self, task_id: int, title: str = None, description: str = None,
-                   completed: bool = None) -> bool:
-        """Update a task's properties"""
+                    completed: bool = None, if_version: Optional[int] = None) -> bool:
+        """
+        Update a task's properties
+        With `if_version`, raises VersionConflict unless the task is at that version.
+        """
         task = self._tasks.get(task_id)
         if not task:
             return False
+        _check_version(task, if_version)
+
+        text_changed = title is not None or description is not None
+        text_indexes = [index for index in (self._text_index, self._dedupe_index, self._title_index)
+                        if index is not None] if text_changed else ()
+        for index in text_indexes:
+            index.remove(task_id, task.title, task.description)
 
         if title is not None:
-            task.title = title
-            task.updated_at = datetime.now()
+            task.title = intern(title)
 
         if description is not None:
-            task.description = description
-            task.updated_at = datetime.now()
+            set_text(task, 'description', description)
+
+        for index in text_indexes:
+            index.add(task_id, task.title, task.description)
 
         if completed is not None:
-            task.completed = completed
-            task.updated_at = datetime.now()
+            self._set_status(task, completed)
 
+        if title is not None or description is not None or completed is not None:
+            task.updated_us = self.clock.now_us()
+
+        self._changed('completed' if completed else 'updated', task_id, task)
         return True
 
-    def delete_task(self, task_id: int) -> bool:
-        """Delete a task by ID"""
-        if task_id in self._tasks:
-            del self._tasks[task_id]
-            return True
-        return False
+    @_per_task
+    def patch_task(self, task_id: int, changes: Dict[str, Any],
+                   if_version: Optional[int] = None) -> Optional[FrozenSet[str]]:
+        """
+        Set fields of a task in place, touching only the indexes over fields that change
+        `changes` maps names in PATCHABLE to new values (due_at as a datetime,
+        epoch microseconds or None); values are stored as given, so callers
+        validate them. Fields already holding their new value are skipped, and
+        the names of the rest are returned and published with the change event.
+        Returns None if there is no such task; raises VersionConflict if
+        `if_version` is given and the task is at another version.
+        """
+        task = self._tasks.get(task_id)
+        if task is None:
+            return None
+        _check_version(task, if_version)
+        unknown = changes.keys() - PATCHABLE
+        if unknown:
+            raise ValueError(f"Unknown field: {min(unknown)}")
+        due = changes.get('due_at')
+        if due is not None and type(due) is not int:
+            changes = dict(changes, due_at=as_micros(due, 'due'))
+        changed = frozenset(name for name, value in changes.items()
+                            if value != (task.due_us if name == 'due_at' else getattr(task, name)))
+        if not changed:
+            return changed
+
+        if 'title' in changed or 'description' in changed:
+            old_title, old_description = task.title, task.description
+            if 'title' in changed:
+                task.title = intern(changes['title'])
+            if 'description' in changed:
+                set_text(task, 'description', changes['description'])
+            if self._text_index is not None:
+                self._text_index.replace(task_id, (old_title, old_description), (task.title, task.description))
+            text_indexes = [self._dedupe_index] if self._dedupe_index is not None else []
+            if 'title' in changed and self._title_index is not None:
+                text_indexes.append(self._title_index)
+            for index in text_indexes:
+                index.remove(task_id, old_title, old_description)
+                index.add(task_id, task.title, task.description)
+        if 'tags' in changed:
+            tags = list(changes['tags'])
+            if self._indexed:
+                for tag in task.tags:
+                    if tag not in tags:
+                        self._tag_index.remove(task_id, tag)
+                for tag in tags:
+                    if tag not in task.tags:
+                        self._tag_index.add(task_id, tag)
+            task.tags = tags
+        if 'priority' in changed:
+            if self._indexed:
+                self._priority_index.remove(task_id, task.priority)
+                self._priority_index.add(task_id, changes['priority'])
+            task.priority = changes['priority']
+        if 'due_at' in changed:
+            task.due_us = changes['due_at']
+            if not task.completed and self._indexed:
+                self._due_index.set(task_id, task.due_us)
+        if 'completed' in changed:
+            self._set_status(task, changes['completed'])
+
+        task.updated_us = self.clock.now_us()
+        self._changed('completed' if 'completed' in changed and task.completed else 'updated', task_id, task, changed)
+        return changed
+
+    @_per_task
+    def delete_task(self, task_id: int, if_version: Optional[int] = None) -> bool:
+        """
+        Delete a task by ID; its subtasks move up to its parent
+        With `if_version`, raises VersionConflict unless the task is at that version.
+        """
+        task = self._tasks.get(task_id)
+        if task is None:
+            return False
+        _check_version(task, if_version)
+        for child_id in self._tree.child_ids(task_id):
+            self._reparent(self._tasks[child_id], task.parent_id)
+        del self._tasks[task_id]
+        self._unindex(task)
+        self._tree.remove(task_id, task.completed)
+        self._changed('deleted', task_id, None)
+        return True
+
+    @_per_task
+    def set_parent(self, task_id: int, parent_id: Optional[int], if_version: Optional[int] = None) -> bool:
+        """
+        Make a task a subtask of `parent_id`, or a top-level task if None
+        Raises ValueError if the parent does not exist or is the task itself or one of its subtasks.
+        """
+        task = self._tasks.get(task_id)
+        if task is None:
+            return False
+        _check_version(task, if_version)
+        if parent_id is not None:
+            if parent_id not in self._tasks:
+                raise ValueError(f"Parent task {parent_id} not found")
+            if parent_id == task_id or task_id in self._tree.ancestors(parent_id):
+                raise ValueError(f"Task {parent_id} is task {task_id} or one of its subtasks")
+        if parent_id != task.parent_id:
+            self._reparent(task, parent_id)
+        return True
+
+    def _reparent(self, task: Task, parent_id: Optional[int]):
+        """Move a task and its subtree under another parent"""
+        self._tree.remove(task.id, task.completed)
+        task.parent_id = parent_id
+        self._tree.add(task.id, parent_id, task.completed)
+        task.updated_us = self.clock.now_us()
+        self._changed('updated', task.id, task, frozenset(('parent_id',)))
 
+    @_whole_store
+    def complete_subtree(self, task_id: int, completed: bool = True) -> Optional[List[Task]]:
+        """
+        Mark a task and every subtask completed (or pending) as one batch
+        Returns the tasks whose status changed, or None if there is no such task.
+        The batch is one generation and one run of change events.
+        """
+        if task_id not in self._tasks:
+            return None
+        tasks = self._tasks
+        now = self.clock.now_us()
+        changed = []
+        for node in self._tree.subtree(task_id):
+            task = tasks[node]
+            if task.completed != completed:
+                self._set_status(task, completed, rollup=False)
+                task.updated_us = now
+                changed.append(task)
+        self._tree.set_subtree_completed(task_id, completed, len(changed))
+        self._changed_many('completed' if completed else 'updated', [(task.id, task) for task in changed])
+        return changed
+
+    @_whole_store
+    def delete_subtree(self, task_id: int, if_version: Optional[int] = None) -> List[int]:
+        """
+        Delete a task and every subtask as one batch, returning the deleted ids
+        With `if_version`, raises VersionConflict unless the root task is at that version.
+        """
+        root = self._tasks.get(task_id)
+        if root is None:
+            return []
+        _check_version(root, if_version)
+        ids = self._tree.subtree(task_id)
+        completed = 0
+        for node in ids:
+            task = self._tasks.pop(node)
+            completed += task.completed
+            self._unindex(task)
+        self._tree.drop_subtree(task_id, ids, completed)
+        self._changed_many('deleted', [(node, None) for node in ids])
+        return ids
+
+    @_per_task
     def mark_completed(self, task_id: int) -> bool:
         """Mark a task as completed"""
         task = self._tasks.get(task_id)
         if task:
-            task.completed = True
-            task.updated_at = datetime.now()
+            self._set_status(task, True)
+            task.updated_us = self.clock.now_us()
+            self._changed('completed', task_id, task)
             return True
         return False
 
+    @_per_task
     def mark_incomplete(self, task_id: int) -> bool:
         """Mark a task as incomplete"""
         task = self._tasks.get(task_id)
         if task:
-            task.completed = False
-            task.updated_at = datetime.now()
+            self._set_status(task, False)
+            task.updated_us = self.clock.now_us()
+            self._changed('updated', task_id, task)
             return True
-        return False
\ No newline at end of file
+        return False
+
+    def _set_status(self, task: Task, completed: bool, rollup: bool = True):
+        """Change a task's completion flag, moving it between status sets and rolling it up to its ancestors"""
+        if task.completed == completed:
+            return
+        if self._indexed:
+            self._status_index.remove(task.id)
+            self._status_index.add(task.id, completed)
+            # Only pending tasks can be overdue, so completed ones leave the due index
+            self._due_index.set(task.id, None if completed else task.due_us)
+        if rollup and task.parent_id is not None:
+            self._tree.set_completed(task.id, completed)
+        task.completed = completed
+
+    def merge_tasks(self, keep_id: int, duplicate_ids: Iterable[int]) -> Optional[Task]:
+        """
+        Fold duplicate tasks into one and delete them
+        The kept task gains the duplicates' tags and any descriptions it lacks, the
+        highest priority and the earliest due time, and stays pending if any of
+        them was pending.
+        """
+        keep = self._tasks.get(keep_id)
+        duplicates = [self._tasks[task_id] for task_id in dict.fromkeys(duplicate_ids)
+                      if task_id != keep_id and task_id in self._tasks]
+        if keep is None:
+            return None
+        if not duplicates:
+            return keep
+
+        self._unindex(keep, with_time=False)
+        was_completed = keep.completed
+        descriptions = [keep.description] if keep.description else []
+        for task in duplicates:
+            if task.description and task.description not in descriptions:
+                descriptions.append(task.description)
+            keep.tags.extend(tag for tag in task.tags if tag not in keep.tags)
+            if PRIORITIES.index(task.priority) > PRIORITIES.index(keep.priority):
+                keep.priority = task.priority
+            if task.due_us is not None and (keep.due_us is None or task.due_us < keep.due_us):
+                keep.due_us = task.due_us
+            keep.completed = keep.completed and task.completed
+        set_text(keep, 'description', "\n".join(descriptions))
+        keep.updated_us = self.clock.now_us()
+        self._index(keep, with_time=False)
+        if keep.completed != was_completed and keep.parent_id is not None:
+            self._tree.set_completed(keep_id, keep.completed)
+        self._changed('updated', keep_id, keep)
+
+        for task in duplicates:
+            self.delete_task(task.id)
+        return keep
+
+    @_per_task
+    def add_tags(self, task_id: int, tags: Iterable[str]) -> bool:
+        """Attach tags to a task"""
+        task = self._tasks.get(task_id)
+        if not task:
+            return False
+
+        for tag in tags:
+            if tag not in task.tags:
+                task.tags.append(tag)
+                if self._indexed:
+                    self._tag_index.add(task_id, tag)
+        task.updated_us = self.clock.now_us()
+        self._changed('updated', task_id, task)
+        return True
+
+    @_per_task
+    def remove_tags(self, task_id: int, tags: Iterable[str]) -> bool:
+        """Detach tags from a task"""
+        task = self._tasks.get(task_id)
+        if not task:
+            return False
+
+        for tag in tags:
+            if tag in task.tags:
+                task.tags.remove(tag)
+                if self._indexed:
+                    self._tag_index.remove(task_id, tag)
+        task.updated_us = self.clock.now_us()
+        self._changed('updated', task_id, task)
+        return True
+
+    @_per_task
+    def set_priority(self, task_id: int, priority: str) -> bool:
+        """Change a task's priority bucket"""
+        task = self._tasks.get(task_id)
+        if not task:
+            return False
+
+        if self._indexed:
+            self._priority_index.remove(task_id, task.priority)
+            self._priority_index.add(task_id, priority)
+        task.priority = priority
+        task.updated_us = self.clock.now_us()
+        self._changed('updated', task_id, task)
+        return True
+
+    @_per_task
+    def set_due(self, task_id: int, due_at: Optional[datetime]) -> bool:
+        """Set or clear (due_at=None) a task's due time"""
+        task = self._tasks.get(task_id)
+        if not task:
+            return False
+
+        task.due_at = due_at
+        if not task.completed and self._indexed:
+            self._due_index.set(task_id, task.due_us)
+        task.updated_us = self.clock.now_us()
+        self._changed('updated', task_id, task)
+        return True
+
+    def overdue_tasks(self, now: datetime, tag: Optional[str] = None,
+                      priority: Optional[str] = None, limit: int = 20) -> List[Task]:
+        """Get the earliest-due pending tasks due at or before now, optionally filtered"""
+        filters: List[Set[int]] = []
+        if tag is not None:
+            filters.append(self.tag_index.ids(tag))
+        if priority is not None:
+            filters.append(self.priority_index.ids(priority))
+        filters.sort(key=len)
+
+        tasks = self._tasks
+        now_us = to_micros(now)
+        if filters and len(filters[0]) <= OVERDUE_SCAN_LIMIT:
+            others = filters[1:]
+            overdue = [task for task in map(tasks.__getitem__, filters[0])
+                       if not task.completed and task.due_us is not None and task.due_us <= now_us
+                       and all(task.id in ids for ids in others)]
+            return heapq.nsmallest(limit, overdue, key=lambda task: (task.due_us, task.id))
+
+        result = []
+        if limit <= 0:
+            return result
+        # Large filters are probed per entry rather than intersected up front
+        for _, task_id in self.due_index.iter_due(until=now_us):
+            if all(task_id in ids for ids in filters):
+                result.append(tasks[task_id])
+                if len(result) >= limit:
+                    break
+        return result
@@ -0,0 +1,114 @@
+"""
+Strings module for the Todo Console Application
+Shares repeated titles and compresses long descriptions
+
+Titles repeat a lot ("Call dentist", "Buy groceries"), so tasks intern them:
+every task with the same title points at one string object in the
+interpreter's intern dictionary, which drops entries nobody uses any more.
+
+Descriptions of COMPRESS_MIN characters or more are kept zlib-compressed in
+`description_z` and only decompressed when read (e.g. by `show`). Shorter ones
+stay plain instance attributes, so reading them costs nothing extra: the
+CompressedText descriptor is consulted only when no plain value is present.
+"""
+
+from __future__ import annotations
+
+import zlib
+from dataclasses import dataclass
+from sys import getsizeof
+
+# Annotation-only imports (see storage.py)
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Iterable
+    from .storage import Task
+
+COMPRESS_MIN = 256
+COMPRESS_LEVEL = 6
+
+
+class CompressedText:
+    """
+    Non-data descriptor reading a zlib-compressed text field
+    Instances hold either the plain string under the field's own name, which
+    shadows this descriptor, or compressed bytes under `<name>_z`.
+    """
+
+    def __init__(self, default: str = ""):
+        self.default = default
+        self.key = ""
+
+    def __set_name__(self, owner, name: str):
+        self.key = name + '_z'
+
+    def __get__(self, obj, owner=None) -> str:
+        if obj is None:
+            return self.default  # the dataclass default
+        return zlib.decompress(obj.__dict__[self.key]).decode()
+
+
+def set_text(obj, name: str, text: str):
+    """Store a text field, compressing it when it is long and compresses well"""
+    state = obj.__dict__
+    if len(text) >= COMPRESS_MIN:
+        data = zlib.compress(text.encode(), COMPRESS_LEVEL)
+        if len(data) < len(text) * 0.9:
+            state.pop(name, None)
+            state[name + '_z'] = data
+            return
+    state[name] = text
+    state.pop(name + '_z', None)
+
+
+@dataclass
+class StringStats:
+    """Bytes held by titles and descriptions, as stored and as plain per-task copies"""
+    tasks: int = 0
+    distinct_titles: int = 0
+    title_bytes: int = 0
+    title_bytes_unshared: int = 0
+    compressed: int = 0
+    description_bytes: int = 0
+    description_bytes_plain: int = 0
+
+    @property
+    def saved(self) -> int:
+        """Bytes saved by interning and compression together"""
+        return (self.title_bytes_unshared - self.title_bytes
+                + self.description_bytes_plain - self.description_bytes)
+
+    def describe(self) -> str:
+        """Human-readable summary"""
+        from .spill import format_size
+        return (f"Titles: {self.distinct_titles} distinct of {self.tasks}, "
+                f"{format_size(self.title_bytes)} (unshared {format_size(self.title_bytes_unshared)})\n"
+                f"Descriptions: {self.compressed} compressed, "
+                f"{format_size(self.description_bytes)} (plain {format_size(self.description_bytes_plain)})\n"
+                f"Saved: {format_size(self.saved)}")
+
+
+def string_stats(tasks: Iterable[Task]) -> StringStats:
+    """Measure title sharing and description compression over tasks"""
+    stats = StringStats()
+    seen = set()
+    for task in tasks:
+        stats.tasks += 1
+        title = task.title
+        size = getsizeof(title)
+        stats.title_bytes_unshared += size
+        if id(title) not in seen:
+            seen.add(id(title))
+            stats.distinct_titles += 1
+            stats.title_bytes += size
+
+        state = task.__dict__
+        if 'description' in state:
+            size = getsizeof(state['description'])
+            stats.description_bytes += size
+            stats.description_bytes_plain += size
+        else:
+            stats.compressed += 1
+            stats.description_bytes += getsizeof(state['description_z'])
+            stats.description_bytes_plain += getsizeof(task.description)
+    return stats
@@ -3,22 +3,148 @@ Tasks module for the Todo Console Application
 Handles business logic for task operations
 """
 
-from typing import List, Optional
-from .storage import InMemoryStorage, Task
+from __future__ import annotations
+
+from .storage import InMemoryStorage, Task, PRIORITIES
+from .utils import normalize_tags
+
+# Annotation-only imports (see storage.py). Importing and querying pull in
+# multiprocessing and the query planner, and reminders, events and duplicate
+# detection are optional, so those modules are only loaded the first time they are used
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from datetime import datetime
+    from typing import Iterable, List, Optional, Sequence, Tuple
+    from .clock import SystemClock
+    from .events import Subscription
+    from .scheduler import ReminderScheduler
+    from .analytics import Report
+    from .importer import ImportResult
+    from .query import QueryResult
+    from .spill import MemoryStats
+    from .strings import StringStats
 
 
 class TaskManager:
     """Manages task operations and business logic"""
 
-    def __init__(self):
-        self.storage = InMemoryStorage()
+    def __init__(self, scheduler: Optional[ReminderScheduler] = None, clock: Optional[SystemClock] = None):
+        self.storage = InMemoryStorage(clock)
+        self.scheduler = scheduler
+        # When set, add_task returns an existing duplicate instead of adding a copy
+        self.dedupe_on_add = False
+
+    def _sync_reminder(self, task_id: int):
+        """Schedule, move or cancel a task's reminder to match its due date"""
+        if self.scheduler is None:
+            return
+        task = self.storage.get_task(task_id)
+        if task is not None and task.due_at is not None and not task.completed:
+            self.scheduler.schedule(task_id, task.due_at)
+        else:
+            self.scheduler.cancel(task_id)
+
+    @property
+    def generation(self) -> int:
+        """Mutation counter of the underlying storage"""
+        return self.storage.generation
+
+    def subscribe(self, max_queue: int = 1024, overflow: str = 'block') -> Subscription:
+        """Subscribe to the ordered stream of task change events"""
+        return self.storage.events.subscribe(max_queue, overflow)
+
+    def add_task(self, title: str, description: str = "", dedupe: Optional[bool] = None) -> Task:
+        """
+        Add a new task
+        With dedupe (default: dedupe_on_add) an existing duplicate is returned
+        instead; the generation is then unchanged.
+        """
+        if not title or not title.strip():
+            raise ValueError("Task title cannot be empty")
+
+        title, description = title.strip(), description.strip()
+        if dedupe if dedupe is not None else self.dedupe_on_add:
+            existing = self.find_duplicate(title, description)
+            if existing is not None:
+                return existing
+        return self.storage.add_task(title, description)
 
-    def add_task(self, title: str, description: str = "") -> Task:
-        """Add a new task"""
+    def add_subtask(self, parent_id: int, title: str, description: str = "") -> Task:
+        """Add a new task under `parent_id` (ValueError if there is no such task)"""
         if not title or not title.strip():
             raise ValueError("Task title cannot be empty")
+        return self.storage.add_task(title.strip(), description.strip(), parent_id=parent_id)
+
+    def move_task(self, task_id: int, parent_id: Optional[int]) -> bool:
+        """Make a task a subtask of `parent_id`, or top-level if None"""
+        return self.storage.set_parent(task_id, parent_id)
+
+    def subtree(self, task_id: int) -> List[Tuple[Task, int]]:
+        """A task and its subtasks at every depth as (task, depth) pairs in outline order"""
+        if self.storage.get_task(task_id) is None:
+            return []
+        get = self.storage.get_task
+        return [(get(node), depth) for node, depth in self.storage.tree.depth_first(task_id)]
+
+    def progress(self, task_id: int) -> Tuple[int, int]:
+        """(completed, total) subtasks below a task, at every depth"""
+        return self.storage.tree.progress(task_id)
+
+    def complete_subtree(self, task_id: int, completed: bool = True) -> Optional[List[Task]]:
+        """Mark a task and all its subtasks completed (or pending); returns the tasks that changed"""
+        changed = self.storage.complete_subtree(task_id, completed)
+        for task in changed or ():
+            self._sync_reminder(task.id)
+        return changed
+
+    def delete_subtree(self, task_id: int) -> List[int]:
+        """Delete a task and all its subtasks, returning the deleted ids"""
+        deleted = self.storage.delete_subtree(task_id)
+        for deleted_id in deleted:
+            self._sync_reminder(deleted_id)
+        return deleted
 
-        return self.storage.add_task(title.strip(), description.strip())
+    def find_duplicate(self, title: str, description: str = "",
+                       threshold: Optional[float] = None) -> Optional[Task]:
+        """
+        Get the task that a task with this title and description would duplicate
+        threshold defaults to dedupe.DEFAULT_THRESHOLD.
+        """
+        if threshold is None:
+            from .dedupe import DEFAULT_THRESHOLD as threshold
+        task_id = self.storage.dedupe_index.find(title, description, self.storage._tasks, threshold)
+        return self.storage.get_task(task_id) if task_id is not None else None
+
+    def duplicate_groups(self, threshold: Optional[float] = None) -> List[List[Task]]:
+        """Get groups of duplicate tasks, each ordered by id (threshold: see find_duplicate)"""
+        if threshold is None:
+            from .dedupe import DEFAULT_THRESHOLD as threshold
+        if not 0 < threshold <= 1:
+            raise ValueError("Similarity threshold must be between 0 and 1")
+        groups = self.storage.dedupe_index.groups(self.storage._tasks, threshold)
+        return [[self.storage.get_task(task_id) for task_id in group] for group in groups]
+
+    def merge_tasks(self, keep_id: int, duplicate_ids: Iterable[int]) -> Optional[Task]:
+        """Merge duplicates into the task keep_id, deleting them"""
+        duplicate_ids = [task_id for task_id in duplicate_ids if task_id != keep_id]
+        task = self.storage.merge_tasks(keep_id, duplicate_ids)
+        if task is not None:
+            for task_id in [keep_id, *duplicate_ids]:
+                self._sync_reminder(task_id)
+        return task
+
+    def merge_duplicates(self, threshold: Optional[float] = None) -> int:
+        """Merge every duplicate group into its oldest task; returns the number of tasks removed"""
+        removed = 0
+        for group in self.duplicate_groups(threshold):
+            self.merge_tasks(group[0].id, [task.id for task in group[1:]])
+            removed += len(group) - 1
+        return removed
+
+    def import_tasks(self, path: str, workers: Optional[int] = None) -> ImportResult:
+        """Import tasks from a JSON Lines file, parsing chunks in parallel"""
+        from .importer import import_file
+        return import_file(path, self.storage, workers=workers)
 
     def get_task(self, task_id: int) -> Optional[Task]:
         """Get a specific task by ID"""
@@ -28,9 +154,14 @@ class TaskManager:
         """Get all tasks"""
         return self.storage.get_all_tasks()
 
+    def query_tasks(self, tokens: Sequence[str]) -> QueryResult:
+        """Run a list query such as: where completed=false order by updated desc limit 5"""
+        from .query import execute_query, parse_query
+        return execute_query(parse_query(tokens), self.storage._tasks, self.storage)
+
     def update_task(self, task_id: int, title: str = None, description: str = None,
-                   completed: bool = None) -> bool:
-        """Update a task"""
+                    completed: bool = None, if_version: Optional[int] = None) -> bool:
+        """Update a task; with if_version, only if it is still at that version (else VersionConflict)"""
         if title is not None and title.strip() == "":
             raise ValueError("Task title cannot be empty")
 
@@ -39,22 +170,85 @@ class TaskManager:
         if description is not None:
             description = description.strip()
 
-        return self.storage.update_task(task_id, title, description, completed)
+        success = self.storage.update_task(task_id, title, description, completed, if_version=if_version)
+        if success and completed is not None:
+            self._sync_reminder(task_id)
+        return success
 
-    def delete_task(self, task_id: int) -> bool:
-        """Delete a task"""
-        return self.storage.delete_task(task_id)
+    def delete_task(self, task_id: int, if_version: Optional[int] = None) -> bool:
+        """Delete a task; with if_version, only if it is still at that version (else VersionConflict)"""
+        success = self.storage.delete_task(task_id, if_version=if_version)
+        if success:
+            self._sync_reminder(task_id)
+        return success
 
     def mark_completed(self, task_id: int) -> bool:
         """Mark a task as completed"""
-        return self.storage.mark_completed(task_id)
+        success = self.storage.mark_completed(task_id)
+        if success:
+            self._sync_reminder(task_id)
+        return success
 
     def mark_incomplete(self, task_id: int) -> bool:
         """Mark a task as incomplete"""
-        return self.storage.mark_incomplete(task_id)
+        success = self.storage.mark_incomplete(task_id)
+        if success:
+            self._sync_reminder(task_id)
+        return success
+
+    def set_memory_budget(self, budget: Optional[int], path: Optional[str] = None):
+        """Cap resident task memory in bytes, spilling cold completed tasks to disk (None lifts the cap)"""
+        self.storage.set_memory_budget(budget, path)
+
+    def memory_stats(self) -> Optional[MemoryStats]:
+        """Residency and paging counters, or None when no budget is set"""
+        return self.storage.memory_stats()
+
+    def string_stats(self) -> StringStats:
+        """Memory held by titles and descriptions, and what interning and compression save"""
+        from .strings import string_stats
+        return string_stats(self.storage.iter_tasks())
+
+    def report(self, use_numpy: Optional[bool] = None) -> Report:
+        """Completion rates per day, median time to complete and backlog ages over all tasks"""
+        from .analytics import build_report
+        return build_report(self.storage.columns, self.storage.clock.now_us(), use_numpy)
 
     def get_next_id(self) -> int:
         """Get the next available ID (for UI purposes)"""
         if not self.storage._tasks:
             return 1
-        return max(self.storage._tasks.keys()) + 1
\ No newline at end of file
+        return max(self.storage._tasks.keys()) + 1
+
+    def add_tags(self, task_id: int, tags: Iterable[str]) -> bool:
+        """Attach tags to a task"""
+        return self.storage.add_tags(task_id, normalize_tags(tags))
+
+    def remove_tags(self, task_id: int, tags: Iterable[str]) -> bool:
+        """Detach tags from a task"""
+        return self.storage.remove_tags(task_id, normalize_tags(tags))
+
+    def set_priority(self, task_id: int, priority: str) -> bool:
+        """Set a task's priority (low, medium or high)"""
+        priority = priority.strip().lower()
+        if priority not in PRIORITIES:
+            raise ValueError(f"Priority must be one of: {', '.join(PRIORITIES)}")
+        return self.storage.set_priority(task_id, priority)
+
+    def set_due(self, task_id: int, due_at: Optional[datetime]) -> bool:
+        """Set or clear (None) a task's due date"""
+        success = self.storage.set_due(task_id, due_at)
+        if success:
+            self._sync_reminder(task_id)
+        return success
+
+    def overdue_tasks(self, tag: Optional[str] = None, priority: Optional[str] = None,
+                      limit: int = 20, now: Optional[datetime] = None) -> List[Task]:
+        """Get the next overdue tasks, earliest due first"""
+        if tag is not None:
+            tag = normalize_tags([tag])[0]
+        if priority is not None:
+            priority = priority.strip().lower()
+            if priority not in PRIORITIES:
+                raise ValueError(f"Priority must be one of: {', '.join(PRIORITIES)}")
+        return self.storage.overdue_tasks(now or self.storage.clock.now(), tag, priority, limit)
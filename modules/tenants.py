@@ -0,0 +1,348 @@
+"""
+Tenants module for the Todo Console Application
+Isolated task namespaces with lazy loading, eviction and per-namespace quotas
+
+Each namespace is its own TaskManager: its own InMemoryStorage, id
+allocator, indexes and event log, so ids and queries never cross lists.
+Namespaces are created on first use. At most `max_loaded` stay in memory;
+past that the least recently used one is written to a snapshot file (in a
+temporary directory unless one is given) and dropped, and it is read back
+the next time it is used. The active namespace is never evicted, nor is one
+pinned by something still serving it (a change feed, replication leader or
+snapshot publisher).
+
+A Quota caps what one namespace may consume. `ops_per_second` (with a
+`burst` allowance) is a token bucket charged once per admitted command;
+`max_bytes` becomes the namespace's memory budget, so cold completed tasks
+spill to disk, and once pending tasks alone fill it, commands that add
+tasks are refused. Refusals raise QuotaExceeded and are counted.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from .ratelimit import TokenBucket
+
+# Annotation-only imports (see storage.py)
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from datetime import datetime
+    from typing import Callable, Dict, List, Optional
+    from .scheduler import ReminderScheduler
+    from .tasks import TaskManager
+
+DEFAULT_NAMESPACE = 'default'
+# Namespaces kept in memory before the least recently used is snapshotted to disk
+DEFAULT_MAX_LOADED = 8
+# Names double as snapshot file names
+NAME_PATTERN = re.compile(r'[A-Za-z0-9][A-Za-z0-9_-]{0,63}')
+
+
+class QuotaExceeded(ValueError):
+    """A namespace ran past its ops/s or memory quota"""
+
+    def __init__(self, namespace: str, reason: str):
+        super().__init__(f"List '{namespace}' is over its {reason}")
+        self.namespace = namespace
+        self.reason = reason
+
+
+@dataclass(frozen=True)
+class Quota:
+    """Limits for one namespace; None means unlimited"""
+    max_bytes: Optional[int] = None
+    ops_per_second: Optional[float] = None
+    burst: Optional[float] = None
+
+    def describe(self) -> str:
+        """Human-readable quota"""
+        from .spill import format_size
+        memory = "unlimited" if self.max_bytes is None else format_size(self.max_bytes)
+        if self.ops_per_second is None:
+            rate = "unlimited"
+        else:
+            rate = f"{self.ops_per_second:g} ops/s"
+            if self.burst is not None:
+                rate += f" (burst {self.burst:g})"
+        return f"memory {memory}, rate {rate}"
+
+
+def check_name(name: str) -> str:
+    """Return `name` if it is a valid namespace name, otherwise raise ValueError"""
+    if not NAME_PATTERN.fullmatch(name):
+        raise ValueError("List names are 1-64 letters, digits, '-' or '_', starting with a letter or digit")
+    return name
+
+
+class ScopedScheduler:
+    """
+    One namespace's view of a shared ReminderScheduler
+    Reminders are keyed by (namespace, task id), so one scheduler thread
+    serves every namespace without their task ids colliding.
+    """
+
+    __slots__ = ('scheduler', 'namespace')
+
+    def __init__(self, scheduler: ReminderScheduler, namespace: str):
+        self.scheduler = scheduler
+        self.namespace = namespace
+
+    def schedule(self, task_id: int, when: datetime):
+        """Add or move the reminder for a task"""
+        self.scheduler.schedule((self.namespace, task_id), when)
+
+    def cancel(self, task_id: int) -> bool:
+        """Cancel the reminder for a task, returning whether one was pending"""
+        return self.scheduler.cancel((self.namespace, task_id))
+
+
+class Namespace:
+    """A loaded namespace: its task manager, quota and admission counters"""
+
+    __slots__ = ('name', 'manager', 'quota', 'bucket', 'ops', 'rejected')
+
+    def __init__(self, name: str, manager: TaskManager, quota: Quota, clock: Callable[[], float]):
+        self.name = name
+        self.manager = manager
+        self.ops = 0
+        self.rejected = 0
+        self.quota = quota
+        self.bucket: Optional[TokenBucket] = None
+        self.apply_quota(quota, clock)
+
+    def __repr__(self) -> str:
+        return f"Namespace({self.name!r}, {len(self.manager.storage)} tasks)"
+
+    def apply_quota(self, quota: Quota, clock: Callable[[], float] = time.monotonic):
+        """Start enforcing `quota`"""
+        self.quota = quota
+        self.bucket = (None if quota.ops_per_second is None
+                       else TokenBucket(quota.ops_per_second, quota.burst, clock))
+        if quota.max_bytes is not None or self.manager.storage.memory_budget is not None:
+            self.manager.set_memory_budget(quota.max_bytes)
+
+    def memory_full(self) -> bool:
+        """Whether resident tasks fill the memory quota even after spilling"""
+        stats = self.manager.memory_stats()
+        return self.quota.max_bytes is not None and stats is not None and stats.resident_bytes >= stats.budget
+
+    def admit(self, grows: bool = False):
+        """
+        Charge one operation, raising QuotaExceeded if the namespace is over quota
+        `grows` marks operations that add tasks, which the memory quota can refuse.
+        """
+        if self.bucket is not None and not self.bucket.try_take():
+            self.rejected += 1
+            raise QuotaExceeded(self.name, f"rate quota of {self.quota.ops_per_second:g} ops/s")
+        if grows and self.memory_full():
+            self.rejected += 1
+            raise QuotaExceeded(self.name, "memory quota")
+        self.ops += 1
+
+
+class Namespaces:
+    """
+    Namespaces by name, created or loaded on use and evicted least recently used first
+    `factory(name)` builds an empty TaskManager for a namespace. `quota` is
+    given to namespaces without one of their own (see set_quota).
+    """
+
+    def __init__(self, factory: Callable[[str], TaskManager], max_loaded: int = DEFAULT_MAX_LOADED,
+                 directory: Optional[str] = None, quota: Quota = Quota(),
+                 clock: Callable[[], float] = time.monotonic):
+        if max_loaded < 1:
+            raise ValueError("At least one namespace must stay loaded")
+        self._factory = factory
+        self.max_loaded = max_loaded
+        self.directory = directory
+        self._own_directory = False
+        self.default_quota = quota
+        self._clock = clock
+        self._loaded: OrderedDict[str, Namespace] = OrderedDict()
+        self._snapshots: Dict[str, str] = {}
+        self._quotas: Dict[str, Quota] = {}
+        # Counters carried across evictions: name -> [ops, rejected]
+        self._counters: Dict[str, List[int]] = {}
+        # Pin counts of namespaces that must stay loaded
+        self._pins: Dict[str, int] = {}
+        self.current: Optional[str] = None
+        self.loads = 0
+        self.evictions = 0
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._loaded or name in self._snapshots
+
+    def __len__(self) -> int:
+        return len(self._loaded) + len(self._snapshots)
+
+    def names(self) -> List[str]:
+        """Every namespace, loaded or not, in name order"""
+        return sorted([*self._loaded, *self._snapshots])
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._loaded
+
+    def peek(self, name: str) -> Optional[Namespace]:
+        """A namespace if it is loaded, without loading it or changing the eviction order"""
+        return self._loaded.get(name)
+
+    def get(self, name: str) -> Namespace:
+        """A namespace, created or loaded if needed; it becomes the most recently used"""
+        namespace = self._loaded.get(name)
+        if namespace is not None:
+            self._loaded.move_to_end(name)
+            return namespace
+
+        check_name(name)
+        namespace = Namespace(name, self._factory(name), self.quota_for(name), self._clock)
+        path = self._snapshots.pop(name, None)
+        if path is not None:
+            self._restore(namespace, path)
+            self.loads += 1
+        self._loaded[name] = namespace
+        self._evict_over_limit(keep=name)
+        return namespace
+
+    def use(self, name: str) -> Namespace:
+        """Make `name` the current namespace, which is never evicted, and return it"""
+        namespace = self.get(name)
+        self.current = name
+        # The previous current namespace may now be evicted
+        self._evict_over_limit()
+        return namespace
+
+    def pin(self, name: str):
+        """Keep a loaded namespace in memory until a matching unpin()"""
+        if name not in self._loaded:
+            raise ValueError(f"List '{name}' is not loaded")
+        self._pins[name] = self._pins.get(name, 0) + 1
+
+    def unpin(self, name: str):
+        """Undo one pin() of a namespace"""
+        count = self._pins.get(name, 0) - 1
+        if count > 0:
+            self._pins[name] = count
+        else:
+            self._pins.pop(name, None)
+        self._evict_over_limit()
+
+    def is_pinned(self, name: str) -> bool:
+        return name in self._pins
+
+    def quota_for(self, name: str) -> Quota:
+        return self._quotas.get(name, self.default_quota)
+
+    def set_quota(self, name: str, quota: Quota):
+        """Give one namespace its own quota, effective immediately if it is loaded"""
+        check_name(name)
+        self._quotas[name] = quota
+        namespace = self._loaded.get(name)
+        if namespace is not None:
+            namespace.apply_quota(quota, self._clock)
+
+    def counters(self, name: str) -> List[int]:
+        """[ops admitted, ops rejected] for a namespace over its lifetime"""
+        namespace = self._loaded.get(name)
+        if namespace is not None:
+            return [namespace.ops, namespace.rejected]
+        return list(self._counters.get(name, (0, 0)))
+
+    def evict(self, name: str) -> bool:
+        """Snapshot a loaded namespace to disk and drop it, returning whether it was loaded"""
+        if name == self.current:
+            raise ValueError("The current list cannot be unloaded")
+        if name in self._pins:
+            raise ValueError(f"List '{name}' is in use and cannot be unloaded")
+        namespace = self._loaded.pop(name, None)
+        if namespace is None:
+            return False
+        self._snapshots[name] = self._save(namespace)
+        self._counters[name] = [namespace.ops, namespace.rejected]
+        namespace.manager.storage.close()
+        self.evictions += 1
+        return True
+
+    def _evict_over_limit(self, keep: Optional[str] = None):
+        """
+        Evict least recently used namespaces down to max_loaded
+        The current namespace, pinned ones and `keep` (one just loaded) are skipped.
+        """
+        while len(self._loaded) > self.max_loaded:
+            for name in self._loaded:
+                if name != self.current and name != keep and name not in self._pins:
+                    self.evict(name)
+                    break
+            else:
+                return
+
+    def _snapshot_path(self, name: str) -> str:
+        if self.directory is None:
+            import tempfile
+            self.directory = tempfile.mkdtemp(prefix="todo-lists-")
+            self._own_directory = True
+        return os.path.join(self.directory, f"{name}.snapshot")
+
+    def _save(self, namespace: Namespace) -> str:
+        """Write a namespace's tasks and id allocator to its snapshot file"""
+        import pickle
+        manager = namespace.manager
+        path = self._snapshot_path(namespace.name)
+        state = {'next_id': manager.storage.next_id, 'dedupe_on_add': manager.dedupe_on_add,
+                 'tasks': list(manager.storage.iter_tasks())}
+        with open(path, 'wb') as out:
+            pickle.dump(state, out, pickle.HIGHEST_PROTOCOL)
+        return path
+
+    def _restore(self, namespace: Namespace, path: str):
+        """Load a snapshot into a fresh namespace and delete the file"""
+        import pickle
+        with open(path, 'rb') as source:
+            state = pickle.load(source)
+        os.remove(path)
+        manager = namespace.manager
+        storage = manager.storage
+        for task in state['tasks']:
+            storage.upsert_task(task)
+        storage.reserve_ids(state['next_id'])
+        manager.dedupe_on_add = state['dedupe_on_add']
+        counters = self._counters.pop(namespace.name, None)
+        if counters is not None:
+            namespace.ops, namespace.rejected = counters
+
+    def close(self):
+        """Drop every namespace and remove snapshot files"""
+        for namespace in self._loaded.values():
+            namespace.manager.storage.close()
+        self._loaded.clear()
+        self._pins.clear()
+        for path in self._snapshots.values():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._snapshots.clear()
+        if self._own_directory:
+            import shutil
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+            self._own_directory = False
+
+    def describe(self) -> str:
+        """Human-readable table of namespaces"""
+        lines = [f"{'list':<20} {'state':<9} {'tasks':>8} {'ops':>8} {'rejected':>9}  quota"]
+        for name in self.names():
+            namespace = self._loaded.get(name)
+            ops, rejected = self.counters(name)
+            if namespace is None:
+                state, tasks = "unloaded", "-"
+            else:
+                state = "current" if name == self.current else "pinned" if name in self._pins else "loaded"
+                tasks = str(len(namespace.manager.storage))
+            lines.append(f"{name:<20} {state:<9} {tasks:>8} {ops:>8} {rejected:>9}  "
+                         f"{self.quota_for(name).describe()}")
+        return "\n".join(lines)
@@ -0,0 +1,189 @@
+"""
+Tracing module for the Todo Console Application
+Sampled timing spans across the CLI, service and storage layers
+
+A Tracer wraps the methods of live objects (instrument) so that each call
+records a span: its name, layer, start, duration and self time (duration
+minus the spans nested inside it). The outermost span of a call chain is a
+trace; each trace is sampled or not as it starts, and the spans below an
+unsampled trace cost only a depth counter. Nothing is wrapped, and so nothing
+is paid, until a tracer is attached.
+
+Spans are exported as Chrome trace-event JSON ("X" complete events), which
+chrome://tracing and Perfetto open directly; stats() sums them per span name.
+The item console (main.py) traces itself when the TODO_TRACE environment
+variable names an output file, sampling TODO_TRACE_SAMPLE of its requests.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from time import perf_counter_ns
+
+# Annotation-only imports (see storage.py)
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO, Tuple
+
+# Spans kept per tracer; later spans are counted as dropped
+MAX_SPANS = 1_000_000
+
+
+class _ThreadState(threading.local):
+    """Per-thread nesting state: depth, whether the current trace is sampled, child time stack"""
+
+    def __init__(self):
+        self.depth = 0
+        self.sampled = False
+        self.trace = 0
+        self.children: List[int] = []
+
+
+class Tracer:
+    """
+    Records sampled spans around wrapped calls
+    `sample_rate` is the fraction of traces recorded; `seed` makes the
+    sampling repeatable. Spans are (name, layer, start ns, duration ns, self
+    ns, thread id, trace number) tuples in the order they finish.
+    """
+
+    def __init__(self, sample_rate: float = 1.0, path: Optional[str] = None, seed: Optional[int] = None,
+                 max_spans: int = MAX_SPANS):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("Sample rate must be between 0 and 1")
+        self.sample_rate = sample_rate
+        self.path = path
+        self.max_spans = max_spans
+        self.spans: List[Tuple[str, str, int, int, int, int, int]] = []
+        self.traces = 0
+        self.sampled = 0
+        self.dropped = 0
+        self.origin = perf_counter_ns()
+        self._local = _ThreadState()
+        if sample_rate >= 1.0:
+            self._sample = lambda: True
+        else:
+            import random
+            draw = random.Random(seed).random
+            self._sample = lambda: draw() < sample_rate
+
+    @classmethod
+    def from_environ(cls) -> Optional[Tracer]:
+        """A tracer writing to TODO_TRACE at TODO_TRACE_SAMPLE, or None if TODO_TRACE is unset"""
+        path = os.environ.get('TODO_TRACE')
+        if not path:
+            return None
+        sample = os.environ.get('TODO_TRACE_SAMPLE', '1')
+        try:
+            return cls(float(sample), path)
+        except ValueError:
+            raise ValueError(f"TODO_TRACE_SAMPLE must be a number between 0 and 1, not {sample!r}") from None
+
+    def wrap(self, function: Callable, name: str, layer: str) -> Callable:
+        """`function` recording a span per call"""
+        tracer, local, clock, get_ident = self, self._local, perf_counter_ns, threading.get_ident
+
+        def traced(*args, **kwargs):
+            state = local.__dict__
+            depth = state['depth']
+            if not depth:
+                tracer.traces += 1
+                state['sampled'] = tracer._sample()
+                if state['sampled']:
+                    tracer.sampled += 1
+                    state['trace'] = tracer.traces
+            state['depth'] = depth + 1
+            if not state['sampled']:
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    state['depth'] = depth
+            children = state['children']
+            children.append(0)
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                duration = clock() - start
+                state['depth'] = depth
+                nested = children.pop()
+                if children:
+                    children[-1] += duration
+                if len(tracer.spans) < tracer.max_spans:
+                    tracer.spans.append((name, layer, start, duration, duration - nested, get_ident(),
+                                         state['trace']))
+                else:
+                    tracer.dropped += 1
+
+        traced.__name__ = getattr(function, '__name__', name)
+        traced.__doc__ = getattr(function, '__doc__', None)
+        traced.__wrapped__ = function
+        return traced
+
+    def instrument(self, obj, layer: str, names: Optional[Iterable[str]] = None):
+        """
+        Replace methods of `obj` (its public ones by default) with traced versions
+        Spans are named Class.method. Only this object is affected, not its
+        class; a generator method's span ends when the generator is returned.
+        """
+        cls = type(obj)
+        if names is None:
+            names = [name for name in dir(cls) if not name.startswith('_')
+                     and callable(getattr(cls, name)) and not isinstance(getattr(cls, name), type)]
+        for name in names:
+            method = getattr(obj, name)
+            setattr(obj, name, self.wrap(method, f"{cls.__name__}.{name}", layer))
+
+    def clear(self):
+        """Forget recorded spans and counters"""
+        self.spans = []
+        self.traces = self.sampled = self.dropped = 0
+
+    def stats(self) -> List[Tuple[str, str, int, float, float]]:
+        """(name, layer, calls, total ms, self ms) per span name, most total time first"""
+        totals: Dict[Tuple[str, str], List[int]] = {}
+        for name, layer, _, duration, own, _, _ in self.spans:
+            row = totals.get((name, layer))
+            if row is None:
+                totals[(name, layer)] = [1, duration, own]
+            else:
+                row[0] += 1
+                row[1] += duration
+                row[2] += own
+        rows = [(name, layer, calls, total / 1e6, own / 1e6) for (name, layer), (calls, total, own) in totals.items()]
+        return sorted(rows, key=lambda row: (-row[3], row[0]))
+
+    def describe(self) -> str:
+        """Human-readable per-span timing table"""
+        rows = self.stats()
+        if not rows:
+            return "No spans recorded"
+        lines = [f"Traces: {self.traces}, sampled: {self.sampled}, spans: {len(self.spans)}"
+                 + (f" ({self.dropped} dropped)" if self.dropped else ""),
+                 f"{'span':<32} {'layer':<8} {'calls':>7} {'total ms':>10} {'self ms':>10} {'mean us':>9}"]
+        lines.extend(f"{name:<32} {layer:<8} {calls:>7} {total:>10.2f} {own:>10.2f} {total / calls * 1000:>9.1f}"
+                     for name, layer, calls, total, own in rows)
+        return "\n".join(lines)
+
+    def chrome_events(self) -> List[Dict[str, Any]]:
+        """Spans as Chrome trace-event complete ("X") events, timestamps in microseconds"""
+        pid, origin = os.getpid(), self.origin
+        return [{'name': name, 'cat': layer, 'ph': 'X', 'ts': (start - origin) / 1000, 'dur': duration / 1000,
+                 'pid': pid, 'tid': thread, 'args': {'trace': trace, 'self_us': own / 1000}}
+                for name, layer, start, duration, own, thread, trace in sorted(self.spans, key=lambda span: span[2])]
+
+    def export(self, out: TextIO):
+        """Write the trace as Chrome trace-event JSON"""
+        import json
+        json.dump({'traceEvents': self.chrome_events(), 'displayTimeUnit': 'ms',
+                   'otherData': {'traces': self.traces, 'sampled': self.sampled, 'dropped': self.dropped}}, out)
+
+    def save(self, path: Optional[str] = None) -> str:
+        """Export to `path` (default: the tracer's path) and return the path"""
+        path = path or self.path
+        if not path:
+            raise ValueError("No trace file given")
+        with open(path, 'w', encoding='utf-8') as out:
+            self.export(out)
+        return path
@@ -3,9 +3,16 @@ Utilities module for the Todo Console Application
 Contains validation, formatting, and utility functions
 """
 
+from __future__ import annotations
+
 import re
-from typing import Tuple, Optional
-from .storage import Task
+from datetime import datetime
+
+# Annotation-only imports (see storage.py)
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Iterable, List, Optional, Tuple
+    from .storage import Task
 
 
 def validate_title(title: str) -> bool:
@@ -28,6 +35,36 @@ def validate_task_id(task_id: str) -> Tuple[bool, Optional[int]]:
         return False, None
 
 
+def parse_positive_int(value: str) -> Optional[int]:
+    """
+    Parse a count such as a worker count or a limit
+    Returns the integer, or None unless it is a positive whole number
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        return None
+    return number if number > 0 else None
+
+
+def normalize_tags(tags: Iterable[str]) -> List[str]:
+    """
+    Lowercase and de-duplicate tags, dropping a leading '#'
+    Raises ValueError for a tag that is not a string, or is empty or more than one word.
+    Shared by TaskManager and the item service so both front ends apply the same rules.
+    """
+    result = []
+    for tag in tags:
+        if not isinstance(tag, str):
+            raise ValueError("Tags must be non-empty single words")
+        tag = tag.strip().lower().lstrip('#')
+        if not tag or any(ch.isspace() for ch in tag):
+            raise ValueError("Tags must be non-empty single words")
+        if tag not in result:
+            result.append(tag)
+    return result
+
+
 def format_task(task: Task) -> str:
     """
     Format a task for display
@@ -36,19 +73,42 @@ def format_task(task: Task) -> str:
     return f"[{status}] {task.id}. {task.title}"
 
 
-def format_task_detailed(task: Task) -> str:
+def format_task_detailed(task: Task, progress: Optional[Tuple[int, int]] = None) -> str:
     """
     Format a task with detailed information
+    `progress` is (completed, total) subtasks, shown when there are any
     """
     status = "Completed" if task.completed else "Pending"
-    return (
+    text = (
         f"ID: {task.id}\n"
         f"Title: {task.title}\n"
         f"Description: {task.description or 'No description'}\n"
         f"Status: {status}\n"
+        f"Priority: {task.priority}\n"
+        f"Tags: {', '.join(task.tags) or 'None'}\n"
+        f"Due: {task.due_at.strftime('%Y-%m-%d %H:%M') if task.due_at else 'None'}\n"
         f"Created: {task.created_at.strftime('%Y-%m-%d %H:%M:%S')}\n"
-        f"Updated: {task.updated_at.strftime('%Y-%m-%d %H:%M:%S')}"
+        f"Updated: {task.updated_at.strftime('%Y-%m-%d %H:%M:%S')}\n"
+        f"Version: {task.version}"
     )
+    if task.parent_id is not None:
+        text += f"\nParent: {task.parent_id}"
+    if progress is not None and progress[1]:
+        text += f"\nSubtasks: {progress[0]}/{progress[1]} completed"
+    return text
+
+
+def parse_due(value: str) -> Tuple[bool, Optional[datetime]]:
+    """
+    Parse a due date (YYYY-MM-DD or YYYY-MM-DDTHH:MM) or 'none' to clear it
+    Returns (is_valid, parsed_datetime) tuple
+    """
+    if value.strip().lower() in ('none', 'clear'):
+        return True, None
+    try:
+        return True, datetime.fromisoformat(value.strip())
+    except ValueError:
+        return False, None
 
 
 def parse_command(user_input: str) -> Tuple[str, list]:
@@ -94,9 +154,14 @@ def parse_command(user_input: str) -> Tuple[str, list]:
 
 def is_valid_command(command: str) -> bool:
     """
-    Check if the command is valid
+    Check if the command is one of the commands from before the command registry
+    Front ends now look commands up in their CommandRegistry (see commands.py);
+    this fixed list is kept as the baseline for benchmarks/bench_dispatch.py
+    and is not extended with new commands.
     """
     valid_commands = {
-        'add', 'list', 'show', 'update', 'complete', 'incomplete', 'delete', 'help', 'quit', 'exit'
+        'add', 'list', 'show', 'update', 'complete', 'incomplete', 'delete', 'import',
+        'explain', 'cache', 'dedupe', 'merge', 'memory',
+        'tag', 'untag', 'priority', 'due', 'overdue', 'tail', 'replicate', 'help', 'quit', 'exit'
     }
-    return command in valid_commands
\ No newline at end of file
+    return command in valid_commands
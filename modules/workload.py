@@ -0,0 +1,343 @@
+"""
+Workload module for the Todo Console Application
+Generates, records and replays command traces for load testing
+
+A trace is a JSON Lines file of {"t": seconds since start, "command": line}
+records. Lines are what a user would type, so the same trace drives TodoCLI
+(modules/cli.py) and TodoConsoleApp (todo_console_app.py); ids assume a
+fresh store, where the n-th add creates task n.
+
+    python -m modules.workload generate -n 100000 --mix show=50,add=20 -o trace.jsonl
+    python -m modules.workload replay trace.jsonl --target console --speed max
+    python -m modules.workload record session.jsonl --target cli
+"""
+
+from __future__ import annotations
+
+import argparse
+import builtins
+import contextlib
+import json
+import math
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+
+# Annotation-only imports (see storage.py)
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+DEFAULT_MIX = {'add': 20, 'list': 5, 'show': 40, 'update': 15, 'complete': 15, 'delete': 5}
+TARGETS = ('cli', 'console')
+
+VERBS = ("call buy book email fix pay renew review send write clean plan order check "
+         "prepare schedule update finish draft read").split()
+WORDS = ("dentist groceries report invoice car insurance garden taxes flight hotel presentation "
+         "budget kitchen laptop passport meeting notes client team project the a to for and with "
+         "before after on at by next week today tomorrow monday friday urgent quick").split()
+
+
+@dataclass
+class TraceRecord:
+    """One command line and when it was issued, in seconds from the start"""
+    t: float
+    command: str
+
+
+@dataclass
+class Workload:
+    """
+    Shape of a synthetic command trace
+    `mix` weights each command. Ids are drawn Zipf-distributed over live tasks
+    (exponent `zipf`), most recently added first. Titles have a log-normal
+    word count; descriptions are empty with probability `empty_description`
+    and otherwise have a log-normal character length. `rate` is the mean
+    commands per second used for arrival times (Poisson arrivals).
+    """
+    mix: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    zipf: float = 1.1
+    title_words: float = 3.0
+    description_chars: float = 60.0
+    empty_description: float = 0.3
+    rate: float = 10.0
+    initial_tasks: int = 100
+
+    def __post_init__(self):
+        unknown = set(self.mix) - set(DEFAULT_MIX)
+        if unknown:
+            raise ValueError(f"Unknown commands in mix: {', '.join(sorted(unknown))}")
+        if not self.mix or any(weight < 0 for weight in self.mix.values()) or not sum(self.mix.values()):
+            raise ValueError("Command mix weights must be non-negative and not all zero")
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parse a mix such as 'add=20,show=50,list=5'"""
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        try:
+            mix[name.strip().lower()] = float(weight)
+        except ValueError:
+            raise ValueError(f"Invalid mix entry: {part!r}") from None
+    return mix
+
+
+def zipf_rank(rng: random.Random, n: int, s: float) -> int:
+    """Draw a rank in 1..n with probability roughly proportional to 1/rank**s"""
+    u = rng.random()
+    if abs(s - 1.0) < 1e-9:
+        return min(n, int(math.exp(u * math.log(n + 1))))
+    # Inverse CDF of the continuous approximation on [1, n + 1)
+    a = 1.0 - s
+    return min(n, int((((n + 1) ** a - 1) * u + 1) ** (1 / a)))
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(max(1, words)))
+
+
+def generate(count: int, workload: Optional[Workload] = None, seed: Optional[int] = None) -> List[TraceRecord]:
+    """
+    Build a trace of `count` commands (after `initial_tasks` adds)
+    Ids refer to tasks the trace itself created and has not deleted, so every
+    command is valid when replayed against a fresh store.
+    """
+    workload = workload or Workload()
+    rng = random.Random(seed)
+    names = list(workload.mix)
+    weights = [workload.mix[name] for name in names]
+    live: List[int] = []
+    next_id = 1
+    t = 0.0
+    trace = []
+
+    def title() -> str:
+        words = round(rng.lognormvariate(math.log(workload.title_words), 0.4))
+        return f"{rng.choice(VERBS).title()} {_text(rng, words - 1)}"
+
+    def description() -> str:
+        if rng.random() < workload.empty_description:
+            return ""
+        chars = rng.lognormvariate(math.log(workload.description_chars), 0.8)
+        return _text(rng, round(chars / 6))
+
+    def pick() -> int:
+        return live[-zipf_rank(rng, len(live), workload.zipf)]
+
+    for i in range(workload.initial_tasks + count):
+        name = 'add' if i < workload.initial_tasks or not live else rng.choices(names, weights)[0]
+        if name == 'add':
+            text = description()
+            command = f'add "{title()}"' + (f' "{text}"' if text else "")
+            live.append(next_id)
+            next_id += 1
+        elif name == 'list':
+            command = "list"
+        elif name == 'update':
+            command = f'update {pick()} "{title()}"'
+        elif name == 'delete':
+            task_id = pick()
+            live.remove(task_id)
+            command = f"delete {task_id}"
+        else:
+            command = f"{name} {pick()}"
+        trace.append(TraceRecord(round(t, 6), command))
+        t += rng.expovariate(workload.rate)
+    return trace
+
+
+def save_trace(trace: Iterable[TraceRecord], path: str):
+    """Write a trace as JSON Lines"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in trace:
+            f.write(json.dumps({'t': record.t, 'command': record.command}) + "\n")
+
+
+def load_trace(path: str) -> List[TraceRecord]:
+    """Read a JSON Lines trace"""
+    trace = []
+    with open(path, encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+                trace.append(TraceRecord(float(data['t']), str(data['command'])))
+            except (ValueError, KeyError, TypeError):
+                raise ValueError(f"Line {line_no}: expected {{\"t\": seconds, \"command\": text}}") from None
+    return trace
+
+
+def make_target(name: str) -> Callable[[str], None]:
+    """Build a fresh front end and return a function running one command line on it"""
+    if name == 'cli':
+        from .admission import AdmissionController
+        from .cli import TodoCLI
+        # Replays measure the front end itself, so no client rate limits (the work queue stays)
+        return TodoCLI(AdmissionController(limits={})).process_command
+    if name == 'console':
+        from todo_console_app import TodoConsoleApp
+        app = TodoConsoleApp()
+        return lambda line: app.execute(*app.parse_command(line))
+    raise ValueError(f"Target must be one of: {', '.join(TARGETS)}")
+
+
+def percentile(ordered: List[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(p / 100 * len(ordered)) - 1))]
+
+
+@dataclass
+class ReplayReport:
+    """Throughput and latency of a replayed trace"""
+    seconds: float = 0.0
+    latencies: Dict[str, List[float]] = field(default_factory=dict)
+
+    @property
+    def commands(self) -> int:
+        """Commands replayed"""
+        return sum(map(len, self.latencies.values()))
+
+    @property
+    def throughput(self) -> float:
+        """Commands per second of wall time"""
+        return self.commands / self.seconds if self.seconds else 0.0
+
+    def describe(self) -> str:
+        """Table of latency percentiles in microseconds, per command and overall"""
+        rows = sorted(self.latencies.items())
+        rows.append(('all', [value for _, values in rows for value in values]))
+        lines = [f"{self.commands} commands in {self.seconds:.2f} s: {self.throughput:,.0f} commands/s",
+                 f"{'command':<10}{'count':>8}{'p50 us':>10}{'p90 us':>10}{'p99 us':>10}{'max us':>10}"]
+        for name, values in rows:
+            ordered = sorted(values)
+            cells = "".join(f"{percentile(ordered, p) * 1e6:>10.1f}" for p in (50, 90, 99, 100))
+            lines.append(f"{name:<10}{len(values):>8}{cells}")
+        return "\n".join(lines)
+
+
+def replay(trace: Iterable[TraceRecord], execute: Callable[[str], None],
+           speed: Optional[float] = None, output=None) -> ReplayReport:
+    """
+    Run a trace through a front end and time every command
+    With a speed, commands are issued at their recorded times divided by it
+    (1.0 reproduces the original pacing); without one they run back to back.
+    Command output goes to `output`, by default the null device, so it is
+    formatted but does not flood the terminal.
+    """
+    report = ReplayReport()
+    sink = output if output is not None else open(os.devnull, 'w')
+    clock = time.perf_counter
+    try:
+        with contextlib.redirect_stdout(sink):
+            start = clock()
+            for record in trace:
+                if speed:
+                    delay = start + record.t / speed - clock()
+                    if delay > 0:
+                        time.sleep(delay)
+                name = record.command.split(' ', 1)[0].lower()
+                began = clock()
+                execute(record.command)
+                report.latencies.setdefault(name, []).append(clock() - began)
+            report.seconds = clock() - start
+    finally:
+        if output is None:
+            sink.close()
+    return report
+
+
+@contextlib.contextmanager
+def recording(path: str) -> Iterator[List[TraceRecord]]:
+    """
+    Record every line read through input() while the block runs
+    The trace is saved to `path` when the block exits, however it exits.
+    """
+    trace: List[TraceRecord] = []
+    original = builtins.input
+    start = time.perf_counter()
+
+    def recorded_input(prompt: str = "") -> str:
+        line = original(prompt)
+        if line.strip() and line.split()[0].lower() not in ('quit', 'exit'):
+            trace.append(TraceRecord(round(time.perf_counter() - start, 6), line.strip()))
+        return line
+
+    builtins.input = recorded_input
+    try:
+        yield trace
+    finally:
+        builtins.input = original
+        save_trace(trace, path)
+
+
+def record_session(path: str, target: str) -> int:
+    """Run an interactive front end, recording the session to a trace file"""
+    if target == 'cli':
+        from .cli import TodoCLI
+        app = TodoCLI()
+    elif target == 'console':
+        from todo_console_app import TodoConsoleApp
+        app = TodoConsoleApp()
+    else:
+        raise ValueError(f"Target must be one of: {', '.join(TARGETS)}")
+    with recording(path) as trace:
+        app.run()
+    print(f"Recorded {len(trace)} command(s) to {path}")
+    return len(trace)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point: generate, replay or record traces"""
+    parser = argparse.ArgumentParser(prog="python -m modules.workload", description=__doc__.split("\n")[1])
+    commands = parser.add_subparsers(dest='action', required=True)
+
+    gen = commands.add_parser('generate', help="write a synthetic trace")
+    gen.add_argument('-n', '--count', type=int, default=10_000, help="commands after the initial adds")
+    gen.add_argument('--mix', default=",".join(f"{k}={v}" for k, v in DEFAULT_MIX.items()),
+                     help="command weights, e.g. add=20,show=40")
+    gen.add_argument('--zipf', type=float, default=1.1, help="id popularity exponent")
+    gen.add_argument('--initial', type=int, default=100, help="tasks added before the mix starts")
+    gen.add_argument('--rate', type=float, default=10.0, help="mean commands per second for timestamps")
+    gen.add_argument('--title-words', type=float, default=3.0, help="median title length in words")
+    gen.add_argument('--description-chars', type=float, default=60.0, help="median description length")
+    gen.add_argument('--seed', type=int, default=None)
+    gen.add_argument('-o', '--output', required=True)
+
+    rep = commands.add_parser('replay', help="run a trace and report latency")
+    rep.add_argument('trace')
+    rep.add_argument('--target', choices=TARGETS, default='cli')
+    rep.add_argument('--speed', default='max', help="'max' or a multiple of recorded pacing, e.g. 1")
+
+    rec = commands.add_parser('record', help="record an interactive session")
+    rec.add_argument('trace')
+    rec.add_argument('--target', choices=TARGETS, default='cli')
+
+    args = parser.parse_args(argv)
+    try:
+        if args.action == 'generate':
+            workload = Workload(mix=parse_mix(args.mix), zipf=args.zipf, initial_tasks=args.initial,
+                                rate=args.rate, title_words=args.title_words,
+                                description_chars=args.description_chars)
+            trace = generate(args.count, workload, args.seed)
+            save_trace(trace, args.output)
+            print(f"Wrote {len(trace)} commands to {args.output}")
+        elif args.action == 'replay':
+            speed = None if args.speed == 'max' else float(args.speed)
+            report = replay(load_trace(args.trace), make_target(args.target), speed)
+            print(report.describe())
+        else:
+            record_session(args.trace, args.target)
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
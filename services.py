@@ -1,8 +1,16 @@
-from datetime import datetime
-from typing import List, Optional
+from __future__ import annotations
+
 from models import Item
+from modules.storage import PRIORITIES
+from modules.utils import normalize_tags
 from storage import InMemoryStorage
 
+# Annotation-only imports (see storage.py)
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from datetime import datetime
+    from typing import Any, Callable, Dict, Iterator, List, Optional
+
 
 class ItemService:
     """
@@ -12,19 +20,33 @@ class ItemService:
     def __init__(self, storage: InMemoryStorage):
         self.storage = storage
 
-    def create_item(self, title: str, description: str) -> Item:
+    @property
+    def generation(self) -> int:
+        """
+        Mutation counter of the underlying storage.
+
+        Returns:
+            A number that changes whenever any item is created, updated or deleted
+        """
+        return self.storage.generation
+
+    def create_item(self, title: str, description: str, tags: Optional[List[str]] = None,
+                    priority: str = 'medium', due_at: Optional[datetime] = None) -> Item:
         """
         Create a new item with validation.
 
         Args:
             title: Title of the item
             description: Description of the item
+            tags: Labels for the item (optional)
+            priority: 'low', 'medium' or 'high' (default 'medium')
+            due_at: When the item is due (optional)
 
         Returns:
             The created item
 
         Raises:
-            ValueError: If title is invalid
+            ValueError: If title, tags or priority are invalid
         """
         if not title or not title.strip():
             raise ValueError("Title cannot be empty")
@@ -33,7 +55,10 @@ class ItemService:
             id=0,  # Will be assigned by storage
             title=title.strip(),
             description=description.strip() if description else "",
-            created_at=datetime.now()
+            created_at=self.storage.clock.now_us(),
+            tags=normalize_tags(tags or []),
+            priority=priority,
+            due_at=due_at
         )
         return self.storage.create_item(item)
 
@@ -58,43 +83,126 @@ class ItemService:
         """
         return self.storage.get_all_items()
 
-    def update_item(self, item_id: int, title: Optional[str] = None, description: Optional[str] = None) -> Optional[Item]:
+    def iter_items(self) -> Iterator[Item]:
         """
-        Update an item.
+        Iterate over all items without building a list, e.g. for paging.
+
+        Returns:
+            An iterator over all items
+        """
+        return self.storage.iter_items()
+
+    def count(self) -> int:
+        """
+        Count all items.
+
+        Returns:
+            Number of items
+        """
+        return self.storage.count()
+
+    def update_item(self, item_id: int, title: Optional[str] = None, description: Optional[str] = None,
+                    tags: Optional[List[str]] = None, priority: Optional[str] = None,
+                    due_at: Optional[datetime] = None, if_version: Optional[int] = None) -> Optional[Item]:
+        """
+        Update an item in place; fields left as None keep their values (see patch_item).
 
         Args:
             item_id: ID of the item to update
             title: New title (optional)
             description: New description (optional)
+            tags: Replacement tags (optional)
+            priority: New priority (optional)
+            due_at: New due date (optional)
+            if_version: Version the item must be at for the update to apply (optional)
 
         Returns:
             Updated item if successful, None if item doesn't exist
+
+        Raises:
+            VersionConflict: If if_version is given and the item has been changed since
         """
-        existing_item = self.storage.get_item(item_id)
-        if not existing_item:
-            return None
+        fields = {name: value for name, value in (('title', title), ('description', description), ('tags', tags),
+                                                  ('priority', priority), ('due_at', due_at)) if value is not None}
+        return self.patch_item(item_id, if_version, **fields)
+
+    def patch_item(self, item_id: int, if_version: Optional[int] = None, **fields: Any) -> Optional[Item]:
+        """
+        Change some fields of an item in place.
 
-        # Use existing values if new values are not provided
-        new_title = title if title is not None else existing_item.title
-        new_description = description if description is not None else existing_item.description
+        Only the given fields are validated, and only the storage indexes over
+        fields whose value actually changes are updated; the names of those
+        fields are published with the change event.
 
-        updated_item = Item(
-            id=item_id,
-            title=new_title.strip() if new_title else "",
-            description=new_description.strip() if new_description else "",
-            created_at=existing_item.created_at  # Preserve original creation time
-        )
+        Args:
+            item_id: ID of the item to change
+            if_version: Version the item must be at for the change to apply (optional)
+            **fields: New values for title, description, tags, priority or due_at
+                (due_at=None clears the due date)
 
-        return self.storage.update_item(item_id, updated_item)
+        Returns:
+            The changed item, or None if the item doesn't exist
 
-    def delete_item(self, item_id: int) -> bool:
+        Raises:
+            ValueError: If a field is unknown or a value is invalid
+            VersionConflict: If if_version is given and the item has been changed since
+        """
+        changes = {}
+        for name, value in fields.items():
+            check = _FIELD_CHECKS.get(name)
+            if check is None:
+                raise ValueError(f"Unknown field: {name}")
+            changes[name] = check(value)
+        if self.storage.patch_item(item_id, changes, if_version) is None:
+            return None
+        return self.storage.get_item(item_id)
+
+    def delete_item(self, item_id: int, if_version: Optional[int] = None) -> bool:
         """
         Delete an item by ID.
 
         Args:
             item_id: ID of the item to delete
+            if_version: Version the item must be at for the delete to apply (optional)
 
         Returns:
             True if deletion was successful, False if item doesn't exist
+
+        Raises:
+            VersionConflict: If if_version is given and the item has been changed since
         """
-        return self.storage.delete_item(item_id)
\ No newline at end of file
+        return self.storage.delete_item(item_id, if_version)
+
+
+def _check_title(title: Any) -> str:
+    if not isinstance(title, str) or not title.strip():
+        raise ValueError("Title cannot be empty")
+    return title.strip()
+
+
+def _check_description(description: Any) -> str:
+    if not isinstance(description, str):
+        raise ValueError("Description must be a string")
+    return description.strip()
+
+
+def _check_tags(tags: Any) -> List[str]:
+    if not isinstance(tags, (list, tuple)):
+        raise ValueError("Tags must be a list of non-empty single words")
+    return normalize_tags(tags)
+
+
+def _check_priority(priority: Any) -> str:
+    if priority not in PRIORITIES:
+        raise ValueError(f"Priority must be one of: {', '.join(PRIORITIES)}")
+    return priority
+
+
+# Validation and normalization per patchable field; due dates are checked when stored
+_FIELD_CHECKS: Dict[str, Callable[[Any], Any]] = {
+    'title': _check_title,
+    'description': _check_description,
+    'tags': _check_tags,
+    'priority': _check_priority,
+    'due_at': lambda due_at: due_at,
+}
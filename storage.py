@@ -1,15 +1,58 @@
-from typing import Dict, List, Optional
+from __future__ import annotations
+
 from models import Item
+from modules.storage import InMemoryStorage as TaskStore
+
+# typing costs several milliseconds to import and annotations are never evaluated
+# at runtime here, so its names are only imported for type checkers
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, FrozenSet, Iterator, List, Optional
+    from modules.clock import SystemClock
+    from modules.events import EventBus
 
 
 class InMemoryStorage:
     """
     In-memory storage for items using Python data structures.
+
+    Items live in the shared task engine (modules.storage), which provides the
+    id counter, generation, change events and secondary indexes.
     """
 
-    def __init__(self):
-        self._items: Dict[int, Item] = {}
-        self._next_id: int = 1
+    def __init__(self, clock: Optional[SystemClock] = None):
+        self.engine = TaskStore(clock)
+
+    @property
+    def clock(self) -> SystemClock:
+        """
+        Time source used to stamp items.
+
+        Returns:
+            The engine's clock (the system clock unless one was injected)
+        """
+        return self.engine.clock
+
+    @property
+    def generation(self) -> int:
+        """
+        Mutation counter, bumped on every change so caches can tell when results are stale.
+
+        Returns:
+            The engine's current generation
+        """
+        return self.engine.generation
+
+    @property
+    def events(self) -> EventBus:
+        """
+        Change event stream for this storage.
+
+        Returns:
+            The EventBus publishing every mutation, with sequence numbers counted
+            from the first mutation even if nobody subscribed before
+        """
+        return self.engine.events
 
     def create_item(self, item: Item) -> Item:
         """
@@ -21,10 +64,7 @@ class InMemoryStorage:
         Returns:
             The created item with assigned ID
         """
-        item.id = self._next_id
-        self._items[self._next_id] = item
-        self._next_id += 1
-        return item
+        return self.engine.insert_task(item)
 
     def get_item(self, item_id: int) -> Optional[Item]:
         """
@@ -36,7 +76,7 @@ class InMemoryStorage:
         Returns:
             The item if found, None otherwise
         """
-        return self._items.get(item_id)
+        return self.engine.get_task(item_id)
 
     def get_all_items(self) -> List[Item]:
         """
@@ -45,42 +85,86 @@ class InMemoryStorage:
         Returns:
             List of all items
         """
-        return list(self._items.values())
+        return self.engine.get_all_tasks()
 
-    def update_item(self, item_id: int, updated_item: Item) -> Optional[Item]:
+    def iter_items(self) -> Iterator[Item]:
+        """
+        Iterate over items without copying them.
+
+        Returns:
+            An iterator over all items in ID order
+        """
+        return self.engine.iter_tasks()
+
+    def count(self) -> int:
+        """
+        Count stored items.
+
+        Returns:
+            Number of items
+        """
+        return len(self.engine)
+
+    def update_item(self, item_id: int, updated_item: Item, if_version: Optional[int] = None) -> Optional[Item]:
         """
         Update an existing item.
 
+        The item's title, description, tags, priority and due date are replaced
+        by updated_item's. Its ID, creation time, completion, parent and version
+        count are kept, and the version is bumped if anything changed. The
+        version check and the change happen under the item's lock stripe.
+
         Args:
             item_id: The ID of the item to update
             updated_item: The updated item data
+            if_version: Version the item must be at (optional)
 
         Returns:
             The updated item if successful, None if item doesn't exist
+
+        Raises:
+            VersionConflict: If if_version is given and the item is at another version
         """
-        if item_id not in self._items:
+        changes = {'title': updated_item.title, 'description': updated_item.description,
+                   'tags': list(updated_item.tags), 'priority': updated_item.priority,
+                   'due_at': updated_item.due_us}
+        if self.engine.patch_task(item_id, changes, if_version) is None:
             return None
+        return self.engine.get_task(item_id)
 
-        # Preserve the original ID
-        updated_item.id = item_id
-        self._items[item_id] = updated_item
-        return updated_item
+    def patch_item(self, item_id: int, changes: Dict[str, Any],
+                   if_version: Optional[int] = None) -> Optional[FrozenSet[str]]:
+        """
+        Change fields of an item in place.
+
+        Args:
+            item_id: The ID of the item to change
+            changes: New values by field name (already validated)
+            if_version: Version the item must be at (optional)
+
+        Returns:
+            Names of the fields that changed, or None if the item doesn't exist
 
-    def delete_item(self, item_id: int) -> bool:
+        Raises:
+            VersionConflict: If if_version is given and the item is at another version
+        """
+        return self.engine.patch_task(item_id, changes, if_version)
+
+    def delete_item(self, item_id: int, if_version: Optional[int] = None) -> bool:
         """
         Delete an item by ID.
 
         Args:
             item_id: The ID of the item to delete
+            if_version: Version the item must be at (optional)
 
         Returns:
             True if deletion was successful, False if item doesn't exist
-        """
-        if item_id not in self._items:
-            return False
 
-        del self._items[item_id]
-        return True
+        Raises:
+            VersionConflict: If if_version is given and the item is at another version
+        """
+        return self.engine.delete_task(item_id, if_version=if_version)
 
     def get_next_id(self) -> int:
         """
@@ -89,4 +173,4 @@ class InMemoryStorage:
         Returns:
             The next ID that will be assigned
         """
-        return self._next_id
\ No newline at end of file
+        return self.engine._next_id
@@ -0,0 +1,179 @@
+"""
+Unit tests for per-client rate limits, cost-weighted admission and the work queue
+"""
+
+import threading
+import time
+
+import pytest
+
+from modules.admission import AdmissionController, Limit, Overloaded, scan_cost
+from modules.cli import TodoCLI
+from modules.clock import ManualClock
+
+
+class TestRateLimits:
+    """Test token buckets per client and class"""
+
+    def test_costs_and_classes(self):
+        """Test expensive commands drain their class's bucket and leave other classes and clients alone"""
+        clock = ManualClock()
+        admission = AdmissionController({'read': Limit(10, 10), 'scan': Limit(100, 150)}, clock=clock.seconds)
+        with admission.admit("script", 'scan', scan_cost(100_000)):
+            pass
+        with pytest.raises(Overloaded) as error:
+            admission.admit("script", 'scan', scan_cost(100_000))
+        assert error.value.retry_after == pytest.approx(0.52)
+        for _ in range(10):
+            with admission.admit("script", 'read'):
+                pass
+        with admission.admit("person", 'scan', scan_cost(100_000)):
+            pass
+        with admission.admit("script", 'write', 1000):
+            pass  # unlimited class
+        clock.advance(0.52)
+        with admission.admit("script", 'scan', scan_cost(100_000)):
+            pass
+        stats = admission.stats("script")
+        assert (stats.admitted, stats.rejected, stats.queued, stats.shed) == (13, 1, 0, 0)
+        assert admission.stats("nobody").admitted == 0
+
+    def test_cost_above_burst_waits_for_full_bucket(self):
+        """Test a command dearer than the burst runs whenever the bucket is full"""
+        clock = ManualClock()
+        admission = AdmissionController({'scan': Limit(10, 20)}, clock=clock.seconds)
+        with admission.admit("a", 'scan', 500):
+            pass
+        with pytest.raises(Overloaded):
+            admission.admit("a", 'scan', 500)
+        clock.advance(2)
+        with admission.admit("a", 'scan', 500):
+            pass
+
+    def test_set_limit(self):
+        """Test changing a limit applies to existing clients and bad limits are refused"""
+        admission = AdmissionController({'read': Limit(1, 1)})
+        with admission.admit("a", 'read'):
+            pass
+        with pytest.raises(Overloaded):
+            admission.admit("a", 'read')
+        admission.set_limit('read', None)
+        with admission.admit("a", 'read'):
+            pass
+        with pytest.raises(ValueError):
+            admission.set_limit('read', Limit(0))
+
+
+class TestWorkQueue:
+    """Test queueing and load shedding of concurrent requests"""
+
+    def test_queue_then_shed(self):
+        """Test requests beyond the running slot queue in order, and beyond the queue are shed"""
+        admission = AdmissionController({'scan': Limit(1000, 1000)}, max_running=1, max_queued=2, max_wait=5)
+        order = []
+        slot = admission.admit("a", 'scan', 10)
+        threads = []
+        for name in ("b", "c"):
+            def run(client=name):
+                with admission.admit(client, 'scan', 10):
+                    order.append(client)
+            thread = threading.Thread(target=run)
+            thread.start()
+            threads.append(thread)
+            while admission.waiting < len(threads):
+                time.sleep(0.001)
+        with pytest.raises(Overloaded) as error:
+            admission.admit("d", 'scan', 10)
+        assert "queue is full" in str(error.value)
+        with slot:
+            pass
+        for thread in threads:
+            thread.join()
+        assert order == ["b", "c"] and admission.running == 0 and admission.waiting == 0
+        assert admission.stats("b").queued == 1 and admission.stats("d").shed == 1
+        # A shed request's tokens are refunded
+        assert admission._buckets[("d", 'scan')].tokens == pytest.approx(1000, abs=1)
+
+    def test_wait_timeout_sheds(self):
+        """Test a request waiting longer than max_wait is shed and leaves the queue"""
+        admission = AdmissionController({}, max_wait=0.01)
+        with admission.admit("a", 'read'):
+            with pytest.raises(Overloaded) as error:
+                admission.admit("b", 'read')
+        assert "waited" in str(error.value) and admission.waiting == 0
+        with admission.admit("b", 'read'):
+            assert admission.running == 1
+
+
+class TestAdmissionCommands:
+    """Test admission through TodoCLI.process_command"""
+
+    def test_list_costs_more_than_show(self, capsys):
+        """Test a flood of big lists is rejected while shows and other clients still run"""
+        cli = TodoCLI()
+        cli.task_manager.storage.add_tasks((f"Task {i}", "", False) for i in range(10_000))
+        cli.process_command("admission scan 11 22")
+        capsys.readouterr()
+        cli.process_command("list", client="script")
+        capsys.readouterr()
+        cli.process_command("list", client="script")  # cached: 1 token
+        cli.process_command("add \"More\"", client="script")
+        capsys.readouterr()
+        cli.process_command("list", client="script")
+        out = capsys.readouterr().out
+        assert "Error: Too busy to run this for 'script': scan rate limit of 11 tokens/s (burst 22) (this costs 11" in out
+        cli.process_command("show 1", client="script")
+        assert "Task 0" in capsys.readouterr().out
+        cli.process_command("list where completed=true", client="person")
+        assert "No tasks found" in capsys.readouterr().out
+        cli.process_command("admission")
+        out = capsys.readouterr().out
+        assert "scan 11 tokens/s (burst 22)" in out
+        assert "script" in out and "person" in out
+        script = cli.admission.stats("script")
+        assert (script.admitted, script.rejected) == (4, 1)
+
+    def test_admission_command_errors(self, capsys):
+        """Test bad admission arguments"""
+        cli = TodoCLI()
+        cli.process_command("admission bulk 5")
+        assert "Usage: admission" in capsys.readouterr().out
+        cli.process_command("admission read -1")
+        assert "Error: Rate must be positive" in capsys.readouterr().out
+        cli.process_command("admission read off")
+        assert "No rate limit for read commands" in capsys.readouterr().out
+
+    def test_limits_changed_only_from_console(self, capsys):
+        """Test other clients cannot lift rate limits or list quotas"""
+        cli = TodoCLI()
+        for command in ("admission read off", "admission", "quota rate 1000", "quota"):
+            cli.process_command(command, client="script")
+            assert f"Error: '{command.split()[0]}' can only be run from the console" in capsys.readouterr().out
+        assert cli.admission.limits['read'] == Limit(200, 500)
+        assert cli.namespace.quota.ops_per_second is None
+
+    def test_use_is_metered(self, capsys):
+        """Test creating a list is charged as a write and switching to an existing one as a read"""
+        cli = TodoCLI(AdmissionController({'write': Limit(1, 1), 'read': Limit(1, 1)}))
+        cli.process_command("use one", client="script")
+        assert "Created list 'one'" in capsys.readouterr().out
+        cli.process_command("use two", client="script")
+        assert "Error: Too busy to run this for 'script': write rate limit" in capsys.readouterr().out
+        assert "two" not in cli.namespaces
+        cli.process_command("use default", client="script")
+        cli.process_command("use one", client="script")
+        assert "read rate limit" in capsys.readouterr().out
+        assert cli.namespace.name == 'default'
+
+    def test_quota_refusal_refunds_tokens(self, capsys):
+        """Test a command refused by the list's quota is counted as rejected and its tokens returned"""
+        cli = TodoCLI(AdmissionController({'read': Limit(1, 5)}))
+        cli.process_command('add "Buy milk"')
+        cli.process_command("quota rate 0.001 1")
+        capsys.readouterr()
+        cli.process_command("show 1", client="script")
+        cli.process_command("show 1", client="script")
+        assert "over its rate quota" in capsys.readouterr().out
+        script = cli.admission.stats("script")
+        assert (script.admitted, script.rejected, script.tokens) == (1, 1, 1)
+        assert cli.admission._buckets[("script", 'read')].tokens == pytest.approx(4, abs=0.1)
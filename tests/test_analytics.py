@@ -0,0 +1,107 @@
+"""
+Unit tests for column-based analytics reports
+"""
+
+from datetime import date, datetime
+
+import pytest
+
+from modules.analytics import DAY_US, TaskColumns, build_report, load_numpy
+from modules.cli import TodoCLI
+from modules.clock import ManualClock, to_micros
+from modules.storage import InMemoryStorage
+
+BACKENDS = [False, pytest.param(True, marks=pytest.mark.skipif(not load_numpy(), reason="NumPy not installed"))]
+
+
+def store():
+    """Tasks created over three days, two of them completed after 1 and 3 hours"""
+    clock = ManualClock(datetime(2026, 3, 1, 9, 0))
+    storage = InMemoryStorage(clock)
+    for day, title in ((1, "Pay rent"), (1, "Buy milk"), (2, "Call mum"), (10, "Plan trip"), (10, "Read")):
+        clock.set(datetime(2026, 3, day, 9, 0))
+        storage.add_task(title)
+    clock.set(datetime(2026, 3, 1, 10, 0))
+    storage.mark_completed(1)
+    clock.set(datetime(2026, 3, 2, 12, 0))
+    storage.mark_completed(3)
+    clock.set(datetime(2026, 3, 10, 18, 0))
+    return storage
+
+
+class TestColumns:
+    """Test the column table tracks the engine"""
+
+    def test_columns_follow_mutations(self):
+        """Test adds, updates, batches and deletes reach built columns"""
+        storage = store()
+        columns = storage.columns
+        storage.update_task(2, title="Buy oat milk")
+        storage.add_tasks([("Batch", "", True)])
+        storage.delete_task(4)
+
+        rows = {task_id: (completed, length) for task_id, completed, length, live
+                in zip(columns.ids, columns.completed, columns.title_length, columns.alive) if live}
+        assert rows == {1: (1, 8), 2: (0, 12), 3: (1, 8), 5: (0, 4), 6: (1, 5)}
+        assert len(columns) == 5
+
+    def test_compaction(self):
+        """Test dead rows are dropped once they outnumber live ones"""
+        columns = TaskColumns()
+        storage = InMemoryStorage()
+        for i in range(10):
+            columns.put(storage.add_task(f"Task {i}"))
+        for task_id in range(1, 7):
+            columns.remove(task_id)
+        assert columns.dead == 0 and list(columns.ids) == [7, 8, 9, 10]
+
+
+class TestReport:
+    """Test the reports on both backends"""
+
+    @pytest.mark.parametrize("use_numpy", BACKENDS)
+    def test_report(self, use_numpy):
+        """Test per-day rates, median completion time and backlog ages"""
+        storage = store()
+        storage.delete_task(5)
+        report = build_report(storage.columns, storage.clock.now_us(), use_numpy)
+
+        assert (report.tasks, report.completed) == (4, 2)
+        assert report.per_day == [(date(2026, 3, 1), 2, 1), (date(2026, 3, 2), 1, 1), (date(2026, 3, 10), 1, 0)]
+        assert report.median_completion_us == 2 * 3600 * 1_000_000
+        assert dict(report.backlog_ages) == {'today': 1, '1-6 days': 0, '7-29 days': 1,
+                                             '30-89 days': 0, '90+ days': 0}
+        assert report.mean_title_length == pytest.approx(33 / 4)
+
+    def test_backends_agree(self):
+        """Test NumPy and Python reports match on a larger random store"""
+        if not load_numpy():
+            pytest.skip("NumPy not installed")
+        import random
+        rng = random.Random(4)
+        start = to_micros(datetime(2026, 1, 1))
+        storage = InMemoryStorage(ManualClock(start))
+        for i in range(2000):
+            storage.clock.set(start + rng.randrange(200 * DAY_US))
+            storage.add_task("x" * rng.randrange(1, 40))
+            if rng.random() < 0.5:
+                storage.mark_completed(i + 1)
+        for task_id in range(1, 2000, 7):
+            storage.delete_task(task_id)
+        now = start + 201 * DAY_US
+        fast, slow = build_report(storage.columns, now, True), build_report(storage.columns, now, False)
+        fast.backend = slow.backend
+        assert fast == slow
+
+    def test_report_command(self, capsys):
+        """Test the CLI prints the report"""
+        cli = TodoCLI()
+        cli.process_command('report')
+        assert "No tasks to report on." in capsys.readouterr().out
+        cli.process_command('add "Buy milk"')
+        cli.process_command('add "Walk dog"')
+        cli.process_command('complete 1')
+        cli.process_command('report 7')
+        out = capsys.readouterr().out
+        assert "Tasks: 2, completed: 1 (50.0%)" in out
+        assert "Backlog age" in out and "1 / 2" in out
@@ -0,0 +1,130 @@
+"""
+Unit tests for the list result cache and storage generation counters
+"""
+
+import pytest
+from modules.cache import ResultCache, normalize_query
+from modules.clock import ManualClock
+from modules.storage import InMemoryStorage
+from modules.cli import TodoCLI
+from storage import InMemoryStorage as ItemStorage
+from services import ItemService
+from cli import CLIInterface
+
+
+class TestResultCache:
+    """Test LRU, TTL and generation invalidation"""
+
+    def test_hit_and_generation_invalidation(self):
+        """Test entries only hit under the generation that produced them"""
+        cache = ResultCache()
+        cache.put("k", 1, "v")
+
+        assert cache.get("k", 1) == "v"
+        assert cache.get("k", 2) is None
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+        assert cache.stats.invalidations == 1
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted first"""
+        cache = ResultCache(max_entries=2)
+        cache.put("a", 0, 1)
+        cache.put("b", 0, 2)
+        cache.get("a", 0)
+        cache.put("c", 0, 3)
+
+        assert cache.get("b", 0) is None
+        assert cache.get("a", 0) == 1
+        assert cache.stats.evictions == 1
+
+    def test_ttl_expiry(self):
+        """Test entries expire after the TTL"""
+        clock = ManualClock()
+        cache = ResultCache(ttl=5, clock=clock.seconds)
+        cache.put("k", 0, "v")
+        clock.advance(4)
+        assert cache.get("k", 0) == "v"
+        clock.advance(6)
+        assert cache.get("k", 0) is None
+        assert cache.stats.expirations == 1
+
+    def test_normalize_query(self):
+        """Test equivalent queries share a key"""
+        assert normalize_query("LIST", ["WHERE", "completed=false"]) == normalize_query("list", ["where", "completed=false"])
+        assert normalize_query("list", ["where", "title=A"]) != normalize_query("list", ["where", "title=a"])
+        assert normalize_query("list", ["where", "title=a  b"]) != normalize_query("list", ["where", "title=a b"])
+
+    def test_spacing_inside_values_is_not_shared(self, capsys):
+        """Test a cached listing is not reused for a value differing only in spacing"""
+        cli = TodoCLI()
+        cli.process_command('add "a  b"')
+        cli.process_command('add "a b"')
+        cli.process_command('list where title="a  b"')
+        capsys.readouterr()
+        cli.process_command('list where title="a b"')
+        out = capsys.readouterr().out
+        assert "2. a b" in out and "1. a  b" not in out
+
+    def test_invalid_size(self):
+        """Test a non-positive size is rejected"""
+        with pytest.raises(ValueError):
+            ResultCache(max_entries=0)
+
+
+class TestGenerations:
+    """Test that every mutation bumps the store generation"""
+
+    def test_task_storage_generation(self):
+        """Test modules.storage mutations bump the generation"""
+        storage = InMemoryStorage()
+        seen = [storage.generation]
+        storage.add_task("A")
+        seen.append(storage.generation)
+        storage.update_task(1, title="B")
+        seen.append(storage.generation)
+        storage.mark_completed(1)
+        seen.append(storage.generation)
+        storage.delete_task(1)
+        seen.append(storage.generation)
+        storage.delete_task(1)  # no-op
+
+        assert seen == sorted(set(seen))
+        assert storage.generation == seen[-1]
+
+    def test_item_storage_generation(self):
+        """Test storage.InMemoryStorage mutations bump the generation"""
+        service = ItemService(ItemStorage())
+        service.create_item("A", "")
+        service.update_item(1, title="B")
+        service.delete_item(1)
+        assert service.generation == 3
+
+
+class TestFrontEndCaching:
+    """Test the front ends serve repeated lists from the cache"""
+
+    def test_cli_list_cached_until_mutation(self, capsys):
+        """Test repeated lists hit and a mutation invalidates"""
+        cli = TodoCLI()
+        cli.process_command('add "Buy milk"')
+        cli.process_command('list')
+        cli.process_command('list')
+        assert cli.result_cache.stats.hits == 1
+
+        cli.process_command('add "Walk dog"')
+        capsys.readouterr()
+        cli.process_command('list')
+        assert "Walk dog" in capsys.readouterr().out
+        assert cli.result_cache.stats.invalidations == 1
+
+    def test_menu_list_cached(self, capsys):
+        """Test the menu CLI caches the item table"""
+        service = ItemService(ItemStorage())
+        interface = CLIInterface(service)
+        service.create_item("Buy milk", "")
+        interface.list_items()
+        interface.list_items()
+
+        assert interface.result_cache.stats.hits == 1
+        assert capsys.readouterr().out.count("Buy milk") == 2
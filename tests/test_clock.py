@@ -0,0 +1,171 @@
+"""
+Unit tests for the injectable clocks and epoch-microsecond timestamps
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from modules.clock import CoarseClock, ManualClock, SystemClock, to_datetime, to_micros
+from modules.storage import InMemoryStorage, Task
+from modules.tasks import TaskManager
+from services import ItemService
+from storage import InMemoryStorage as ItemStorage
+from todo_console_app import TodoManager
+
+START = datetime(2026, 6, 1, 12, 0)
+
+
+class TestClocks:
+    """Test the clock implementations"""
+
+    def test_round_trip_is_exact(self):
+        """Test converting to microseconds and back loses nothing"""
+        when = datetime(2026, 6, 1, 12, 34, 56, 789012)
+        assert to_datetime(to_micros(when)) == when
+        assert to_micros(START) == int(START.timestamp()) * 1_000_000
+
+    def test_system_clock_tracks_wall_time(self):
+        """Test the system clock agrees with datetime.now()"""
+        before = datetime.now()
+        now = SystemClock().now()
+        assert before - timedelta(seconds=1) <= now <= datetime.now() + timedelta(seconds=1)
+
+    def test_batch_freezes_time(self):
+        """Test a batch reads the clock once, including nested batches"""
+        clock = SystemClock()
+        with clock.batch() as frozen:
+            time.sleep(0.002)
+            assert clock.now_us() == frozen
+            with clock.batch() as inner:
+                assert inner == frozen
+            assert clock.now_us() == frozen
+        assert clock.now_us() > frozen
+
+    def test_coarse_clock_moves_on_tick(self):
+        """Test the coarse clock only changes when ticked"""
+        clock = CoarseClock()
+        cached = clock.now_us()
+        time.sleep(0.002)
+        assert clock.now_us() == cached
+        assert clock.tick() > cached
+
+    def test_coarse_clock_ticker(self):
+        """Test the background ticker refreshes the cached time"""
+        clock = CoarseClock(resolution=0.001)
+        cached = clock.now_us()
+        clock.start()
+        try:
+            deadline = time.monotonic() + 2
+            while clock.now_us() == cached and time.monotonic() < deadline:
+                time.sleep(0.001)
+        finally:
+            clock.stop()
+        assert clock.now_us() > cached
+
+    def test_manual_clock(self):
+        """Test the manual clock only moves when told to"""
+        clock = ManualClock(START)
+        assert clock.now() == START
+        clock.advance(seconds=90)
+        assert clock.now() == START + timedelta(seconds=90)
+        clock.set(START)
+        assert clock.now_us() == to_micros(START)
+
+
+class TestTimestamps:
+    """Test tasks keep their times as epoch microseconds"""
+
+    def test_fields_accept_datetimes_and_micros(self):
+        """Test *_at fields convert on access and *_us hold integers"""
+        task = Task(1, "Buy milk", created_at=START, updated_at=to_micros(START), due_at=None)
+
+        assert task.created_us == task.updated_us == to_micros(START)
+        assert task.created_at == task.updated_at == START
+        assert task.due_at is None and task.due_us is None
+
+        task.due_at = START + timedelta(days=1)
+        assert task.due_us == to_micros(START) + 86_400_000_000
+        with pytest.raises(ValueError):
+            task.due_at = "tomorrow"
+
+    def test_unstamped_task_gets_store_time(self):
+        """Test a task built without times is stamped from the clock of the store it is inserted into"""
+        task = Task(0, "Buy milk")
+        assert task.created_at is None and task.to_dict()['created_at'] is None
+        storage = InMemoryStorage(ManualClock(START))
+        storage.insert_task(task)
+        assert task.created_at == task.updated_at == START
+        item = ItemService(ItemStorage(ManualClock(START))).create_item("Buy milk", "")
+        assert item.created_at == item.updated_at == START
+
+    def test_serialization_round_trip(self):
+        """Test to_dict/from_dict preserve microsecond times"""
+        task = Task(1, "Buy milk", created_at=START, updated_at=START + timedelta(microseconds=7))
+        copy = Task.from_dict(task.to_dict())
+        assert copy == task
+        assert copy.updated_us == task.updated_us
+
+
+class TestInjectedClock:
+    """Test every store stamps records from its injected clock"""
+
+    def test_engine_mutations_use_clock(self):
+        """Test creation and every kind of update take the clock's time"""
+        clock = ManualClock(START)
+        storage = InMemoryStorage(clock)
+        task = storage.add_task("Buy milk")
+        assert task.created_at == task.updated_at == START
+
+        clock.advance(seconds=1)
+        storage.update_task(task.id, title="Buy oat milk", description="", completed=True)
+        assert task.updated_at == START + timedelta(seconds=1)
+        assert task.created_at == START
+
+        clock.advance(seconds=1)
+        storage.set_priority(task.id, "high")
+        assert task.updated_at == START + timedelta(seconds=2)
+
+        clock.advance(seconds=1)
+        storage.update_task(task.id)
+        assert task.updated_at == START + timedelta(seconds=2)  # nothing changed
+
+    def test_batch_add_shares_one_time(self):
+        """Test a batch insert stamps every task with the same time"""
+        clock = ManualClock(START)
+        tasks = InMemoryStorage(clock).add_tasks([("A", "", False), ("B", "", True)])
+        assert {task.created_us for task in tasks} == {to_micros(START)}
+
+    def test_front_ends_use_clock(self):
+        """Test all three front ends accept a clock"""
+        clock = ManualClock(START)
+        assert ItemService(ItemStorage(clock)).create_item("A", "").created_at == START
+        assert TodoManager(clock).add_todo("A").created_at == START
+        assert TaskManager(clock=clock).add_task("A").created_at == START
+
+    def test_overdue_defaults_to_clock_time(self):
+        """Test overdue lookups default to the store's clock, not the wall clock"""
+        clock = ManualClock(START)
+        manager = TaskManager(clock=clock)
+        manager.add_task("Pay rent")
+        manager.set_due(1, START + timedelta(hours=1))
+
+        assert manager.overdue_tasks() == []
+        clock.advance(seconds=3600)
+        assert [task.id for task in manager.overdue_tasks()] == [1]
+
+    def test_time_queries_compare_micros(self):
+        """Test created/updated/due conditions and ordering work on stored microseconds"""
+        clock = ManualClock(START)
+        manager = TaskManager(clock=clock)
+        for title in ("A", "B", "C"):
+            manager.add_task(title)
+            clock.advance(seconds=60)
+
+        result = manager.query_tasks(["where", "created>=2026-06-01T12:01"])
+        assert [task.title for task in result.rows] == ["B", "C"]
+        assert result.plan.access == "time index (created)"
+
+        result = manager.query_tasks("where created<2026-06-01T12:01:30 order by created desc".split())
+        assert [task.title for task in result.rows] == ["B", "A"]
@@ -0,0 +1,126 @@
+"""
+Unit tests for the command registry and dispatch
+"""
+
+import sys
+import types
+
+import pytest
+
+from cli import CLIInterface
+from modules.cli import TodoCLI
+from modules.commands import ALL, CommandRegistry, load_plugins
+from services import ItemService
+from storage import InMemoryStorage
+from todo_console_app import TodoConsoleApp
+
+
+class TestRegistry:
+    """Test registration, argument checks and timing"""
+
+    def test_ids_are_parsed_once(self, capsys):
+        """Test leading ids arrive as ints and bad ids never reach the handler"""
+        calls = []
+        registry = CommandRegistry(usage_result='usage', id_result='bad id')
+        registry.register('move', calls.append, ids=1, min_args=2, max_args=2, usage="move <id> <where>",
+                          missing="Error: Please provide a task ID and a place")
+
+        registry.get('move')(['3', 'done'])
+        assert calls == [[3, 'done']]
+        assert registry.get('move')(['0', 'done']) == 'bad id'
+        assert registry.get('move')(['3']) == 'usage'
+        assert calls == [[3, 'done']]
+        assert capsys.readouterr().out.splitlines()[-2:] == [
+            "Error: Please provide a task ID and a place", "Usage: move <id> <where>"]
+
+    def test_all_ids(self):
+        """Test ids=ALL converts every argument"""
+        registry = CommandRegistry()
+        registry.register('merge', lambda args: args, ids=ALL, min_args=2)
+        assert registry.get('merge')(['1', '2', '3']) == [1, 2, 3]
+        assert registry.get('merge')(['1', 'x']) is None
+
+    def test_register_aliases_and_conflicts(self):
+        """Test aliases share one command and names cannot be taken twice"""
+        registry = CommandRegistry()
+
+        @registry.register('quit', aliases=('Exit',), help="Leave")
+        def leave(args):
+            return 'bye'
+
+        assert registry.get('exit') is registry.get('quit')
+        assert [command.name for command in registry] == ['quit']
+        assert registry.help_lines() == [f"  {'quit':<30}- Leave"]
+        with pytest.raises(ValueError):
+            registry.register('exit', leave)
+        registry.unregister('exit')
+        assert 'quit' not in registry and 'exit' not in registry
+
+    def test_timing(self):
+        """Test calls are counted and timed per command"""
+        registry = CommandRegistry()
+        registry.register('ping', lambda args: None)
+        for _ in range(3):
+            registry.get('ping')([])
+        assert registry.stats()[0][:2] == ('ping', 3)
+        assert "ping" in registry.describe()
+        registry.reset_stats()
+        assert registry.stats() == []
+
+
+class TestFrontEnds:
+    """Test each front end dispatches through its registry"""
+
+    def test_todo_cli(self, capsys):
+        """Test validation messages, plugin commands and stats"""
+        cli = TodoCLI()
+        cli.process_command('show abc')
+        cli.process_command('priority 1')
+        cli.process_command('frobnicate')
+        out = capsys.readouterr().out
+        assert "Error: Task ID must be a positive integer" in out
+        assert "Usage: priority <id> <low|medium|high>" in out
+        assert "Unknown command: frobnicate" in out
+
+        cli.commands.register('shout', lambda args: print(cli.task_manager.get_task(args[0]).title.upper()),
+                              ids=1, max_args=1, usage="shout <id>", help="Print a task's title loudly")
+        cli.process_command('add "Buy milk"')
+        cli.process_command('shout 1')
+        cli.process_command('help')
+        cli.process_command('stats')
+        out = capsys.readouterr().out
+        assert "BUY MILK" in out and "Print a task's title loudly" in out
+        assert "shout" in out.split("calls")[-1]
+
+        cli.process_command('exit')
+        assert not cli.running
+
+    def test_load_plugins(self, monkeypatch):
+        """Test plugin modules named in TODO_PLUGINS register their commands"""
+        plugin = types.ModuleType('todo_test_plugin')
+        plugin.register_commands = lambda registry, app: registry.register('hello', lambda args: 'hi')
+        monkeypatch.setitem(sys.modules, 'todo_test_plugin', plugin)
+        monkeypatch.setenv('TODO_PLUGINS', 'todo_test_plugin')
+        assert TodoCLI().commands.get('hello')([]) == 'hi'
+        assert load_plugins(CommandRegistry(), None, '') == []
+
+    def test_console_app(self, capsys):
+        """Test the console app rejects bad ids before its handlers run"""
+        app = TodoConsoleApp()
+        assert app.execute('add', ['Buy milk'])
+        assert app.execute('complete', ['x'])
+        assert not app.execute('bogus', [])
+        out = capsys.readouterr().out
+        assert "Error: ID must be a positive number" in out
+        assert "Unknown command: bogus" in out
+
+    def test_item_console_one_shot(self, capsys):
+        """Test run_once exit statuses: 1 for bad or missing items, 2 for usage"""
+        cli = CLIInterface(ItemService(InMemoryStorage()))
+        assert cli.run_once(['add', 'Buy milk']) == 0
+        assert cli.run_once(['update', '1', 'Buy oat milk']) == 0
+        assert cli.run_once(['show', 'abc']) == 1
+        assert cli.run_once(['delete', '9']) == 1
+        assert cli.run_once(['show']) == 2
+        assert cli.run_once(['bogus']) == 2
+        assert "Updated item 1: Buy oat milk" in capsys.readouterr().out
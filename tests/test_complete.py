@@ -0,0 +1,134 @@
+"""
+Unit tests for title/id completion at the interactive prompt
+"""
+
+import modules.complete as complete
+from modules.cli import TodoCLI
+from modules.complete import Completer, TitleIndex, id_prefix
+from modules.storage import InMemoryStorage
+from todo_console_app import TodoConsoleApp
+
+TITLES = ["Buy milk", "Buy oat milk", "Budget review", "Call mum", "Schedule dentist", "Write report"]
+
+
+def store():
+    """Storage holding TITLES as tasks 1-6"""
+    storage = InMemoryStorage()
+    for title in TITLES:
+        storage.add_task(title)
+    return storage
+
+
+def titles(storage, ids):
+    return [storage.get_task(task_id).title for task_id in ids]
+
+
+class TestTitleIndex:
+    """Test prefix and fuzzy search over titles"""
+
+    def test_prefix_is_case_and_space_insensitive(self):
+        """Test prefix matches come back in title order"""
+        index = TitleIndex(enumerate(TITLES, 1))
+        assert index.prefix("bu") == [3, 1, 2]
+        assert index.prefix("BUY  o") == [2]
+        assert index.prefix("buy milk") == [1]
+        assert index.prefix("x") == []
+        assert index.prefix("bu", limit=2) == [3, 1]
+
+    def test_fuzzy_tolerates_typos(self):
+        """Test substitutions, transpositions and missing letters, closest first"""
+        index = TitleIndex(enumerate(TITLES, 1))
+        assert index.fuzzy("shcedule") == [5]
+        assert index.fuzzy("wirte rep") == [6]
+        assert index.fuzzy("cal mum") == [4]
+        assert index.fuzzy("buy milj") == [1]
+        assert index.fuzzy("bux", max_edits=1) == [3, 1, 2]
+        assert index.fuzzy("zzzzzz") == []
+        assert index.fuzzy("cx") == []  # too short for typos
+
+    def test_suggest_tops_up_prefix_matches(self):
+        """Test exact prefixes come before fuzzy ones"""
+        index = TitleIndex(enumerate(TITLES, 1))
+        assert index.suggest("buy m") == [1, 2]
+        assert index.suggest("buy milj") == [1]
+        assert index.suggest("buy m", limit=1) == [1]
+
+    def test_incremental_updates_and_merges(self, monkeypatch):
+        """Test adds, renames and removals through buffer merges and compaction"""
+        monkeypatch.setattr(complete, 'MERGE_MIN', 4)
+        index = TitleIndex()
+        for task_id in range(1, 21):
+            index.add(task_id, f"task {task_id:02}")
+        assert index.prefix("task 1", limit=50) == list(range(10, 20))
+        index.remove(10)
+        index.remove(11)
+        index.add(12, "renamed")
+        assert index.prefix("task 1", limit=50) == list(range(13, 20))
+        assert index.prefix("ren") == [12]
+        assert index.fuzzy("tsak 05") == [5]
+        for task_id in range(1, 21):
+            index.remove(task_id)
+        assert len(index) == 0 and index.prefix("") == []
+
+
+class TestStorageIndex:
+    """Test the engine keeps a built title index in step"""
+
+    def test_index_follows_mutations(self):
+        """Test add, batch add, rename and delete after the index is built"""
+        storage = store()
+        index = storage.title_index
+        storage.add_task("Buy bread")
+        storage.add_tasks([("Budget plan", "", False)])
+        storage.update_task(1, title="Sell milk")
+        storage.update_task(2, description="unchanged title")
+        storage.delete_task(3)
+        assert titles(storage, index.prefix("bu")) == ["Budget plan", "Buy bread", "Buy oat milk"]
+        assert titles(storage, index.prefix("sell")) == ["Sell milk"]
+
+    def test_id_prefix(self):
+        """Test ids starting with the typed digits, smallest first"""
+        storage = InMemoryStorage()
+        for number in range(1, 131):
+            storage.add_task(f"Task {number}")
+        storage.delete_task(12)
+        assert id_prefix(storage, "1", limit=5) == [1, 10, 11, 13, 14]
+        assert id_prefix(storage, "12") == [120, 121, 122, 123, 124, 125, 126, 127, 128, 129]
+        assert id_prefix(storage, "999") == []
+        assert id_prefix(storage, "0") == []
+
+
+class TestCompleter:
+    """Test completion of whole prompt lines"""
+
+    def test_command_names(self):
+        """Test commands complete by prefix, aliases once"""
+        cli = TodoCLI()
+        completer = Completer(cli.commands, cli.task_manager.storage)
+        assert [line for line, _ in completer.complete("del")] == ["delete "]
+        assert "quit " in [line for line, _ in completer.complete("")]
+
+    def test_ids_and_titles(self):
+        """Test commands taking an id complete ids, titles and fuzzy titles to ids"""
+        app = TodoConsoleApp()
+        for title in TITLES:
+            app.manager.storage.add_task(title)
+        completer = Completer(app.commands, app.manager.storage, limit=3)
+        assert completer.complete("show ") == [("show 1 ", "     1  Buy milk"), ("show 2 ", "     2  Buy oat milk"),
+                                               ("show 3 ", "     3  Budget review")]
+        assert completer.complete("complete 4") == [("complete 4 ", "     4  Call mum")]
+        assert completer.complete("delete shed") == [("delete 5 ", "     5  Schedule dentist")]
+        assert completer.complete("update Wrtie") == [("update 6 ", "     6  Write report")]
+        assert completer.complete("update 6 Wri") == []
+        assert completer.complete("add Bu") == []
+        assert completer.complete("nosuch x") == []
+
+    def test_readline_protocol(self, monkeypatch):
+        """Test the readline completer returns one match per state, then None"""
+        import sys
+        import types
+        fake = types.SimpleNamespace(get_line_buffer=lambda: "show bu", get_endidx=lambda: 7)
+        monkeypatch.setitem(sys.modules, 'readline', fake)
+        completer = Completer(TodoCLI().commands, store())
+        assert [completer.readline_complete("show bu", state) for state in range(4)] == [
+            "show 3 ", "show 1 ", "show 2 ", None]
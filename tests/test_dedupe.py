@@ -0,0 +1,152 @@
+"""
+Unit tests for duplicate detection and merging
+"""
+
+from datetime import datetime
+
+from modules.cli import TodoCLI
+from modules.dedupe import DedupeIndex, jaccard, normalize_title, shingles, signature
+from modules.storage import InMemoryStorage
+from modules.tasks import TaskManager
+
+
+class TestSimilarity:
+    """Test normalization, shingling and signatures"""
+
+    def test_normalize_title(self):
+        """Test case, punctuation and spacing are ignored"""
+        assert normalize_title("  Buy MILK!! ") == normalize_title("buy   milk") == "buy milk"
+
+    def test_symbols_and_punctuation_only_titles(self):
+        """Test emoji are kept and punctuation-only titles are compared as written"""
+        assert normalize_title("🔥 party") != normalize_title("🎉 party")
+        assert normalize_title("Café — ¡olé!") == "café olé"
+        assert normalize_title("!!!") != normalize_title("???") and normalize_title("  !!! ") == "!!!"
+
+    def test_signature_agreement_tracks_jaccard(self):
+        """Test similar texts agree on most signature bins and unrelated ones on few"""
+        a = shingles("Prepare the quarterly budget report", "for finance")
+        b = shingles("Prepare the quarterly budget report", "for the finance team")
+        c = shingles("Walk the dog", "around the park")
+        agree = lambda x, y: sum(p == q for p, q in zip(signature(x), signature(y)))
+
+        assert jaccard(a, b) > 0.7
+        assert agree(a, b) > agree(a, c)
+        assert agree(a, c) <= 4
+
+
+class TestDedupeIndex:
+    """Test the index finds duplicates without false matches"""
+
+    def test_exact_and_near_duplicates(self):
+        """Test exact titles and near-identical texts are found"""
+        storage = InMemoryStorage()
+        storage.add_task("Buy milk", "2 litres")
+        storage.add_task("buy milk!", "")
+        storage.add_task("Renew the car insurance policy", "before it lapses in June")
+        storage.add_task("Renew the car insurance policy", "before it lapses in june!")
+        storage.add_task("Walk the dog", "")
+        index = storage.dedupe_index
+
+        assert index.exact("BUY MILK", storage._tasks) == [1, 2]
+        assert index.similar("Renew the car insurance policy", "before it lapses in June",
+                             storage._tasks) == [3, 4]
+        assert index.find("Walk a cat", "", storage._tasks) is None
+        assert index.groups(storage._tasks) == [[1, 2], [3, 4]]
+
+    def test_index_follows_mutations(self):
+        """Test updates and deletes keep the index in step"""
+        storage = InMemoryStorage()
+        storage.add_task("Buy milk")
+        index = storage.dedupe_index
+        storage.add_task("Buy milk")
+        assert index.groups(storage._tasks) == [[1, 2]]
+
+        storage.update_task(2, title="Buy bread")
+        assert index.groups(storage._tasks) == []
+        storage.add_task("buy bread")
+        storage.delete_task(2)
+        assert index.groups(storage._tasks) == []
+        assert index.exact("buy bread", storage._tasks) == [3]
+
+    def test_large_buckets_stay_linear(self):
+        """Test many copies of one task form one group"""
+        index = DedupeIndex()
+        storage = InMemoryStorage()
+        for _ in range(500):
+            task = storage.add_task("Submit the weekly status report", "to the team lead")
+            index.add(task.id, task.title, task.description)
+        assert index.groups(storage._tasks) == [list(range(1, 501))]
+
+
+class TestTaskManagerDedupe:
+    """Test dedupe-on-insert and merging through TaskManager"""
+
+    def test_dedupe_on_add(self):
+        """Test a duplicate add returns the existing task"""
+        manager = TaskManager()
+        first = manager.add_task("Buy milk")
+        assert manager.add_task("buy milk.", dedupe=True) is first
+        assert len(manager.get_all_tasks()) == 1
+
+        manager.dedupe_on_add = True
+        assert manager.add_task("Buy Milk") is first
+        assert manager.add_task("Buy milk", dedupe=False) is not first
+
+    def test_no_false_matches_on_symbols(self):
+        """Test titles differing only in emoji, or made only of punctuation, are not duplicates"""
+        manager = TaskManager()
+        bangs, fire = manager.add_task("!!!"), manager.add_task("🎉 party")
+        assert manager.add_task("???", dedupe=True) is not bangs
+        assert manager.add_task("🔥 party", dedupe=True) is not fire
+        assert manager.add_task("!!!", dedupe=True) is bangs
+        assert manager.duplicate_groups() == []
+
+    def test_merge_combines_fields(self):
+        """Test merging keeps tags, the highest priority and the earliest due date"""
+        manager = TaskManager()
+        keep = manager.add_task("Pay rent", "landlord")
+        other = manager.add_task("pay rent", "bank transfer")
+        manager.add_tags(keep.id, ["home"])
+        manager.add_tags(other.id, ["money", "home"])
+        manager.set_priority(other.id, "high")
+        manager.set_due(other.id, datetime(2026, 7, 1))
+        manager.mark_completed(keep.id)
+
+        merged = manager.merge_tasks(keep.id, [other.id])
+        assert merged is keep
+        assert manager.get_task(other.id) is None
+        assert merged.tags == ["home", "money"]
+        assert merged.priority == "high"
+        assert merged.due_at == datetime(2026, 7, 1)
+        assert merged.description == "landlord\nbank transfer"
+        assert not merged.completed
+        assert [task.id for task in manager.query_tasks(["where", "priority=high"]).rows] == [keep.id]
+
+    def test_merge_duplicates(self):
+        """Test every group is merged into its oldest task"""
+        manager = TaskManager()
+        for title in ("Buy milk", "Walk dog", "buy milk", "Buy  Milk", "walk dog"):
+            manager.add_task(title)
+        assert manager.merge_duplicates() == 3
+        assert [task.title for task in manager.get_all_tasks()] == ["Buy milk", "Walk dog"]
+
+
+class TestDedupeCommands:
+    """Test the dedupe and merge CLI commands"""
+
+    def test_dedupe_and_merge(self, capsys):
+        """Test listing, auto mode and merging from the CLI"""
+        cli = TodoCLI()
+        cli.process_command('add "Buy milk"')
+        cli.process_command('add "buy milk"')
+        cli.process_command('dedupe')
+        assert "1 group(s) of duplicates" in capsys.readouterr().out
+
+        cli.process_command('dedupe auto on')
+        cli.process_command('add "BUY MILK"')
+        assert "Not added, duplicate of: [O] 1. Buy milk" in capsys.readouterr().out
+
+        cli.process_command('merge 1 2')
+        assert "Merged into task: [O] 1. Buy milk" in capsys.readouterr().out
+        assert len(cli.task_manager.get_all_tasks()) == 1
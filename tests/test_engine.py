@@ -0,0 +1,109 @@
+"""
+Unit tests for the shared task engine behind all three front ends
+"""
+
+from modules.storage import InMemoryStorage, Task
+from modules.tasks import TaskManager
+from models import Item
+from services import ItemService
+from storage import InMemoryStorage as ItemStorage
+from todo_console_app import TodoItem, TodoManager
+
+
+class TestSharedEngine:
+    """Test each front end stores its records in the engine"""
+
+    def test_front_ends_use_engine(self):
+        """Test items, tasks and todos all live in an engine store"""
+        service = ItemService(ItemStorage())
+        item = service.create_item("Buy milk", "2%")
+        todos = TodoManager()
+        todo = todos.add_todo("Walk dog")
+
+        assert isinstance(service.storage.engine, InMemoryStorage)
+        assert isinstance(todos.storage, InMemoryStorage)
+        assert isinstance(item, Task) and isinstance(todo, Task)
+        assert service.storage.engine.get_task(item.id) is item
+        assert todos.todos == {1: todo}
+
+    def test_todo_item_keeps_its_constructor(self):
+        """Test TodoItem still takes (id, title, description, completed)"""
+        todo = TodoItem(3, "Read", "a book", True)
+
+        assert (todo.id, todo.title, todo.description, todo.completed) == (3, "Read", "a book", True)
+        assert str(todo) == "[X] 3. Read"
+
+    def test_item_update_changes_record_in_place(self):
+        """Test updating an item changes the engine record in place and bumps the generation"""
+        service = ItemService(ItemStorage())
+        item = service.create_item("Buy milk", "")
+        generation = service.generation
+
+        updated = service.update_item(item.id, title="Buy oat milk")
+        assert service.get_item(item.id) is updated is item
+        assert service.generation == generation + 1
+        assert service.storage.update_item(99, updated) is None
+        assert isinstance(updated, Item)
+
+    def test_todo_toggle_and_delete(self):
+        """Test todo mutations go through the engine"""
+        manager = TodoManager()
+        manager.add_todo("Buy milk")
+        manager.add_todo("Walk dog")
+
+        assert manager.toggle_completion(1)
+        assert manager.get_todo(1).completed
+        assert manager.toggle_completion(1)
+        assert not manager.get_todo(1).completed
+        assert manager.delete_todo(2)
+        assert not manager.delete_todo(2)
+        assert manager.get_next_id() == 3
+
+
+class TestLazyIndexes:
+    """Test indexes are only built and maintained once something reads them"""
+
+    def test_crud_builds_no_indexes(self):
+        """Test plain writes leave the indexes and event bus unbuilt"""
+        storage = InMemoryStorage()
+        storage.add_task("Buy milk")
+        storage.update_task(1, title="Buy oat milk", completed=True)
+        storage.delete_task(1)
+
+        assert not storage._indexed
+        assert storage._text_index is None
+        assert storage._events is None
+        assert storage.events.seq == 3
+
+    def test_first_read_builds_from_current_tasks(self):
+        """Test an index built late matches one maintained from the start"""
+        storage = InMemoryStorage()
+        for title in ("Buy milk", "Walk dog", "Buy bread"):
+            storage.add_task(title)
+        storage.mark_completed(2)
+        storage.add_tags(3, ["errand"])
+        storage.set_priority(1, "high")
+
+        assert storage.status_index.ids(False) == {1, 3}
+        assert storage.tag_index.ids("errand") == {3}
+        assert storage.priority_index.ids("high") == {1}
+        assert storage.time_index.ids(*storage.time_index.bounds()) == [1, 2, 3]
+        assert storage.text_index.ids(["buy"]) == {1, 3}
+
+        storage.update_task(3, title="Bake bread", completed=True)
+        storage.delete_task(1)
+        assert storage.status_index.ids(False) == set()
+        assert storage.text_index.ids(["buy"]) == set()
+        assert storage.text_index.ids(["bake"]) == {3}
+
+    def test_queries_without_text_skip_text_index(self):
+        """Test only a word search builds the text index"""
+        manager = TaskManager()
+        manager.add_task("Buy milk")
+
+        manager.query_tasks(["where", "completed=false"])
+        assert manager.storage._indexed
+        assert manager.storage._text_index is None
+
+        manager.query_tasks(["where", "title~milk"])
+        assert manager.storage._text_index is not None
@@ -0,0 +1,126 @@
+"""
+Unit tests for the change-data-capture event stream
+"""
+
+import threading
+from datetime import datetime
+
+import pytest
+from modules.clock import ManualClock
+from modules.events import EventBus
+from modules.tasks import TaskManager
+from services import ItemService
+from storage import InMemoryStorage as ItemStorage
+
+
+class TestEventBus:
+    """Test sequencing, batching and overflow policies"""
+
+    def test_sequence_numbers_without_subscribers(self):
+        """Test the sequence advances even when nobody listens"""
+        bus = EventBus()
+        bus.publish("created", 1)
+        subscription = bus.subscribe()
+        bus.publish("deleted", 1)
+
+        assert [event.seq for event in subscription.get_batch(timeout=0)] == [2]
+
+    def test_get_batch_limits(self):
+        """Test batches are capped and returned in order"""
+        bus = EventBus()
+        subscription = bus.subscribe()
+        bus.publish_batch(("deleted", i, None) for i in range(5))
+
+        assert [event.record_id for event in subscription.get_batch(max_items=3)] == [0, 1, 2]
+        assert [event.record_id for event in subscription.get_batch(max_items=3)] == [3, 4]
+        assert subscription.get_batch(timeout=0.01) == []
+
+    def test_drop_oldest(self):
+        """Test a full drop_oldest queue discards old events"""
+        bus = EventBus()
+        subscription = bus.subscribe(max_queue=2, overflow="drop_oldest")
+        for i in range(5):
+            bus.publish("deleted", i)
+
+        assert [event.seq for event in subscription.get_batch()] == [4, 5]
+        assert subscription.dropped == 3
+
+    def test_block_applies_backpressure(self):
+        """Test a full blocking queue makes the publisher wait for the consumer"""
+        bus = EventBus()
+        subscription = bus.subscribe(max_queue=1)
+        bus.publish("deleted", 1)
+        publisher = threading.Thread(target=bus.publish, args=("deleted", 2))
+        publisher.start()
+        publisher.join(0.05)
+        assert publisher.is_alive()
+
+        assert [event.record_id for event in subscription.get_batch()] == [1]
+        publisher.join(1.0)
+        assert not publisher.is_alive()
+        assert [event.record_id for event in subscription.get_batch()] == [2]
+
+    def test_close_releases_blocked_publisher(self):
+        """Test closing a full subscription unblocks the publisher"""
+        bus = EventBus()
+        subscription = bus.subscribe(max_queue=1)
+        bus.publish("deleted", 1)
+        publisher = threading.Thread(target=bus.publish, args=("deleted", 2))
+        publisher.start()
+        publisher.join(0.05)
+        subscription.close()
+        publisher.join(1.0)
+
+        assert not publisher.is_alive()
+        assert not bus.has_subscribers
+
+    def test_invalid_options(self):
+        """Test bad subscription options are rejected"""
+        with pytest.raises(ValueError):
+            EventBus().subscribe(overflow="ignore")
+
+
+class TestStoreEvents:
+    """Test both stores publish their mutations"""
+
+    def test_task_store_events(self):
+        """Test TaskManager operations produce ordered events"""
+        manager = TaskManager()
+        subscription = manager.subscribe()
+        manager.add_task("A")
+        manager.update_task(1, title="B")
+        manager.mark_completed(1)
+        manager.set_priority(1, "high")
+        manager.delete_task(1)
+
+        events = subscription.get_batch()
+        assert [event.kind for event in events] == ["created", "updated", "completed", "updated", "deleted"]
+        assert [event.seq for event in events] == [1, 2, 3, 4, 5]
+        assert events[1].data["title"] == "B"
+        assert events[3].data["priority"] == "high"
+        assert events[4].data is None
+
+    def test_events_use_store_clock(self):
+        """Test event timestamps come from the store's clock, matching updated_at"""
+        clock = ManualClock(datetime(2026, 3, 1, 9, 30))
+        manager = TaskManager(clock=clock)
+        subscription = manager.subscribe()
+        manager.add_task("A")
+        clock.advance(seconds=90)
+        manager.update_task(1, title="B")
+        created, updated = subscription.get_batch()
+        assert created.timestamp == datetime(2026, 3, 1, 9, 30).timestamp()
+        assert updated.timestamp * 1_000_000 == manager.get_task(1).updated_us
+
+    def test_item_store_events(self):
+        """Test ItemService operations produce ordered events"""
+        storage = ItemStorage()
+        subscription = storage.events.subscribe()
+        service = ItemService(storage)
+        service.create_item("A", "")
+        service.update_item(1, title="B")
+        service.delete_item(1)
+
+        events = subscription.get_batch()
+        assert [event.kind for event in events] == ["created", "updated", "deleted"]
+        assert events[1].data["title"] == "B"
@@ -0,0 +1,86 @@
+"""
+Unit tests for the parallel import pipeline
+"""
+
+import json
+
+import pytest
+from modules.importer import split_chunks, parse_chunk, import_file, validate_record
+from modules.storage import InMemoryStorage
+from modules.tasks import TaskManager
+
+
+def write_records(path, records):
+    """Write records as JSON Lines, passing raw strings through unchanged"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(record if isinstance(record, str) else json.dumps(record))
+            f.write("\n")
+
+
+class TestImporter:
+    """Test chunking, validation and ordered merging"""
+
+    def test_split_chunks_end_on_line_boundaries(self, tmp_path):
+        """Test that every chunk but the last ends after a newline"""
+        path = tmp_path / "tasks.jsonl"
+        write_records(path, [{"title": f"Task {i}"} for i in range(50)])
+        data = path.read_bytes()
+
+        ranges = split_chunks(str(path), chunk_size=64)
+
+        assert ranges[0][0] == 0
+        assert ranges[-1][1] == len(data)
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            assert end == start
+            assert data[end - 1:end] == b"\n"
+
+    def test_validate_record(self):
+        """Test record validation rules"""
+        assert validate_record({"title": " A ", "description": " b "}) == ("A", "b", False)
+        with pytest.raises(ValueError):
+            validate_record({"title": "   "})
+        with pytest.raises(ValueError):
+            validate_record({"title": "A", "description": 5})
+        with pytest.raises(ValueError):
+            validate_record(["not", "an", "object"])
+
+    def test_parse_chunk_reports_relative_lines(self, tmp_path):
+        """Test that bad lines are reported with their offset in the chunk"""
+        path = tmp_path / "tasks.jsonl"
+        write_records(path, [{"title": "Good"}, "{broken", {"title": ""}])
+
+        records, errors, line_count = parse_chunk(str(path), 0, path.stat().st_size)
+
+        assert records == [("Good", "", False)]
+        assert [offset for offset, _ in errors] == [1, 2]
+        assert line_count == 3
+
+    def test_parallel_import_preserves_order(self, tmp_path):
+        """Test that a multi-worker import merges chunks in file order"""
+        path = tmp_path / "tasks.jsonl"
+        records = [{"title": f"Task {i}", "completed": i % 3 == 0} for i in range(200)]
+        records[57] = {"title": 42}
+        write_records(path, records)
+        storage = InMemoryStorage()
+
+        result = import_file(str(path), storage, workers=2, chunk_size=256)
+
+        assert result.chunks > 2
+        assert result.imported == 199
+        assert result.errors == [(58, "Title must be a non-empty string")]
+        titles = [task.title for task in storage.get_all_tasks()]
+        assert titles == [f"Task {i}" for i in range(200) if i != 57]
+        assert [task.id for task in storage.get_all_tasks()] == list(range(1, 200))
+
+    def test_task_manager_import(self, tmp_path):
+        """Test importing through TaskManager after existing tasks"""
+        path = tmp_path / "tasks.jsonl"
+        write_records(path, [{"title": "Imported", "description": "From file"}])
+        manager = TaskManager()
+        manager.add_task("Existing")
+
+        result = manager.import_tasks(str(path), workers=1)
+
+        assert result.imported == 1
+        assert manager.get_task(2).description == "From file"
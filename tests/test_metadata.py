@@ -0,0 +1,158 @@
+"""
+Unit tests for tags, priorities and due dates
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from modules import storage as storage_module
+from modules.tasks import TaskManager
+from modules.cli import TodoCLI
+from modules.indexes import DueIndex
+from models import Item
+from services import ItemService
+from storage import InMemoryStorage as ItemStorage
+
+NOW = datetime(2026, 6, 1, 12, 0)
+
+
+def build_manager():
+    """Create tasks with a mix of tags, priorities and due dates"""
+    manager = TaskManager()
+    for i in range(1, 31):
+        manager.add_task(f"Task {i}")
+        manager.set_due(i, NOW - timedelta(hours=31 - i))  # task 1 is the most overdue
+        manager.set_priority(i, "high" if i % 2 else "low")
+        if i % 3 == 0:
+            manager.add_tags(i, ["Work"])
+    manager.set_due(30, NOW + timedelta(days=1))  # not overdue yet
+    manager.mark_completed(1)
+    return manager
+
+
+class TestDueIndex:
+    """Test the lazy-deletion due heap"""
+
+    def test_iter_due_in_order_with_moves(self):
+        """Test moved and cleared entries are skipped"""
+        index = DueIndex()
+        for task_id, hours in [(1, 5), (2, 1), (3, 3), (4, 2)]:
+            index.set(task_id, NOW + timedelta(hours=hours))
+        index.set(3, NOW + timedelta(hours=10))
+        index.set(4, None)
+        index.set(3, NOW + timedelta(hours=3))
+
+        assert [task_id for _, task_id in index.iter_due()] == [2, 3, 1]
+        assert [task_id for _, task_id in index.iter_due(until=NOW + timedelta(hours=3))] == [2, 3]
+        assert index.peek()[1] == 2
+
+
+class TestTaskMetadata:
+    """Test TaskManager tag, priority and due date operations"""
+
+    def test_tags_normalized_and_indexed(self):
+        """Test tags are normalized and removable"""
+        manager = TaskManager()
+        manager.add_task("Report")
+        manager.add_tags(1, ["#Work", "urgent", "work"])
+        assert manager.get_task(1).tags == ["work", "urgent"]
+
+        manager.remove_tags(1, ["URGENT"])
+        assert manager.get_task(1).tags == ["work"]
+        assert manager.storage.tag_index.ids("urgent") == set()
+        with pytest.raises(ValueError):
+            manager.add_tags(1, ["two words"])
+
+    def test_invalid_priority(self):
+        """Test an unknown priority is rejected"""
+        manager = TaskManager()
+        manager.add_task("Report")
+        with pytest.raises(ValueError):
+            manager.set_priority(1, "urgent")
+
+    def test_overdue_filtered(self):
+        """Test overdue tasks come back earliest first with filters applied"""
+        manager = build_manager()
+
+        tasks = manager.overdue_tasks(tag="work", priority="high", limit=3, now=NOW)
+        assert [task.id for task in tasks] == [3, 9, 15]
+
+        tasks = manager.overdue_tasks(limit=4, now=NOW)
+        assert [task.id for task in tasks] == [2, 3, 4, 5]
+
+    def test_overdue_heap_walk_matches_scan(self, monkeypatch):
+        """Test the due heap walk and the candidate scan agree"""
+        manager = build_manager()
+        scanned = manager.overdue_tasks(priority="high", limit=50, now=NOW)
+        monkeypatch.setattr(storage_module, "OVERDUE_SCAN_LIMIT", 0)
+        walked = manager.overdue_tasks(priority="high", limit=50, now=NOW)
+
+        assert scanned == walked
+        assert 1 not in [task.id for task in walked]  # completed
+        assert 29 in [task.id for task in walked]
+
+    def test_query_fields(self):
+        """Test tag, priority and due are queryable"""
+        manager = build_manager()
+        result = manager.query_tasks(["where", "tag=work", "and", "priority>=medium", "order", "by", "due", "limit", "2"])
+
+        assert result.plan.access == "tag index (work)"
+        assert [task.id for task in result.rows] == [3, 9]
+
+    def test_cli_commands(self, capsys):
+        """Test the tag, priority, due and overdue commands"""
+        cli = TodoCLI()
+        cli.process_command('add "Pay rent"')
+        cli.process_command('tag 1 home bills')
+        cli.process_command('priority 1 high')
+        cli.process_command('due 1 2020-01-01')
+        capsys.readouterr()
+
+        cli.process_command('overdue tag=bills priority=high')
+        out = capsys.readouterr().out
+        assert "Pay rent" in out and "2020-01-01 00:00" in out
+
+        cli.process_command('due 1 none')
+        cli.process_command('overdue')
+        assert "No overdue tasks." in capsys.readouterr().out
+
+
+class TestItemMetadata:
+    """Test the new Item fields"""
+
+    def test_item_validation(self):
+        """Test priority and tag validation on Item"""
+        with pytest.raises(ValueError):
+            Item(id=1, title="A", description="", created_at=NOW, priority="urgent")
+        with pytest.raises(ValueError):
+            Item(id=1, title="A", description="", created_at=NOW, tags=[""])
+
+    def test_positional_construction(self):
+        """Test the item signature survives sharing the task engine: created_at stays 4th"""
+        item = Item(1, "t", "d", datetime(2026, 1, 1), ["home"], "high", NOW)
+        assert (item.created_at, item.completed, item.tags, item.priority, item.due_at) == (
+            datetime(2026, 1, 1), False, ["home"], "high", NOW)
+        with pytest.raises(TypeError):
+            Item(1, "t", "d", NOW, [], "low", None, True)
+        item = Item(1, "t", "d", NOW, version=3, parent_id=7)
+        assert Item.from_dict(item.to_dict()).to_dict() == item.to_dict()
+        assert {'completed', 'version', 'parent_id'} <= item.to_dict().keys()
+
+    def test_service_preserves_fields(self):
+        """Test updates keep metadata that was not changed"""
+        service = ItemService(ItemStorage())
+        service.create_item("A", "", tags=["Home"], priority="high", due_at=NOW)
+        item = service.update_item(1, title="B")
+
+        assert item.tags == ["home"]
+        assert item.priority == "high"
+        assert item.due_at == NOW
+        assert item.to_dict()["due_at"] == NOW.isoformat()
+
+    def test_tags_follow_task_rules(self):
+        """Test items and tasks normalize and reject tags the same way"""
+        service = ItemService(ItemStorage())
+        assert service.create_item("A", "", tags=["#Work", "work", "Home"]).tags == ["work", "home"]
+        for tags in (["two words"], [""], [5]):
+            with pytest.raises(ValueError):
+                service.create_item("A", "", tags=tags)
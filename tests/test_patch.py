@@ -0,0 +1,153 @@
+"""
+Unit tests for in-place field patches and task versions
+"""
+
+from datetime import datetime
+
+import pytest
+
+from models import Item
+from modules.storage import InMemoryStorage, Task, VersionConflict
+from services import ItemService
+from storage import InMemoryStorage as ItemStorage
+
+DUE = datetime(2026, 5, 1, 12, 0)
+
+
+def service_with_item():
+    service = ItemService(ItemStorage())
+    service.create_item("Buy milk", "2%", tags=["home"], priority="low")
+    return service
+
+
+class TestEnginePatch:
+    """Test patch_task changes fields and indexes in place"""
+
+    def test_only_changed_fields_reported(self):
+        """Test equal values are skipped and the rest returned, with one version bump"""
+        storage = InMemoryStorage()
+        task = storage.add_task("Buy milk", "2%")
+        assert task.version == 1
+        generation = storage.generation
+        assert storage.patch_task(1, {'title': "Buy milk", 'priority': 'high', 'description': "2%"}) == {'priority'}
+        assert task.priority == 'high' and task.version == 2
+        assert storage.generation == generation + 1
+        assert storage.patch_task(1, {'priority': 'high'}) == frozenset()
+        assert task.version == 2 and storage.generation == generation + 1
+        assert storage.patch_task(99, {'title': "x"}) is None
+        with pytest.raises(ValueError):
+            storage.patch_task(1, {'colour': 'red'})
+
+    def test_indexes_follow_patches(self):
+        """Test tag, priority, due, status and text indexes see patched values"""
+        storage = InMemoryStorage()
+        storage.add_task("Buy milk")
+        storage.add_task("Call mum")
+        storage.patch_task(1, {'tags': ["home", "shop"], 'priority': 'high', 'due_at': DUE})
+        assert storage.tag_index.ids("shop") == {1}
+        assert storage.text_index.ids(["milk"]) == {1}
+        storage.patch_task(1, {'tags': ["shop"], 'priority': 'low', 'title': "Buy bread"})
+        assert storage.tag_index.ids("home") == set()
+        assert storage.priority_index.ids('low') == {1}
+        assert storage.text_index.ids(["milk"]) == set() and storage.text_index.ids(["bread"]) == {1}
+        assert [task.id for task in storage.overdue_tasks(datetime(2026, 6, 1))] == [1]
+        assert storage.patch_task(1, {'completed': True}) == {'completed'}
+        assert storage.overdue_tasks(datetime(2026, 6, 1)) == []
+        assert storage.get_task(1).due_at == DUE
+
+    def test_text_index_keeps_shared_words(self):
+        """Test a word leaving the title stays indexed while the description has it"""
+        storage = InMemoryStorage()
+        storage.add_task("Milk run", "get milk")
+        storage.text_index
+        storage.patch_task(1, {'title': "Bread run"})
+        assert storage.text_index.ids(["milk"]) == {1} and storage.text_index.ids(["bread", "run"]) == {1}
+        storage.patch_task(1, {'description': "get eggs"})
+        assert storage.text_index.ids(["milk"]) == set()
+
+    def test_version_check(self):
+        """Test if_version rejects a patch when the task moved on"""
+        storage = InMemoryStorage()
+        storage.add_task("Buy milk")
+        storage.patch_task(1, {'title': "Buy oat milk"}, if_version=1)
+        with pytest.raises(VersionConflict) as error:
+            storage.patch_task(1, {'title': "Buy soy milk"}, if_version=1)
+        assert (error.value.expected, error.value.actual) == (1, 2)
+        assert storage.get_task(1).title == "Buy oat milk"
+
+    def test_events_carry_changed_fields(self):
+        """Test patch events name the changed fields"""
+        storage = InMemoryStorage()
+        subscription = storage.events.subscribe()
+        storage.add_task("Buy milk")
+        storage.patch_task(1, {'title': "Buy bread", 'priority': 'high'})
+        storage.patch_task(1, {'completed': True})
+        events = subscription.get_batch()
+        assert [(event.kind, event.fields) for event in events] == [
+            ('created', None), ('updated', ['priority', 'title']), ('completed', ['completed'])]
+        assert events[1].to_dict()['fields'] == ['priority', 'title']
+        assert events[2].data['version'] == 3
+
+    def test_versions_survive_serialization_and_replication(self):
+        """Test to_dict/from_dict keep versions and replicas mirror them"""
+        storage = InMemoryStorage()
+        task = storage.add_task("Buy milk")
+        storage.mark_completed(1)
+        assert Task.from_dict(task.to_dict()).version == task.version == 2
+        replica = InMemoryStorage()
+        replica.upsert_task(Task.from_dict(task.to_dict()))
+        assert replica.get_task(1).version == 2
+
+
+class TestItemPatch:
+    """Test ItemService.patch_item validates and applies single fields"""
+
+    def test_patch_keeps_item(self):
+        """Test the item is changed in place, keeping other fields"""
+        service = service_with_item()
+        item = service.get_item(1)
+        patched = service.patch_item(1, tags=["Shop", "#shop"], due_at=DUE)
+        assert patched is item
+        assert (item.title, item.description, item.tags, item.priority, item.due_at) == (
+            "Buy milk", "2%", ["shop"], "low", DUE)
+        assert service.patch_item(1, due_at=None).due_at is None
+        assert service.patch_item(99, title="x") is None
+
+    def test_only_given_fields_validated(self):
+        """Test invalid values and unknown fields raise without changing the item"""
+        service = service_with_item()
+        for fields in ({'title': "  "}, {'priority': "urgent"}, {'tags': [""]}, {'tags': "home"},
+                       {'tags': None}, {'tags': 5}, {'tags': ["two words"]}, {'description': None}, {'colour': "red"}):
+            with pytest.raises(ValueError):
+                service.patch_item(1, **fields)
+        assert service.get_item(1).version == 1
+        assert service.patch_item(1, title="  Buy bread ").title == "Buy bread"
+
+    def test_patch_under_version_check(self):
+        """Test a stale version is a conflict"""
+        service = service_with_item()
+        service.patch_item(1, if_version=1, priority="high")
+        with pytest.raises(VersionConflict):
+            service.patch_item(1, if_version=1, priority="medium")
+        assert service.get_item(1).priority == "high"
+
+    def test_update_and_replace_continue_versions(self):
+        """Test update_item patches and whole-record replacement keeps counting"""
+        service = service_with_item()
+        assert service.update_item(1, title="Buy bread").version == 2
+        replacement = service.storage.update_item(1, Item(id=0, title="Other", description="", created_at=DUE))
+        assert replacement.version == 3
+
+    def test_replace_keeps_engine_fields(self):
+        """Test replacing an item's data keeps its completion, parent, creation time and rollup"""
+        service = service_with_item()
+        engine = service.storage.engine
+        child = engine.add_task("Child", parent_id=1)
+        engine.mark_completed(child.id)
+        created, version = child.created_us, child.version
+        replacement = service.storage.update_item(child.id, Item(0, "Child 2", "", DUE, priority="high"))
+        assert replacement is child and (child.title, child.priority) == ("Child 2", "high")
+        assert (child.completed, child.parent_id, child.created_us, child.version) == (True, 1, created, version + 1)
+        assert engine.tree.progress(1) == (1, 1)
+        assert service.storage.update_item(99, Item(0, "Other", "", DUE)) is None
+
@@ -0,0 +1,172 @@
+"""
+Unit tests for the list query language, planner and secondary indexes
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from modules.query import parse_query, execute_query
+from modules.storage import InMemoryStorage
+from modules.tasks import TaskManager
+from modules.cli import TodoCLI
+from todo_console_app import TodoManager
+
+
+def build_manager(count=20):
+    """Create a manager with predictable titles, statuses and timestamps"""
+    manager = TaskManager()
+    base = datetime(2026, 1, 1)
+    for i in range(1, count + 1):
+        task = manager.add_task(f"Task {i} {'milk' if i % 5 == 0 else 'bread'}")
+        task.created_at = base + timedelta(days=i)
+        task.updated_at = base + timedelta(days=(i * 7) % count)
+        if i % 2 == 0:
+            manager.mark_completed(i)
+    # Indexes are built on the first query, so they pick up the adjusted creation times
+    assert not manager.storage._indexed
+    return manager
+
+
+class TestQueryParser:
+    """Test parsing of list queries"""
+
+    def test_parse_full_query(self):
+        """Test a query with conditions, ordering and a limit"""
+        query = parse_query("where completed=false and created>2026-01-01 order by updated desc limit 50".split())
+
+        assert [(c.field, c.op) for c in query.conditions] == [("completed", "="), ("created", ">")]
+        assert query.conditions[0].value is False
+        assert query.conditions[1].value == datetime(2026, 1, 1)
+        assert query.order_by == "updated"
+        assert query.descending is True
+        assert query.limit == 50
+
+    def test_parse_spaced_condition(self):
+        """Test conditions split across tokens"""
+        query = parse_query(["where", "id", ">=", "3"])
+        assert query.conditions[0].value == 3
+
+    def test_parse_errors(self):
+        """Test invalid queries raise ValueError"""
+        for text in ["where", "where colour=red", "where completed=maybe", "order updated", "limit x", "bogus"]:
+            with pytest.raises(ValueError):
+                parse_query(text.split())
+
+
+class TestQueryPlanner:
+    """Test plan selection and execution"""
+
+    def test_status_index_chosen(self):
+        """Test the status index beats a full scan"""
+        manager = build_manager()
+        result = manager.query_tasks(["where", "completed=true"])
+
+        assert result.plan.access == "status index (completed)"
+        assert [task.id for task in result.rows] == list(range(2, 21, 2))
+        assert result.rows_examined == 10
+
+    def test_time_index_range(self):
+        """Test created ranges are served by the time index"""
+        manager = build_manager()
+        result = manager.query_tasks("where created>2026-01-18 and completed=false".split())
+
+        assert result.plan.access == "time index (created)"
+        assert [task.id for task in result.rows] == [19]
+        assert result.rows_examined == 3
+
+    def test_text_index_and_primary_key(self):
+        """Test word search and id lookups"""
+        manager = build_manager()
+
+        result = manager.query_tasks(["where", "title~MILK"])
+        assert result.plan.access.startswith("text index")
+        assert [task.id for task in result.rows] == [5, 10, 15, 20]
+
+        result = manager.query_tasks(["where", "id=7", "and", "title~bread"])
+        assert result.plan.access == "primary key"
+        assert result.rows_examined == 1
+
+    def test_unselective_index_loses_to_limited_scan(self):
+        """Test a scan that can stop at the limit beats walking a large index"""
+        manager = build_manager()
+        result = manager.query_tasks("where title~bread limit 2".split())
+
+        assert result.plan.access == "full scan"
+        assert [task.id for task in result.rows] == [1, 2]
+        assert result.rows_examined == 2
+
+        # With an order by every match must be seen, so the index still wins
+        result = manager.query_tasks("where title~bread order by id desc limit 2".split())
+        assert result.plan.access.startswith("text index")
+
+    def test_top_k_matches_full_sort(self):
+        """Test order by with limit returns the same rows as a full sort"""
+        manager = build_manager()
+        top = manager.query_tasks("order by updated desc limit 5".split()).rows
+        expected = sorted(manager.get_all_tasks(), key=lambda t: (-t.updated_us, t.id))[:5]
+
+        assert top == expected
+
+    def test_descending_keeps_missing_last_and_ties_in_id_order(self):
+        """Test desc reverses only the values: undated tasks stay last and ties stay in id order"""
+        manager = TaskManager()
+        for title in ("Old", "New", "Undated", "Same", "Same"):
+            manager.add_task(title)
+        manager.set_due(1, datetime(2020, 1, 1))
+        manager.set_due(2, datetime(2030, 1, 1))
+        for limit in ("", " limit 5"):
+            rows = manager.query_tasks(f"order by due desc{limit}".split()).rows
+            assert [task.id for task in rows] == [2, 1, 3, 4, 5]
+            rows = manager.query_tasks(f"order by title desc{limit}".split()).rows
+            assert [task.id for task in rows] == [3, 4, 5, 1, 2]
+            rows = manager.query_tasks(f"order by priority desc{limit}".split()).rows
+            assert [task.id for task in rows] == [1, 2, 3, 4, 5]
+
+    def test_indexes_follow_mutations(self):
+        """Test updates and deletes keep the indexes consistent"""
+        storage = InMemoryStorage()
+        storage.add_task("Buy milk")
+        storage.add_task("Walk dog")
+        storage.update_task(1, title="Buy bread", completed=True)
+        storage.delete_task(2)
+
+        query = parse_query(["where", "text~milk"])
+        assert execute_query(query, storage._tasks, storage).rows == []
+        query = parse_query(["where", "completed=false"])
+        assert execute_query(query, storage._tasks, storage).rows == []
+        query = parse_query(["where", "completed=true"])
+        assert [task.title for task in execute_query(query, storage._tasks, storage).rows] == ["Buy bread"]
+
+
+class TestFrontEnds:
+    """Test the list and explain commands"""
+
+    def test_cli_list_and_explain(self, capsys):
+        """Test TodoCLI filtered list and explain output"""
+        cli = TodoCLI()
+        cli.process_command('add "Buy milk"')
+        cli.process_command('add "Walk dog"')
+        cli.process_command('complete 2')
+        capsys.readouterr()
+
+        cli.process_command('list where completed=false')
+        out = capsys.readouterr().out
+        assert "Buy milk" in out and "Walk dog" not in out
+
+        cli.process_command('explain list where completed=true')
+        out = capsys.readouterr().out
+        assert "status index (completed)" in out
+        assert "rows examined: 1, returned: 1" in out
+
+    def test_console_manager_query(self):
+        """Test TodoManager queries use the shared engine's indexes"""
+        manager = TodoManager()
+        manager.add_todo("Buy milk")
+        manager.add_todo("Walk dog")
+        manager.toggle_completion(1)
+
+        result = manager.query_todos(["where", "completed=false"])
+        assert result.plan.access == "status index (pending)"
+        assert [todo.title for todo in result.rows] == ["Walk dog"]
+        with pytest.raises(ValueError):
+            manager.query_todos(["where", "created>2026-01-01"])
@@ -0,0 +1,137 @@
+"""
+Unit tests for table rendering and the virtualized pager
+"""
+
+import io
+import itertools
+from datetime import datetime
+
+from cli import CLIInterface
+from modules.clock import to_micros
+from modules.render import Column, Pager, Table, display_width, fit, format_minute
+from services import ItemService
+from storage import InMemoryStorage as ItemStorage
+
+
+def number_table():
+    """A table over plain integers"""
+    return Table([
+        Column("N", str, 6),
+        Column("Square", lambda n: str(n * n), 12, min_width=6),
+    ])
+
+
+class CountingStream(io.StringIO):
+    """StringIO that counts write calls"""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+class TestText:
+    """Test width-aware padding and truncation"""
+
+    def test_display_width(self):
+        """Test wide characters take two columns and combining marks none"""
+        assert display_width("abc") == 3
+        assert display_width("日本") == 4
+        assert display_width("é") == 1
+
+    def test_fit_ascii(self):
+        """Test ASCII text is padded or truncated with an ellipsis"""
+        assert fit("milk", 6) == "milk  "
+        assert fit("Buy some milk", 8) == "Buy so.."
+        assert fit("milk", 2) == "mi"
+
+    def test_fit_wide_characters(self):
+        """Test wide text never overflows its column"""
+        for width in range(1, 12):
+            assert display_width(fit("日本語のタイトル", width)) == width
+        assert fit("日本語のタイトル", 7) == "日本.. "
+
+    def test_format_minute(self):
+        """Test the cached minute format matches strftime"""
+        when = datetime(2026, 6, 1, 12, 34, 56)
+        assert format_minute(to_micros(when)) == "2026-06-01 12:34"
+        assert format_minute(None) == ""
+
+
+class TestTable:
+    """Test the buffered table renderer"""
+
+    def test_single_write(self):
+        """Test a whole table goes out in one write"""
+        out = CountingStream()
+        number_table().write(range(1000), out=out, footer="done")
+        lines = out.getvalue().splitlines()
+
+        assert out.writes == 1
+        assert lines[0] == "N      Square"
+        assert lines[2:4] == ["0      0", "1      1"]
+        assert lines[-1] == "done"
+
+    def test_widths_follow_terminal(self):
+        """Test flexible columns grow and shrink but fixed ones do not"""
+        table = number_table()
+        assert table.widths() == [6, 12]
+        assert table.widths(40) == [6, 33]
+        assert table.widths(10) == [6, 6]
+
+
+class TestPager:
+    """Test the pager renders only the visible window"""
+
+    def test_pages_through_infinite_iterator(self):
+        """Test an endless source is consumed one screen at a time"""
+        out = io.StringIO()
+        commands = iter(["n", "n", "p", "q"])
+        pager = Pager(number_table(), itertools.count(1), out=out,
+                      read=lambda prompt: next(commands), size=(40, 14))
+        pager.run()
+        screens = out.getvalue().split("-- rows ")
+
+        assert pager.page_size == 10
+        assert screens[1].startswith("1-10 of 11+")
+        assert screens[2].startswith("11-20 of 21+")
+        assert screens[4].startswith("11-20 of 31+")
+        assert len(pager._rows) == 31
+
+    def test_jump_and_last_page(self):
+        """Test jumping to a row and to the end of a finite source"""
+        pager = Pager(number_table(), iter(range(1, 26)), read=lambda prompt: "q", size=(40, 14))
+        pager.scroll("G")
+        assert pager.top == 15 and pager.exhausted
+        assert "-- rows 16-25 of 25 --" in pager.window()
+
+        pager.scroll("7")
+        assert pager.window().splitlines()[2].split() == ["7", "49"]
+        pager.scroll("g")
+        assert pager.top == 0
+
+    def test_stops_at_end_of_input(self):
+        """Test the pager exits cleanly when input runs out"""
+        def read(prompt):
+            raise EOFError
+        out = io.StringIO()
+        Pager(number_table(), [1, 2, 3], out=out, read=read, size=(40, 14)).run()
+        assert "-- rows 1-3 of 3 --" in out.getvalue()
+
+
+class TestMenuListing:
+    """Test the menu CLI's item listing"""
+
+    def test_listing_fits_terminal_width(self, capsys, monkeypatch):
+        """Test long titles are cut to the terminal width"""
+        monkeypatch.setenv("COLUMNS", "60")
+        service = ItemService(ItemStorage())
+        service.create_item("A title far too long for any narrow terminal column", "")
+        CLIInterface(service).list_items()
+
+        lines = capsys.readouterr().out.splitlines()
+        assert max(display_width(line) for line in lines) <= 60
+        assert lines[-1] == "Total items: 1"
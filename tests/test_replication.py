@@ -0,0 +1,117 @@
+"""
+Unit tests for leader/follower replication
+"""
+
+import multiprocessing
+
+import pytest
+from modules.replication import ReplicationLeader, ReplicationFollower, parse_address
+from modules.tasks import TaskManager
+
+TIMEOUT = 5.0
+
+
+@pytest.fixture
+def manager():
+    """A task manager with a few tasks created before replication starts"""
+    manager = TaskManager()
+    for i in range(1, 6):
+        manager.add_task(f"Task {i}")
+    return manager
+
+
+def follower_process(address, seq, results):
+    """Run a follower in a child process and report what it replicated"""
+    follower = ReplicationFollower(address)
+    caught_up = follower.wait_for(seq, TIMEOUT)
+    results.put((caught_up, sorted(task.title for task in follower.get_all_tasks())))
+    follower.stop()
+
+
+class TestReplication:
+    """Test snapshot, streaming and catch-up"""
+
+    def test_follower_snapshot_then_stream(self, manager):
+        """Test a new follower loads a snapshot and then applies live changes"""
+        leader = ReplicationLeader(manager.storage)
+        follower = ReplicationFollower(leader.address)
+        try:
+            assert follower.wait_for(5, TIMEOUT)
+            assert len(follower.get_all_tasks()) == 5
+
+            manager.add_task("Live")
+            manager.update_task(1, title="Renamed")
+            manager.mark_completed(3)
+            manager.delete_task(2)
+            assert follower.wait_for(manager.storage.events.seq, TIMEOUT)
+
+            assert follower.get_task(1).title == "Renamed"
+            assert follower.get_task(2) is None
+            assert follower.get_task(6).title == "Live"
+            result = follower.query_tasks(["where", "completed=true"])
+            assert [task.id for task in result.rows] == [3]
+            assert follower.lag().events == 0
+        finally:
+            follower.stop()
+            leader.stop()
+
+    def test_follower_catches_up_after_log_eviction(self, manager):
+        """Test a follower that fell behind the log receives a new snapshot"""
+        leader = ReplicationLeader(manager.storage, log_capacity=4)
+        follower = ReplicationFollower(leader.address, reconnect_delay=0.05)
+        try:
+            assert follower.wait_for(5, TIMEOUT)
+            follower.stop()
+
+            for i in range(20):
+                manager.add_task(f"Missed {i}")
+            seq = manager.storage.events.seq
+
+            with leader._log_condition:
+                assert leader._log_condition.wait_for(lambda: leader.seq == seq, TIMEOUT)
+                assert leader._read_log(6)[2] is True  # seq 6 was evicted from the log
+
+            follower = ReplicationFollower(leader.address)
+            assert follower.wait_for(seq, TIMEOUT)
+            assert len(follower.get_all_tasks()) == 25
+        finally:
+            follower.stop()
+            leader.stop()
+
+    def test_unix_socket(self, manager, tmp_path):
+        """Test replication over a Unix domain socket"""
+        leader = ReplicationLeader(manager.storage, f"unix://{tmp_path / 'todo.sock'}")
+        follower = ReplicationFollower(leader.address)
+        try:
+            assert follower.wait_for(5, TIMEOUT)
+        finally:
+            follower.stop()
+            leader.stop()
+
+    def test_followers_in_other_processes(self, manager):
+        """Test several follower processes replicate the same state"""
+        leader = ReplicationLeader(manager.storage)
+        results = multiprocessing.Queue()
+        manager.add_task("Before fork")
+        seq = manager.storage.events.seq
+        processes = [multiprocessing.Process(target=follower_process, args=(leader.address, seq, results))
+                     for _ in range(2)]
+        try:
+            for process in processes:
+                process.start()
+            expected = sorted(task.title for task in manager.get_all_tasks())
+            for _ in processes:
+                caught_up, titles = results.get(timeout=TIMEOUT * 2)
+                assert caught_up
+                assert titles == expected
+        finally:
+            for process in processes:
+                process.join(TIMEOUT)
+            leader.stop()
+
+    def test_parse_address(self):
+        """Test address parsing"""
+        assert parse_address("tcp://127.0.0.1:7000")[1] == ("127.0.0.1", 7000)
+        assert parse_address("unix:///tmp/x.sock")[1] == "/tmp/x.sock"
+        with pytest.raises(ValueError):
+            parse_address("http://example.com")
@@ -0,0 +1,94 @@
+"""
+Unit tests for the due-date reminder scheduler
+"""
+
+import threading
+from datetime import datetime, timedelta
+
+from modules.scheduler import ReminderScheduler
+from modules.tasks import TaskManager
+
+BASE = datetime(2026, 6, 1, 12, 0)
+
+
+def at(minutes):
+    """Return BASE shifted by the given number of minutes"""
+    return BASE + timedelta(minutes=minutes)
+
+
+class TestReminderScheduler:
+    """Test scheduling, moving and cancelling timers"""
+
+    def test_fires_in_deadline_order(self):
+        """Test due reminders fire earliest first and only once"""
+        fired = []
+        scheduler = ReminderScheduler(lambda task_id, deadline: fired.append(task_id))
+        scheduler.schedule(1, at(10))
+        scheduler.schedule(2, at(5))
+        scheduler.schedule(3, at(30))
+
+        assert scheduler.run_pending(at(10).timestamp()) == 2
+        assert fired == [2, 1]
+        assert scheduler.run_pending(at(10).timestamp()) == 0
+        assert len(scheduler) == 1
+
+    def test_move_and_cancel(self):
+        """Test moved timers fire at the new time and cancelled ones never fire"""
+        fired = []
+        scheduler = ReminderScheduler(lambda task_id, deadline: fired.append((task_id, deadline)))
+        scheduler.schedule(1, at(5))
+        scheduler.schedule(2, at(6))
+        scheduler.schedule(1, at(20))
+        assert scheduler.cancel(2) is True
+        assert scheduler.cancel(2) is False
+
+        scheduler.run_pending(at(10).timestamp())
+        assert fired == []
+        assert scheduler.next_deadline() == at(20).timestamp()
+        scheduler.run_pending(at(20).timestamp())
+        assert fired == [(1, at(20).timestamp())]
+
+    def test_cancelled_entries_are_compacted(self):
+        """Test cancelling many reminders does not leave the heap growing"""
+        scheduler = ReminderScheduler(lambda task_id, deadline: None)
+        for round_ in range(20):
+            for task_id in range(1000):
+                scheduler.schedule(round_ * 1000 + task_id, datetime(2030, 1, 1) + timedelta(seconds=task_id))
+            for task_id in range(1000):
+                scheduler.cancel(round_ * 1000 + task_id)
+        assert len(scheduler) == 0 and len(scheduler._heap) <= 64
+
+    def test_background_thread_fires(self):
+        """Test the worker thread wakes for a newly scheduled earlier deadline"""
+        event = threading.Event()
+        scheduler = ReminderScheduler(lambda task_id, deadline: event.set())
+        scheduler.start()
+        try:
+            scheduler.schedule(1, datetime.now() + timedelta(hours=1))
+            scheduler.schedule(2, datetime.now() + timedelta(milliseconds=20))
+            assert event.wait(2.0)
+        finally:
+            scheduler.stop()
+        assert scheduler.fired == 1
+
+
+class TestTaskManagerHooks:
+    """Test TaskManager keeps reminders in step with tasks"""
+
+    def test_hooks(self):
+        """Test set_due, completion and deletion update the scheduler"""
+        scheduler = ReminderScheduler(lambda task_id, deadline: None)
+        manager = TaskManager(scheduler=scheduler)
+        manager.add_task("A")
+        manager.add_task("B")
+        manager.set_due(1, at(5))
+        manager.set_due(2, at(6))
+        assert len(scheduler) == 2
+
+        manager.mark_completed(1)
+        assert len(scheduler) == 1
+        manager.mark_incomplete(1)
+        assert len(scheduler) == 2
+        manager.delete_task(2)
+        manager.set_due(1, None)
+        assert len(scheduler) == 0
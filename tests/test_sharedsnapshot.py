@@ -0,0 +1,161 @@
+"""
+Unit tests for shared memory snapshots
+"""
+
+import os
+import subprocess
+import sys
+
+from datetime import datetime
+
+import pytest
+
+from modules.cli import TodoCLI
+from modules.clock import ManualClock, to_micros
+from modules.sharedsnapshot import SnapshotPublisher, SnapshotReader, encode_snapshot
+from modules.storage import InMemoryStorage
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+START = datetime(2026, 6, 1, 12, 0)
+
+
+@pytest.fixture
+def publisher():
+    """A publisher of a small store under a name unique to this test process"""
+    storage = InMemoryStorage()
+    storage.add_task("Buy oat milk", "from the corner shop")
+    storage.add_task("Call mum")
+    storage.add_task("Write report", "quarterly numbers", parent_id=1)
+    storage.add_tags(1, ["home", "shop"])
+    storage.set_priority(2, "high")
+    storage.mark_completed(2)
+    publisher = SnapshotPublisher(storage, f"todo_test_{os.getpid()}")
+    publisher.publish()
+    yield publisher
+    publisher.stop()
+
+
+class TestSnapshot:
+    """Test the layout and reading it back"""
+
+    def test_records_round_trip(self, publisher):
+        """Test every field of every task reads back as stored"""
+        reader = SnapshotReader(publisher.name)
+        try:
+            assert len(reader) == 3 and reader.generation == publisher.storage.generation
+            for task in publisher.storage.get_all_tasks():
+                assert reader.get_task(task.id).to_task().to_dict() == task.to_dict()
+            assert [task.id for task in reader] == [1, 2, 3]
+            assert reader.get_task(3).parent_id == 1 and reader.get_task(1).tags == ["home", "shop"]
+            assert reader.get_task(4) is None and reader.get_task(0) is None
+        finally:
+            reader.close()
+
+    def test_search(self, publisher):
+        """Test searching titles and descriptions for every word"""
+        reader = SnapshotReader(publisher.name)
+        try:
+            assert [task.id for task in reader.search("shop")] == [1]
+            assert [task.id for task in reader.search("Report QUARTERLY")] == [3]
+            assert reader.search("report milk") == [] and reader.search("absent") == []
+            assert reader.search("") == []
+        finally:
+            reader.close()
+
+    def test_non_ascii_text(self):
+        """Test text outside ASCII is stored and tokenized like the store does"""
+        storage = InMemoryStorage()
+        storage.add_task("Café Über", "naïve résumé")
+        publisher = SnapshotPublisher(storage, f"todo_utf8_{os.getpid()}")
+        try:
+            publisher.publish()
+            reader = SnapshotReader(publisher.name)
+            assert reader.get_task(1).title == "Café Über"
+            assert [task.id for task in reader.search("über RÉSUMÉ")] == [1]
+            reader.close()
+        finally:
+            publisher.stop()
+
+    def test_refresh_swaps_generations(self, publisher):
+        """Test a reader keeps its snapshot until refresh() moves it to the newest one"""
+        reader = SnapshotReader(publisher.name)
+        try:
+            publisher.storage.add_task("Book flights")
+            publisher.publish()
+            assert len(reader) == 3 and reader.get_task(4) is None
+            assert reader.refresh() is True and reader.refresh() is False
+            assert len(reader) == 4 and reader.get_task(4).title == "Book flights"
+            assert reader.snapshot.number == 2
+        finally:
+            reader.close()
+
+    def test_publisher_stopped_under_reader(self, publisher):
+        """Test refreshing after the publisher stops fails at once and the mapped snapshot stays readable"""
+        reader = SnapshotReader(publisher.name)
+        try:
+            publisher.storage.add_task("Book flights")
+            publisher.publish()
+            publisher.stop()
+            with pytest.raises(FileNotFoundError, match="publisher has stopped"):
+                reader.refresh()
+            assert len(reader) == 3 and reader.get_task(1).title == "Buy oat milk"
+        finally:
+            reader.close()
+
+    def test_empty_store_and_errors(self):
+        """Test empty stores publish and unpublished or unknown names are refused"""
+        publisher = SnapshotPublisher(InMemoryStorage(ManualClock(START)), f"todo_empty_{os.getpid()}")
+        try:
+            with pytest.raises(ValueError):
+                SnapshotReader(publisher.name)
+            publisher.publish()
+            reader = SnapshotReader(publisher.name)
+            assert len(reader) == 0 and list(reader) == [] and reader.search("x") == []
+            assert reader.snapshot.published_us == to_micros(START)
+            reader.close()
+        finally:
+            publisher.stop()
+        with pytest.raises(FileNotFoundError):
+            SnapshotReader(f"todo_missing_{os.getpid()}")
+        with pytest.raises(ValueError):
+            SnapshotPublisher(InMemoryStorage(), "x" * 49)
+        assert sum(map(len, encode_snapshot([], 1, 0, 0))) > 0
+
+    def test_reader_in_another_process(self, publisher):
+        """Test a separate process reads the segment, and leaves it in place when it exits"""
+        script = (
+            "import sys\n"
+            "from modules.sharedsnapshot import SnapshotReader\n"
+            "reader = SnapshotReader(sys.argv[1])\n"
+            "print(len(reader), reader.get_task(1).title, [t.id for t in reader.search('report')])\n"
+            "reader.close()\n"
+        )
+        for _ in range(2):
+            result = subprocess.run([sys.executable, "-c", script, publisher.name], cwd=REPO,
+                                    capture_output=True, text=True, timeout=30)
+            assert result.returncode == 0, result.stderr
+            assert result.stdout.strip() == "3 Buy oat milk [3]"
+
+
+class TestSnapshotCommand:
+    """Test the snapshot command"""
+
+    def test_publish_status_stop(self, capsys):
+        """Test publishing the current list, reading it and stopping"""
+        cli = TodoCLI()
+        cli.process_command('add "Write report"')
+        name = f"todo_cli_{os.getpid()}"
+        cli.process_command(f"snapshot publish {name} 0.05")
+        assert f"Publishing snapshots of list 'default' as '{name}' (1 task(s))" in capsys.readouterr().out
+        try:
+            reader = SnapshotReader(name)
+            assert reader.get_task(1).title == "Write report"
+            reader.close()
+            cli.process_command("snapshot status")
+            out = capsys.readouterr().out
+            assert f"Shared snapshot '{name}': #1" in out and "(list 'default')" in out
+        finally:
+            cli.process_command("snapshot stop")
+        assert "Stopped publishing snapshots" in capsys.readouterr().out
+        cli.process_command("snapshot publish x 0")
+        assert "Error: Could not publish snapshots: Interval must be positive" in capsys.readouterr().out
@@ -0,0 +1,166 @@
+"""
+Unit tests for the memory budget and spilling cold tasks to disk
+"""
+
+import random
+
+import pytest
+
+from modules.cli import TodoCLI
+from modules.spill import AccessTracker, Segment, parse_size, task_size
+from modules.storage import InMemoryStorage, Task
+from modules.tasks import TaskManager
+
+
+def budgeted_storage(count=100, resident=10, path=None):
+    """A store of completed tasks whose budget fits about `resident` of them"""
+    storage = InMemoryStorage()
+    for i in range(count):
+        storage.add_task(f"Task {i:03d}", "done long ago")
+        storage.mark_completed(i + 1)
+    storage.set_memory_budget(resident * task_size(storage.get_task(1)), path)
+    return storage
+
+
+class TestAccessTracker:
+    """Test the choice of eviction victims"""
+
+    def test_least_recent_completed_first(self):
+        """Test pending tasks are never chosen and older ones go first"""
+        tracker = AccessTracker()
+        tracker.touch(1, completed=True)
+        tracker.touch(2, completed=False)
+        tracker.touch(3, completed=True)
+        assert tracker.victim() == 1
+        assert tracker.victim() == 3
+        assert tracker.victim() is None
+
+    def test_frequent_tasks_get_second_chances(self):
+        """Test a task read repeatedly outlives one read once"""
+        tracker = AccessTracker()
+        for _ in range(3):
+            tracker.touch(1, completed=True)
+        tracker.touch(2, completed=True)
+        assert tracker.victim() == 2
+
+
+class TestSpilling:
+    """Test tasks move between memory and the segment file"""
+
+    def test_budget_spills_and_pages_in(self):
+        """Test cold tasks leave memory and come back on lookup"""
+        storage = budgeted_storage()
+        stats = storage.memory_stats()
+        assert stats.resident <= 10 and stats.spilled == 100 - stats.resident
+        assert stats.resident_bytes <= stats.budget
+
+        task = storage.get_task(1)
+        assert task.title == "Task 000" and task.completed
+        assert storage.memory_stats().page_ins == 1
+        assert storage.memory_stats().page_in_latency_us > 0
+
+    def test_spilled_tasks_stay_visible(self):
+        """Test length, membership, listing and queries include spilled tasks"""
+        storage = budgeted_storage()
+        assert len(storage) == 100
+        assert 1 in storage._tasks
+        assert [task.id for task in storage.get_all_tasks()] == list(range(1, 101))
+        assert storage.memory_stats().page_ins == 0  # scans read without paging in
+
+        manager = TaskManager()
+        manager.storage = storage
+        result = manager.query_tasks(["where", "title~042"])
+        assert [task.title for task in result.rows] == ["Task 042"]
+
+    def test_pending_tasks_are_never_spilled(self):
+        """Test a budget smaller than the pending tasks leaves them resident"""
+        storage = InMemoryStorage()
+        for i in range(20):
+            storage.add_task(f"Task {i}")
+        storage.set_memory_budget(100)
+        assert storage.memory_stats().spilled == 0
+
+    def test_mutations_and_deletes_of_spilled_tasks(self):
+        """Test updating or deleting a spilled task works through the engine"""
+        storage = budgeted_storage()
+        assert storage.update_task(2, title="Renamed")
+        assert storage.get_task(2).title == "Renamed"
+        assert storage.delete_task(3)
+        assert storage.get_task(3) is None and len(storage) == 99
+
+        storage.mark_incomplete(4)
+        assert dict.__contains__(storage._tasks, 4)
+        assert storage.status_index.pending == {4}
+
+    def test_ids_stay_ordered_without_sorting(self):
+        """Test iteration order follows the id set through out-of-order upserts, deletes and page-ins"""
+        rng = random.Random(5)
+        storage = budgeted_storage()
+        for _ in range(300):
+            task_id = rng.randrange(1, 200)
+            action = rng.random()
+            if action < 0.4:
+                storage.upsert_task(Task(task_id, f"Task {task_id}", completed=True))
+            elif action < 0.7:
+                storage.delete_task(task_id)
+            else:
+                storage.get_task(task_id)
+        tasks = storage._tasks
+        expected = sorted([*dict.keys(tasks), *tasks.segment.ids()])
+        assert tasks.stats().spilled
+        assert list(tasks.keys()) == expected == [task.id for task in storage.get_all_tasks()]
+
+    def test_compressed_descriptions_sized_as_stored(self, monkeypatch):
+        """Test a compressed description counts its stored bytes and is not decompressed to be sized"""
+        storage = InMemoryStorage()
+        plain = storage.add_task("Plain", "x" * 100)
+        packed = storage.add_task("Packed", "budget review " * 100)
+        assert 'description_z' in packed.__dict__
+        monkeypatch.setattr('modules.strings.zlib.decompress', None)
+        assert task_size(packed) < task_size(plain)  # 1,400 characters stored in far fewer bytes
+
+    def test_lifting_budget_reloads_everything(self):
+        """Test removing the budget makes every task resident again"""
+        storage = budgeted_storage()
+        storage.set_memory_budget(None)
+        assert type(storage._tasks) is dict
+        assert len(storage._tasks) == 100 and storage.memory_stats() is None
+
+    def test_segment_compaction(self, tmp_path, monkeypatch):
+        """Test the segment file is rewritten once it is mostly garbage"""
+        monkeypatch.setattr("modules.spill.COMPACT_MIN_BYTES", 0)
+        path = tmp_path / "segment.bin"
+        segment = Segment(str(path))
+        storage = InMemoryStorage()
+        for i in range(10):
+            segment.write(storage.add_task(f"Task {i}", "x" * 100))
+        written = segment.size
+        for task_id in range(1, 8):
+            segment.discard(task_id)
+        segment.close()
+
+        assert segment.size == path.stat().st_size < written / 2
+        assert sorted(segment.ids()) == [8, 9, 10]
+
+
+class TestMemoryCommand:
+    """Test the memory CLI command"""
+
+    def test_parse_size(self):
+        """Test byte counts with units"""
+        assert parse_size("64KB") == 65536
+        assert parse_size("1.5m") == 1572864
+        with pytest.raises(ValueError):
+            parse_size("lots")
+
+    def test_memory_budget_command(self, capsys):
+        """Test setting a budget and reading the report"""
+        cli = TodoCLI()
+        for i in range(50):
+            cli.process_command(f'add "Task {i}"')
+            cli.process_command(f'complete {i + 1}')
+        cli.process_command('memory budget 4KB')
+        cli.process_command('memory')
+        out = capsys.readouterr().out
+        assert "Memory budget set to 4.0 KB" in out
+        assert "Spilled:" in out and "page-ins: 0" in out
@@ -0,0 +1,85 @@
+"""
+Startup tests: entry points stay cheap to import and support one-shot commands
+"""
+
+import os
+import subprocess
+import sys
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that only specific commands need; none may load at startup
+DEFERRED = ('socket', 'concurrent.futures', 'multiprocessing', 'json',
+            'modules.replication', 'modules.importer', 'modules.query', 'modules.sharedsnapshot')
+
+
+def run(*args):
+    """Run python with the given arguments from the repository root"""
+    return subprocess.run([sys.executable, *args], cwd=REPO, capture_output=True,
+                          text=True, stdin=subprocess.DEVNULL, timeout=30)
+
+
+def imported_modules(module):
+    """Get {name: cumulative microseconds} from -X importtime for one import"""
+    result = run('-X', 'importtime', '-c', f'import {module}')
+    assert result.returncode == 0, result.stderr
+    modules = {}
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            _, cumulative, name = line.split('|')
+            if cumulative.strip().isdigit():
+                modules[name.strip()] = int(cumulative)
+    return modules
+
+
+class TestStartupImports:
+    """Test entry points defer heavy modules"""
+
+    def test_main_defers_heavy_modules(self):
+        """Test the item console imports neither typing nor command-specific modules"""
+        modules = imported_modules('main')
+        assert 'typing' not in modules
+        assert not [name for name in DEFERRED if name in modules]
+        assert modules['main'] < 100_000  # generous: about 30 ms locally
+
+    def test_todo_console_app_defers_heavy_modules(self):
+        """Test the todo console app loads the query engine only when used"""
+        modules = imported_modules('todo_console_app')
+        assert 'typing' not in modules
+        assert not [name for name in DEFERRED if name in modules]
+
+    def test_todo_cli_defers_heavy_modules(self):
+        """Test the task CLI imports no typing and leaves importing, querying, replication, admission and lists until needed"""
+        modules = imported_modules('modules.cli')
+        assert not [name for name in ('typing', 'modules.admission', 'modules.tenants', 'modules.complete', 'modules.events')
+                    if name in modules]
+        assert not [name for name in DEFERRED if name in modules]
+
+    def test_task_manager_defers_optional_modules(self):
+        """Test the task manager loads typing, reminders, events and dedupe only when used"""
+        modules = imported_modules('modules.tasks')
+        assert not [name for name in ('typing', 'modules.scheduler', 'modules.events', 'modules.dedupe')
+                    if name in modules]
+        assert not [name for name in DEFERRED if name in modules]
+
+
+class TestOneShot:
+    """Test running a single command from the command line"""
+
+    def test_main_add(self):
+        """Test main.py runs one command and exits"""
+        result = run('main.py', 'add', 'Buy milk', 'From the store')
+        assert result.returncode == 0
+        assert result.stdout.strip() == "Created item 1: Buy milk"
+
+    def test_main_errors_set_exit_status(self):
+        """Test invalid one-shot commands exit non-zero"""
+        assert run('main.py', 'show', 'abc').returncode == 1
+        assert run('main.py', 'show', '7').returncode == 1
+        assert run('main.py', 'bogus').returncode == 2
+
+    def test_todo_console_app_add(self):
+        """Test todo_console_app.py runs one command and exits"""
+        result = run('todo_console_app.py', 'add', 'Buy milk')
+        assert result.returncode == 0
+        assert "Buy milk" in result.stdout
@@ -0,0 +1,79 @@
+"""
+Unit tests for title interning and description compression
+"""
+
+from modules.storage import InMemoryStorage, Task
+from modules.strings import COMPRESS_MIN, set_text, string_stats
+from modules.tasks import TaskManager
+
+LONG = "Remember to bring the insurance card and the referral letter. " * 8
+
+
+class TestInterning:
+    """Test repeated titles share one string"""
+
+    def test_titles_are_shared(self):
+        """Test tasks built from separate but equal strings share a title object"""
+        storage = InMemoryStorage()
+        first = storage.add_task("".join(["Call ", "dentist"]))
+        second = storage.add_task("".join(["Call ", "dentist"]))
+        assert first.title is second.title
+
+        storage.update_task(second.id, title="".join(["Buy ", "groceries"]))
+        third = storage.add_task("".join(["Buy ", "groceries"]))
+        assert second.title is third.title
+
+
+class TestCompression:
+    """Test long descriptions are stored compressed and read back intact"""
+
+    def test_long_descriptions_compress(self):
+        """Test only descriptions over the threshold are compressed"""
+        short = Task(1, "Call dentist", "Ask about the bill")
+        long = Task(2, "Call dentist", LONG)
+
+        assert short.__dict__['description'] == "Ask about the bill"
+        assert 'description' not in long.__dict__
+        assert len(long.__dict__['description_z']) < len(LONG) // 4
+        assert long.description == LONG
+        assert long == Task.from_dict(long.to_dict())
+
+    def test_incompressible_text_stays_plain(self):
+        """Test text that does not shrink is kept as a string"""
+        task = Task(1, "Noise", "")
+        noise = "".join(chr(0x4E00 + (i * 7919) % 20000) for i in range(COMPRESS_MIN))
+        set_text(task, 'description', noise)
+        assert task.__dict__['description'] == noise
+
+    def test_updates_switch_representation(self):
+        """Test updating between long and short descriptions"""
+        storage = InMemoryStorage()
+        task = storage.add_task("Call dentist", LONG)
+        storage.update_task(task.id, description="short")
+        assert task.description == "short" and 'description_z' not in task.__dict__
+        storage.update_task(task.id, description=LONG)
+        assert task.description == LONG and 'description' not in task.__dict__
+
+    def test_compressed_descriptions_are_searchable(self):
+        """Test queries and duplicate detection read compressed text"""
+        manager = TaskManager()
+        manager.add_task("Call dentist", LONG)
+        assert len(manager.query_tasks(["where", "text~referral"]).rows) == 1
+        assert manager.find_duplicate("Call dentist", LONG) is not None
+
+
+class TestStringStats:
+    """Test the memory report"""
+
+    def test_report_shows_savings(self):
+        """Test shared titles and compressed descriptions count as savings"""
+        storage = InMemoryStorage()
+        for i in range(20):
+            storage.add_task("".join(["Buy ", "groceries"]), LONG if i % 2 else "milk")
+        stats = string_stats(storage.iter_tasks())
+
+        assert stats.tasks == 20 and stats.distinct_titles == 1
+        assert stats.compressed == 10
+        assert stats.title_bytes * 20 == stats.title_bytes_unshared
+        assert stats.description_bytes < stats.description_bytes_plain
+        assert "Saved:" in stats.describe()
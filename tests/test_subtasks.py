@@ -0,0 +1,176 @@
+"""
+Unit tests for subtasks, rolled-up progress and subtree operations
+"""
+
+import random
+
+import pytest
+
+from modules.cli import TodoCLI
+from modules.storage import InMemoryStorage, Task, VersionConflict
+
+
+def project():
+    """1 -> (2 -> (4, 5), 3)"""
+    storage = InMemoryStorage()
+    storage.add_task("Launch")
+    storage.add_task("Build", parent_id=1)
+    storage.add_task("Announce", parent_id=1)
+    storage.add_task("Backend", parent_id=2)
+    storage.add_task("Frontend", parent_id=2)
+    return storage
+
+
+def brute_progress(storage, task_id):
+    """(completed, total) descendants by walking parent ids"""
+    done = total = 0
+    for task in storage.iter_tasks():
+        parent = task.parent_id
+        while parent is not None:
+            if parent == task_id:
+                total += 1
+                done += task.completed
+                break
+            parent = storage.get_task(parent).parent_id
+    return done, total
+
+
+class TestTree:
+    """Test child lists and rolled-up counts"""
+
+    def test_subtree_and_progress(self):
+        """Test outline order and counts at every level"""
+        storage = project()
+        tree = storage.tree
+        assert tree.subtree(1) == [1, 2, 4, 5, 3]
+        assert tree.child_ids(2) == [4, 5]
+        assert tree.progress(1) == (0, 4) and tree.progress(4) == (0, 0)
+        storage.mark_completed(4)
+        storage.mark_completed(3)
+        assert tree.progress(1) == (2, 4) and tree.progress(2) == (1, 2)
+        storage.mark_incomplete(4)
+        assert tree.progress(1) == (1, 4)
+        with pytest.raises(ValueError):
+            storage.add_task("Orphan", parent_id=99)
+
+    def test_move_keeps_counts(self):
+        """Test moving a subtree moves its counts and cycles are refused"""
+        storage = project()
+        storage.mark_completed(5)
+        assert storage.set_parent(2, 3)
+        assert storage.tree.progress(3) == (1, 3) and storage.tree.progress(1) == (1, 4)
+        assert storage.get_task(2).parent_id == 3 and storage.get_task(2).version == 2
+        for bad in (2, 4, 99):
+            with pytest.raises(ValueError):
+                storage.set_parent(2, bad)
+        storage.set_parent(2, None)
+        assert storage.tree.progress(1) == (0, 1) and storage.tree.progress(2) == (1, 2)
+        assert storage.set_parent(99, 1) is False
+
+    def test_delete_promotes_children(self):
+        """Test deleting a parent moves its subtasks up to its own parent"""
+        storage = project()
+        storage.mark_completed(4)
+        storage.delete_task(2)
+        assert storage.get_task(4).parent_id == 1 and storage.get_task(5).parent_id == 1
+        assert storage.tree.child_ids(1) == [3, 4, 5]
+        assert storage.tree.progress(1) == (1, 3)
+
+    def test_random_operations_match_brute_force(self):
+        """Test counts stay exact through random adds, moves, status changes and deletes"""
+        rng = random.Random(3)
+        storage = InMemoryStorage()
+        storage.add_task("root")
+        for _ in range(600):
+            ids = [task.id for task in storage.iter_tasks()]
+            task_id = rng.choice(ids)
+            action = rng.random()
+            if action < 0.35 or len(ids) < 5:
+                storage.add_task("t", parent_id=rng.choice(ids + [None]))
+            elif action < 0.55:
+                storage.mark_completed(task_id) if rng.random() < 0.6 else storage.mark_incomplete(task_id)
+            elif action < 0.7:
+                try:
+                    storage.set_parent(task_id, rng.choice(ids + [None]))
+                except ValueError:
+                    pass
+            elif action < 0.8:
+                storage.complete_subtree(task_id, rng.random() < 0.7)
+            elif action < 0.9:
+                storage.delete_task(task_id)
+            else:
+                storage.delete_subtree(task_id)
+        assert len(storage) > 20
+        for task in storage.iter_tasks():
+            assert storage.tree.progress(task.id) == brute_progress(storage, task.id)
+
+
+class TestSubtreeBatches:
+    """Test cascaded completion and deletion"""
+
+    def test_complete_subtree_is_one_batch(self):
+        """Test one generation and one run of events for the whole subtree"""
+        storage = project()
+        storage.mark_completed(5)
+        subscription = storage.events.subscribe()
+        generation = storage.generation
+        changed = storage.complete_subtree(2)
+        assert [task.id for task in changed] == [2, 4]
+        assert storage.generation == generation + 1
+        assert [(event.kind, event.record_id) for event in subscription.get_batch()] == [
+            ('completed', 2), ('completed', 4)]
+        assert storage.tree.progress(1) == (3, 4) and storage.tree.progress(2) == (2, 2)
+        assert storage.status_index.ids(False) == {1, 3}
+        storage.complete_subtree(1, completed=False)
+        assert storage.tree.progress(1) == (0, 4) and storage.get_task(5).completed is False
+        assert storage.complete_subtree(99) is None
+
+    def test_delete_subtree(self):
+        """Test the whole subtree goes, the rest of the tree and its counts stay"""
+        storage = project()
+        storage.mark_completed(4)
+        storage.text_index
+        with pytest.raises(VersionConflict):
+            storage.delete_subtree(2, if_version=5)
+        assert storage.delete_subtree(2) == [2, 4, 5]
+        assert [task.id for task in storage.iter_tasks()] == [1, 3]
+        assert storage.tree.child_ids(1) == [3] and storage.tree.progress(1) == (0, 1)
+        assert storage.text_index.ids(["backend"]) == set()
+        assert storage.delete_subtree(2) == []
+
+    def test_parent_survives_serialization_and_replica_upserts(self):
+        """Test parent ids round-trip and upserted tasks join the tree"""
+        storage = project()
+        assert Task.from_dict(storage.get_task(4).to_dict()).parent_id == 2
+        replica = InMemoryStorage()
+        for task in reversed(storage.get_all_tasks()):
+            replica.upsert_task(Task.from_dict(task.to_dict()))
+        assert sorted(replica.tree.subtree(1)) == [1, 2, 3, 4, 5] and replica.tree.progress(1) == (0, 4)
+
+
+class TestSubtaskCommands:
+    """Test the subtask, tree and move commands and the 'all' forms"""
+
+    def test_commands(self, capsys):
+        """Test building, showing, completing and deleting a tree"""
+        cli = TodoCLI()
+        cli.process_command('add "Launch"')
+        cli.process_command('subtask 1 "Build"')
+        cli.process_command('subtask 2 "Backend"')
+        cli.process_command('subtask 1 "Announce"')
+        assert "Added subtask of task 2: [O] 3. Backend" in capsys.readouterr().out
+        cli.process_command("complete 3")
+        cli.process_command("tree 1")
+        out = capsys.readouterr().out
+        assert "  [O] 1. Launch (1/3)\n    [O] 2. Build (1/1)\n      [X] 3. Backend\n    [O] 4. Announce" in out
+        cli.process_command("show 2")
+        out = capsys.readouterr().out
+        assert "Parent: 1" in out and "Subtasks: 1/1 completed" in out
+        cli.process_command("move 2 4")
+        cli.process_command("move 4 3")
+        assert "Error: Task 3 is task 4 or one of its subtasks" in capsys.readouterr().out
+        cli.process_command("complete 1 all")
+        assert "3 task(s) completed" in capsys.readouterr().out
+        cli.process_command("delete 4 all")
+        assert "Deleted task with ID 4 and 2 subtask(s)" in capsys.readouterr().out
+        assert [task.id for task in cli.task_manager.get_all_tasks()] == [1]
@@ -0,0 +1,207 @@
+"""
+Unit tests for task namespaces and their quotas
+"""
+
+from datetime import datetime
+
+import pytest
+
+from modules.cli import TodoCLI
+from modules.clock import ManualClock
+from modules.ratelimit import TokenBucket
+from modules.scheduler import ReminderScheduler
+from modules.tasks import TaskManager
+from modules.tenants import Namespaces, Quota, QuotaExceeded, ScopedScheduler
+
+
+def make_namespaces(tmp_path, **options):
+    return Namespaces(lambda name: TaskManager(), directory=str(tmp_path), **options)
+
+
+class TestTokenBucket:
+    """Test refill and burst limits"""
+
+    def test_burst_then_refill(self):
+        """Test a full bucket admits its burst, then refills at the rate"""
+        clock = ManualClock()
+        bucket = TokenBucket(2, capacity=3, clock=clock.seconds)
+        assert [bucket.try_take() for _ in range(4)] == [True, True, True, False]
+        assert bucket.wait_time() == pytest.approx(0.5)
+        clock.advance(0.5)
+        assert bucket.try_take() and not bucket.try_take()
+        clock.advance(99.5)
+        assert bucket.tokens <= 3 and bucket.wait_time(3) == 0.0
+        with pytest.raises(ValueError):
+            TokenBucket(0)
+
+
+class TestNamespaces:
+    """Test isolation, lazy loading and eviction"""
+
+    def test_namespaces_are_isolated(self, tmp_path):
+        """Test each namespace has its own ids, tasks and indexes"""
+        namespaces = make_namespaces(tmp_path)
+        work, home = namespaces.get("work").manager, namespaces.get("home").manager
+        work.add_task("Write report")
+        work.add_task("Call client")
+        assert home.add_task("Buy milk").id == 1
+        assert [task.title for task in home.get_all_tasks()] == ["Buy milk"]
+        assert work.storage.text_index.ids(["milk"]) == set()
+        assert namespaces.names() == ["home", "work"]
+        with pytest.raises(ValueError):
+            namespaces.get("../etc")
+
+    def test_eviction_round_trip(self, tmp_path):
+        """Test the least recently used namespace is snapshotted and restored intact"""
+        namespaces = make_namespaces(tmp_path, max_loaded=2)
+        work = namespaces.use("work").manager
+        work.add_task("Write report")
+        work.add_task("Call client")
+        work.delete_task(2)
+        work.mark_completed(1)
+        namespaces.get("home")
+        namespaces.get("gym")
+        assert not namespaces.is_loaded("home") and namespaces.is_loaded("work")
+        assert namespaces.evictions == 1 and "home" in namespaces
+        with pytest.raises(ValueError):
+            namespaces.evict("work")
+
+        namespaces.use("home")
+        assert namespaces.evict("work")
+        assert (tmp_path / "work.snapshot").exists()
+        restored = namespaces.get("work").manager
+        assert restored is not work and namespaces.loads == 2
+        task = restored.get_task(1)
+        assert task.completed and task.version == 2 and task.title == "Write report"
+        assert restored.add_task("Plan week").id == 3
+        assert not (tmp_path / "work.snapshot").exists()
+        namespaces.close()
+        assert len(namespaces) == 0
+
+    def test_pinned_namespaces_stay_loaded(self, tmp_path):
+        """Test a pinned namespace is skipped by eviction until its last unpin"""
+        namespaces = make_namespaces(tmp_path, max_loaded=2)
+        namespaces.use("work")
+        namespaces.pin("work")
+        namespaces.pin("work")
+        namespaces.use("home")
+        namespaces.get("gym")
+        assert [namespaces.is_loaded(name) for name in ("work", "home", "gym")] == [True, True, True]
+        with pytest.raises(ValueError):
+            namespaces.evict("work")
+        assert "pinned" in namespaces.describe()
+        namespaces.unpin("work")  # still pinned once: gym goes instead
+        assert namespaces.is_pinned("work") and not namespaces.is_loaded("gym")
+        namespaces.unpin("work")
+        namespaces.get("gym")
+        assert not namespaces.is_loaded("work") and not namespaces.is_pinned("work")
+        with pytest.raises(ValueError):
+            namespaces.pin("work")
+        namespaces.close()
+
+    def test_reminders_keyed_by_namespace(self):
+        """Test reminders for the same task id in two namespaces do not collide"""
+        fired = []
+        scheduler = ReminderScheduler(lambda key, deadline: fired.append(key))
+        due = datetime(2026, 5, 1, 9, 0)
+        for name in ("home", "work"):
+            manager = TaskManager(scheduler=ScopedScheduler(scheduler, name))
+            manager.add_task("Task")
+            manager.set_due(1, due)
+        assert len(scheduler) == 2
+        scheduler.run_pending(due.timestamp())
+        assert sorted(fired) == [("home", 1), ("work", 1)]
+
+
+class TestQuotas:
+    """Test per-namespace rate and memory quotas"""
+
+    def test_rate_quota(self, tmp_path):
+        """Test a busy namespace is throttled without affecting others"""
+        clock = ManualClock()
+        namespaces = make_namespaces(tmp_path, clock=clock.seconds)
+        namespaces.set_quota("busy", Quota(ops_per_second=10, burst=2))
+        busy, quiet = namespaces.get("busy"), namespaces.get("quiet")
+        busy.admit()
+        busy.admit()
+        with pytest.raises(QuotaExceeded):
+            busy.admit()
+        for _ in range(100):
+            quiet.admit()
+        clock.advance(0.1)
+        busy.admit()
+        assert namespaces.counters("busy") == [3, 1]
+
+    def test_memory_quota_refuses_growth(self, tmp_path):
+        """Test adds are refused once pending tasks fill the quota, while reads go on"""
+        namespaces = make_namespaces(tmp_path)
+        namespaces.set_quota("small", Quota(max_bytes=4096))
+        small = namespaces.get("small")
+        while not small.memory_full():
+            small.admit(grows=True)
+            small.manager.add_task("A pending task with a title long enough to count")
+        with pytest.raises(QuotaExceeded):
+            small.admit(grows=True)
+        small.admit()
+        small.manager.mark_completed(1)
+        namespaces.set_quota("small", Quota(max_bytes=4096))  # re-applying spills the completed task
+        assert not small.memory_full()
+
+
+class TestUseCommand:
+    """Test the use and quota commands"""
+
+    def test_use_switches_lists(self, capsys):
+        """Test lists keep separate tasks and the list cache does not leak across them"""
+        cli = TodoCLI()
+        cli.process_command('add "Buy milk"')
+        cli.process_command("list")
+        cli.process_command("use work")
+        assert "Created list 'work' (0 task(s))" in capsys.readouterr().out
+        cli.process_command("list")
+        assert "No tasks found" in capsys.readouterr().out
+        cli.process_command('add "Write report"')
+        assert "1. Write report" in capsys.readouterr().out
+        cli.process_command("use default")
+        cli.process_command("use")
+        out = capsys.readouterr().out
+        assert "Using list 'default' (1 task(s))" in out
+        assert "work" in out and "current" in out
+
+    def test_feeds_keep_serving_their_list(self, capsys):
+        """Test tail and replication stay on the list they started on, which stays loaded"""
+        cli = TodoCLI()
+        cli.namespaces.max_loaded = 1
+        cli.process_command("tail")
+        cli.process_command("replicate serve")
+        try:
+            assert "Tailing changes in list 'default'" in capsys.readouterr().out
+            cli.process_command("use work")
+            out = capsys.readouterr().out
+            assert "Note: replication still serves list 'default'" in out
+            assert "Note: tail still serves list 'default'" in out
+            cli.process_command("use home")
+            assert cli.namespaces.is_loaded("default") and not cli.namespaces.is_loaded("work")
+            cli.process_command("replicate status")
+            assert "Serving list 'default' on" in capsys.readouterr().out
+        finally:
+            cli.process_command("replicate stop")
+            cli.process_command("tail off")
+        assert not cli.namespaces.is_loaded("default") and cli.served_lists == {}
+        cli.process_command("use work")
+        assert "Note:" not in capsys.readouterr().out
+
+    def test_rate_quota_command(self, capsys):
+        """Test a rate quota rejects commands past the burst"""
+        cli = TodoCLI()
+        cli.process_command("quota rate 0.001 2")
+        assert "rate 0.001 ops/s (burst 2)" in capsys.readouterr().out
+        for _ in range(3):
+            cli.process_command('add "Buy milk"')
+        assert "over its rate quota" in capsys.readouterr().out
+        assert len(cli.task_manager.get_all_tasks()) == 2
+        cli.process_command("quota")
+        assert "2 command(s) admitted, 1 rejected" in capsys.readouterr().out
+        cli.process_command("quota rate off")
+        cli.process_command('add "Buy bread"')
+        assert "Added task" in capsys.readouterr().out
@@ -7,7 +7,7 @@ import pytest
 from modules.storage import InMemoryStorage, Task
 from modules.tasks import TaskManager
 from modules.utils import (
-    validate_title, validate_task_id, format_task,
+    validate_title, validate_task_id, parse_positive_int, format_task,
     format_task_detailed, parse_command, is_valid_command
 )
 from modules.cli import TodoCLI
@@ -163,6 +163,13 @@ class TestUtilsModule:
         assert is_valid is False
         assert parsed_id is None
 
+    def test_parse_positive_int(self):
+        """Test count parsing for workers, limits and days"""
+        assert parse_positive_int("4") == 4
+        assert parse_positive_int("0") is None
+        assert parse_positive_int("-1") is None
+        assert parse_positive_int("abc") is None
+
     def test_format_task(self):
         """Test task formatting"""
         task = Task(id=1, title="Test task", completed=False)
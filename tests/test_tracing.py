@@ -0,0 +1,153 @@
+"""
+Unit tests for sampled tracing spans
+"""
+
+import json
+
+import pytest
+
+from cli import CLIInterface
+from main import main
+from modules.tracing import Tracer
+from services import ItemService
+from storage import InMemoryStorage
+
+
+class Layers:
+    """Three nested calls, the innermost sometimes failing"""
+
+    def outer(self, fail=False):
+        return self.middle(fail) + 1
+
+    def middle(self, fail):
+        return self.inner(fail) + self.inner(False)
+
+    def inner(self, fail):
+        if fail:
+            raise ValueError("boom")
+        return 1
+
+
+def traced_layers(tracer):
+    layers = Layers()
+    tracer.instrument(layers, 'test', ['outer', 'middle', 'inner'])
+    return layers
+
+
+class TestTracer:
+    """Test span recording, nesting and sampling"""
+
+    def test_spans_nest_with_self_time(self):
+        """Test each call records a span whose self time excludes nested spans"""
+        tracer = Tracer()
+        layers = traced_layers(tracer)
+        assert layers.outer() == 3
+        names = [span[0] for span in tracer.spans]
+        assert names == ["Layers.inner", "Layers.inner", "Layers.middle", "Layers.outer"]
+        spans = {span[0]: span for span in tracer.spans}
+        _, _, start, duration, own, _, trace = spans["Layers.outer"]
+        assert own == duration - spans["Layers.middle"][3]
+        middle = spans["Layers.middle"]
+        assert start <= middle[2] and middle[2] + middle[3] <= start + duration
+        assert {span[6] for span in tracer.spans} == {1}
+        assert layers.outer.__name__ == 'outer'
+
+    def test_failing_calls_still_recorded(self):
+        """Test exceptions pass through and close their spans"""
+        tracer = Tracer()
+        layers = traced_layers(tracer)
+        with pytest.raises(ValueError):
+            layers.outer(fail=True)
+        assert [span[0] for span in tracer.spans] == ["Layers.inner", "Layers.middle", "Layers.outer"]
+        assert layers.outer() == 3
+        assert tracer.traces == 2 and tracer.spans[-1][6] == 2
+
+    def test_sampling_is_per_trace(self):
+        """Test a trace is kept or dropped whole, at roughly the sample rate"""
+        tracer = Tracer(sample_rate=0.25, seed=7)
+        layers = traced_layers(tracer)
+        for _ in range(2000):
+            layers.outer()
+        assert tracer.traces == 2000
+        assert 400 < tracer.sampled < 600
+        assert len(tracer.spans) == 4 * tracer.sampled
+        never = Tracer(0.0)
+        traced_layers(never).outer()
+        assert never.traces == 1 and not never.spans
+        with pytest.raises(ValueError):
+            Tracer(sample_rate=1.5)
+
+    def test_span_limit(self):
+        """Test spans past the limit are counted, not kept"""
+        tracer = Tracer(max_spans=5)
+        layers = traced_layers(tracer)
+        layers.outer()
+        layers.outer()
+        assert len(tracer.spans) == 5 and tracer.dropped == 3
+        assert "(3 dropped)" in tracer.describe()
+
+    def test_stats(self):
+        """Test per-span totals"""
+        tracer = Tracer()
+        layers = traced_layers(tracer)
+        layers.outer()
+        rows = {name: (layer, calls) for name, layer, calls, _, _ in tracer.stats()}
+        assert rows == {"Layers.outer": ('test', 1), "Layers.middle": ('test', 1), "Layers.inner": ('test', 2)}
+        assert tracer.stats()[0][0] == "Layers.outer"
+
+
+class TestExport:
+    """Test Chrome trace-event output and the item console hooks"""
+
+    def test_chrome_events(self):
+        """Test complete events in start order with microsecond times"""
+        tracer = Tracer()
+        traced_layers(tracer).outer()
+        events = tracer.chrome_events()
+        assert [event['name'] for event in events] == ["Layers.outer", "Layers.middle", "Layers.inner", "Layers.inner"]
+        assert all(event['ph'] == 'X' and event['cat'] == 'test' for event in events)
+        assert events[0]['ts'] <= events[1]['ts'] and events[0]['dur'] >= events[1]['dur']
+        assert events[0]['args']['trace'] == 1
+
+    def test_cli_requests_traced_through_layers(self):
+        """Test a one-shot update records CLI, service, storage and engine spans"""
+        cli = CLIInterface(ItemService(InMemoryStorage()))
+        cli.item_service.create_item("Buy milk", "")
+        tracer = Tracer()
+        cli.trace(tracer)
+        assert cli.run_once(['update', '1', 'Buy oat milk']) == 0
+        layers = {span[1]: span[0] for span in tracer.spans}
+        assert layers['cli'] == "CLIInterface._update_once"
+        assert layers['service'] == "ItemService.update_item"
+        assert 'storage' in layers and 'engine' in layers
+        assert tracer.traces == 1
+        assert cli.item_service.get_item(1).title == "Buy oat milk"
+
+    def test_menu_handlers_traced(self, monkeypatch):
+        """Test interactive menu choices are traced too"""
+        cli = CLIInterface(ItemService(InMemoryStorage()))
+        tracer = Tracer()
+        cli.trace(tracer)
+        monkeypatch.setattr('builtins.input', lambda prompt="": "Buy milk")
+        cli.menu['1']()
+        assert tracer.spans[-1][0] == "CLIInterface.create_item_prompt"
+
+    def test_main_writes_trace_file(self, monkeypatch, tmp_path, capsys):
+        """Test TODO_TRACE makes main write a trace file"""
+        path = tmp_path / "trace.json"
+        monkeypatch.setenv('TODO_TRACE', str(path))
+        assert main(['add', 'Buy milk']) == 0
+        assert "written to" in capsys.readouterr().err
+        data = json.loads(path.read_text())
+        assert data['otherData']['sampled'] == 1
+        assert data['traceEvents'][0]['name'] == "CLIInterface._add_once"
+
+    def test_main_rejects_bad_sample_rate(self, monkeypatch, tmp_path, capsys):
+        """Test a bad TODO_TRACE_SAMPLE is a usage error rather than a traceback"""
+        monkeypatch.setenv('TODO_TRACE', str(tmp_path / "trace.json"))
+        for sample in ("abc", "2"):
+            monkeypatch.setenv('TODO_TRACE_SAMPLE', sample)
+            assert main(['add', 'Buy milk']) == 2
+            err = capsys.readouterr().err
+            assert err.startswith("Error: ") and "between 0 and 1" in err
+        assert not (tmp_path / "trace.json").exists()
@@ -0,0 +1,142 @@
+"""
+Unit tests for task versions and compare-and-set updates
+"""
+
+import threading
+
+import pytest
+
+from models import Item
+from modules.cli import TodoCLI
+from modules.storage import InMemoryStorage, VersionConflict
+from services import ItemService
+from storage import InMemoryStorage as ItemStorage
+
+
+class TestConditionalWrites:
+    """Test if_version on engine, task manager and item service writes"""
+
+    def test_every_write_bumps_version(self):
+        """Test each mutation increments the version once"""
+        storage = InMemoryStorage()
+        task = storage.add_task("Buy milk")
+        storage.update_task(1, title="Buy oat milk")
+        storage.mark_completed(1)
+        storage.add_tags(1, ["home"])
+        storage.set_priority(1, "high")
+        assert task.version == 5
+        assert [task.version for task in storage.add_tasks([("A", "", False), ("B", "", True)])] == [1, 1]
+
+    def test_update_if_version(self):
+        """Test an update applies at the expected version and conflicts otherwise"""
+        storage = InMemoryStorage()
+        storage.add_task("Buy milk")
+        assert storage.update_task(1, title="Buy oat milk", if_version=1)
+        with pytest.raises(VersionConflict) as error:
+            storage.update_task(1, title="Buy soy milk", if_version=1)
+        assert (error.value.task_id, error.value.expected, error.value.actual) == (1, 1, 2)
+        assert storage.get_task(1).title == "Buy oat milk"
+        assert storage.update_task(99, title="x", if_version=1) is False
+
+    def test_delete_if_version(self):
+        """Test a stale delete leaves the task in place"""
+        storage = InMemoryStorage()
+        storage.add_task("Buy milk")
+        storage.mark_completed(1)
+        with pytest.raises(VersionConflict):
+            storage.delete_task(1, if_version=1)
+        assert storage.get_task(1) is not None
+        assert storage.delete_task(1, if_version=2)
+        assert storage.delete_task(1, if_version=2) is False
+
+    def test_item_service_if_version(self):
+        """Test item updates and deletes take if_version"""
+        service = ItemService(ItemStorage())
+        service.create_item("Buy milk", "")
+        assert service.update_item(1, title="Buy bread", if_version=1).version == 2
+        with pytest.raises(VersionConflict):
+            service.update_item(1, title="Buy eggs", if_version=1)
+        with pytest.raises(VersionConflict):
+            service.delete_item(1, if_version=1)
+        assert service.delete_item(1, if_version=2)
+
+
+class TestConcurrentCas:
+    """Test compare-and-set under contention from several threads"""
+
+    def test_no_lost_updates(self):
+        """Test concurrent read-modify-write loops with retries count every increment"""
+        storage = InMemoryStorage()
+        for _ in range(4):
+            storage.add_task("0")
+
+        def worker():
+            for round_ in range(300):
+                task_id = round_ % 4 + 1
+                while True:
+                    task = storage.get_task(task_id)
+                    version, count = task.version, int(task.title)
+                    try:
+                        storage.update_task(task_id, title=str(count + 1), if_version=version)
+                        break
+                    except VersionConflict:
+                        continue  # another thread got there first: read again
+
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert [storage.get_task(task_id).title for task_id in range(1, 5)] == ["450"] * 4
+        assert [storage.get_task(task_id).version for task_id in range(1, 5)] == [451] * 4
+
+    def test_item_replacement_is_checked(self):
+        """Test whole-item replacements and field patches racing on one item count every increment"""
+        storage = ItemStorage()
+        service = ItemService(storage)
+        service.create_item("0", "")
+
+        def worker(replace):
+            for _ in range(200):
+                while True:
+                    item = storage.get_item(1)
+                    version, title = item.version, str(int(item.title) + 1)
+                    try:
+                        if replace:
+                            storage.update_item(1, Item(0, title, "", item.created_at), if_version=version)
+                        else:
+                            service.patch_item(1, if_version=version, title=title)
+                        break
+                    except VersionConflict:
+                        continue
+
+        threads = [threading.Thread(target=worker, args=(index % 2 == 0,)) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert (storage.get_item(1).title, storage.get_item(1).version) == ("800", 801)
+        with pytest.raises(VersionConflict):
+            storage.update_item(1, Item(0, "Stale", "", None), if_version=1)
+
+
+class TestCasCommand:
+    """Test the cas and versioned delete commands"""
+
+    def test_cas_and_delete(self, capsys):
+        """Test cas applies at the shown version and reports conflicts"""
+        cli = TodoCLI()
+        cli.process_command('add "Buy milk"')
+        cli.process_command("show 1")
+        assert "Version: 1" in capsys.readouterr().out
+        cli.process_command('cas 1 1 "Buy oat milk"')
+        assert "(version 2)" in capsys.readouterr().out
+        cli.process_command('cas 1 1 "Buy soy milk"')
+        assert "Conflict: task 1 is at version 2, not 1" in capsys.readouterr().out
+        assert cli.task_manager.get_task(1).title == "Buy oat milk"
+        cli.process_command('cas 1 x "Buy soy milk"')
+        assert "Version must be" in capsys.readouterr().out
+        cli.process_command("delete 1 1")
+        assert "not deleted" in capsys.readouterr().out
+        cli.process_command("delete 1 2")
+        assert "Deleted task with ID 1" in capsys.readouterr().out
@@ -0,0 +1,101 @@
+"""
+Unit tests for workload generation, recording and replay
+"""
+
+import io
+from collections import Counter
+
+import pytest
+
+from modules.workload import (
+    TraceRecord, Workload, generate, load_trace, main, make_target, parse_mix,
+    percentile, recording, replay, save_trace, zipf_rank
+)
+
+
+class TestGenerate:
+    """Test synthetic traces"""
+
+    def test_mix_and_determinism(self):
+        """Test command ratios follow the mix and a seed fixes the trace"""
+        workload = Workload(mix=parse_mix("add=1,show=3"), initial_tasks=10)
+        trace = generate(4000, workload, seed=5)
+        counts = Counter(record.command.split()[0] for record in trace[10:])
+
+        assert len(trace) == 4010
+        assert set(counts) == {'add', 'show'}
+        assert 2.5 < counts['show'] / counts['add'] < 3.5
+        assert generate(50, workload, seed=5) == generate(50, workload, seed=5)
+        assert all(a.t <= b.t for a, b in zip(trace, trace[1:]))
+
+    def test_zipf_favours_low_ranks(self):
+        """Test rank 1 is drawn far more often than the median rank"""
+        import random
+        rng = random.Random(1)
+        ranks = Counter(zipf_rank(rng, 1000, 1.1) for _ in range(20000))
+        assert min(ranks) >= 1 and max(ranks) <= 1000
+        assert ranks[1] > 20 * ranks.get(500, 1)
+
+    def test_invalid_mix(self):
+        """Test unknown commands and empty weights are rejected"""
+        with pytest.raises(ValueError):
+            Workload(mix={'frobnicate': 1})
+        with pytest.raises(ValueError):
+            Workload(mix={'add': 0})
+        with pytest.raises(ValueError):
+            parse_mix("add=lots")
+
+    @pytest.mark.parametrize("target", ["cli", "console"])
+    def test_trace_is_valid_for_each_front_end(self, target):
+        """Test every generated command succeeds against a fresh store"""
+        output = io.StringIO()
+        report = replay(generate(500, seed=2), make_target(target), output=output)
+        assert report.commands == 600
+        assert "Error" not in output.getvalue()
+
+
+class TestReplay:
+    """Test timing and reporting"""
+
+    def test_paced_replay_waits(self):
+        """Test speed 1 honours recorded times and max speed does not"""
+        trace = [TraceRecord(0.0, "show 1"), TraceRecord(0.05, "show 1")]
+        calls = []
+        assert replay(trace, calls.append, speed=1.0).seconds >= 0.05
+        assert replay(trace, calls.append).seconds < 0.05
+        assert calls == ["show 1"] * 4
+
+    def test_report(self):
+        """Test percentiles and the summary table"""
+        assert percentile([1, 2, 3, 4], 50) == 2
+        assert percentile([1, 2, 3, 4], 100) == 4
+        report = replay(generate(100, seed=3), make_target('cli'))
+        assert report.throughput > 0
+        assert "p99 us" in report.describe() and "\nall" in report.describe()
+
+
+class TestRecording:
+    """Test recording sessions and trace files"""
+
+    def test_record_and_reload(self, tmp_path, monkeypatch):
+        """Test lines read through input() are saved with their times"""
+        lines = iter(['add "Buy milk"', '', 'show 1', 'quit'])
+        monkeypatch.setattr('builtins.input', lambda prompt="": next(lines))
+        path = str(tmp_path / "session.jsonl")
+        with recording(path):
+            for _ in range(4):
+                input("> ")
+
+        trace = load_trace(path)
+        assert [record.command for record in trace] == ['add "Buy milk"', 'show 1']
+
+    def test_round_trip_and_cli(self, tmp_path, capsys):
+        """Test the command-line tool generates and replays a trace"""
+        path = str(tmp_path / "trace.jsonl")
+        assert main(["generate", "-n", "50", "--seed", "1", "-o", path]) == 0
+        assert len(load_trace(path)) == 150
+        assert main(["replay", path, "--target", "console"]) == 0
+        assert "150 commands" in capsys.readouterr().out
+
+        save_trace([TraceRecord(0.0, "list")], path)
+        assert load_trace(path) == [TraceRecord(0.0, "list")]
@@ -3,18 +3,31 @@ Phase I: In-Memory Console Todo Application
 Simple CLI-based todo manager with in-memory storage
 """
 
+from __future__ import annotations
+
 import sys
-from typing import Dict, List, Optional
 
+# Only type checkers need these; importing typing at startup costs several ms
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, List, Optional, Sequence
+    from modules.clock import SystemClock
+    from modules.query import QueryResult
+
+from modules.commands import CommandRegistry
+from modules.complete import Completer, install as install_completion
+from modules.storage import InMemoryStorage, Task
+
+# TodoItem has no timestamps, so only these fields can be queried
+QUERY_FIELDS = ('id', 'title', 'description', 'text', 'completed')
 
-class TodoItem:
-    """Represents a single todo item"""
 
-    def __init__(self, id: int, title: str, description: str = "", completed: bool = False):
-        self.id = id
-        self.title = title
-        self.description = description
-        self.completed = completed
+class TodoItem(Task):
+    """
+    Represents a single todo item
+    Constructed as TodoItem(id, title, description="", completed=False); the
+    remaining Task fields keep their defaults.
+    """
 
     def __str__(self):
         status = "X" if self.completed else "O"
@@ -26,64 +39,66 @@ class TodoItem:
 
 
 class TodoManager:
-    """Manages the collection of todo items in memory"""
+    """Manages the collection of todo items in the shared task engine"""
 
-    def __init__(self):
-        self.todos: Dict[int, TodoItem] = {}
-        self.next_id = 1
+    def __init__(self, clock: Optional[SystemClock] = None):
+        self.storage = InMemoryStorage(clock)
+
+    @property
+    def todos(self) -> Dict[int, TodoItem]:
+        """The engine's ID -> todo mapping; treat it as read-only"""
+        return self.storage._tasks
 
     def add_todo(self, title: str, description: str = "") -> TodoItem:
         """Add a new todo item"""
         if not title.strip():
             raise ValueError("Todo title cannot be empty")
 
-        todo = TodoItem(self.next_id, title.strip(), description.strip())
-        self.todos[self.next_id] = todo
-        self.next_id += 1
-        return todo
+        now = self.storage.clock.now_us()
+        return self.storage.insert_task(TodoItem(0, title.strip(), description.strip(),
+                                                 created_at=now, updated_at=now))
 
     def get_todo(self, todo_id: int) -> Optional[TodoItem]:
         """Get a todo by ID"""
-        return self.todos.get(todo_id)
+        return self.storage.get_task(todo_id)
 
     def list_todos(self) -> List[TodoItem]:
         """Get all todos"""
-        return list(self.todos.values())
+        return self.storage.get_all_tasks()
+
+    def query_todos(self, tokens: Sequence[str]) -> QueryResult:
+        """Run a list query over the todos, using the engine's indexes where they help"""
+        from modules.query import execute_query, parse_query  # deferred: only queries need it
+        storage = self.storage
+        return execute_query(parse_query(tokens, fields=QUERY_FIELDS), storage._tasks, storage)
 
     def update_todo(self, todo_id: int, title: Optional[str] = None,
                    description: Optional[str] = None, completed: Optional[bool] = None) -> bool:
         """Update a todo item"""
-        if todo_id not in self.todos:
-            return False
-
-        todo = self.todos[todo_id]
-        if title is not None:
-            todo.title = title.strip()
-        if description is not None:
-            todo.description = description.strip()
-        if completed is not None:
-            todo.completed = completed
-
-        return True
+        return self.storage.update_task(
+            todo_id,
+            title.strip() if title is not None else None,
+            description.strip() if description is not None else None,
+            completed,
+        )
 
     def delete_todo(self, todo_id: int) -> bool:
         """Delete a todo item"""
-        if todo_id in self.todos:
-            del self.todos[todo_id]
-            return True
-        return False
+        return self.storage.delete_task(todo_id)
 
     def toggle_completion(self, todo_id: int) -> bool:
         """Toggle the completion status of a todo"""
-        if todo_id not in self.todos:
+        todo = self.storage.get_task(todo_id)
+        if todo is None:
             return False
 
-        self.todos[todo_id].completed = not self.todos[todo_id].completed
-        return True
+        if todo.completed:
+            return self.storage.mark_incomplete(todo_id)
+        return self.storage.mark_completed(todo_id)
 
     def get_next_id(self) -> int:
         """Get the next available ID"""
-        return self.next_id
+        return self.storage._next_id
 
 
 class TodoConsoleApp:
@@ -91,12 +106,30 @@ class TodoConsoleApp:
 
     def __init__(self):
         self.manager = TodoManager()
+        self.commands = CommandRegistry(id_error="Error: ID must be a positive number")
+        self._register_commands()
+
+    def _register_commands(self):
+        """Register the commands and their argument specs"""
+        register = self.commands.register
+        register('help', lambda args: self.print_help())
+        register('add', self.handle_add, min_args=1, missing="Error: Please provide a title for the todo")
+        register('list', self.handle_list)
+        register('explain', self.handle_explain)
+        register('show', self.handle_show, ids=1, max_args=1, missing="Error: Please provide a todo ID")
+        register('update', self.handle_update, ids=1, min_args=2, missing="Error: Please provide ID and new title")
+        register('complete', self.handle_complete, ids=1, max_args=1,
+                 missing="Error: Please provide a todo ID to complete")
+        register('incomplete', lambda args: self.handle_complete(args, completed=False), ids=1, max_args=1,
+                 missing="Error: Please provide a todo ID to mark as incomplete")
+        register('delete', self.handle_delete, ids=1, max_args=1, missing="Error: Please provide a todo ID to delete")
 
     def print_help(self):
         """Print available commands"""
         print("\nAvailable commands:")
         print("  add <title> [description]    - Add a new todo")
-        print("  list                         - List all todos")
+        print("  list [query]                 - List todos, e.g. list where completed=false limit 5")
+        print("  explain list [query]         - Show the query plan and rows examined")
         print("  show <id>                    - Show details of a specific todo")
         print("  update <id> <title> [desc]   - Update a todo")
         print("  complete <id>                - Mark todo as complete")
@@ -137,10 +170,6 @@ class TodoConsoleApp:
 
     def handle_add(self, args: List[str]):
         """Handle add command"""
-        if len(args) < 1:
-            print("Error: Please provide a title for the todo")
-            return
-
         title = args[0]
         description = ' '.join(args[1:]) if len(args) > 1 else ""
 
@@ -152,28 +181,38 @@ class TodoConsoleApp:
 
     def handle_list(self, args: List[str]):
         """Handle list command"""
-        todos = self.manager.list_todos()
+        if args:
+            try:
+                todos = self.manager.query_todos(args).rows
+            except ValueError as e:
+                print(f"Error: {e}")
+                return
+        else:
+            todos = self.manager.list_todos()
 
         if not todos:
             print("\nNo todos found.")
             return
 
-        print("\nYour todos:")
-        for todo in todos:
-            print(f"  {todo}")
+        sys.stdout.write("\nYour todos:\n" + "".join(f"  {todo}\n" for todo in todos))
 
-    def handle_show(self, args: List[str]):
-        """Handle show command"""
-        if len(args) != 1:
-            print("Error: Please provide a todo ID")
+    def handle_explain(self, args: List[str]):
+        """Handle explain command"""
+        if not args or args[0].lower() != 'list':
+            print("Error: Please provide a list query to explain")
             return
 
         try:
-            todo_id = int(args[0])
-        except ValueError:
-            print("Error: ID must be a number")
+            result = self.manager.query_todos(args[1:])
+        except ValueError as e:
+            print(f"Error: {e}")
             return
 
+        print(f"\n{result.explain()}")
+
+    def handle_show(self, args: List[str]):
+        """Handle show command"""
+        todo_id = args[0]
         todo = self.manager.get_todo(todo_id)
         if todo is None:
             print(f"Error: Todo with ID {todo_id} not found")
@@ -183,16 +222,7 @@ class TodoConsoleApp:
 
     def handle_update(self, args: List[str]):
         """Handle update command"""
-        if len(args) < 2:
-            print("Error: Please provide ID and new title")
-            return
-
-        try:
-            todo_id = int(args[0])
-        except ValueError:
-            print("Error: ID must be a number")
-            return
-
+        todo_id = args[0]
         title = args[1]
         description = ' '.join(args[2:]) if len(args) > 2 else ""
 
@@ -204,16 +234,7 @@ class TodoConsoleApp:
 
     def handle_complete(self, args: List[str], completed=True):
         """Handle complete/incomplete commands"""
-        if len(args) != 1:
-            print(f"Error: Please provide a todo ID to {'complete' if completed else 'mark as incomplete'}")
-            return
-
-        try:
-            todo_id = int(args[0])
-        except ValueError:
-            print("Error: ID must be a number")
-            return
-
+        todo_id = args[0]
         if self.manager.toggle_completion(todo_id):
             status = "completed" if completed else "marked as incomplete"
             todo = self.manager.get_todo(todo_id)
@@ -223,25 +244,26 @@ class TodoConsoleApp:
 
     def handle_delete(self, args: List[str]):
         """Handle delete command"""
-        if len(args) != 1:
-            print("Error: Please provide a todo ID to delete")
-            return
-
-        try:
-            todo_id = int(args[0])
-        except ValueError:
-            print("Error: ID must be a number")
-            return
-
+        todo_id = args[0]
         if self.manager.delete_todo(todo_id):
             print(f"Deleted todo with ID {todo_id}")
         else:
             print(f"Error: Todo with ID {todo_id} not found")
 
+    def execute(self, command: str, args: List[str]) -> bool:
+        """Run one command, returning False if it is unknown"""
+        handler = self.commands.get(command)
+        if handler is None:
+            print(f"Unknown command: {command}. Type 'help' for available commands.")
+            return False
+        handler(args)
+        return True
+
     def run(self):
         """Main application loop"""
         print("Welcome to the Todo Console Application!")
         print("Type 'help' for available commands or 'quit' to exit.\n")
+        install_completion(Completer(self.commands, self.manager.storage))
 
         while True:
             try:
@@ -255,24 +277,7 @@ class TodoConsoleApp:
                 if command in ['quit', 'exit']:
                     print("Goodbye!")
                     break
-                elif command == 'help':
-                    self.print_help()
-                elif command == 'add':
-                    self.handle_add(args)
-                elif command == 'list':
-                    self.handle_list(args)
-                elif command == 'show':
-                    self.handle_show(args)
-                elif command == 'update':
-                    self.handle_update(args)
-                elif command == 'complete':
-                    self.handle_complete(args, completed=True)
-                elif command == 'incomplete':
-                    self.handle_complete(args, completed=False)
-                elif command == 'delete':
-                    self.handle_delete(args)
-                else:
-                    print(f"Unknown command: {command}. Type 'help' for available commands.")
+                self.execute(command, args)
 
             except KeyboardInterrupt:
                 print("\n\nGoodbye!")
@@ -281,11 +286,19 @@ class TodoConsoleApp:
                 print(f"An unexpected error occurred: {e}")
 
 
-def main():
-    """Entry point of the application"""
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Entry point of the application
+    With arguments, runs that single command and exits instead of starting the loop,
+    e.g. `python todo_console_app.py add "Buy milk"`
+    """
+    args = sys.argv[1:] if argv is None else argv
     app = TodoConsoleApp()
+    if args:
+        return 0 if app.execute(args[0].lower(), args[1:]) else 2
     app.run()
+    return 0
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file